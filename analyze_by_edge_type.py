@@ -17,6 +17,8 @@ from collections import defaultdict
 import sys
 from config import Config
 from g_quads import g_quads
+from utils.basepair_stream import BasepairStream
+from utils.residue_key import residues_adjacent
 
 
 def normalize_bp_type(bp_type: str) -> str:
@@ -36,35 +38,36 @@ def is_adjacent_pair(res_1: str, res_2: str) -> bool:
     Return True if the two residues are adjacent in sequence (same chain, residue numbers differ by 1).
     Excludes base pairs between consecutive residues (e.g. 74-75) which are often stacking/artifacts.
     """
-    if not res_1 or not res_2:
-        return False
-    parts1 = res_1.split('-')
-    parts2 = res_2.split('-')
-    if len(parts1) < 3 or len(parts2) < 3:
-        return False
-    try:
-        chain1, num1 = parts1[0], int(parts1[2])
-        chain2, num2 = parts2[0], int(parts2[2])
-    except (ValueError, IndexError):
-        return False
-    if chain1 != chain2:
-        return False
-    return abs(num1 - num2) == 1
+    return residues_adjacent(res_1, res_2)
+
+
+# Base pair fields the analysis reads; the rest of each record is dropped while streaming
+SAMPLE_FIELDS = ('res_1', 'res_2', 'bp_type', 'lw', 'shear', 'stretch', 'stagger',
+                 'buckle', 'propeller', 'opening', 'hbond_score')
+
+
+def _is_adjacent_record(bp: Dict) -> bool:
+    return is_adjacent_pair(bp.get('res_1', ''), bp.get('res_2', ''))
 
 
 def load_basepair_sample(basepair_dir: Path, max_files: int = None, sample_fraction: float = None,
-                         include_pdb_ids: Optional[set] = None) -> List[Dict]:
+                         include_pdb_ids: Optional[set] = None, exclude_adjacent: bool = True) -> List[Dict]:
     """
     Load base pair data efficiently.
 
+    Files are streamed record by record: adjacent pairs are dropped as they
+    are read and only SAMPLE_FIELDS are kept per pair, so memory grows with
+    the analyzed fields rather than the size of the JSON files.
+
     Args:
         basepair_dir: Directory containing base pair JSON files
         max_files: Maximum number of files to process (None = process all)
         sample_fraction: Fraction of files to sample (None = use max_files)
         include_pdb_ids: Set of PDB IDs (uppercase) to include. If provided, only these are processed.
+        exclude_adjacent: Drop pairs of sequence-adjacent residues (same chain, numbers differ by 1)
 
     Returns:
-        List of base pair dictionaries
+        List of base pair dictionaries (SAMPLE_FIELDS plus bp_type_norm)
     """
     json_files = list(basepair_dir.glob("*.json"))
 
@@ -87,32 +90,30 @@ def load_basepair_sample(basepair_dir: Path, max_files: int = None, sample_fract
     
     all_basepairs = []
     files_processed = 0
+    excluded_adj = 0
     
     for bp_file in json_files:
+        stream = BasepairStream(bp_file, exclude=_is_adjacent_record if exclude_adjacent else None)
+        collected = []
         try:
-            with open(bp_file, 'r') as f:
-                data = json.load(f)
-            
-            if isinstance(data, list):
-                base_pairs = data
-            elif isinstance(data, dict):
-                base_pairs = data.get('base_pairs', [])
-            else:
-                continue
-            
-            # Normalize bp_type for symmetry
-            for bp in base_pairs:
-                bp["bp_type_norm"] = normalize_bp_type(bp.get("bp_type", "unknown"))
-            all_basepairs.extend(base_pairs)
-            files_processed += 1
-            
-            if files_processed % 500 == 0:
-                print(f"  Processed {files_processed}/{len(json_files)} files, collected {len(all_basepairs):,} base pairs...")
-        
+            for bp in stream:
+                sample = {field: bp[field] for field in SAMPLE_FIELDS if field in bp}
+                # Normalize bp_type for symmetry
+                sample["bp_type_norm"] = normalize_bp_type(bp.get("bp_type", "unknown"))
+                collected.append(sample)
         except Exception as e:
             continue
+        
+        all_basepairs.extend(collected)
+        excluded_adj += stream.excluded
+        files_processed += 1
+        
+        if files_processed % 500 == 0:
+            print(f"  Processed {files_processed}/{len(json_files)} files, collected {len(all_basepairs):,} base pairs...")
     
     print(f"✓ Loaded {len(all_basepairs):,} base pairs from {files_processed} files")
+    if excluded_adj > 0:
+        print(f"✓ Excluded {excluded_adj:,} adjacent base pairs (residue diff=1), {len(all_basepairs):,} remaining")
     return all_basepairs
 
 
@@ -565,15 +566,9 @@ def main():
     
     # Load base pairs (process all files for complete analysis)
     print("\nProcessing ALL base pair files (this may take a few minutes)...")
+    # Adjacent base pairs (same chain, residue numbers differ by 1) are excluded while loading
     basepairs = load_basepair_sample(basepair_dir, max_files=None, include_pdb_ids=allowed_pdb_ids)
 
-    # Exclude adjacent base pairs (same chain, residue numbers differ by 1)
-    before_adj = len(basepairs)
-    basepairs = [bp for bp in basepairs if not is_adjacent_pair(bp.get('res_1', ''), bp.get('res_2', ''))]
-    excluded_adj = before_adj - len(basepairs)
-    if excluded_adj > 0:
-        print(f"✓ Excluded {excluded_adj:,} adjacent base pairs (residue diff=1), {len(basepairs):,} remaining")
-
     if len(basepairs) == 0:
         print("Error: No base pair data loaded")
         sys.exit(1)
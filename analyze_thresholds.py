@@ -9,40 +9,66 @@ data files and outputs statistical distributions and recommended thresholds.
 import json
 import pandas as pd
 import numpy as np
+from array import array
 from pathlib import Path
 from collections import defaultdict
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 import sys
 
+from utils.basepair_stream import BasepairStream
 
-def load_all_basepairs(basepair_dir: Path) -> List[Dict]:
-    """Load all base pair JSON files and collect geometry parameters."""
-    all_basepairs = []
+
+GEOMETRY_PARAMS = ('shear', 'stretch', 'stagger', 'buckle', 'propeller', 'opening')
+
+
+def iter_all_basepairs(basepair_dir: Path) -> Iterator[Dict]:
+    """Stream the base pairs of every JSON file, one record at a time."""
     basepair_files = list(basepair_dir.glob("*.json"))
     
     print(f"Loading {len(basepair_files)} base pair files...")
     
+    total = 0
     for bp_file in basepair_files:
+        # Handles both list and dict formats
+        stream = BasepairStream(bp_file)
         try:
-            with open(bp_file, 'r') as f:
-                data = json.load(f)
-            
-            # Handle both list and dict formats
-            if isinstance(data, list):
-                base_pairs = data
-            elif isinstance(data, dict):
-                base_pairs = data.get('base_pairs', [])
-            else:
-                continue
-            
-            all_basepairs.extend(base_pairs)
-            
+            yield from stream
         except Exception as e:
             print(f"Warning: Error loading {bp_file.name}: {e}")
-            continue
+        total += stream.read
     
-    print(f"✓ Loaded {len(all_basepairs)} total base pairs")
-    return all_basepairs
+    print(f"✓ Loaded {total} total base pairs")
+
+
+def collect_parameter_values(basepairs: Iterable[Dict]) -> Tuple[int, Dict[str, array]]:
+    """
+    Collect the analyzed parameters in one pass over the base pairs.
+    
+    Only the float values are kept (8 bytes each), never the base pair
+    records, so a corpus is analyzed without holding it in memory.
+    
+    Returns:
+        (number of base pairs, parameter -> values); 'hbond_score' holds
+        DSSR scores > 0 only (pairs with H-bonds)
+    """
+    values = {param: array('d') for param in GEOMETRY_PARAMS + ('hbond_score',)}
+    count = 0
+    for bp in basepairs:
+        count += 1
+        for param in GEOMETRY_PARAMS:
+            if param in bp and bp[param] is not None:
+                try:
+                    values[param].append(float(bp[param]))
+                except (ValueError, TypeError):
+                    pass
+        if 'hbond_score' in bp and bp['hbond_score'] is not None:
+            try:
+                score = float(bp['hbond_score'])
+                if score > 0:  # Only include pairs with H-bonds
+                    values['hbond_score'].append(score)
+            except (ValueError, TypeError):
+                pass
+    return count, values
 
 
 # H-bond CSV analysis excluded as requested
@@ -106,31 +132,14 @@ def calculate_statistics(values: List[float], param_name: str) -> Dict:
     return stats
 
 
-def analyze_geometry_parameters(basepairs: List[Dict]) -> Dict:
-    """Analyze geometry parameters from base pairs."""
+def analyze_geometry_parameters(values: Dict[str, array]) -> Dict:
+    """Analyze geometry parameters collected by collect_parameter_values."""
     print("\nAnalyzing geometry parameters...")
     
-    geometry_params = {
-        'shear': [],
-        'stretch': [],
-        'stagger': [],
-        'buckle': [],
-        'propeller': [],
-        'opening': []
-    }
-    
-    for bp in basepairs:
-        for param in geometry_params.keys():
-            if param in bp and bp[param] is not None:
-                try:
-                    geometry_params[param].append(float(bp[param]))
-                except (ValueError, TypeError):
-                    pass
-    
     results = {}
-    for param, values in geometry_params.items():
-        print(f"  {param}: {len(values)} values")
-        results[param] = calculate_statistics(values, param)
+    for param in GEOMETRY_PARAMS:
+        print(f"  {param}: {len(values[param])} values")
+        results[param] = calculate_statistics(values[param], param)
     
     return results
 
@@ -141,20 +150,11 @@ def analyze_geometry_parameters(basepairs: List[Dict]) -> Dict:
 #     ...
 
 
-def analyze_dssr_hbond_score(basepairs: List[Dict]) -> Dict:
-    """Analyze DSSR H-bond score from base pairs."""
+def analyze_dssr_hbond_score(values: Dict[str, array]) -> Dict:
+    """Analyze DSSR H-bond scores collected by collect_parameter_values."""
     print("\nAnalyzing DSSR H-bond scores...")
     
-    hbond_scores = []
-    for bp in basepairs:
-        if 'hbond_score' in bp and bp['hbond_score'] is not None:
-            try:
-                score = float(bp['hbond_score'])
-                if score > 0:  # Only include pairs with H-bonds
-                    hbond_scores.append(score)
-            except (ValueError, TypeError):
-                pass
-    
+    hbond_scores = values['hbond_score']
     print(f"  hbond_score: {len(hbond_scores)} values (score > 0)")
     return calculate_statistics(hbond_scores, 'hbond_score')
 
@@ -325,16 +325,16 @@ def main():
     print("(H-bond CSV analysis excluded)")
     print("=" * 60)
     
-    # Load data
-    basepairs = load_all_basepairs(basepair_dir)
+    # Stream the data, keeping only the parameter values
+    total_basepairs, values = collect_parameter_values(iter_all_basepairs(basepair_dir))
     
-    if len(basepairs) == 0:
+    if total_basepairs == 0:
         print("Error: No base pair data loaded")
         sys.exit(1)
     
     # Analyze parameters (geometry and DSSR score only)
-    geometry_stats = analyze_geometry_parameters(basepairs)
-    dssr_stats = analyze_dssr_hbond_score(basepairs)
+    geometry_stats = analyze_geometry_parameters(values)
+    dssr_stats = analyze_dssr_hbond_score(values)
     
     # Generate recommendations
     recommendations = generate_recommendations(geometry_stats, dssr_stats)
@@ -342,7 +342,7 @@ def main():
     # Compile results
     results = {
         'summary': {
-            'total_basepairs': len(basepairs),
+            'total_basepairs': total_basepairs,
             'analysis_date': pd.Timestamp.now().isoformat(),
             'note': 'H-bond CSV analysis excluded as requested'
         },
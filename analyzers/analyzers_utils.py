@@ -3,6 +3,9 @@
 import pandas as pd
 from typing import Dict, List, Tuple
 
+from utils.atom_classifier import is_base_atom, base_base_mask, BASE_BASE_COLUMN
+from utils.residue_key import residue_key, residues_adjacent
+
 
 class BasePairScoring:
     """Core scoring logic for base pair geometry."""
@@ -42,31 +45,19 @@ class BasePairScoring:
     @staticmethod
     def check_adjacent_pairing(res_1: str, res_2: str) -> bool:
         """Check if two adjacent residues are pairing (unusual)."""
-        try:
-            chain_1 = res_1.split('-')[0]
-            chain_2 = res_2.split('-')[0]
-            num_1 = int(res_1.split('-')[2])
-            num_2 = int(res_2.split('-')[2])
-            # Only adjacent if same chain AND consecutive numbers
-            return chain_1 == chain_2 and abs(num_1 - num_2) == 1
-        except (IndexError, ValueError):
-            return False
+        # Only adjacent if same chain AND consecutive numbers
+        return residues_adjacent(res_1, res_2)
     
     
     
     @staticmethod
     def check_self_pairing(res_1: str, res_2: str) -> bool:
         """Check if a residue is pairing with itself (serious error)."""
-        try:
-            chain_1 = res_1.split('-')[0]
-            chain_2 = res_2.split('-')[0]
-            num_1 = int(res_1.split('-')[2])
-            num_2 = int(res_2.split('-')[2])
-            # Self-pairing only if same chain AND same residue number
-            return chain_1 == chain_2 and num_1 == num_2
-
-        except (IndexError, ValueError):
-            return False
+        key_1 = residue_key(res_1)
+        key_2 = residue_key(res_2)
+        # Self-pairing only if same chain AND same residue number
+        return (key_1 is not None and key_2 is not None and
+                key_1.chain == key_2.chain and key_1.number == key_2.number)
 
     @staticmethod
     def check_coplanarity(buckle: float, config) -> bool:
@@ -459,39 +450,7 @@ class ScoringUtils:
         Returns:
             True if base atom, False if backbone/sugar atom
         """
-        # Remove whitespace
-        atom_name = atom_name.strip()
-        
-        # Pattern-based exclusion for robustness
-        # Phosphate patterns
-        if atom_name.startswith('P') and len(atom_name) <= 3:  # P, PA, PB, PG
-            return False
-        if atom_name.startswith('OP'):  # OP1, OP2, OP3
-            return False
-        if 'P' in atom_name and 'O' in atom_name:  # O1P, O2P, O3P
-            return False
-        
-        # Sugar patterns (contains prime ' or asterisk *)
-        if "'" in atom_name or '*' in atom_name:
-            return False
-        
-        # Explicit exclusion list (backup)
-        backbone_sugar_atoms = {
-            # Phosphate
-            'P', 'OP1', 'OP2', 'OP3', 'O1P', 'O2P', 'O3P',
-            'PA', 'PB', 'PG',
-            
-            # Ribose (prime notation)
-            "O5'", "C5'", "C4'", "O4'", "C3'", "O3'", "C2'", "O2'", "C1'",
-            
-            # Ribose (asterisk notation)
-            'O5*', 'C5*', 'C4*', 'O4*', 'C3*', 'O3*', 'C2*', 'O2*', 'C1*',
-            
-            # Hydrogens
-            "HO5'", "HO2'", "HO3'", 'HO5*', 'HO2*', 'HO3*',
-        }
-    
-        return atom_name not in backbone_sugar_atoms
+        return is_base_atom(atom_name)
 
     @staticmethod
     def is_base_base_hbond(atom_1: str, atom_2: str) -> bool:
@@ -505,8 +464,36 @@ class ScoringUtils:
         Returns:
             True if both atoms are base atoms
         """
-        return (ScoringUtils.is_base_atom(atom_1) and 
-                ScoringUtils.is_base_atom(atom_2))
+        return is_base_atom(atom_1) and is_base_atom(atom_2)
+
+    @staticmethod
+    def is_base_base_row(hbond: pd.Series) -> bool:
+        """
+        Check if an H-bond row is base-base, reading the loader's
+        `is_base_base` column when present.
+        
+        Args:
+            hbond: H-bond data as pandas Series
+            
+        Returns:
+            True if both atoms are base atoms
+        """
+        if BASE_BASE_COLUMN in hbond.index:
+            return bool(hbond[BASE_BASE_COLUMN])
+        return is_base_atom(hbond['atom_1']) and is_base_atom(hbond['atom_2'])
+
+    @staticmethod
+    def base_base_mask(hbond_df: pd.DataFrame) -> pd.Series:
+        """
+        Vectorized base-base mask for a whole H-bond DataFrame.
+        
+        Args:
+            hbond_df: H-bond DataFrame
+            
+        Returns:
+            Boolean Series aligned with hbond_df.index
+        """
+        return base_base_mask(hbond_df)
         
     @staticmethod
     def build_base_pair_set(base_pairs: list) -> set:
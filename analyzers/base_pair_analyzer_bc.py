@@ -2,6 +2,7 @@
 
 from typing import Dict, List
 from .analyzers_utils import BasePairScoring
+from utils.residue_key import residue_key
 
 class BasePairAnalyzer:
     """Analyzes base pair geometry quality."""
@@ -97,12 +98,12 @@ class BasePairAnalyzer:
                         specific_issues.append(issue_type)
                 
                 # Extract residue numbers safely
-                try:
-                    chain_1 = res_1.split('-')[0]
-                    residue_1 = int(res_1.split('-')[2])
-                    chain_2 = res_2.split('-')[0]
-                    residue_2 = int(res_2.split('-')[2])
-                except (IndexError, ValueError):
+                key_1 = residue_key(res_1)
+                key_2 = residue_key(res_2)
+                if key_1 is not None and key_2 is not None:
+                    chain_1, residue_1 = key_1.chain, key_1.number
+                    chain_2, residue_2 = key_2.chain, key_2.number
+                else:
                     # Fallback if residue format is unexpected
                     chain_1 = res_1
                     residue_1 = 0
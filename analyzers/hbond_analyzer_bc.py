@@ -3,6 +3,7 @@
 import pandas as pd
 from typing import Dict
 from .analyzers_utils import HBondScoring, ScoringUtils, BasePairScoring
+from utils.residue_key import residue_key
 
 
 class HBondAnalyzer:
@@ -23,12 +24,10 @@ class HBondAnalyzer:
             base_pair_set = ScoringUtils.build_base_pair_set(basepair_data)
             
         # **FILTER 2: Only keep base-base H-bonds that belong to base pairs**
+        # Base-base check is one vectorized pass (reads the loader's is_base_base column)
+        hbond_df = hbond_df[ScoringUtils.base_base_mask(hbond_df)]
         valid_hbonds = []
         for _, row in hbond_df.iterrows():
-            # Check if atoms are base atoms (not backbone)
-            if not ScoringUtils.is_base_base_hbond(row['atom_1'], row['atom_2']):
-                continue
-            
             # **Skip adjacent pairs**
             if BasePairScoring.check_adjacent_pairing(row['res_1'], row['res_2']):
                 continue
@@ -73,12 +72,12 @@ class HBondAnalyzer:
                         specific_issues.append(issue_type)
                 
                 # Extract residue numbers safely
-                try:
-                    chain_1 = row['res_1'].split('-')[0]
-                    residue_1 = int(row['res_1'].split('-')[2])
-                    chain_2 = row['res_2'].split('-')[0]
-                    residue_2 = int(row['res_2'].split('-')[2])
-                except (IndexError, ValueError):
+                key_1 = residue_key(row['res_1'])
+                key_2 = residue_key(row['res_2'])
+                if key_1 is not None and key_2 is not None:
+                    chain_1, residue_1 = key_1.chain, key_1.number
+                    chain_2, residue_2 = key_2.chain, key_2.number
+                else:
                     # Fallback if residue format is unexpected
                     chain_1 = row['res_1']
                     residue_1 = 0
@@ -95,11 +94,11 @@ class HBondAnalyzer:
                     "atoms": f"{row['atom_1']} - {row['atom_2']}",
                     "specific_issues": specific_issues,
                     "hbond_parameters": {
-                        "distance": row['distance'],
-                        "angle_1": row['angle_1'],
-                        "angle_2": row['angle_2'],
-                        "dihedral": row['dihedral_angle'],
-                        "quality_score": row['score']
+                        "distance": float(row['distance']),
+                        "angle_1": float(row['angle_1']),
+                        "angle_2": float(row['angle_2']),
+                        "dihedral": float(row['dihedral_angle']),
+                        "quality_score": float(row['score'])
                     }
                 }
                 detailed_issues.append(detailed_issue)
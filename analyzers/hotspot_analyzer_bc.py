@@ -5,6 +5,8 @@ from typing import Dict, List, Set, Tuple
 from dataclasses import dataclass
 from collections import defaultdict
 from .analyzers_utils import BasePairScoring, HBondScoring, ScoringUtils
+from utils.residue_key import require_residue_key
+from utils.instrumentation import ConsoleSink, EventSink
 
 @dataclass
 class Hotspot:
@@ -24,10 +26,18 @@ class Hotspot:
 class HotspotAnalyzer:
     """Finds hotspots using connectivity-based approach with hierarchical classification."""
     
-    def __init__(self, config, bp_analyzer, hb_analyzer):
+    def __init__(self, config, bp_analyzer, hb_analyzer, events: EventSink = None):
+        """
+        Args:
+            config: Configuration with hotspot thresholds
+            bp_analyzer: Base pair analyzer
+            hb_analyzer: H-bond analyzer
+            events: Sink for progress events and stage timings (default: console output)
+        """
         self.config = config
         self.bp_analyzer = bp_analyzer
         self.hb_analyzer = hb_analyzer
+        self.events = events if events is not None else ConsoleSink()
     
     def find_hotspots(self, basepair_data: list, hbond_data: pd.DataFrame) -> List[Hotspot]:
         """Find hotspots using hierarchical geometry + H-bond analysis."""
@@ -36,18 +46,20 @@ class HotspotAnalyzer:
         
         self._basepair_cache = basepair_data
         self._hbond_cache = hbond_data
+        events = self.events
         
         # ===== Pre-compute all H-bond lookups ONCE =====
-        print("  Pre-computing H-bond lookups...")
-        self._precompute_hbond_data()
-        print(f"  Found {len(self._pair_to_hbonds)} base pairs with H-bonds")
+        with events.stage('hotspot_hbond_lookups', "  Pre-computing H-bond lookups..."):
+            self._precompute_hbond_data()
+        events.emit('hotspot_hbond_pairs', f"  Found {len(self._pair_to_hbonds)} base pairs with H-bonds",
+                    count=len(self._pair_to_hbonds))
         
         # Step 1: Score all residues
-        print("  Scoring residues...")
-        residue_scores = self._score_all_residues(basepair_data, hbond_data)
+        with events.stage('hotspot_residue_scores', "  Scoring residues..."):
+            residue_scores = self._score_all_residues(basepair_data, hbond_data)
         
         if not residue_scores:
-            print("  ERROR: No residue scores calculated!")
+            events.emit('hotspot_error', "  ERROR: No residue scores calculated!")
             return []
         
         # Calculate distribution statistics
@@ -60,54 +72,54 @@ class HotspotAnalyzer:
         statistical = mean_score - 1.0 * std_dev
         threshold = max(percentile_5, statistical, self.config.DAMAGE_THRESHOLD_FOR_HOTSPOTS)
         
-        print(f"  Damage threshold: {threshold:.1f}")
+        events.emit('hotspot_threshold', f"  Damage threshold: {threshold:.1f}", threshold=threshold)
         
         # Find damaged residues
         damaged_residues = self._find_damaged_residues(residue_scores, threshold)
         total_damaged = sum(len(res_set) for res_set in damaged_residues.values())
 
         if total_damaged == 0:
-            print("  No damaged residues")
+            events.emit('hotspot_damaged', "  No damaged residues", count=0)
             return []
         
-        print(f"  Found {total_damaged} damaged residues")
+        events.emit('hotspot_damaged', f"  Found {total_damaged} damaged residues", count=total_damaged)
         
         # Build connectivity and find components
-        print("  Building connectivity graph...")
-        connectivity = self._build_connectivity_graph(basepair_data)
+        with events.stage('hotspot_connectivity', "  Building connectivity graph..."):
+            connectivity = self._build_connectivity_graph(basepair_data)
         
-        print("  Finding connected components...")
-        components = self._find_connected_components(damaged_residues, connectivity)
+        with events.stage('hotspot_components', "  Finding connected components..."):
+            components = self._find_connected_components(damaged_residues, connectivity)
         
         min_size = getattr(self.config, 'MIN_HOTSPOT_RESIDUES', 3)
         
-        print("  Creating hotspots...")
-        hotspots = []
-        for chain, residue_sets in components.items():
-            for residues in residue_sets:
-                if len(residues) >= min_size:
-                    hotspot = self._create_hotspot_from_residues(chain, residues)
-                    if hotspot:
-                        hotspots.append(hotspot)
+        with events.stage('hotspot_create', "  Creating hotspots..."):
+            hotspots = []
+            for chain, residue_sets in components.items():
+                for residues in residue_sets:
+                    if len(residues) >= min_size:
+                        hotspot = self._create_hotspot_from_residues(chain, residues)
+                        if hotspot:
+                            hotspots.append(hotspot)
         
-        print(f"  Created {len(hotspots)} initial hotspots")
+        events.emit('hotspots_created', f"  Created {len(hotspots)} initial hotspots", count=len(hotspots))
         
         # Merge and filter
-        print("  Merging overlapping hotspots...")
-        hotspots = self._merge_overlapping_hotspots(hotspots)
+        with events.stage('hotspot_merge', "  Merging overlapping hotspots..."):
+            hotspots = self._merge_overlapping_hotspots(hotspots)
         
-        print("  Stitching hotspot chains...")
-        hotspots = self._stitch_hotspot_chains(hotspots)
+        with events.stage('hotspot_stitch', "  Stitching hotspot chains..."):
+            hotspots = self._stitch_hotspot_chains(hotspots)
         
-        print("  Filtering by context...")
-        hotspots = self._filter_by_context(hotspots)
+        with events.stage('hotspot_filter', "  Filtering by context..."):
+            hotspots = self._filter_by_context(hotspots)
         
         hotspots.sort(key=lambda h: h.score)
         
         if not hotspots:
-            print("\n  === NO HOTSPOTS - Overall structure quality is good ===")
+            events.emit('hotspots_found', "\n  === NO HOTSPOTS - Overall structure quality is good ===", count=0)
         else:
-            print(f"\n  === FOUND {len(hotspots)} HOTSPOTS ===")
+            events.emit('hotspots_found', f"\n  === FOUND {len(hotspots)} HOTSPOTS ===", count=len(hotspots))
         
         return hotspots
     
@@ -130,7 +142,7 @@ class HotspotAnalyzer:
         # Single pass through H-bond data
         for _, hb in self._hbond_cache.iterrows():
             # Filter 1: Only base-base H-bonds
-            if not ScoringUtils.is_base_base_hbond(hb['atom_1'], hb['atom_2']):
+            if not ScoringUtils.is_base_base_row(hb):
                 continue
             
             # Filter 2: Skip adjacent pairs
@@ -348,7 +360,7 @@ class HotspotAnalyzer:
         # HYDROGEN-BOND GEOMETRY PENALTIES
         if hbond_data is not None and not hbond_data.empty:
             for _, row in hbond_data.iterrows():
-                if not ScoringUtils.is_base_base_hbond(row['atom_1'], row['atom_2']):
+                if not ScoringUtils.is_base_base_row(row):
                     continue
                 if BasePairScoring.check_adjacent_pairing(row['res_1'], row['res_2']):
                     continue
@@ -626,7 +638,9 @@ class HotspotAnalyzer:
             for bp in all_region_bps
         ]
         
-        print(f"DEBUG: Creating hotspot {chain}:{start_res}-{end_res} with {len(all_base_pairs_data)} total base pairs, {num_problematic} problematic ({fraction_bad:.1%})")
+        self.events.emit('hotspot_debug', f"DEBUG: Creating hotspot {chain}:{start_res}-{end_res} with {len(all_base_pairs_data)} total base pairs, {num_problematic} problematic ({fraction_bad:.1%})",
+                         chain=chain, start_res=start_res, end_res=end_res,
+                         base_pairs=len(all_base_pairs_data), problematic=num_problematic)
         
         return Hotspot(
             chain=chain,
@@ -789,9 +803,9 @@ class HotspotAnalyzer:
         return pair_hbond_counts
     
     def _parse_residue(self, res_id: str) -> Tuple[str, int]:
-        """Parse residue ID into (chain, res_num)."""
-        parts = res_id.split('-')
-        return parts[0], int(parts[2].rstrip('-'))
+        """Parse residue ID into (chain, res_num); raises ValueError if malformed."""
+        key = require_residue_key(res_id)
+        return key.chain, key.number
     
     def _classify_severity(self, score: float) -> str:
         """Classify severity based on score."""
@@ -1004,15 +1018,15 @@ class HotspotAnalyzer:
     
     def _create_empty_issue_entry(self, res_1: str, res_2: str, bp: dict = None) -> dict:
         """Create an empty issue entry for a residue pair."""
-        res1_parts = res_1.split('-')
-        res2_parts = res_2.split('-')
+        key_1 = require_residue_key(res_1)
+        key_2 = require_residue_key(res_2)
         
         return {
             'residues': f"{res_1} - {res_2}",
-            'chain_1': res1_parts[0],
-            'chain_2': res2_parts[0],
-            'residue_1': int(res1_parts[2]),
-            'residue_2': int(res2_parts[2]),
+            'chain_1': key_1.chain,
+            'chain_2': key_2.chain,
+            'residue_1': key_1.number,
+            'residue_2': key_2.number,
             'bp_type': bp.get('bp_type', 'unknown') if bp else 'unknown',
             'lw_notation': bp.get('lw', 'unknown') if bp else 'unknown',
             'issue_types': [],
@@ -1054,11 +1068,11 @@ class HotspotAnalyzer:
             'atoms': f"{hb['atom_1']} - {hb['atom_2']}",
             'issues': issues,
             'parameters': {
-                'distance': round(hb['distance'], 2),
-                'angle_1': round(hb['angle_1'], 1),
-                'angle_2': round(hb['angle_2'], 1),
-                'dihedral': round(hb['dihedral_angle'], 1),
-                'quality_score': round(hb['score'], 2)
+                'distance': round(float(hb['distance']), 2),
+                'angle_1': round(float(hb['angle_1']), 1),
+                'angle_2': round(float(hb['angle_2']), 1),
+                'dihedral': round(float(hb['dihedral_angle']), 1),
+                'quality_score': round(float(hb['score']), 2)
             }
         }
     
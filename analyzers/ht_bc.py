@@ -5,6 +5,7 @@ from typing import Dict, List, Set, Tuple
 from dataclasses import dataclass
 from collections import defaultdict
 from .analyzers_utils import BasePairScoring, HBondScoring, ScoringUtils
+from utils.residue_key import require_residue_key, residue_mask
 
 @dataclass
 class Hotspot:
@@ -215,7 +216,7 @@ class HotspotAnalyzer:
             for _, row in hbond_data.iterrows():
                 
                 # **FILTER 1: Skip non-base H-bonds**
-                if not ScoringUtils.is_base_base_hbond(row['atom_1'], row['atom_2']):
+                if not ScoringUtils.is_base_base_row(row):
                     continue
                 
                 # **FILTER 2: Skip adjacent pairs**
@@ -244,7 +245,7 @@ class HotspotAnalyzer:
             for _, hb in hbond_data.iterrows():
                 
                 # **FILTER 1: Only count base-base H-bonds in base pairs**
-                if not ScoringUtils.is_base_base_hbond(hb['atom_1'], hb['atom_2']):
+                if not ScoringUtils.is_base_base_row(hb):
                     continue
                 
                 # **FILTER 2: Skip adjacent pairs**
@@ -663,8 +664,8 @@ class HotspotAnalyzer:
             c, r = self._parse_residue(res_id)
             return c == chain and r in residues
         
-        mask = (self._hbond_cache['res_1'].apply(in_region) | 
-                self._hbond_cache['res_2'].apply(in_region))
+        mask = (residue_mask(self._hbond_cache['res_1'], in_region) |
+                residue_mask(self._hbond_cache['res_2'], in_region))
         return self._hbond_cache[mask]
     
     def _filter_bps_by_expanded_residues(self, residues: Set[Tuple[str, int]]) -> list:
@@ -701,16 +702,13 @@ class HotspotAnalyzer:
 
         
         # **Filter 1: Residues in region**
-        mask = (self._hbond_cache['res_1'].apply(in_region) | 
-                self._hbond_cache['res_2'].apply(in_region))
+        mask = (residue_mask(self._hbond_cache['res_1'], in_region) |
+                residue_mask(self._hbond_cache['res_2'], in_region))
         filtered = self._hbond_cache[mask]
 
         # **FILTER 2: Only base-base H-bonds**
         if not filtered.empty:
-            base_mask = filtered.apply(
-                lambda row: ScoringUtils.is_base_base_hbond(row['atom_1'], row['atom_2']),
-                axis=1
-            )
+            base_mask = ScoringUtils.base_base_mask(filtered)
             filtered = filtered[base_mask]
             
         # **Filter 3: NOT adjacent pairs**
@@ -727,9 +725,9 @@ class HotspotAnalyzer:
         return filtered
     
     def _parse_residue(self, res_id: str) -> Tuple[str, int]:
-        """Parse residue ID into (chain, res_num)."""
-        parts = res_id.split('-')
-        return parts[0], int(parts[2].rstrip('-'))
+        """Parse residue ID into (chain, res_num); raises ValueError if malformed."""
+        key = require_residue_key(res_id)
+        return key.chain, key.number
     
     def _classify_severity(self, score: float) -> str:
         """Classify severity based on score."""
@@ -950,15 +948,15 @@ class HotspotAnalyzer:
                 }
     def _create_empty_issue_entry(self, res_1: str, res_2: str, bp: dict = None) -> dict:
         """Create an empty issue entry for a residue pair."""
-        res1_parts = res_1.split('-')
-        res2_parts = res_2.split('-')
+        key_1 = require_residue_key(res_1)
+        key_2 = require_residue_key(res_2)
         
         return {
             'residues': f"{res_1} - {res_2}",
-            'chain_1': res1_parts[0],
-            'chain_2': res2_parts[0],
-            'residue_1': int(res1_parts[2]),
-            'residue_2': int(res2_parts[2]),
+            'chain_1': key_1.chain,
+            'chain_2': key_2.chain,
+            'residue_1': key_1.number,
+            'residue_2': key_2.number,
             'bp_type': bp.get('bp_type', 'unknown') if bp else 'unknown',
             'lw_notation': bp.get('lw', 'unknown') if bp else 'unknown',
             'issue_types': [],
@@ -992,11 +990,11 @@ class HotspotAnalyzer:
             'atoms': f"{hb['atom_1']} - {hb['atom_2']}",
             'issues': [],
             'parameters': {
-                'distance': round(hb['distance'], 2),
-                'angle_1': round(hb['angle_1'], 1),
-                'angle_2': round(hb['angle_2'], 1),
-                'dihedral': round(hb['dihedral_angle'], 1),
-                'quality_score': round(hb['score'], 2)
+                'distance': round(float(hb['distance']), 2),
+                'angle_1': round(float(hb['angle_1']), 1),
+                'angle_2': round(float(hb['angle_2']), 1),
+                'dihedral': round(float(hb['dihedral_angle']), 1),
+                'quality_score': round(float(hb['score']), 2)
             }
         }
         
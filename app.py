@@ -1,16 +1,23 @@
 """Main entry point for RNA quality scorer."""
 
+import re
 import sys
+import glob
 import json
 import argparse
+from collections import Counter
 from pathlib import Path
+from typing import Dict, FrozenSet, Hashable, Iterable, List, NamedTuple, Optional, Tuple
 
 sys.path.insert(0, str(Path(__file__).parent))
 
 from config import Config
 from utils.data_loader import DataLoader
 from utils.report_generator import ReportGenerator
-from scorer2 import Scorer
+from scorer2 import Scorer, StructureScores
+from utils.instrumentation import SINKS, SilentSink, make_sink
+from utils.result_cache import ResultCache
+from utils.residue_key import residue_columns, residue_key
 import pandas as pd
 
 # Standard amino acid 3-letter codes (normalized to uppercase for comparison)
@@ -167,67 +174,892 @@ def filter_motif_data(basepair_data, hbond_data, motif_residues=None, start_res=
         chain: Optional chain ID filter (str)
         
     Returns:
-        Tuple of (filtered_basepairs, filtered_hbonds)
+        Tuple of (filtered_basepairs, filtered_hbonds); both empty if neither
+        motif_residues nor start_res/end_res is given
     """
     
-    # Filter base pairs
-    motif_bps = []
-    for bp in basepair_data:
-        # Extract residue numbers from res_1 and res_2
-        # Format: "X-A-2104-" -> extract chain and residue number
-        res1_parts = bp['res_1'].split('-')
-        res2_parts = bp['res_2'].split('-')
+    # PREFERRED: exact residue list from the CIF file; both residues must be in it
+    if motif_residues is not None:
+        # Set lookups first, so only the few member pairs need their residue keys
+        motif_bps = []
+        for bp in basepair_data:
+            if bp['res_1'] not in motif_residues or bp['res_2'] not in motif_residues:
+                continue
+            # Residue keys attached by DataLoader (parsed here for other sources)
+            key_1 = bp.get('key_1') or residue_key(bp['res_1'])
+            key_2 = bp.get('key_2') or residue_key(bp['res_2'])
+            # Skip malformed residue IDs lacking numeric position
+            if key_1 is None or key_2 is None:
+                continue
+            if chain and key_1.chain != chain:
+                continue
+            motif_bps.append(bp)
         
-        # Skip malformed residue IDs lacking numeric position
-        try:
-            res1_chain = res1_parts[0]
-            res1_num = int(res1_parts[2])
-            res2_num = int(res2_parts[2])
-        except (IndexError, ValueError):
+        motif_hbonds = hbond_data[
+            hbond_data['res_1'].isin(motif_residues).to_numpy() &
+            hbond_data['res_2'].isin(motif_residues).to_numpy()
+        ]
+        return motif_bps, motif_hbonds
+    
+    # FALLBACK: residue number range (for backward compatibility), compared on parsed
+    # chain/number arrays; the chain filter applies to res_1 of base pairs and to
+    # both residues of H-bonds
+    if start_res is None or end_res is None:
+        return [], hbond_data.iloc[:0]
+    
+    (valid_1, chain_1, num_1), (valid_2, _, num_2) = residue_columns(
+        [bp['res_1'] for bp in basepair_data], [bp['res_2'] for bp in basepair_data])
+    keep = valid_1 & valid_2 & (start_res <= num_1) & (num_1 <= end_res) & (start_res <= num_2) & (num_2 <= end_res)
+    if chain:
+        keep &= chain_1 == chain
+    motif_bps = [bp for bp, kept in zip(basepair_data, keep.tolist()) if kept]
+    
+    (valid_1, chain_1, num_1), (valid_2, chain_2, num_2) = residue_columns(hbond_data['res_1'], hbond_data['res_2'])
+    keep = valid_1 & valid_2 & (start_res <= num_1) & (num_1 <= end_res) & (start_res <= num_2) & (num_2 <= end_res)
+    if chain:
+        keep &= (chain_1 == chain) & (chain_2 == chain)
+    motif_hbonds = hbond_data[keep]
+    
+    return motif_bps, motif_hbonds
+
+
+def motif_residue_index(motifs: Dict[Hashable, Iterable[str]]) -> Dict[str, FrozenSet[Hashable]]:
+    """
+    Inverted index of motif residues: residue ID -> IDs of the motifs containing it.
+
+    Args:
+        motifs: Motif ID -> residue IDs of the motif
+    """
+    index = {}
+    for motif_id, residues in motifs.items():
+        for res_id in residues:
+            index.setdefault(res_id, []).append(motif_id)
+    return {res_id: frozenset(motif_ids) for res_id, motif_ids in index.items()}
+
+
+def filter_motifs_data(basepair_data, hbond_data, motifs: Dict[Hashable, Iterable[str]],
+                       chains: Dict[Hashable, Optional[str]] = None) -> Dict[Hashable, Tuple[list, pd.DataFrame]]:
+    """
+    Filter base pairs and H-bonds for many motifs of one structure in a single pass.
+
+    Each row goes to every motif containing both of its residues (looked up
+    in motif_residue_index), so the cost grows with the rows and their motif
+    memberships rather than with motifs x rows. Per motif, the result is the
+    same as filter_motif_data with motif_residues (and chain) of that motif.
+
+    Args:
+        basepair_data: List of all base pairs
+        hbond_data: DataFrame of all H-bonds
+        motifs: Motif ID -> residue IDs of the motif (e.g. from parse_motif_cif)
+        chains: Optional motif ID -> chain ID filter for its base pairs
+
+    Returns:
+        Dict of motif ID -> (filtered_basepairs, filtered_hbonds), for every motif in motifs
+    """
+    chains = chains or {}
+    index = motif_residue_index(motifs)
+    motif_bps = {motif_id: [] for motif_id in motifs}
+    hbond_rows = {motif_id: [] for motif_id in motifs}
+
+    for bp in basepair_data:
+        motif_ids_1 = index.get(bp['res_1'])
+        motif_ids_2 = index.get(bp['res_2']) if motif_ids_1 else None
+        if not motif_ids_2:
             continue
-        
-        # Check chain filter if specified
-        if chain and res1_chain != chain:
+        shared = motif_ids_1 & motif_ids_2
+        if not shared:
             continue
+        # Residue keys attached by DataLoader (parsed here for other sources)
+        key_1 = bp.get('key_1') or residue_key(bp['res_1'])
+        key_2 = bp.get('key_2') or residue_key(bp['res_2'])
+        # Skip malformed residue IDs lacking numeric position
+        if key_1 is None or key_2 is None:
+            continue
+        for motif_id in shared:
+            chain = chains.get(motif_id)
+            if not chain or key_1.chain == chain:
+                motif_bps[motif_id].append(bp)
+
+    # Only rows with both residues in some motif need a per-row lookup
+    members = list(index)
+    candidates = (hbond_data['res_1'].isin(members).to_numpy() &
+                  hbond_data['res_2'].isin(members).to_numpy()).nonzero()[0]
+    res_1 = hbond_data['res_1'].to_numpy()
+    res_2 = hbond_data['res_2'].to_numpy()
+    for position in candidates.tolist():
+        for motif_id in index[res_1[position]] & index[res_2[position]]:
+            hbond_rows[motif_id].append(position)
+
+    return {motif_id: (motif_bps[motif_id], hbond_data.iloc[hbond_rows[motif_id]]) for motif_id in motifs}
+
+
+def motif_pdb_id(motif_name: str) -> Optional[str]:
+    """PDB ID embedded in a motif name (e.g. HAIRPIN-2-CGAG-7O7Y-1 -> 7O7Y), or None."""
+    pdb_match = re.search(r'([0-9][A-Z0-9]{3})', motif_name)
+    return pdb_match.group(1) if pdb_match else None
+
+
+def parse_motif_cif(motif_cif_file) -> Tuple[Optional[str], List[str]]:
+    """
+    Chain and residue IDs of a motif CIF file.
+
+    Args:
+        motif_cif_file: Path to the motif's CIF file
+
+    Returns:
+        Tuple of (chain of the first ATOM record, residue IDs in file order);
+        (None, []) if the file has no usable ATOM records
+    """
+    chain = None
+    residues = []
+    with open(motif_cif_file, 'r') as f:
+        for line in f:
+            if line.startswith("ATOM"):
+                parts = line.split()
+                if len(parts) >= 6:
+                    if chain is None:
+                        chain = parts[5]  # Chain is in column 6
+                    res_num = parts[4]   # Residue number is in column 5
+                    base = parts[3]      # Base type is in column 4
+                    residue_id = f"{chain}-{base}-{res_num}-"
+                    if residue_id not in residues:
+                        residues.append(residue_id)
+    return chain, residues
+
+
+
+class StructureData(NamedTuple):
+    """Loaded inputs of one structure, as score_pdb, score_motif and score_residue take them."""
+    pdb_id: str
+    basepairs: list
+    hbonds: pd.DataFrame  # RNA-RNA H-bonds, for scoring
+    all_hbonds: Optional[pd.DataFrame] = None  # all H-bonds, for protein/ligand binding analysis
+    torsions: Optional[dict] = None
+    input_hash: Optional[str] = None  # DataLoader.input_fingerprint; None bypasses the result cache
+
+
+def load_structure(data_loader: DataLoader, pdb_id: str, quiet: bool = False,
+                   fingerprint: bool = True) -> Optional[StructureData]:
+    """
+    Load a structure's inputs for scoring.
+
+    Args:
+        data_loader: Loader to read the inputs with
+        pdb_id: PDB ID
+        quiet: Suppress load messages
+        fingerprint: Hash the input files for result cache lookups
+
+    Returns:
+        StructureData, or None if the base pairs or H-bonds cannot be loaded
+    """
+    basepair_data = data_loader.load_basepairs(pdb_id, quiet=quiet)
+    hbond_data = data_loader.load_hbonds(pdb_id, quiet=quiet)  # RNA-RNA only for scoring
+    all_hbond_data = data_loader.load_all_hbonds(pdb_id, quiet=quiet)  # same parse
+    torsion_data = data_loader.load_torsions(pdb_id, quiet=quiet)
+    if basepair_data is None or hbond_data is None:
+        return None
+    input_hash = data_loader.input_fingerprint(pdb_id) if fingerprint else None
+    return StructureData(pdb_id, basepair_data, hbond_data, all_hbond_data, torsion_data, input_hash)
+
+
+def _structure(data, pdb_id: Optional[str], fingerprint: bool = True) -> StructureData:
+    """StructureData as given, or loaded through data when it is a DataLoader."""
+    if isinstance(data, StructureData):
+        return data
+    if pdb_id is None:
+        raise ValueError("pdb_id is required to score through a DataLoader")
+    structure = load_structure(data, pdb_id, quiet=True, fingerprint=fingerprint)
+    if structure is None:
+        raise FileNotFoundError(f"Could not load data for {pdb_id}")
+    return structure
+
+
+def _scorer_for(data, scorer: Optional[Scorer]) -> Scorer:
+    """scorer, or a new silent one for the DataLoader's config (Config() for loaded data)."""
+    if scorer is not None:
+        return scorer
+    config = data.config if isinstance(data, DataLoader) else Config()
+    return Scorer(config, events=SilentSink())
+
+
+def _quiet(message: str) -> None:
+    pass
+
+
+def _full_structure_result(scorer, result_cache, structure: StructureData) -> Tuple[dict, bool]:
+    """
+    Full-structure scores as exported by Scorer.export_to_dict, from the result cache when possible.
+
+    Returns:
+        Tuple of (result dict in its JSON round-tripped form, True if it came from the cache)
+    """
+    use_cache = result_cache is not None and structure.input_hash is not None
+    result_dict = result_cache.get(structure.input_hash) if use_cache else None
+    if result_dict is not None:
+        return result_dict, True
+    result = scorer.score_structure(structure.basepairs, structure.hbonds, torsion_data=structure.torsions)
+    result_dict = scorer.export_to_dict(result)
+    if use_cache:
+        result_cache.put(structure.pdb_id, structure.input_hash, result_dict)
+    # Cached entries are JSON round-tripped; use the same values now
+    return json.loads(json.dumps(result_dict)), False
+
+
+def _full_structure_scores(scorer, result_cache, structure: StructureData) -> Tuple[StructureScores, float]:
+    """
+    Per-pair scores and the full-structure score of a structure, scoring its base pairs once.
+
+    The full score is read from the result cache when possible; otherwise it is
+    aggregated from the per-pair scores and stored there.
+
+    Returns:
+        Tuple of (StructureScores for every base pair, full-structure overall score)
+    """
+    structure_scores = scorer.score_basepairs(structure.basepairs, structure.hbonds,
+                                              torsion_data=structure.torsions)
+    use_cache = result_cache is not None and structure.input_hash is not None
+    cached_result = result_cache.get(structure.input_hash) if use_cache else None
+    if cached_result is not None and cached_result.get('overall_score') is not None:
+        return structure_scores, cached_result['overall_score']
+    full_result = scorer.aggregate_scores(structure_scores.basepair_scores)
+    if use_cache:
+        result_cache.put(structure.pdb_id, structure.input_hash, scorer.export_to_dict(full_result))
+    return structure_scores, full_result.overall_score
+
+
+def score_pdb(data, pdb_id: str = None, scorer: Scorer = None, result_cache: ResultCache = None,
+              num_nucleotides: int = 0, validation_metrics: dict = None, echo=_quiet) -> dict:
+    """
+    Score an entire structure (the report.json of app.py --pdb_id).
+
+    Args:
+        data: StructureData, or a DataLoader to load pdb_id with
+        pdb_id: PDB ID (required with a DataLoader)
+        scorer: Scorer to use (default: a new one; pass one in when scoring many structures)
+        result_cache: Full-structure result cache to read and fill (default: none)
+        num_nucleotides: Nucleotide count to report
+        validation_metrics: Metrics merged into the report (DataLoader.get_validation_metrics)
+        echo: Callable receiving progress messages (default: none)
+
+    Returns:
+        Report dict; nothing is written to disk
+
+    Raises:
+        FileNotFoundError: If the DataLoader cannot load the structure
+    """
+    structure = _structure(data, pdb_id)
+    scorer = _scorer_for(data, scorer)
+    pdb_id = structure.pdb_id
+    all_hbond_data = structure.all_hbonds
+    result_dict, from_cache = _full_structure_result(scorer, result_cache, structure)
+    if from_cache:
+        echo(f"Using cached scores ({result_cache.key(structure.input_hash)[:12]})")
+
+    result_dict['pdb_id'] = pdb_id
+    result_dict['analysis_type'] = 'baseline'
+    result_dict['num_nucleotides'] = num_nucleotides
+    
+    # If no base pairs, mark scores as N/A instead of treating as failure
+    if result_dict['total_base_pairs'] == 0:
+        result_dict['overall_score'] = 'N/A'
+        result_dict['avg_basepair_score'] = 'N/A'
+    
+    # Analyze protein/ligand bindings and add directly to base pair objects in JSON
+    protein_bindings, ligand_bindings = analyze_protein_bindings(
+        result_dict.get('basepair_scores', []),
+        all_hbond_data,
+        baseline_threshold=scorer.config.BASELINE
+    )
+
+    # Add protein binding info directly to each base pair object
+    for bp_score in result_dict.get('basepair_scores', []):
+        bp_info = bp_score.get('bp_info', {})
+        res_1 = bp_info.get('res_1', '')
+        res_2 = bp_info.get('res_2', '')
+        bp_id = f"{res_1}-{res_2}"
+
+        # Add bindings to this base pair if it has any
+        if bp_id in protein_bindings:
+            bp_score['protein_bindings'] = protein_bindings[bp_id]
+        else:
+            bp_score['protein_bindings'] = []
+
+        # Add ligand bindings to this base pair if it has any
+        if bp_id in ligand_bindings:
+            bp_score['ligand_bindings'] = ligand_bindings[bp_id]
+        else:
+            bp_score['ligand_bindings'] = []
+
+    # Keep top-level for backward compatibility (can be removed later if not needed)
+    result_dict['protein_binding_explanations'] = protein_bindings
+    result_dict['ligand_binding_explanations'] = ligand_bindings
+    
+    if validation_metrics:
+        result_dict.update(validation_metrics)
+    return result_dict
+
+
+def score_motif(data, pdb_id: str = None, motif_residues=None, start_res=None, end_res=None, chain=None,
+                scorer: Scorer = None, result_cache: ResultCache = None, num_nucleotides: int = 0,
+                validation_metrics: dict = None, on_full_report=None, motif_data: Tuple[list, pd.DataFrame] = None,
+                structure_scores: StructureScores = None, full_score: float = None,
+                echo=_quiet) -> Optional[dict]:
+    """
+    Score a motif against its full structure (the motif report of app.py --motif / --motif-name).
+
+    Args:
+        data: StructureData, or a DataLoader to load pdb_id with
+        pdb_id: PDB ID (required with a DataLoader)
+        motif_residues: Residue IDs of the motif (preferred; see filter_motif_data)
+        start_res, end_res: Residue number range, used when motif_residues is None
+        chain: Optional chain filter
+        scorer: Scorer to use (default: a new one; pass one in when scoring many motifs)
+        result_cache: Full-structure result cache to read and fill (default: none)
+        num_nucleotides: Full-structure nucleotide count to report
+        validation_metrics: Metrics merged into the report
+        on_full_report: Called with the full-structure report when the full
+            structure is scored here rather than read from result_cache
+        motif_data: The motif's (base pairs, H-bonds) already filtered from
+            the structure (e.g. by filter_motifs_data); skips filtering here
+        structure_scores: The structure's per-pair scores (Scorer.score_basepairs);
+            the motif is aggregated from them instead of scoring its pairs here
+        full_score: The structure's full score, already computed; skips
+            result_cache and full-structure scoring (on_full_report is not called)
+        echo: Callable receiving progress messages (default: none)
+
+    Returns:
+        Motif report dict, or None if no base pair lies in the motif;
+        nothing is written to disk
+
+    Raises:
+        FileNotFoundError: If the DataLoader cannot load the structure
+    """
+    structure = _structure(data, pdb_id)
+    scorer = _scorer_for(data, scorer)
+    config = scorer.config
+    pdb_id = structure.pdb_id
+    input_hash = structure.input_hash
+    basepair_data, hbond_data = structure.basepairs, structure.hbonds
+    all_hbond_data, torsion_data = structure.all_hbonds, structure.torsions
+
+    # ========================================
+    # STEP 1: Get full structure score (from cache if available)
+    # ========================================
+    use_cache = result_cache is not None and input_hash is not None
+
+    if full_score is not None:
+        echo(f"\n{'='*60}")
+        echo("STEP 1: Using the full structure score computed for this structure")
+        echo(f"{'='*60}")
+        echo(f"→ Full structure score: {full_score}/100")
+    else:
+        cached_result = result_cache.get(input_hash) if use_cache else None
+        if cached_result is not None:
+            full_score = cached_result.get('overall_score')
+            echo(f"\n{'='*60}")
+            echo("STEP 1: Using CACHED full structure score")
+            echo(f"{'='*60}")
+            echo(f"→ Full structure score: {full_score}/100 [from cache]")
+    
+    if full_score is None:
+        echo(f"\n{'='*60}")
+        echo("STEP 1: Scoring ENTIRE structure for comparison...")
+        echo(f"{'='*60}")
         
-        # PREFERRED: Filter by exact residue list from CIF file
-        if motif_residues is not None:
-            # Both residues must be in the motif residue list
-            if bp['res_1'] in motif_residues and bp['res_2'] in motif_residues:
-                motif_bps.append(bp)
-        # FALLBACK: Filter by range (for backward compatibility)
-        elif start_res is not None and end_res is not None:
-            if (start_res <= res1_num <= end_res) and (start_res <= res2_num <= end_res):
-                motif_bps.append(bp)
-    
-    # Filter H-bonds
-    if motif_residues is not None:
-        # Filter by exact residue list
-        def residue_in_motif(res_id):
-            return res_id in motif_residues
+        full_result = scorer.score_structure(basepair_data, hbond_data, torsion_data=torsion_data)
+        full_score = full_result.overall_score
+        structure_scores = StructureScores(full_result.basepair_scores)
+
+        echo(f"\n→ Full structure score: {full_score}/100")
+
+        # Save to cache for future use
+        if use_cache:
+            result_cache.put(pdb_id, input_hash, scorer.export_to_dict(full_result))
         
-        motif_hbonds = hbond_data[
-            hbond_data['res_1'].apply(residue_in_motif) &
-            hbond_data['res_2'].apply(residue_in_motif)
-        ]
+        if on_full_report is not None:
+            # Convert full result to dictionary
+            full_result_dict = scorer.export_to_dict(full_result)
+            full_result_dict['pdb_id'] = pdb_id
+            full_result_dict['analysis_type'] = 'baseline'
+            full_result_dict['num_nucleotides'] = num_nucleotides
+            if validation_metrics:
+                full_result_dict.update(validation_metrics)
+            on_full_report(full_result_dict)
+    
+    # ========================================
+    # STEP 2: Score the motif
+    # ========================================
+    echo(f"\n{'='*60}")
+    if motif_residues:
+        echo(f"STEP 2: Scoring MOTIF ({len(motif_residues)} residues from CIF file)")
     else:
-        # Fallback: Filter by range
-        def residue_in_range(res_id):
-            try:
-                parts = res_id.split('-')
-                if chain and parts[0] != chain:
-                    return False
-                res_num = int(parts[2])
-                return start_res <= res_num <= end_res
-            except (IndexError, ValueError):
-                return False
+        echo(f"STEP 2: Scoring MOTIF (Residues {start_res}-{end_res})")
+    if chain:
+        echo(f"Chain: {chain}")
+    echo(f"{'='*60}")
+    
+    if motif_data is not None:
+        motif_basepairs, motif_hbonds = motif_data
+    else:
+        motif_basepairs, motif_hbonds = filter_motif_data(
+            basepair_data, hbond_data, 
+            motif_residues=motif_residues,
+            start_res=start_res, 
+            end_res=end_res, 
+            chain=chain
+        )
+    
+    echo(f"Filtered to {len(motif_basepairs)} base pairs in motif")
+    echo(f"Filtered to {len(motif_hbonds)} H-bonds in motif")
+    
+    if len(motif_basepairs) == 0:
+        return None
+    
+    # Score the motif: base-pair scores do not depend on the motif, so aggregate
+    # the full-structure scores; with a cached full score, score only the motif's pairs
+    if structure_scores is None:
+        structure_scores = scorer.score_basepairs(motif_basepairs, motif_hbonds, torsion_data=torsion_data)
+    motif_result = scorer.score_motif(structure_scores, basepairs=motif_basepairs)
+    motif_score = motif_result.overall_score
+
+    # Convert motif result to dictionary
+    temp_motif_dict = scorer.export_to_dict(motif_result)
+    
+    # Calculate num_problematic_bps from basepair_scores
+    # Use BASELINE threshold (75) to match Detailed_Issues column
+    num_problematic_bps = sum(
+        1 for bp in temp_motif_dict.get('basepair_scores', [])
+        if bp['score'] < config.BASELINE
+    )
+    
+    # Count actual unique residues in motif (from base pairs and H-bonds)
+    # This handles non-contiguous motifs (e.g., multi-way junctions)
+    # NOTE: This is different from the filtering criteria - this counts what was actually found
+    actual_motif_residues = set()
+    for bp in motif_basepairs:
+        actual_motif_residues.add(bp['res_1'])
+        actual_motif_residues.add(bp['res_2'])
+    for _, hbond in motif_hbonds.iterrows():
+        actual_motif_residues.add(hbond['res_1'])
+        actual_motif_residues.add(hbond['res_2'])
+    
+    # Count unique paired nucleotides (only those in base pairs)
+    paired_nucleotides = set()
+    for bp in motif_basepairs:
+        paired_nucleotides.add(bp['res_1'])
+        paired_nucleotides.add(bp['res_2'])
+    
+    # ========================================
+    # REORGANIZE: Put important info at TOP
+    # ========================================
+    motif_result_dict = {
+        # CRITICAL INFORMATION FIRST
+        'pdb_id': pdb_id,
+        'analysis_type': 'motif',
+        'motif_range': f"{start_res}-{end_res}",
+        'motif_chain': chain if chain else "all",
         
-        motif_hbonds = hbond_data[
-            hbond_data['res_1'].apply(residue_in_range) &
-            hbond_data['res_2'].apply(residue_in_range)
-        ]
+        # COMPARISON METRICS
+        'motif_score': motif_score,
+        'full_structure_score': full_score,
+        'full_structure_num_nucleotides': num_nucleotides,
+        # Motif length: actual number of unique residues in motif (handles non-contiguous)
+        'motif_num_nucleotides': len(actual_motif_residues),
+        # Count unique nucleotides that are paired (appear in at least one base pair)
+        'num_paired_nucleotides': len(paired_nucleotides),
+        'score_difference': round(motif_score - full_score, 1),
+        
+        # MOTIF STATISTICS
+        'total_base_pairs': motif_result.total_base_pairs,
+        'num_problematic_bps': num_problematic_bps,
+        
+        # DETAILED ANALYSIS BELOW
+        'overall_score': motif_result.overall_score,
+        'avg_basepair_score': motif_result.avg_basepair_score,
+        
+        # Issue counts and fractions
+        'geometry_issues': temp_motif_dict['geometry_issues'],
+        'geometry_fractions': temp_motif_dict['geometry_fractions'],
+        'hbond_issues': temp_motif_dict['hbond_issues'],
+        'hbond_fractions': temp_motif_dict['hbond_fractions'],
+        'summary': temp_motif_dict['summary'],
+        
+        # Individual base pair details
+        'basepair_scores': temp_motif_dict['basepair_scores'],
+
+        # Backbone suiteness
+        'avg_suiteness': temp_motif_dict.get('avg_suiteness', None),
+
+        # Structure-level metadata
+    }
     
-    return motif_bps, motif_hbonds
+    # Analyze protein/ligand bindings for problematic base pairs
+    protein_bindings, ligand_bindings = analyze_protein_bindings(
+        temp_motif_dict.get('basepair_scores', []),
+        all_hbond_data,
+        baseline_threshold=config.BASELINE
+    )
+    motif_result_dict['protein_binding_explanations'] = protein_bindings
+    motif_result_dict['ligand_binding_explanations'] = ligand_bindings
+    
+    # Add validation metrics at the end
+    if validation_metrics:
+        motif_result_dict.update(validation_metrics)
+    return motif_result_dict
+
+
+def _motif_name(pdb_id: str, start_res, end_res, chain=None) -> str:
+    """File name stem of a motif given by residue range."""
+    chain_str = f"{chain}_" if chain else ""
+    return f"{pdb_id}_{chain_str}{start_res}-{end_res}"
+
+
+def score_residue(data, residue_num: int, pdb_id: str = None, chain=None, scorer: Scorer = None,
+                  echo=_quiet) -> Optional[dict]:
+    """
+    Score every base pair involving one residue (the basepair_report.json of app.py --residue).
+
+    Args:
+        data: StructureData, or a DataLoader to load pdb_id with
+        residue_num: Residue number
+        pdb_id: PDB ID (required with a DataLoader)
+        chain: Optional chain of the residue
+        scorer: Scorer to use (default: a new one)
+        echo: Callable receiving progress messages (default: none)
+
+    Returns:
+        Report dict, or None if no base pair involves the residue; nothing
+        is written to disk
+
+    Raises:
+        FileNotFoundError: If the DataLoader cannot load the structure
+    """
+    structure = _structure(data, pdb_id, fingerprint=False)
+    scorer = _scorer_for(data, scorer)
+    pdb_id = structure.pdb_id
+    basepair_data, hbond_data = structure.basepairs, structure.hbonds
+    all_hbond_data, torsion_data = structure.all_hbonds, structure.torsions
+
+    # Find all base pairs that involve this residue
+    matching_bps = []
+    for bp in basepair_data:
+        key_1 = bp.get('key_1') or residue_key(bp['res_1'])
+        key_2 = bp.get('key_2') or residue_key(bp['res_2'])
+        if key_1 is None or key_2 is None:
+            continue
+        res1_chain, res1_num = key_1.chain, key_1.number
+        res2_chain, res2_num = key_2.chain, key_2.number
+
+        # Check if this base pair involves our residue
+        residue_match = (res1_num == residue_num or res2_num == residue_num)
+
+        # Apply chain filter if specified
+        if chain:
+            chain_match = (
+                (res1_num == residue_num and res1_chain == chain) or
+                (res2_num == residue_num and res2_chain == chain)
+            )
+            if residue_match and chain_match:
+                matching_bps.append(bp)
+        elif residue_match:
+            matching_bps.append(bp)
+
+    if len(matching_bps) == 0:
+        return None
+
+    echo(f"Found {len(matching_bps)} base pair(s) involving residue {residue_num}")
+
+    # Collect residue IDs for H-bond filtering
+    residue_ids = set()
+    for bp in matching_bps:
+        residue_ids.add(bp['res_1'])
+        residue_ids.add(bp['res_2'])
+
+    # Filter H-bonds to those between residues in our base pairs
+    filtered_hbonds = hbond_data[
+        hbond_data['res_1'].isin(residue_ids) &
+        hbond_data['res_2'].isin(residue_ids)
+    ]
+
+    echo(f"Found {len(filtered_hbonds)} H-bonds for these base pairs")
+
+    # Score each base pair individually
+    bp_results = []
+    for bp in matching_bps:
+        bp_score_dict = scorer._score_base_pair(bp, filtered_hbonds, torsion_data)
+
+        # Add full geometry parameters for detailed report
+        bp_score_dict['geometry_params'] = {
+            'shear': bp.get('shear', 0),
+            'stretch': bp.get('stretch', 0),
+            'stagger': bp.get('stagger', 0),
+            'buckle': bp.get('buckle', 0),
+            'propeller': bp.get('propeller', 0),
+            'opening': bp.get('opening', 0),
+        }
+
+        # Get H-bonds for this specific base pair
+        nt1_id = bp.get('res_1', '')
+        nt2_id = bp.get('res_2', '')
+        bp_hbonds = scorer._get_basepair_hbonds(nt1_id, nt2_id, filtered_hbonds)
+
+        # Add detailed H-bond info
+        hbond_details = []
+        for _, hb in bp_hbonds.iterrows():
+            hbond_details.append({
+                'atom_1': hb.get('atom_1', ''),
+                'atom_2': hb.get('atom_2', ''),
+                'distance': round(float(hb.get('distance', 0)), 3),
+                'angle_1': round(float(hb.get('angle_1', 0)), 1),
+                'angle_2': round(float(hb.get('angle_2', 0)), 1),
+                'dihedral_angle': round(float(hb.get('dihedral_angle', 0)), 1),
+                'quality_score': round(float(hb.get('score', 0)), 3),
+            })
+        bp_score_dict['hbond_details'] = hbond_details
+
+        bp_results.append(bp_score_dict)
+
+    # Build the report
+    report = {
+        'pdb_id': pdb_id,
+        'analysis_type': 'single_residue',
+        'query_residue': residue_num,
+        'query_chain': chain if chain else 'all',
+
+        # Summary
+        'num_base_pairs': len(bp_results),
+
+        # Individual base pair scores
+        'base_pairs': bp_results,
+    }
+
+    # Analyze protein/ligand bindings
+    protein_bindings, ligand_bindings = analyze_protein_bindings(
+        bp_results,
+        all_hbond_data,
+        baseline_threshold=scorer.config.BASELINE
+    )
+    report['protein_binding_explanations'] = protein_bindings
+    report['ligand_binding_explanations'] = ligand_bindings
+    return report
+
+
+def print_comparison(motif_report: dict, motif_output_file) -> None:
+    """Print the motif vs. full structure summary of the motif mode."""
+    full_score = motif_report['full_structure_score']
+    motif_score = motif_report['motif_score']
+    print(f"\n{'='*60}")
+    print("COMPARISON SUMMARY")
+    print(f"{'='*60}")
+    print(f"Full Structure: {full_score}/100")
+    print(f"Motif Score:    {motif_score}/100")
+    print(f"Difference:     {motif_score - full_score:+.1f} points")
+    
+    if motif_score < full_score:
+        print(f"→ Motif is {full_score - motif_score:.1f} points WORSE than full structure")
+    elif motif_score > full_score:
+        print(f"→ Motif is {motif_score - full_score:.1f} points BETTER than full structure")
+    else:
+        print(f"→ Motif score matches full structure")
+    
+    print(f"\n{'='*60}")
+    #print(f"Full structure report: {full_output_file}")
+    print(f"Motif report:          {motif_output_file}")
+    print(f"{'='*60}\n")
+
+
+def print_residue_report(report: dict, output_file) -> None:
+    """Print the base pair summary of the single-residue mode."""
+    bp_results = report['base_pairs']
+    total_score = sum(bp['score'] for bp in bp_results)
+    avg_score = total_score / len(bp_results) if bp_results else 0
+    chain = report['query_chain'] if report['query_chain'] != 'all' else None
+
+    print(f"\n{'='*60}")
+    print("BASE PAIR REPORT")
+    print(f"{'='*60}")
+    print(f"Query: Residue {report['query_residue']}" + (f" (Chain {chain})" if chain else ""))
+    print(f"Base pairs found: {len(bp_results)}")
+    print(f"Average score: {avg_score:.1f}/100")
+    print(f"\nIndividual base pairs:")
+    for bp in bp_results:
+        info = bp['bp_info']
+        score = bp['score']
+        bp_type = info.get('bp_type', 'unknown')
+        edge = info.get('edge_type', 'unknown')
+        print(f"  {info['res_1']} <-> {info['res_2']}")
+        print(f"    Type: {bp_type} ({edge}), Score: {score}/100")
+        if bp['geometry_issues']:
+            print(f"    Geometry issues: {list(bp['geometry_issues'].keys())}")
+        if bp['hbond_issues']:
+            print(f"    H-bond issues: {list(bp['hbond_issues'].keys())}")
+
+    print(f"\n{'='*60}")
+    print(f"Detailed report saved to: {output_file}")
+    print(f"{'='*60}\n")
+
+
+def save_motif_outputs(report_gen, motif_report: dict, motif_name: str, output_dir=None, csv_dir=None,
+                       workdir=None) -> Path:
+    """
+    Write a motif report as the motif mode does: JSON report plus motif summary CSV row.
+
+    Args:
+        motif_name: File name stem ({motif_name}.json in output_dir)
+        output_dir: Directory for the JSON report (default: motif_report.json)
+        csv_dir: Directory for one CSV per motif (default: append to scores_motifs_summary.csv)
+        workdir: Directory relative paths are resolved against (default: current directory)
+
+    Returns:
+        Path of the JSON report
+    """
+    workdir = Path(workdir) if workdir else Path('.')
+    if output_dir:
+        output_dir = workdir / output_dir
+        output_dir.mkdir(parents=True, exist_ok=True)
+        motif_output_file = output_dir / f"{motif_name}.json"
+    else:
+        motif_output_file = workdir / "motif_report.json"
+    
+    with open(motif_output_file, 'w') as f:
+        json.dump(motif_report, f, indent=2)
+    
+    report_gen.save_motifs_summary_csv(
+        motif_report, 
+        motif_name=motif_name,
+        csv_file=str(workdir / "scores_motifs_summary.csv"),
+        csv_dir=str(workdir / csv_dir) if csv_dir else None
+    )
+    return motif_output_file
+
+
+def motif_files(list_file=None, pattern=None, motif_dir='unique_motifs') -> List[Path]:
+    """
+    Motif CIF files named by a list file and/or a glob pattern, in order and without duplicates.
+
+    Args:
+        list_file: File with one motif per line: a motif name (looked up in
+            motif_dir), a CIF path, or "name|path"; blank and '#' lines are skipped
+        pattern: Glob pattern of motif CIF files (e.g. "unique_motifs/*.cif")
+        motif_dir: Directory of the CIF files of motif names in list_file
+    """
+    files = []
+    if list_file:
+        with open(list_file, 'r') as f:
+            for line in f:
+                entry = line.strip()
+                if not entry or entry.startswith('#'):
+                    continue
+                entry = entry.split('|')[-1].strip()
+                files.append(Path(entry) if entry.endswith('.cif') else Path(motif_dir) / f"{entry}.cif")
+    if pattern:
+        files.extend(sorted(Path(path) for path in glob.glob(pattern)))
+    return list(dict.fromkeys(files))
+
+
+def group_motifs_by_pdb(files) -> Tuple[Dict[str, List[Path]], List[Path]]:
+    """
+    Motif CIF files grouped by the PDB ID in their names.
+
+    Returns:
+        Tuple of (PDB ID -> files, in sorted PDB order; files without a PDB ID in their name)
+    """
+    groups = {}
+    unmatched = []
+    for path in files:
+        pdb_id = motif_pdb_id(path.stem)
+        if pdb_id is None:
+            unmatched.append(path)
+        else:
+            groups.setdefault(pdb_id, []).append(path)
+    return dict(sorted(groups.items())), unmatched
+
+
+def score_motif_batch(groups: Dict[str, List[Path]], data_loader: DataLoader, scorer: Scorer,
+                      report_gen: ReportGenerator, output_dir, csv_dir=None, result_cache: ResultCache = None,
+                      skip_existing: bool = False, echo=print) -> Counter:
+    """
+    Score many motifs, loading each structure once for all of its motifs.
+
+    The motifs of a structure are filtered together in one pass over its
+    base pairs and H-bonds (filter_motifs_data), and its base pairs and full
+    score are computed once (_full_structure_scores); each motif then only
+    aggregates its own pairs. Each motif is reported as app.py --motif-name
+    reports it and written to {output_dir}/{motif name}.json plus its motif
+    summary CSV row.
+
+    Args:
+        groups: PDB ID -> motif CIF files (see group_motifs_by_pdb)
+        output_dir: Directory for the JSON reports
+        csv_dir: Directory for one CSV per motif (default: append to scores_motifs_summary.csv)
+        skip_existing: Skip motifs whose JSON report (and CSV, with csv_dir) already exist
+        echo: Callable receiving progress messages
+
+    Returns:
+        Counter of outcomes: scored, skipped, no_data, bad_cif, no_base_pairs, error
+    """
+    outcomes = Counter()
+    for pdb_id, files in groups.items():
+        if skip_existing:
+            done = [path for path in files
+                    if (Path(output_dir) / f"{path.stem}.json").exists()
+                    and (not csv_dir or (Path(csv_dir) / f"{path.stem}.csv").exists())]
+            outcomes['skipped'] += len(done)
+            files = [path for path in files if path not in done]
+        if not files:
+            continue
+
+        structure = load_structure(data_loader, pdb_id, quiet=True)
+        if structure is None:
+            echo(f"{pdb_id}: could not load data, skipping {len(files)} motif(s)")
+            outcomes['no_data'] += len(files)
+            continue
+        echo(f"{pdb_id}: {len(files)} motif(s), {len(structure.basepairs)} base pairs")
+
+        # Parse every motif of the structure, then filter them all in one pass
+        motifs = {}
+        for path in files:
+            try:
+                chain, residues = parse_motif_cif(path)
+            except Exception as e:
+                echo(f"  ✗ {path.stem}: {e}")
+                outcomes['error'] += 1
+                continue
+            if not chain or not residues:
+                echo(f"  ✗ {path.stem}: could not parse chain or residues from {path}")
+                outcomes['bad_cif'] += 1
+                continue
+            motifs[path] = (chain, set(residues))
+        motif_data = filter_motifs_data(structure.basepairs, structure.hbonds,
+                                        {path: residues for path, (_, residues) in motifs.items()},
+                                        {path: chain for path, (chain, _) in motifs.items()})
+        try:
+            structure_scores, full_score = _full_structure_scores(scorer, result_cache, structure)
+        except Exception as e:
+            echo(f"  ✗ {pdb_id}: {e}")
+            outcomes['error'] += len(motifs)
+            continue
+
+        for path, (chain, residues) in motifs.items():
+            motif_name = path.stem
+            try:
+                res_nums = sorted(set(int(r.split('-')[2]) for r in residues))
+                report = score_motif(structure, motif_residues=residues, start_res=res_nums[0],
+                                     end_res=res_nums[-1], chain=chain, scorer=scorer,
+                                     motif_data=motif_data[path], structure_scores=structure_scores,
+                                     full_score=full_score)
+                if report is None:
+                    echo(f"  ✗ {motif_name}: no base pairs in motif")
+                    outcomes['no_base_pairs'] += 1
+                    continue
+                save_motif_outputs(report_gen, report, motif_name, output_dir=output_dir, csv_dir=csv_dir)
+            except Exception as e:
+                echo(f"  ✗ {motif_name}: {e}")
+                outcomes['error'] += 1
+                continue
+            echo(f"  ✓ {motif_name}: {report['motif_score']}/100 (full structure {report['full_structure_score']}/100)")
+            outcomes['scored'] += 1
+    return outcomes
 
 
 def app():
@@ -244,6 +1076,9 @@ Examples:
   # Score specific motif by name (RECOMMENDED - uses exact residues from CIF)
   python app.py --motif-name HAIRPIN-2-CGAG-7O7Y-1
 
+  # Score many motifs, loading each structure once
+  python app.py --motif-glob "unique_motifs/*.cif" --output-dir reports --csv-dir motif_csvs
+
   # Score specific motif (residues 2104-2169, chain AN1)
   python app.py --pdb_id 6V3A --motif 2104 2169 --chain AN1
 
@@ -334,12 +1169,83 @@ Scoring:
         default='unique_motifs',
         help='Directory containing motif CIF files (default: unique_motifs)'
     )
+    parser.add_argument(
+        '--motif-list',
+        type=str,
+        metavar='FILE',
+        help='Score many motifs in one run: file with one motif name (in --motif-dir) or CIF path per line. Motifs are grouped by PDB and each structure is loaded once; requires --output-dir.'
+    )
+    parser.add_argument(
+        '--motif-glob',
+        type=str,
+        metavar='PATTERN',
+        help='Score many motifs in one run: glob of motif CIF files (e.g. "unique_motifs/*.cif"; quote it); as --motif-list'
+    )
+    parser.add_argument(
+        '--shard',
+        nargs=2,
+        type=int,
+        metavar=('INDEX', 'COUNT'),
+        help='With --motif-list/--motif-glob, score only the PDB groups at positions INDEX, INDEX+COUNT, ... (for array jobs)'
+    )
+    parser.add_argument(
+        '--skip-existing',
+        action='store_true',
+        help='With --motif-list/--motif-glob, skip motifs whose report (and CSV, with --csv-dir) already exist'
+    )
+    parser.add_argument(
+        '--columnar',
+        action='store_true',
+        help='Score base pairs with the vectorized columnar engine (same results, faster on large structures)'
+    )
+    parser.add_argument(
+        '--cache-dir',
+        type=str,
+        default='full_structure_cache',
+        help='Full-structure result cache, keyed by input files, config and reference data (default: full_structure_cache)'
+    )
+    parser.add_argument(
+        '--corpus',
+        type=str,
+        default=None,
+        help='Packed corpus store to read inputs from (built with pack_corpus.py; default: Config.CORPUS_DIR)'
+    )
+    parser.add_argument(
+        '--full-hbonds',
+        action='store_true',
+        help='Load every H-bond CSV column with default dtypes instead of the compact scoring schema'
+    )
+    parser.add_argument(
+        '--events',
+        choices=sorted(SINKS),
+        default='console',
+        help='Progress output from the loader and scorer: console (default), silent, or ndjson (one JSON event per line)'
+    )
+    
+    parser.add_argument(
+        '--server',
+        type=str,
+        metavar='URL',
+        help='Send the request to a running scoring service (scoring_service.py, e.g. http://127.0.0.1:8765) instead of scoring in this process'
+    )
     
     args = parser.parse_args()
     
     # Validate arguments
-    if not args.pdb_id and not args.motif_name:
-        parser.error("Either --pdb_id or --motif-name must be provided")
+    batch = bool(args.motif_list or args.motif_glob)
+    if not args.pdb_id and not args.motif_name and not batch:
+        parser.error("Either --pdb_id, --motif-name, --motif-list or --motif-glob must be provided")
+    if batch and not args.output_dir:
+        parser.error("--motif-list and --motif-glob require --output-dir")
+    if args.shard and not (0 <= args.shard[0] < args.shard[1]):
+        parser.error("--shard INDEX COUNT needs 0 <= INDEX < COUNT")
+    if batch and args.server:
+        parser.error("--server cannot be combined with --motif-list or --motif-glob")
+    
+    # Forward to a running scoring service (scoring_service.py) instead of scoring here
+    if args.server:
+        from scoring_client import forward
+        sys.exit(forward(args))
     
     # If motif-name is provided, parse CIF file and extract information
     if args.motif_name:
@@ -348,27 +1254,12 @@ Scoring:
             parser.error(f"Motif CIF file not found: {motif_cif_file}")
         
         # Extract PDB ID from motif name (e.g., HAIRPIN-2-CGAG-7O7Y-1 -> 7O7Y)
-        import re
-        pdb_match = re.search(r'([0-9][A-Z0-9]{3})', args.motif_name)
-        if not pdb_match:
+        args.pdb_id = motif_pdb_id(args.motif_name)
+        if not args.pdb_id:
             parser.error(f"Could not extract PDB ID from motif name: {args.motif_name}")
-        args.pdb_id = pdb_match.group(1)
         
         # Parse CIF file to extract chain and exact residues
-        chain = None
-        residues = []
-        with open(motif_cif_file, 'r') as f:
-            for line in f:
-                if line.startswith("ATOM"):
-                    parts = line.split()
-                    if len(parts) >= 6:
-                        if chain is None:
-                            chain = parts[5]  # Chain is in column 6
-                        res_num = parts[4]   # Residue number is in column 5
-                        base = parts[3]      # Base type is in column 4
-                        residue_id = f"{chain}-{base}-{res_num}-"
-                        if residue_id not in residues:
-                            residues.append(residue_id)
+        chain, residues = parse_motif_cif(motif_cif_file)
         
         if not chain or not residues:
             parser.error(f"Could not parse chain or residues from CIF file: {motif_cif_file}")
@@ -393,23 +1284,48 @@ Scoring:
     
     # Initialize components
     config = Config()
-    data_loader = DataLoader(config)
+    if args.corpus:
+        config.CORPUS_DIR = args.corpus
+    if args.full_hbonds:
+        config.HBOND_COMPACT = False
+    events = make_sink(args.events)
+    data_loader = DataLoader(config, events=events)
     report_gen = ReportGenerator(config)
     
-    scorer = Scorer(config)
+    scorer = Scorer(config, columnar=args.columnar, events=events)
+    result_cache = ResultCache(args.cache_dir, scorer.fingerprint())
+    
+    # BATCH MOTIF MODE: many motifs per run, each structure loaded once
+    if batch:
+        files = motif_files(args.motif_list, args.motif_glob, args.motif_dir)
+        groups, unmatched = group_motifs_by_pdb(files)
+        for path in unmatched:
+            print(f"Could not extract PDB ID from motif name: {path.stem}")
+        if args.shard:
+            index, count = args.shard
+            groups = {pdb_id: group for i, (pdb_id, group) in enumerate(groups.items()) if i % count == index}
+        print(f"Scoring {sum(len(group) for group in groups.values())} motifs from {len(groups)} structures")
+        
+        outcomes = score_motif_batch(groups, data_loader, scorer, report_gen, args.output_dir, args.csv_dir,
+                                     result_cache=result_cache, skip_existing=args.skip_existing)
+        outcomes['no_pdb_id'] += len(unmatched)
+        print(f"\n{'='*60}")
+        print(", ".join(f"{outcome}: {count}" for outcome, count in sorted(outcomes.items()) if count) or "No motifs")
+        print(f"{'='*60}")
+        failed = sum(count for outcome, count in outcomes.items() if outcome not in ('scored', 'skipped'))
+        sys.exit(1 if failed else 0)
     
     # Run analysis
     try:
         # Load data
         print(f"Loading data for {args.pdb_id}...")
-        basepair_data = data_loader.load_basepairs(args.pdb_id)
-        hbond_data = data_loader.load_hbonds(args.pdb_id)  # RNA-RNA only for scoring
-        all_hbond_data = data_loader.load_all_hbonds(args.pdb_id)  # All H-bonds for protein binding analysis
-        torsion_data = data_loader.load_torsions(args.pdb_id)  # Backbone torsion angles
+        # Input fingerprint only where the result cache is used (motif and full structure modes)
+        structure = load_structure(data_loader, args.pdb_id, fingerprint=not args.residue or bool(args.motif))
         
-        if basepair_data is None or hbond_data is None:
+        if structure is None:
             print(f"Error: Could not load data for {args.pdb_id}")
             sys.exit(2)
+        basepair_data, hbond_data, all_hbond_data = structure.basepairs, structure.hbonds, structure.all_hbonds
         
         print(f"Loaded {len(basepair_data)} base pairs")
         print(f"Loaded {len(hbond_data)} RNA-RNA H-bonds")
@@ -444,226 +1360,37 @@ Scoring:
                 motif_residues = set(args.motif_residues.split(','))
                 print(f"Using {len(motif_residues)} exact residues from CIF file for filtering")
             
-            # ========================================
-            # STEP 1: Get full structure score (from cache if available)
-            # ========================================
-            cache_file = Path('full_structure_cache') / f"{args.pdb_id}.json"
-            full_score = None
-
-            if cache_file.exists():
-                try:
-                    with open(cache_file, 'r') as f:
-                        cache_data = json.load(f)
-                        full_score = cache_data.get('full_structure_score')
-                    print(f"\n{'='*60}")
-                    print("STEP 1: Using CACHED full structure score")
-                    print(f"{'='*60}")
-                    print(f"→ Full structure score: {full_score}/100 [from cache]")
-                except Exception as e:
-                    print(f"⚠ Error reading cache: {e}, computing...")
-            
-            if full_score is None:
-                print(f"\n{'='*60}")
-                print("STEP 1: Scoring ENTIRE structure for comparison...")
-                print(f"{'='*60}")
-                
-                full_result = scorer.score_structure(basepair_data, hbond_data, torsion_data=torsion_data)
-                full_score = full_result.overall_score
-
-                print(f"\n→ Full structure score: {full_score}/100")
-
-                # Save to cache for future use
-                cache_dir = Path('full_structure_cache')
-                cache_dir.mkdir(exist_ok=True)
-                cache_data = {
-                    'pdb_id': args.pdb_id,
-                    'full_structure_score': full_score,
-                    'total_base_pairs': full_result.total_base_pairs,
-                    'num_nucleotides': num_nucleotides
-                }
-                with open(cache_file, 'w') as f:
-                    json.dump(cache_data, f, indent=2)
-                
-                # Convert full result to dictionary
-                full_result_dict = scorer.export_to_dict(full_result)
-                full_result_dict['pdb_id'] = args.pdb_id
-                full_result_dict['analysis_type'] = 'baseline'
-                full_result_dict['num_nucleotides'] = num_nucleotides
-                if validation_metrics:
-                    full_result_dict.update(validation_metrics)
-                
+            def save_full_report(full_result_dict):
                 # Save full structure report
                 full_output_file = "report.json"
                 with open(full_output_file, 'w') as f:
                     json.dump(full_result_dict, f, indent=2)
                 print(f"→ Full structure report saved to: {full_output_file}")
             
-            # ========================================
-            # STEP 2: Score the motif
-            # ========================================
-            print(f"\n{'='*60}")
-            if motif_residues:
-                print(f"STEP 2: Scoring MOTIF ({len(motif_residues)} residues from CIF file)")
-            else:
-                print(f"STEP 2: Scoring MOTIF (Residues {start_res}-{end_res})")
-            if args.chain:
-                print(f"Chain: {args.chain}")
-            print(f"{'='*60}")
-            
-            motif_basepairs, motif_hbonds = filter_motif_data(
-                basepair_data, hbond_data, 
-                motif_residues=motif_residues,
-                start_res=start_res, 
-                end_res=end_res, 
-                chain=args.chain
+            motif_result_dict = score_motif(
+                structure, motif_residues=motif_residues, start_res=start_res, end_res=end_res,
+                chain=args.chain, scorer=scorer, result_cache=result_cache,
+                num_nucleotides=num_nucleotides, validation_metrics=validation_metrics,
+                on_full_report=save_full_report, echo=print
             )
             
-            print(f"Filtered to {len(motif_basepairs)} base pairs in motif")
-            print(f"Filtered to {len(motif_hbonds)} H-bonds in motif")
-            
-            if len(motif_basepairs) == 0:
+            if motif_result_dict is None:
                 print("Warning: No base pairs found in specified motif range!")
                 sys.exit(1)
             
-            # Score the motif
-            motif_result = scorer.score_structure(motif_basepairs, motif_hbonds, torsion_data=torsion_data)
-            motif_score = motif_result.overall_score
-
-            # Convert motif result to dictionary
-            temp_motif_dict = scorer.export_to_dict(motif_result)
-            
-            # Calculate num_problematic_bps from basepair_scores
-            # Use BASELINE threshold (75) to match Detailed_Issues column
-            num_problematic_bps = sum(
-                1 for bp in temp_motif_dict.get('basepair_scores', [])
-                if bp['score'] < config.BASELINE
-            )
-            
-            # Count actual unique residues in motif (from base pairs and H-bonds)
-            # This handles non-contiguous motifs (e.g., multi-way junctions)
-            # NOTE: This is different from the filtering criteria - this counts what was actually found
-            actual_motif_residues = set()
-            for bp in motif_basepairs:
-                actual_motif_residues.add(bp['res_1'])
-                actual_motif_residues.add(bp['res_2'])
-            for _, hbond in motif_hbonds.iterrows():
-                actual_motif_residues.add(hbond['res_1'])
-                actual_motif_residues.add(hbond['res_2'])
-            
-            # Count unique paired nucleotides (only those in base pairs)
-            paired_nucleotides = set()
-            for bp in motif_basepairs:
-                paired_nucleotides.add(bp['res_1'])
-                paired_nucleotides.add(bp['res_2'])
-            
-            # ========================================
-            # REORGANIZE: Put important info at TOP
-            # ========================================
-            motif_result_dict = {
-                # CRITICAL INFORMATION FIRST
-                'pdb_id': args.pdb_id,
-                'analysis_type': 'motif',
-                'motif_range': f"{start_res}-{end_res}",
-                'motif_chain': args.chain if args.chain else "all",
-                
-                # COMPARISON METRICS
-                'motif_score': motif_score,
-                'full_structure_score': full_score,
-                'full_structure_num_nucleotides': num_nucleotides,
-                # Motif length: actual number of unique residues in motif (handles non-contiguous)
-                'motif_num_nucleotides': len(actual_motif_residues),
-                # Count unique nucleotides that are paired (appear in at least one base pair)
-                'num_paired_nucleotides': len(paired_nucleotides),
-                'score_difference': round(motif_score - full_score, 1),
-                
-                # MOTIF STATISTICS
-                'total_base_pairs': motif_result.total_base_pairs,
-                'num_problematic_bps': num_problematic_bps,
-                
-                # DETAILED ANALYSIS BELOW
-                'overall_score': motif_result.overall_score,
-                'avg_basepair_score': motif_result.avg_basepair_score,
-                
-                # Issue counts and fractions
-                'geometry_issues': temp_motif_dict['geometry_issues'],
-                'geometry_fractions': temp_motif_dict['geometry_fractions'],
-                'hbond_issues': temp_motif_dict['hbond_issues'],
-                'hbond_fractions': temp_motif_dict['hbond_fractions'],
-                'summary': temp_motif_dict['summary'],
-                
-                # Individual base pair details
-                'basepair_scores': temp_motif_dict['basepair_scores'],
-
-                # Backbone suiteness
-                'avg_suiteness': temp_motif_dict.get('avg_suiteness', None),
-
-                # Structure-level metadata
-            }
-            
-            # Analyze protein/ligand bindings for problematic base pairs
-            protein_bindings, ligand_bindings = analyze_protein_bindings(
-                temp_motif_dict.get('basepair_scores', []),
-                all_hbond_data,
-                baseline_threshold=config.BASELINE
-            )
-            motif_result_dict['protein_binding_explanations'] = protein_bindings
-            motif_result_dict['ligand_binding_explanations'] = ligand_bindings
-            
-            # Add validation metrics at the end
-            if validation_metrics:
-                motif_result_dict.update(validation_metrics)
-            
             # Get motif name (needed for file naming)
-            if args.motif_name:
-                motif_name = args.motif_name
-            else:
-                # Generate motif name from range
-                chain_str = f"{args.chain}_" if args.chain else ""
-                motif_name = f"{args.pdb_id}_{chain_str}{start_res}-{end_res}"
-            
-            # Save motif report
-            if args.output_dir:
-                output_dir = Path(args.output_dir)
-                output_dir.mkdir(parents=True, exist_ok=True)
-                motif_output_file = output_dir / f"{motif_name}.json"
-            else:
-                motif_output_file = Path("motif_report.json")
+            motif_name = args.motif_name or _motif_name(args.pdb_id, start_res, end_res, args.chain)
             
-            with open(motif_output_file, 'w') as f:
-                json.dump(motif_result_dict, f, indent=2)
+            # Save motif report and CSV summary (separate CSV file)
+            motif_output_file = save_motif_outputs(
+                report_gen, motif_result_dict, motif_name,
+                output_dir=args.output_dir, csv_dir=args.csv_dir
+            )
             
             # ========================================
             # STEP 3: Print comparison summary
             # ========================================
-            print(f"\n{'='*60}")
-            print("COMPARISON SUMMARY")
-            print(f"{'='*60}")
-            print(f"Full Structure: {full_score}/100")
-            print(f"Motif Score:    {motif_score}/100")
-            print(f"Difference:     {motif_score - full_score:+.1f} points")
-            
-            if motif_score < full_score:
-                print(f"→ Motif is {full_score - motif_score:.1f} points WORSE than full structure")
-            elif motif_score > full_score:
-                print(f"→ Motif is {motif_score - full_score:.1f} points BETTER than full structure")
-            else:
-                print(f"→ Motif score matches full structure")
-            
-            print(f"\n{'='*60}")
-            #print(f"Full structure report: {full_output_file}")
-            print(f"Motif report:          {motif_output_file}")
-            print(f"{'='*60}\n")
-            
-            # Save/update CSV summary for motif (separate CSV file)
-            
-            report_gen.save_motifs_summary_csv(
-                motif_result_dict, 
-                motif_name=motif_name,
-                csv_dir=args.csv_dir
-            )
-            
-            # Exit code based on motif quality
-            result = motif_result
+            print_comparison(motif_result_dict, motif_output_file)
             
         # SINGLE RESIDUE MODE: Score all base pairs involving a specific residue
         elif args.residue:
@@ -675,147 +1402,21 @@ Scoring:
                 print(f"Chain filter: {args.chain}")
             print(f"{'='*60}")
 
-            # Find all base pairs that involve this residue
-            matching_bps = []
-            for bp in basepair_data:
-                res1_parts = bp['res_1'].split('-')
-                res2_parts = bp['res_2'].split('-')
-
-                try:
-                    res1_chain = res1_parts[0]
-                    res1_num = int(res1_parts[2])
-                    res2_chain = res2_parts[0]
-                    res2_num = int(res2_parts[2])
-                except (IndexError, ValueError):
-                    continue
+            report = score_residue(structure, residue_num, chain=args.chain, scorer=scorer, echo=print)
 
-                # Check if this base pair involves our residue
-                residue_match = (res1_num == residue_num or res2_num == residue_num)
-
-                # Apply chain filter if specified
-                if args.chain:
-                    chain_match = (
-                        (res1_num == residue_num and res1_chain == args.chain) or
-                        (res2_num == residue_num and res2_chain == args.chain)
-                    )
-                    if residue_match and chain_match:
-                        matching_bps.append(bp)
-                elif residue_match:
-                    matching_bps.append(bp)
-
-            if len(matching_bps) == 0:
+            if report is None:
                 print(f"Error: No base pairs found involving residue {residue_num}")
                 if args.chain:
                     print(f"  (with chain filter: {args.chain})")
                 sys.exit(1)
 
-            print(f"Found {len(matching_bps)} base pair(s) involving residue {residue_num}")
-
-            # Collect residue IDs for H-bond filtering
-            residue_ids = set()
-            for bp in matching_bps:
-                residue_ids.add(bp['res_1'])
-                residue_ids.add(bp['res_2'])
-
-            # Filter H-bonds to those between residues in our base pairs
-            filtered_hbonds = hbond_data[
-                hbond_data['res_1'].isin(residue_ids) &
-                hbond_data['res_2'].isin(residue_ids)
-            ]
-
-            print(f"Found {len(filtered_hbonds)} H-bonds for these base pairs")
-
-            # Score each base pair individually
-            bp_results = []
-            for bp in matching_bps:
-                bp_score_dict = scorer._score_base_pair(bp, filtered_hbonds, torsion_data)
-
-                # Add full geometry parameters for detailed report
-                bp_score_dict['geometry_params'] = {
-                    'shear': bp.get('shear', 0),
-                    'stretch': bp.get('stretch', 0),
-                    'stagger': bp.get('stagger', 0),
-                    'buckle': bp.get('buckle', 0),
-                    'propeller': bp.get('propeller', 0),
-                    'opening': bp.get('opening', 0),
-                }
-
-                # Get H-bonds for this specific base pair
-                nt1_id = bp.get('res_1', '')
-                nt2_id = bp.get('res_2', '')
-                bp_hbonds = scorer._get_basepair_hbonds(nt1_id, nt2_id, filtered_hbonds)
-
-                # Add detailed H-bond info
-                hbond_details = []
-                for _, hb in bp_hbonds.iterrows():
-                    hbond_details.append({
-                        'atom_1': hb.get('atom_1', ''),
-                        'atom_2': hb.get('atom_2', ''),
-                        'distance': round(hb.get('distance', 0), 3),
-                        'angle_1': round(hb.get('angle_1', 0), 1),
-                        'angle_2': round(hb.get('angle_2', 0), 1),
-                        'dihedral_angle': round(hb.get('dihedral_angle', 0), 1),
-                        'quality_score': round(hb.get('score', 0), 3),
-                    })
-                bp_score_dict['hbond_details'] = hbond_details
-
-                bp_results.append(bp_score_dict)
-
-            # Calculate summary statistics
-            total_score = sum(bp['score'] for bp in bp_results)
-            avg_score = total_score / len(bp_results) if bp_results else 0
-
-            # Build the report
-            report = {
-                'pdb_id': args.pdb_id,
-                'analysis_type': 'single_residue',
-                'query_residue': residue_num,
-                'query_chain': args.chain if args.chain else 'all',
-
-                # Summary
-                'num_base_pairs': len(bp_results),
-
-                # Individual base pair scores
-                'base_pairs': bp_results,
-            }
-
-            # Analyze protein/ligand bindings
-            protein_bindings, ligand_bindings = analyze_protein_bindings(
-                bp_results,
-                all_hbond_data,
-                baseline_threshold=config.BASELINE
-            )
-            report['protein_binding_explanations'] = protein_bindings
-            report['ligand_binding_explanations'] = ligand_bindings
-
             # Save report
             output_file = Path("basepair_report.json")
             with open(output_file, 'w') as f:
                 json.dump(report, f, indent=2)
 
             # Print summary
-            print(f"\n{'='*60}")
-            print("BASE PAIR REPORT")
-            print(f"{'='*60}")
-            print(f"Query: Residue {residue_num}" + (f" (Chain {args.chain})" if args.chain else ""))
-            print(f"Base pairs found: {len(bp_results)}")
-            print(f"Average score: {avg_score:.1f}/100")
-            print(f"\nIndividual base pairs:")
-            for bp in bp_results:
-                info = bp['bp_info']
-                score = bp['score']
-                bp_type = info.get('bp_type', 'unknown')
-                edge = info.get('edge_type', 'unknown')
-                print(f"  {info['res_1']} <-> {info['res_2']}")
-                print(f"    Type: {bp_type} ({edge}), Score: {score}/100")
-                if bp['geometry_issues']:
-                    print(f"    Geometry issues: {list(bp['geometry_issues'].keys())}")
-                if bp['hbond_issues']:
-                    print(f"    H-bond issues: {list(bp['hbond_issues'].keys())}")
-
-            print(f"\n{'='*60}")
-            print(f"Detailed report saved to: {output_file}")
-            print(f"{'='*60}\n")
+            print_residue_report(report, output_file)
 
             sys.exit(0)
 
@@ -825,51 +1426,10 @@ Scoring:
             print("Scoring ENTIRE structure...")
             print(f"{'='*60}")
             
-            result = scorer.score_structure(basepair_data, hbond_data, torsion_data=torsion_data)
-            
-            # Convert result to dictionary for JSON export
-            result_dict = scorer.export_to_dict(result)
-            result_dict['pdb_id'] = args.pdb_id
-            result_dict['analysis_type'] = 'baseline'
-            result_dict['num_nucleotides'] = num_nucleotides
-            
-            # If no base pairs, mark scores as N/A instead of treating as failure
-            if result.total_base_pairs == 0:
-                result_dict['overall_score'] = 'N/A'
-                result_dict['avg_basepair_score'] = 'N/A'
-            
-            # Analyze protein/ligand bindings and add directly to base pair objects in JSON
-            protein_bindings, ligand_bindings = analyze_protein_bindings(
-                result_dict.get('basepair_scores', []),
-                all_hbond_data,
-                baseline_threshold=config.BASELINE
+            result_dict = score_pdb(
+                structure, scorer=scorer, result_cache=result_cache,
+                num_nucleotides=num_nucleotides, validation_metrics=validation_metrics, echo=print
             )
-
-            # Add protein binding info directly to each base pair object
-            for bp_score in result_dict.get('basepair_scores', []):
-                bp_info = bp_score.get('bp_info', {})
-                res_1 = bp_info.get('res_1', '')
-                res_2 = bp_info.get('res_2', '')
-                bp_id = f"{res_1}-{res_2}"
-
-                # Add bindings to this base pair if it has any
-                if bp_id in protein_bindings:
-                    bp_score['protein_bindings'] = protein_bindings[bp_id]
-                else:
-                    bp_score['protein_bindings'] = []
-
-                # Add ligand bindings to this base pair if it has any
-                if bp_id in ligand_bindings:
-                    bp_score['ligand_bindings'] = ligand_bindings[bp_id]
-                else:
-                    bp_score['ligand_bindings'] = []
-
-            # Keep top-level for backward compatibility (can be removed later if not needed)
-            result_dict['protein_binding_explanations'] = protein_bindings
-            result_dict['ligand_binding_explanations'] = ligand_bindings
-            
-            if validation_metrics:
-                result_dict.update(validation_metrics)
             
             # Save detailed JSON report
             output_file = "report.json"
@@ -0,0 +1 @@
+"""Micro-benchmarks for the scoring and data loading hot paths."""
@@ -0,0 +1,82 @@
+"""
+Benchmark: corpus-wide threshold statistics from whole-file JSON loads vs.
+the streaming base pair reader.
+
+Peak memory is the tracemalloc peak of Python allocations while collecting
+the parameter values analyze_thresholds.py summarizes.
+
+Usage:
+    python benchmarks/bench_basepair_stream.py [--files 40] [--pairs 5000]
+"""
+
+import io
+import sys
+import json
+import time
+import argparse
+import tempfile
+import contextlib
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from analyze_thresholds import GEOMETRY_PARAMS, collect_parameter_values, iter_all_basepairs
+from benchmarks.synthetic import make_structure
+
+
+def collect_loaded(basepair_dir):
+    """The previous approach: json.load every file and keep every record."""
+    all_basepairs = []
+    for bp_file in basepair_dir.glob("*.json"):
+        with open(bp_file, 'r') as f:
+            data = json.load(f)
+        all_basepairs.extend(data if isinstance(data, list) else data.get('base_pairs', []))
+    return collect_parameter_values(all_basepairs)
+
+
+def collect_streamed(basepair_dir):
+    return collect_parameter_values(iter_all_basepairs(basepair_dir))
+
+
+def measure(collect, basepair_dir):
+    tracemalloc.start()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = collect(basepair_dir)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak / 2 ** 20
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark streaming base pair statistics")
+    parser.add_argument('--files', type=int, default=40)
+    parser.add_argument('--pairs', type=int, default=5000, help='Base pairs per file')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        basepair_dir = Path(tmp)
+        for i in range(args.files):
+            basepair_data, _, _ = make_structure(args.pairs, 0, seed=i)
+            data = basepair_data if i % 2 else {'base_pairs': basepair_data}
+            (basepair_dir / f'S{i:03d}.json').write_text(json.dumps(data, indent=2))
+        size_mb = sum(p.stat().st_size for p in basepair_dir.iterdir()) / 2 ** 20
+        print(f"Synthetic corpus: {args.files} files x {args.pairs} base pairs, {size_mb:.1f} MB of JSON")
+
+        (loaded_count, loaded), loaded_s, loaded_mb = measure(collect_loaded, basepair_dir)
+        (streamed_count, streamed), streamed_s, streamed_mb = measure(collect_streamed, basepair_dir)
+
+    assert streamed_count == loaded_count
+    for param in GEOMETRY_PARAMS + ('hbond_score',):
+        assert sorted(streamed[param]) == sorted(loaded[param]), param
+
+    print(f"{'':10s}{'time':>10s}{'peak memory':>14s}")
+    print(f"{'json.load':10s}{loaded_s:9.2f}s{loaded_mb:11.1f} MB")
+    print(f"{'streamed':10s}{streamed_s:9.2f}s{streamed_mb:11.1f} MB")
+    print(f"Peak memory {loaded_mb / streamed_mb:.1f}x lower; collected values identical")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""
+Benchmark: text (JSON/CSV) vs. binary columnar input loading in DataLoader.
+
+Cold loads use a fresh DataLoader per structure (no in-process memo); warm
+loads repeat the read with the files already in the OS page cache.
+
+Usage:
+    python benchmarks/bench_binary_inputs.py [--pairs 2000] [--hbonds 10000] [--repeat 5]
+"""
+
+import io
+import sys
+import json
+import time
+import argparse
+import tempfile
+import contextlib
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config import Config
+from utils.data_loader import DataLoader
+from utils.instrumentation import SilentSink
+from benchmarks.synthetic import make_structure
+
+PDB_ID = '1SYN'
+
+
+def load_all(config):
+    """Load one structure with a fresh loader; returns (basepairs, hbonds, torsions)."""
+    loader = DataLoader(config, events=SilentSink())
+    return (loader.load_basepairs(PDB_ID, quiet=True),
+            loader.load_all_hbonds(PDB_ID, quiet=True),
+            loader.load_torsions(PDB_ID, quiet=True))
+
+
+def time_loads(config, repeat):
+    """Cold (first) and best warm load time in seconds, plus the loaded data."""
+    start = time.perf_counter()
+    data = load_all(config)
+    cold = time.perf_counter() - start
+    warm = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        load_all(config)
+        warm = min(warm, time.perf_counter() - start)
+    return cold, warm, data
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark binary columnar input loading")
+    parser.add_argument('--pairs', type=int, default=2000)
+    parser.add_argument('--hbonds', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    basepair_data, hbond_data, torsion_data = make_structure(args.pairs, args.hbonds)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        config = Config()
+        for name in ('basepairs', 'hbonds', 'torsions'):
+            (tmp / name).mkdir()
+        config.BASEPAIR_DIR = str(tmp / 'basepairs')
+        config.HBOND_DIR = str(tmp / 'hbonds')
+        config.TORSION_DIR = str(tmp / 'torsions')
+        config.BINARY_DIR = str(tmp / 'binary')
+        (tmp / 'basepairs' / f'{PDB_ID}.json').write_text(json.dumps(basepair_data))
+        hbond_data.to_csv(tmp / 'hbonds' / f'{PDB_ID}.csv', index=False)
+        (tmp / 'torsions' / f'{PDB_ID}.json').write_text(json.dumps(torsion_data))
+
+        print(f"Synthetic structure: {len(basepair_data)} base pairs, {len(hbond_data)} H-bonds, "
+              f"{len(torsion_data)} residues with torsions")
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            text_cold, text_warm, text_data = time_loads(config, args.repeat)
+
+            start = time.perf_counter()
+            status = DataLoader(config, events=SilentSink()).convert_to_binary(PDB_ID)
+            convert_time = time.perf_counter() - start
+            assert set(status.values()) == {'written'}, status
+
+            binary_cold, binary_warm, binary_data = time_loads(config, args.repeat)
+
+        text_bps, text_hbonds, text_torsions = text_data
+        binary_bps, binary_hbonds, binary_torsions = binary_data
+        assert binary_bps == text_bps, "binary base pairs diverged from JSON"
+        assert binary_torsions == text_torsions, "binary torsions diverged from JSON"
+        assert binary_hbonds.equals(text_hbonds), "binary H-bonds diverged from CSV"
+
+        text_size = sum(p.stat().st_size for d in ('basepairs', 'hbonds', 'torsions')
+                        for p in (tmp / d).iterdir())
+        binary_size = sum(p.stat().st_size for p in (tmp / 'binary').rglob('*.col'))
+
+    print(f"One-time conversion: {convert_time:8.3f} s")
+    print(f"Size on disk:        text {text_size / 1e6:6.2f} MB, binary {binary_size / 1e6:6.2f} MB")
+    print(f"{'':20s}{'cold':>10s}{'warm':>10s}")
+    print(f"{'Text loaders:':20s}{text_cold:9.4f}s{text_warm:9.4f}s")
+    print(f"{'Binary loaders:':20s}{binary_cold:9.4f}s{binary_warm:9.4f}s")
+    print(f"{'Speedup:':20s}{text_cold / binary_cold:9.1f}x{text_warm / binary_warm:9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+"""
+Benchmark: per-pair H-bond mask vs. pair-keyed H-bond index in Scorer.
+
+Usage:
+    python benchmarks/bench_hbond_index.py [--pairs 2000] [--hbonds 10000]
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config import Config
+from scorer2 import Scorer
+from benchmarks.synthetic import make_structure
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pair-keyed H-bond lookup")
+    parser.add_argument('--pairs', type=int, default=2000)
+    parser.add_argument('--hbonds', type=int, default=10000)
+    args = parser.parse_args()
+
+    basepair_data, hbond_data, _ = make_structure(args.pairs, args.hbonds)
+    scorer = Scorer(Config())
+
+    print(f"Synthetic structure: {len(basepair_data)} base pairs, {len(hbond_data)} H-bonds")
+
+    start = time.perf_counter()
+    mask_scores = [scorer._score_base_pair(bp, hbond_data) for bp in basepair_data]
+    mask_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    hbond_index = scorer._build_hbond_index(hbond_data)
+    build_time = time.perf_counter() - start
+    indexed_scores = [scorer._score_base_pair(bp, hbond_data, hbond_index=hbond_index)
+                      for bp in basepair_data]
+    index_time = time.perf_counter() - start
+
+    assert indexed_scores == mask_scores, "indexed scoring diverged from mask scoring"
+
+    print(f"Per-pair mask:     {mask_time:8.3f} s")
+    print(f"Pair index:        {index_time:8.3f} s  (index build {build_time:.3f} s)")
+    print(f"Speedup:           {mask_time / index_time:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Benchmark: compact-schema vs. full H-bond CSV ingestion in DataLoader.
+
+Each mode loads the CSV in a fresh child process, so peak RSS covers only
+the imports plus that load. Scores from both modes are compared.
+
+Usage:
+    python benchmarks/bench_hbond_ingest.py [--pairs 5000] [--hbonds 40000]
+"""
+
+import gc
+import io
+import sys
+import json
+import time
+import argparse
+import resource
+import tempfile
+import contextlib
+import subprocess
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config import Config
+from scorer2 import Scorer
+from utils.data_loader import DataLoader
+from utils.instrumentation import SilentSink
+from benchmarks.synthetic import make_structure
+
+PDB_ID = '1SYN'
+
+
+def _proc_status_mb(field: str):
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith(field + ':'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def peak_rss_mb() -> float:
+    """Peak RSS of this process (VmHWM; ru_maxrss would include the parent's peak after fork)."""
+    peak = _proc_status_mb('VmHWM')
+    if peak is None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KiB on Linux
+    return peak
+
+
+def current_rss_mb() -> float:
+    return _proc_status_mb('VmRSS') or 0.0
+
+
+def make_config(hbond_dir: Path, compact: bool) -> Config:
+    config = Config()
+    config.HBOND_DIR = str(hbond_dir)
+    config.HBOND_COMPACT = compact
+    return config
+
+
+def child(hbond_dir: Path, compact: bool) -> None:
+    """Load the CSV once and print load time, frame size and RSS as JSON."""
+    loader = DataLoader(make_config(hbond_dir, compact), events=SilentSink())
+    gc.collect()
+    before = current_rss_mb()
+    start = time.perf_counter()
+    hbonds = loader.load_all_hbonds(PDB_ID, quiet=True)
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    print(json.dumps({
+        'seconds': elapsed,
+        'frame_mb': hbonds.memory_usage(deep=True).sum() / 2 ** 20,
+        'baseline_rss_mb': before,
+        'peak_rss_mb': peak_rss_mb(),
+        'retained_rss_mb': current_rss_mb(),
+    }))
+
+
+def measure(hbond_dir: Path, compact: bool) -> dict:
+    out = subprocess.run([sys.executable, __file__, '--child', str(hbond_dir), '--compact', str(int(compact))],
+                         capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark compact H-bond ingestion")
+    parser.add_argument('--pairs', type=int, default=5000)
+    parser.add_argument('--hbonds', type=int, default=40000)
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    parser.add_argument('--compact', type=int, default=1, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(Path(args.child), bool(args.compact))
+        return
+
+    basepair_data, hbond_data, torsion_data = make_structure(args.pairs, args.hbonds)
+    # Shape of the real files: 3-decimal geometry plus columns scoring never reads
+    hbond_data = hbond_data.round(3)
+    hbond_data['quality'] = hbond_data['score'].map(lambda s: 'strong' if s > 0.7 else 'weak')
+    hbond_data['atom_type_1'] = 'N'
+    hbond_data['atom_type_2'] = 'O'
+
+    with tempfile.TemporaryDirectory() as tmp:
+        hbond_dir = Path(tmp)
+        hbond_data.to_csv(hbond_dir / f'{PDB_ID}.csv', index=False)
+        size_mb = (hbond_dir / f'{PDB_ID}.csv').stat().st_size / 2 ** 20
+        print(f"Synthetic H-bond CSV: {len(hbond_data)} rows, {len(hbond_data.columns)} columns, {size_mb:.1f} MB")
+
+        results = {name: measure(hbond_dir, compact) for name, compact in (('full', False), ('compact', True))}
+
+        # Scores must not depend on the ingestion path, with either engine
+        with contextlib.redirect_stdout(io.StringIO()):
+            for columnar in (False, True):
+                scores = {}
+                for name, compact in (('full', False), ('compact', True)):
+                    config = make_config(hbond_dir, compact)
+                    hbonds = DataLoader(config, events=SilentSink()).load_hbonds(PDB_ID, quiet=True)
+                    scores[name] = Scorer(config, columnar=columnar, events=SilentSink()).score_structure(
+                        basepair_data, hbonds, torsion_data)
+                assert scores['compact'] == scores['full'], "compact ingestion changed scores"
+
+    print(f"{'':10s}{'load':>10s}{'columns':>12s}{'peak RSS':>12s}{'peak growth':>13s}{'retained':>12s}")
+    for name, r in results.items():
+        print(f"{name:10s}{r['seconds']:9.3f}s{r['frame_mb']:9.1f} MB{r['peak_rss_mb']:9.1f} MB"
+              f"{r['peak_rss_mb'] - r['baseline_rss_mb']:10.1f} MB"
+              f"{r['retained_rss_mb'] - r['baseline_rss_mb']:9.1f} MB")
+    full, compact = results['full'], results['compact']
+    print(f"Parsed columns: {full['frame_mb'] / compact['frame_mb']:.1f}x smaller; "
+          f"peak RSS {full['peak_rss_mb']:.1f} MB -> {compact['peak_rss_mb']:.1f} MB")
+    print("Scores identical (row and columnar engines): yes")
+
+
+if __name__ == '__main__':
+    main()
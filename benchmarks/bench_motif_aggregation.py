@@ -0,0 +1,68 @@
+"""
+Benchmark: re-scoring every motif vs. scoring once and aggregating per motif.
+
+Usage:
+    python benchmarks/bench_motif_aggregation.py [--pairs 2000] [--hbonds 10000] [--motifs 200]
+"""
+
+import io
+import sys
+import time
+import random
+import argparse
+import contextlib
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app import filter_motif_data
+from config import Config
+from scorer2 import Scorer
+from benchmarks.synthetic import make_structure
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark score-once motif aggregation")
+    parser.add_argument('--pairs', type=int, default=2000)
+    parser.add_argument('--hbonds', type=int, default=10000)
+    parser.add_argument('--motifs', type=int, default=200)
+    parser.add_argument('--motif-size', type=int, default=30)
+    args = parser.parse_args()
+
+    basepair_data, hbond_data, torsion_data = make_structure(args.pairs, args.hbonds)
+    # Motifs built from whole base pairs, so each one has pairs to score
+    rng = random.Random(0)
+    motifs = []
+    for _ in range(args.motifs):
+        pairs = rng.sample(basepair_data, args.motif_size // 2)
+        motifs.append({bp['res_1'] for bp in pairs} | {bp['res_2'] for bp in pairs})
+    scorer = Scorer(Config())
+
+    print(f"Synthetic structure: {len(basepair_data)} base pairs, {len(hbond_data)} H-bonds, "
+          f"{len(motifs)} motifs of ~{args.motif_size} residues")
+
+    # score_structure prints its report; keep it out of the timing output
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        rescored = []
+        for motif_residues in motifs:
+            motif_bps, motif_hbonds = filter_motif_data(basepair_data, hbond_data,
+                                                        motif_residues=motif_residues)
+            rescored.append(scorer.score_structure(motif_bps, motif_hbonds, torsion_data))
+        rescore_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        structure_scores = scorer.score_basepairs(basepair_data, hbond_data, torsion_data)
+        score_time = time.perf_counter() - start
+        aggregated = [scorer.score_motif(structure_scores, motif_residues) for motif_residues in motifs]
+        aggregate_time = time.perf_counter() - start
+
+    assert aggregated == rescored, "motif aggregation diverged from re-scoring"
+
+    print(f"Re-score per motif:     {rescore_time:8.3f} s")
+    print(f"Score once + aggregate: {aggregate_time:8.3f} s  (scoring pass {score_time:.3f} s)")
+    print(f"Speedup:                {rescore_time / aggregate_time:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
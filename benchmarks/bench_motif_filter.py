@@ -0,0 +1,124 @@
+"""
+Benchmark: per-row motif filtering vs. vectorized filter_motif_data, and
+filtering many motifs one at a time vs. one pass with filter_motifs_data.
+
+Usage:
+    python benchmarks/bench_motif_filter.py [--pairs 2000] [--hbonds 10000] [--motif-size 50] [--motifs 200]
+"""
+
+import sys
+import time
+import random
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app import filter_motif_data, filter_motifs_data
+from benchmarks.synthetic import make_structure
+from utils.residue_key import residue_key
+
+
+def filter_motif_data_rowwise(basepair_data, hbond_data, motif_residues=None, start_res=None, end_res=None,
+                              chain=None):
+    """The per-row filter_motif_data this benchmark compares against (same arguments and results)."""
+    motif_bps = []
+    for bp in basepair_data:
+        key_1 = bp.get('key_1') or residue_key(bp['res_1'])
+        key_2 = bp.get('key_2') or residue_key(bp['res_2'])
+        if key_1 is None or key_2 is None:
+            continue
+        if chain and key_1.chain != chain:
+            continue
+        if motif_residues is not None:
+            if bp['res_1'] in motif_residues and bp['res_2'] in motif_residues:
+                motif_bps.append(bp)
+        elif start_res is not None and end_res is not None:
+            if (start_res <= key_1.number <= end_res) and (start_res <= key_2.number <= end_res):
+                motif_bps.append(bp)
+
+    if motif_residues is not None:
+        motif_hbonds = hbond_data[
+            hbond_data['res_1'].apply(lambda res_id: res_id in motif_residues) &
+            hbond_data['res_2'].apply(lambda res_id: res_id in motif_residues)
+        ]
+    else:
+        def key_in_range(key):
+            if key is None:
+                return False
+            if chain and key.chain != chain:
+                return False
+            return start_res <= key.number <= end_res
+
+        motif_hbonds = hbond_data[
+            hbond_data['res_1'].map(residue_key).map(key_in_range).astype(bool) &
+            hbond_data['res_2'].map(residue_key).map(key_in_range).astype(bool)
+        ]
+    return motif_bps, motif_hbonds
+
+
+def _time(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return (time.perf_counter() - start) / repeat, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark vectorized motif filtering")
+    parser.add_argument('--pairs', type=int, default=2000)
+    parser.add_argument('--hbonds', type=int, default=10000)
+    parser.add_argument('--motif-size', type=int, default=50)
+    parser.add_argument('--motifs', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    basepair_data, hbond_data, _ = make_structure(args.pairs, args.hbonds)
+    # A motif of whole base pairs, and a residue range of the same size on chain A
+    rng = random.Random(0)
+    pairs = rng.sample(basepair_data, args.motif_size // 2)
+    motif_residues = {bp['res_1'] for bp in pairs} | {bp['res_2'] for bp in pairs}
+    range_args = dict(start_res=100, end_res=100 + args.motif_size - 1, chain='A')
+
+    print(f"Synthetic structure: {len(basepair_data)} base pairs, {len(hbond_data)} H-bonds, "
+          f"{len(motif_residues)}-residue motif")
+
+    for label, kwargs in [('Exact residues', dict(motif_residues=motif_residues)), ('Residue range', range_args)]:
+        rowwise_time, expected = _time(lambda: filter_motif_data_rowwise(basepair_data, hbond_data, **kwargs),
+                                       args.repeat)
+        vector_time, result = _time(lambda: filter_motif_data(basepair_data, hbond_data, **kwargs), args.repeat)
+
+        assert result[0] == expected[0], f"{label}: base pairs diverged from per-row filtering"
+        assert result[1].equals(expected[1]), f"{label}: H-bonds diverged from per-row filtering"
+
+        print(f"{label} ({len(result[0])} pairs, {len(result[1])} H-bonds):")
+        print(f"  Per-row:    {rowwise_time * 1000:8.2f} ms")
+        print(f"  Vectorized: {vector_time * 1000:8.2f} ms")
+        print(f"  Speedup:    {rowwise_time / vector_time:8.1f}x")
+
+    motifs = {}
+    for i in range(args.motifs):
+        pairs = rng.sample(basepair_data, args.motif_size // 2)
+        motifs[i] = {bp['res_1'] for bp in pairs} | {bp['res_2'] for bp in pairs}
+
+    start = time.perf_counter()
+    expected = {i: filter_motif_data(basepair_data, hbond_data, motif_residues=residues)
+                for i, residues in motifs.items()}
+    per_motif_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = filter_motifs_data(basepair_data, hbond_data, motifs)
+    single_pass_time = time.perf_counter() - start
+
+    for i in motifs:
+        assert result[i][0] == expected[i][0], f"motif {i}: base pairs diverged from filter_motif_data"
+        assert result[i][1].equals(expected[i][1]), f"motif {i}: H-bonds diverged from filter_motif_data"
+
+    print(f"{len(motifs)} motifs:")
+    print(f"  One at a time:  {per_motif_time * 1000:8.2f} ms")
+    print(f"  Single pass:    {single_pass_time * 1000:8.2f} ms")
+    print(f"  Speedup:        {per_motif_time / single_pass_time:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Synthetic RNA structures for benchmarks (ribosome-sized, reproducible)."""
+
+import numpy as np
+import pandas as pd
+
+BASES = ['A', 'C', 'G', 'U']
+EDGES = ['cWW', 'cWW', 'cWW', 'tSH', 'cWH', 'tHS', 'cSS']
+BASE_ATOMS = ['N1', 'N2', 'N3', 'N4', 'N6', 'N7', 'O2', 'O4', 'O6']
+BACKBONE_ATOMS = ["O2'", 'OP1', 'OP2', "O4'", "O3'"]
+
+
+def make_structure(n_pairs: int = 2000, n_hbonds: int = 10000, n_chains: int = 4,
+                   seed: int = 0):
+    """
+    Build a synthetic structure with the shape of the real input files.
+
+    Args:
+        n_pairs: Number of base pairs
+        n_hbonds: Number of H-bond rows (about 1/4 backbone or non-pair noise)
+        n_chains: Number of chains residues are spread over
+        seed: Random seed
+
+    Returns:
+        Tuple of (basepair_data list, hbond_data DataFrame, torsion_data dict)
+    """
+    rng = np.random.default_rng(seed)
+    chains = [f"{chr(ord('A') + i)}" for i in range(n_chains)]
+    residues_per_chain = max(2 * n_pairs // n_chains + 10, 50)
+
+    residues = []
+    for chain in chains:
+        for num in range(1, residues_per_chain + 1):
+            residues.append(f"{chain}-{BASES[rng.integers(4)]}-{num}-")
+
+    basepair_data = []
+    pairs = []
+    for _ in range(n_pairs):
+        i, j = rng.choice(len(residues), size=2, replace=False)
+        res_1, res_2 = residues[i], residues[j]
+        pairs.append((res_1, res_2))
+        basepair_data.append({
+            'res_1': res_1,
+            'res_2': res_2,
+            'bp_type': f"{res_1.split('-')[1]}-{res_2.split('-')[1]}",
+            'lw': EDGES[rng.integers(len(EDGES))],
+            'shear': float(rng.normal(0, 1.5)),
+            'stretch': float(rng.normal(0, 1.0)),
+            'stagger': float(rng.normal(0, 0.6)),
+            'buckle': float(rng.normal(0, 12)),
+            'propeller': float(rng.normal(-8, 12)),
+            'opening': float(rng.normal(0, 20)),
+            'hbond_score': float(abs(rng.normal(1.5, 0.8))),
+        })
+
+    rows = []
+    for k in range(n_hbonds):
+        if k < 3 * n_hbonds // 4:
+            res_1, res_2 = pairs[rng.integers(len(pairs))]
+            if rng.random() < 0.5:
+                res_1, res_2 = res_2, res_1
+        else:
+            i, j = rng.choice(len(residues), size=2, replace=False)
+            res_1, res_2 = residues[i], residues[j]
+        atom_pool_1 = BASE_ATOMS if rng.random() < 0.8 else BACKBONE_ATOMS
+        rows.append({
+            'res_1': res_1,
+            'res_2': res_2,
+            'atom_1': atom_pool_1[rng.integers(len(atom_pool_1))],
+            'atom_2': BASE_ATOMS[rng.integers(len(BASE_ATOMS))],
+            'distance': float(rng.normal(2.95, 0.25)),
+            'angle_1': float(rng.normal(140, 20)),
+            'angle_2': float(rng.normal(140, 20)),
+            'dihedral_angle': float(rng.uniform(-180, 180)),
+            'score': float(rng.uniform(0.3, 1.0)),
+            'res_type_1': 'RNA',
+            'res_type_2': 'RNA',
+        })
+    hbond_data = pd.DataFrame(rows)
+
+    torsion_data = {}
+    for res_id in residues:
+        torsion_data[res_id] = {
+            'alpha': float(rng.normal(-68, 15)),
+            'beta': float(rng.normal(178, 15)),
+            'gamma': float(rng.normal(54, 15)),
+            'delta': float(rng.normal(82, 8)),
+            'epsilon': float(rng.normal(-150, 15)),
+            'zeta': float(rng.normal(-71, 15)),
+            'chi': float(rng.normal(-160, 30)),
+        }
+
+    return basepair_data, hbond_data, torsion_data
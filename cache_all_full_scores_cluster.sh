@@ -80,15 +80,8 @@ for ((i=START_INDEX; i<=END_INDEX; i++)); do
     
     echo "Processing: $PDB_ID (PDB ID $((i + 1))/$TOTAL_PDB_IDS)"
     
-    # Check if already cached
-    CACHE_FILE="full_structure_cache/${PDB_ID}.json"
-    if [ -f "$CACHE_FILE" ]; then
-        echo "  → Already cached, skipping"
-        ((SUCCESS++))
-        continue
-    fi
-    
-    # Cache full structure score
+    # Cache full structure score (skips PDB IDs already cached for the
+    # current inputs, config and reference data)
     python3 cache_full_structure_scores.py --pdb-id "$PDB_ID" --cache-dir full_structure_cache
     
     exit_code=$?
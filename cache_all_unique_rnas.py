@@ -6,12 +6,13 @@ Skips already cached PDB IDs (resumable).
 """
 
 import sys
-import json
 import glob
 from pathlib import Path
-import subprocess
 from collections import Counter
 
+from app import load_structure, score_pdb
+from cache_full_structure_scores import open_result_cache
+
 def find_unique_pdb_ids(motifs_dir='unique_motifs'):
     """Find all unique PDB IDs from motif CIF files."""
     motif_files = glob.glob(f"{motifs_dir}/*.cif")
@@ -29,24 +30,15 @@ def find_unique_pdb_ids(motifs_dir='unique_motifs'):
     
     return sorted(pdb_ids)
 
-def cache_full_structure_score(pdb_id, cache_dir='full_structure_cache', timeout=300):
+def cache_full_structure_score(pdb_id, data_loader, scorer, result_cache):
     """Compute and cache full structure score for a PDB ID."""
-    cache_file = Path(cache_dir) / f"{pdb_id}.json"
-    
-    # Skip if already cached
-    if cache_file.exists():
-        try:
-            with open(cache_file, 'r') as f:
-                data = json.load(f)
-                if 'full_structure_score' in data and data['full_structure_score'] is not None:
-                    return True, "already_cached"
-        except:
-            # Corrupted cache file, re-cache
-            pass
+    # Skip if already cached for the current inputs and settings
+    input_hash = data_loader.input_fingerprint(pdb_id)
+    if result_cache.get(input_hash) is not None:
+        return True, "already_cached"
     
     # Check if data files exist
-    bp_file = Path(f'data/basepairs/{pdb_id}.json')
-    hb_file = Path(f'data/hbonds/{pdb_id}.csv')
+    bp_file, hb_file, _ = data_loader.input_files(pdb_id)
     
     if not bp_file.exists():
         return False, "no_basepair_file"
@@ -54,49 +46,19 @@ def cache_full_structure_score(pdb_id, cache_dir='full_structure_cache', timeout
     if not hb_file.exists():
         return False, "no_hbond_file"
     
-    # Run app.py to get full structure score
+    structure = load_structure(data_loader, pdb_id, quiet=True, fingerprint=False)
+    if structure is None:
+        return False, "load_error"
+    
+    # Score in-process; score_pdb stores the full structure result in the cache
     try:
-        result = subprocess.run(
-            [sys.executable, 'app.py', '--pdb_id', pdb_id],
-            capture_output=True,
-            text=True,
-            timeout=timeout
-        )
-        
-        if result.returncode == 0:
-            # Read the report.json
-            report_file = Path('report.json')
-            if report_file.exists():
-                with open(report_file, 'r') as f:
-                    data = json.load(f)
-                    full_score = data.get('overall_score')
-                    
-                    if full_score is not None:
-                        # Save to cache
-                        Path(cache_dir).mkdir(exist_ok=True)
-                        cache_data = {
-                            'pdb_id': pdb_id,
-                            'full_structure_score': full_score,
-                            'total_base_pairs': data.get('total_base_pairs', 0),
-                            'num_nucleotides': data.get('num_nucleotides', 0)
-                        }
-                        with open(cache_file, 'w') as f:
-                            json.dump(cache_data, f, indent=2)
-                        return True, "cached"
-                    else:
-                        return False, "no_score_in_report"
-            else:
-                return False, "no_report_file"
-        else:
-            # Check if it's because of no base pairs
-            if "No base pairs found" in result.stdout or "No base pairs found" in result.stderr:
-                return False, "no_base_pairs"
-            return False, f"exit_code_{result.returncode}"
-            
-    except subprocess.TimeoutExpired:
-        return False, "timeout"
+        score_pdb(structure._replace(input_hash=input_hash), scorer=scorer, result_cache=result_cache)
     except Exception as e:
         return False, f"error_{str(e)[:50]}"
+    
+    if result_cache.get(input_hash) is not None:
+        return True, "cached"
+    return False, "not_cached"
 
 def main():
     import argparse
@@ -114,12 +76,6 @@ def main():
         default='full_structure_cache',
         help='Cache directory (default: full_structure_cache)'
     )
-    parser.add_argument(
-        '--timeout',
-        type=int,
-        default=300,
-        help='Timeout per PDB ID in seconds (default: 300)'
-    )
     parser.add_argument(
         '--skip-existing',
         action='store_true',
@@ -139,19 +95,11 @@ def main():
     print(f"Found {len(pdb_ids)} unique PDB IDs")
     
     # Check existing cache
-    cache_dir = Path(args.cache_dir)
-    cache_dir.mkdir(exist_ok=True)
+    data_loader, scorer, result_cache = open_result_cache(args.cache_dir)
     
-    existing_cache = set()
     if args.skip_existing:
-        for cache_file in cache_dir.glob("*.json"):
-            try:
-                with open(cache_file, 'r') as f:
-                    data = json.load(f)
-                    if 'full_structure_score' in data and data['full_structure_score'] is not None:
-                        existing_cache.add(cache_file.stem)
-            except:
-                pass
+        existing_cache = {pdb for pdb in pdb_ids
+                          if result_cache.get(data_loader.input_fingerprint(pdb)) is not None}
         
         if existing_cache:
             print(f"Found {len(existing_cache)} already cached PDB IDs")
@@ -177,7 +125,7 @@ def main():
     for i, pdb_id in enumerate(pdb_ids_to_cache, 1):
         print(f"[{i}/{len(pdb_ids_to_cache)}] {pdb_id}...", end=' ', flush=True)
         
-        success, reason = cache_full_structure_score(pdb_id, args.cache_dir, args.timeout)
+        success, reason = cache_full_structure_score(pdb_id, data_loader, scorer, result_cache)
         
         if success:
             if reason == "already_cached":
@@ -96,69 +96,21 @@ while IFS= read -r PDB_ID; do
     
     echo "[$PROGRESS/$PDB_IDS_TO_PROCESS] ($PCT%) $PDB_ID"
     
-    # Check if already cached
-    CACHE_FILE="full_structure_cache/${PDB_ID}.json"
-    if [ -f "$CACHE_FILE" ]; then
-        # Verify cache is valid
-        if python3 -c "import json; json.load(open('$CACHE_FILE'))" 2>/dev/null; then
-            echo "  ✓ Already cached"
-            ((SKIPPED++))
-            continue
-        else
-            echo "  ⚠ Invalid cache, recomputing..."
-            rm -f "$CACHE_FILE"
-        fi
-    fi
-    
-    # Run app.py to compute full structure score
-    python app.py --pdb_id "$PDB_ID" 2>&1 | tail -3
-    
+    # Cache full structure score: app.py stores the result keyed by the input
+    # files, config and reference data, so PDB IDs already cached under the
+    # current settings are skipped and stale entries are never reused
+    OUTPUT=$(python3 cache_full_structure_scores.py --pdb-id "$PDB_ID" --cache-dir full_structure_cache 2>&1)
     exit_code=$?
     
-    if [ $exit_code -eq 0 ]; then
-        # Check if report.json was created and has valid data
-        if [ -f "report.json" ]; then
-            # Extract score and save to cache
-            python3 -c "
-import json
-from pathlib import Path
-
-try:
-    with open('report.json', 'r') as f:
-        data = json.load(f)
-        full_score = data.get('overall_score')
-        
-        if full_score is not None:
-            cache_data = {
-                'pdb_id': '$PDB_ID',
-                'full_structure_score': full_score,
-                'full_structure_grade': data.get('grade', 'N/A'),
-                'total_base_pairs': data.get('total_base_pairs', 0),
-                'num_nucleotides': data.get('num_nucleotides', 0)
-            }
-            Path('full_structure_cache').mkdir(exist_ok=True)
-            with open('full_structure_cache/$PDB_ID.json', 'w') as f:
-                json.dump(cache_data, f, indent=2)
-            print(f'  ✓ Cached: {full_score}/100')
-        else:
-            print('  ✗ No score in report')
-            exit(1)
-except Exception as e:
-    print(f'  ✗ Error: {e}')
-    exit(1)
-"
-            if [ $? -eq 0 ]; then
-                ((SUCCESS++))
-            else
-                ((FAILED++))
-            fi
-        else
-            echo "  ✗ No report.json generated"
-            ((FAILED++))
-        fi
-    else
+    if [ $exit_code -ne 0 ]; then
         echo "  ✗ Failed (exit code: $exit_code)"
         ((FAILED++))
+    elif echo "$OUTPUT" | grep -q "Already cached"; then
+        echo "  ✓ Already cached"
+        ((SKIPPED++))
+    else
+        echo "  ✓ Cached"
+        ((SUCCESS++))
     fi
     
     # Clean up
@@ -4,11 +4,16 @@ Pre-compute and cache full structure scores for all unique PDB IDs.
 This avoids recomputing full structure scores for each motif.
 """
 
-import json
 import sys
 from pathlib import Path
 import glob
-import subprocess
+
+from app import load_structure, score_pdb
+from config import Config
+from scorer2 import Scorer
+from utils.data_loader import DataLoader
+from utils.instrumentation import SilentSink
+from utils.result_cache import ResultCache
 
 def find_unique_pdb_ids(motifs_dir='motifs'):
     """Find all unique PDB IDs from motif CIF files."""
@@ -25,51 +30,52 @@ def find_unique_pdb_ids(motifs_dir='motifs'):
     
     return sorted(pdb_ids)
 
-def cache_full_structure_score(pdb_id, cache_dir='full_structure_cache'):
-    """Compute and cache full structure score for a PDB ID."""
-    cache_file = Path(cache_dir) / f"{pdb_id}.json"
+def open_result_cache(cache_dir='full_structure_cache'):
+    """
+    Open the full-structure result cache under the current config and reference data.
+
+    Returns:
+        (data_loader, scorer, result_cache); data_loader.input_fingerprint(pdb_id)
+        gives the input hash to look up
+    """
+    config = Config()
+    events = SilentSink()
+    scorer = Scorer(config, events=events)
+    return DataLoader(config, events=events), scorer, ResultCache(cache_dir, scorer.fingerprint())
+
+
+def cache_full_structure_score(pdb_id, cache_dir='full_structure_cache', data_loader=None, result_cache=None,
+                               scorer=None):
+    """
+    Compute and cache full structure score for a PDB ID.
+
+    data_loader, result_cache and scorer come together from open_result_cache:
+    the cache is keyed on the loader's input hashes and the scorer's
+    fingerprint. Pass all three, or none to open them for cache_dir.
+
+    Raises:
+        ValueError: If only some of data_loader, result_cache and scorer are given
+    """
+    opened = (data_loader, result_cache, scorer)
+    if all(part is None for part in opened):
+        data_loader, scorer, result_cache = open_result_cache(cache_dir)
+    elif any(part is None for part in opened):
+        raise ValueError("Pass data_loader, result_cache and scorer together (see open_result_cache), "
+                         "or none of them")
     
-    # Skip if already cached
-    if cache_file.exists():
-        try:
-            with open(cache_file, 'r') as f:
-                data = json.load(f)
-                if 'full_structure_score' in data:
-                    return True
-        except:
-            pass
+    # Skip if already cached for the current inputs and settings
+    input_hash = data_loader.input_fingerprint(pdb_id)
+    if result_cache.get(input_hash) is not None:
+        return True
     
-    # Run app.py to get full structure score
+    structure = load_structure(data_loader, pdb_id, quiet=True, fingerprint=False)
+    if structure is None:
+        return False
+    
+    # Score in-process; score_pdb stores the full structure result in the cache
     try:
-        result = subprocess.run(
-            [sys.executable, 'app.py', '--pdb_id', pdb_id],
-            capture_output=True,
-            text=True,
-            timeout=300  # 5 minute timeout
-        )
-        
-        if result.returncode == 0:
-            # Read the report.json
-            report_file = Path('report.json')
-            if report_file.exists():
-                with open(report_file, 'r') as f:
-                    data = json.load(f)
-                    full_score = data.get('overall_score')
-                    
-                    if full_score is not None:
-                        # Save to cache
-                        Path(cache_dir).mkdir(exist_ok=True)
-                        cache_data = {
-                            'pdb_id': pdb_id,
-                            'full_structure_score': full_score,
-                            'total_base_pairs': data.get('total_base_pairs', 0),
-                            'num_nucleotides': data.get('num_nucleotides', 0)
-                        }
-                        with open(cache_file, 'w') as f:
-                            json.dump(cache_data, f, indent=2)
-                        return True
-    except subprocess.TimeoutExpired:
-        print(f"  ⚠ Timeout for {pdb_id}")
+        score_pdb(structure._replace(input_hash=input_hash), scorer=scorer, result_cache=result_cache)
+        return result_cache.get(input_hash) is not None
     except Exception as e:
         print(f"  ✗ Error for {pdb_id}: {e}")
     
@@ -81,13 +87,26 @@ def main():
     parser.add_argument('--motifs-dir', default='motifs', help='Motifs directory')
     parser.add_argument('--cache-dir', default='full_structure_cache', help='Cache directory')
     parser.add_argument('--pdb-id', help='Cache specific PDB ID only')
+    parser.add_argument('--evict', action='store_true',
+                        help='Remove cache entries written under other config/reference data (and legacy per-PDB files)')
+    parser.add_argument('--dry-run', action='store_true', help='With --evict, only list what would be removed')
     
     args = parser.parse_args()
+    data_loader, scorer, result_cache = open_result_cache(args.cache_dir)
     
-    if args.pdb_id:
+    if args.evict:
+        stale = result_cache.evict(dry_run=args.dry_run)
+        for path in stale:
+            print(f"  {path}")
+        action = "Would remove" if args.dry_run else "Removed"
+        print(f"{action} {len(stale)} stale cache entries (current fingerprint {result_cache.fingerprint[:12]})")
+    elif args.pdb_id:
         # Cache single PDB ID
+        if result_cache.get(data_loader.input_fingerprint(args.pdb_id)) is not None:
+            print(f"✓ Already cached {args.pdb_id}")
+            return
         print(f"Caching full structure score for {args.pdb_id}...")
-        success = cache_full_structure_score(args.pdb_id, args.cache_dir)
+        success = cache_full_structure_score(args.pdb_id, args.cache_dir, data_loader, result_cache, scorer)
         if success:
             print(f"✓ Cached {args.pdb_id}")
         else:
@@ -106,7 +125,7 @@ def main():
         
         for i, pdb_id in enumerate(pdb_ids, 1):
             print(f"[{i}/{len(pdb_ids)}] Processing {pdb_id}...", end=' ')
-            if cache_full_structure_score(pdb_id, args.cache_dir):
+            if cache_full_structure_score(pdb_id, args.cache_dir, data_loader, result_cache, scorer):
                 cached += 1
                 print("✓")
             else:
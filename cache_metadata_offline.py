@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+OFFLINE metadata caching - reads local mmCIF files instead of the RCSB API.
+
+Experimental method, resolution, dates, refinement statistics, software
+and revisions are taken from each file's header (utils/cif_metadata.py),
+parsed on a process pool, and written to metadata_cache.json in the same
+form cache_metadata_parallel.py uses. Validation report values
+(clashscore, RMSZ, outliers, suiteness) are not in mmCIF files; run
+cache_metadata_parallel.py afterwards if they are needed.
+
+Only PDB IDs missing from the cache are filled unless --overwrite is given.
+
+Usage:
+    python cache_metadata_offline.py [--cif-dir data/cif] [--workers N]
+                                     [--nucleotides] [--overwrite]
+"""
+
+import json
+import time
+import argparse
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent))
+from config import Config
+from utils.cif_metadata import extract_directory
+
+
+def get_all_pdb_ids(basepairs_dir: str) -> list:
+    """Get all PDB IDs from basepairs directory."""
+    basepairs_path = Path(basepairs_dir)
+    if not basepairs_path.exists():
+        return []
+
+    json_files = list(basepairs_path.glob('*.json'))
+    return sorted(set([f.stem.upper() for f in json_files]))
+
+
+def main():
+    """Main function to cache metadata from local mmCIF files."""
+    config = Config()
+    parser = argparse.ArgumentParser(description="Cache metadata from local mmCIF files (no network)")
+    parser.add_argument('--cif-dir', default=config.CIF_DIR, help=f'mmCIF directory (default: {config.CIF_DIR})')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    parser.add_argument('--nucleotides', action='store_true',
+                        help='Also count nucleotides from the coordinates (reads whole files)')
+    parser.add_argument('--overwrite', action='store_true', help='Replace entries already in the cache')
+    parser.add_argument('--cache-file', default='metadata_cache.json')
+    args = parser.parse_args()
+
+    print("="*80)
+    print("OFFLINE METADATA CACHING (local mmCIF headers)")
+    print("="*80)
+
+    # Load existing cache
+    cache = {}
+    if Path(args.cache_file).exists():
+        try:
+            with open(args.cache_file, 'r') as f:
+                cache = json.load(f)
+            print(f"\nLoaded existing cache: {args.cache_file}")
+        except Exception as e:
+            print(f"Warning: Could not load cache: {e}")
+            cache = {}
+
+    val_metrics = cache.setdefault('validation_metrics', {})
+    nuc_counts = cache.setdefault('nucleotide_counts', {})
+
+    all_pdb_ids = get_all_pdb_ids(config.BASEPAIR_DIR)
+    print(f"Found {len(all_pdb_ids)} PDB IDs in {config.BASEPAIR_DIR}")
+    if args.overwrite:
+        needed = all_pdb_ids
+    else:
+        needed = [pdb_id for pdb_id in all_pdb_ids
+                  if val_metrics.get(pdb_id) is None or (args.nucleotides and pdb_id not in nuc_counts)]
+    print(f"Metadata needed: {len(needed)}")
+    if not needed:
+        print("\n✓ All metadata already cached!")
+        return
+
+    start_time = time.time()
+    results = extract_directory(args.cif_dir, needed, workers=args.workers, nucleotides=args.nucleotides)
+    elapsed = time.time() - start_time
+
+    filled = failed = 0
+    for pdb_id, result in results.items():
+        if result['metrics'] is None:
+            failed += 1
+            continue
+        if args.overwrite or val_metrics.get(pdb_id) is None:
+            val_metrics[pdb_id] = result['metrics']
+        if result['num_nucleotides'] is not None and (args.overwrite or pdb_id not in nuc_counts):
+            nuc_counts[pdb_id] = result['num_nucleotides']
+        filled += 1
+
+    with open(args.cache_file, 'w') as f:
+        json.dump(cache, f, indent=2)
+
+    print(f"\n{'='*80}")
+    print("CACHING COMPLETE")
+    print(f"{'='*80}")
+    print(f"Read {len(results)} local mmCIF files in {elapsed:.1f} seconds "
+          f"({len(results) / elapsed if elapsed > 0 else 0:.1f}/sec)")
+    print(f"  Cached: {filled}")
+    print(f"  Unreadable: {failed}")
+    print(f"  No local file: {len(needed) - len(results)}")
+    print(f"Cache saved to: {args.cache_file}")
+
+
+if __name__ == '__main__':
+    main()
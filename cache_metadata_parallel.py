@@ -2,23 +2,29 @@
 """
 FAST parallel metadata caching - downloads multiple RNAs simultaneously.
 
-Uses multiprocessing to download nucleotide counts and validation metrics
-in parallel, achieving 10-20x speedup.
+Worker threads share one DataLoader and its pooled RCSB client
+(utils/rcsb_client.py): connections are kept alive and reused, each host
+is rate limited and transient failures are retried with backoff.
+Throughput and tail latency are reported at the end of the run.
+
+Usage:
+    python cache_metadata_parallel.py [--workers 16] [--rate 20]
+                                      [--data-url URL] [--files-url URL]
 """
 
 import json
 import time
-import requests
+import argparse
+from functools import partial
 from pathlib import Path
-from typing import Dict, Optional, Tuple
+from typing import Callable, Dict, Optional, Tuple
 import sys
-from multiprocessing import Pool, Manager
-from functools import partial
 
 # Import data loader to reuse its methods
 sys.path.insert(0, str(Path(__file__).parent))
 from config import Config
 from utils.data_loader import DataLoader
+from utils.rcsb_client import DATA_URL, FILES_URL, RcsbClient
 
 
 def get_all_pdb_ids(basepairs_dir: str) -> list:
@@ -31,99 +37,43 @@ def get_all_pdb_ids(basepairs_dir: str) -> list:
     return sorted(set([f.stem.upper() for f in json_files]))
 
 
-def download_nucleotide_count(args: Tuple[str, int]) -> Tuple[str, int]:
-    """Download nucleotide count for a single PDB ID (worker function)."""
-    pdb_id, worker_id = args
-    import tempfile
-    import os
-    import shutil
-    
-    # Create a unique temporary file for this worker process
-    # Use process ID + worker ID to ensure uniqueness
-    import os as os_module
-    process_id = os_module.getpid()
-    temp_cif = f"temp_structure_{process_id}_{worker_id}.cif"
+def download_nucleotide_count(data_loader: DataLoader, pdb_id: str) -> Tuple[str, int]:
+    """Download nucleotide count for a single PDB ID (worker function).
     
+    The CIF is counted in memory (DataLoader.get_nucleotide_count), so
+    workers never share or leave behind a file on disk.
+    """
     try:
-        # Create a temporary data loader for this worker
-        config = Config()
-        data_loader = DataLoader(config)
-        
-        # Temporarily override get_nucleotide_count to use our unique temp file
-        original_method = data_loader.get_nucleotide_count
-        
-        def get_nuc_count_with_unique_file(pdb_id):
-            """Wrapper that uses unique temp file."""
-            # Download CIF to unique temp file
-            if not data_loader.download_cif(pdb_id, temp_cif):
-                return 0
-            
-            # Count nucleotides
-            count = data_loader.count_nucleotides_from_cif(temp_cif)
-            
-            # Clean up temp file
-            try:
-                if os.path.exists(temp_cif):
-                    os.unlink(temp_cif)
-            except:
-                pass
-            
-            return count
-        
-        # Use our wrapper
-        count = get_nuc_count_with_unique_file(pdb_id)
-        return (pdb_id, count)
-        
+        return (pdb_id, data_loader.get_nucleotide_count(pdb_id))
     except Exception as e:
-        # Clean up on error
-        try:
-            if os.path.exists(temp_cif):
-                os.unlink(temp_cif)
-        except:
-            pass
         return (pdb_id, 0)
 
 
-def download_validation_metrics(pdb_id: str) -> Tuple[str, Optional[Dict]]:
+def download_validation_metrics(data_loader: DataLoader, pdb_id: str) -> Tuple[str, Optional[Dict]]:
     """Download validation metrics for a single PDB ID (worker function).
     
     Uses the SAME extraction logic as data_loader.get_validation_metrics()
     to ensure consistency.
     """
     try:
-        # Import data loader to use its extraction method
-        config = Config()
-        data_loader = DataLoader(config)
-        
-        # Use the same method as data_loader
-        metrics = data_loader.get_validation_metrics(pdb_id)
-        return (pdb_id, metrics)
-            
+        return (pdb_id, data_loader.get_validation_metrics(pdb_id))
     except Exception as e:
         return (pdb_id, None)
 
 
-def process_batch_parallel(items, worker_func, num_workers=20, desc="Processing"):
-    """Process items in parallel batches."""
+def process_batch_parallel(items, worker_func: Callable, client: RcsbClient, desc="Processing"):
+    """Process items on the client's worker threads, showing progress."""
     results = {}
     total = len(items)
     
-    print(f"\n{desc} {total} items with {num_workers} parallel workers...")
+    print(f"\n{desc} {total} items with {client.max_workers} concurrent workers...")
     start_time = time.time()
     
-    with Pool(processes=num_workers) as pool:
-        # Process in batches to show progress
-        batch_size = 100
-        for i in range(0, total, batch_size):
-            batch = items[i:i+batch_size]
-            batch_results = pool.map(worker_func, batch)
-            
-            # Update results
-            for pdb_id, result in batch_results:
-                results[pdb_id] = result
-            
-            # Show progress
-            completed = min(i + batch_size, total)
+    for completed, (pdb_id, result) in enumerate(client.map(worker_func, items), 1):
+        results[pdb_id] = result
+        
+        # Show progress
+        if completed % 100 == 0 or completed == total:
             elapsed = time.time() - start_time
             rate = completed / elapsed if elapsed > 0 else 0
             eta = (total - completed) / rate if rate > 0 else 0
@@ -139,13 +89,20 @@ def process_batch_parallel(items, worker_func, num_workers=20, desc="Processing"
 
 def main():
     """Main function to cache all metadata in parallel."""
+    parser = argparse.ArgumentParser(description="Cache nucleotide counts and validation metrics for all RNAs")
+    parser.add_argument('--workers', type=int, default=16, help='Concurrent requests (default: 16)')
+    parser.add_argument('--rate', type=float, default=20.0, help='Requests per second per host (default: 20)')
+    parser.add_argument('--data-url', default=DATA_URL, help=f'RCSB data API base URL (default: {DATA_URL})')
+    parser.add_argument('--files-url', default=FILES_URL, help=f'RCSB file server base URL (default: {FILES_URL})')
+    args = parser.parse_args()
+    
     CACHE_FILE = 'metadata_cache.json'
     BASEPAIRS_DIR = 'data/basepairs'
-    NUM_WORKERS = 20  # Number of parallel downloads
+    NUM_WORKERS = args.workers  # Number of concurrent downloads
     
     print("="*80)
     print("FAST PARALLEL METADATA CACHING")
-    print(f"(Using {NUM_WORKERS} parallel workers)")
+    print(f"(Using {NUM_WORKERS} concurrent workers)")
     print("="*80)
     
     # Load existing cache
@@ -196,21 +153,22 @@ def main():
         print("Cancelled.")
         return
     
+    # One loader and client shared by all workers: pooled connections, per-host rate limit
+    client = RcsbClient(data_url=args.data_url, files_url=args.files_url,
+                        max_workers=NUM_WORKERS, rate=args.rate)
+    data_loader = DataLoader(Config(), rcsb=client)
+    
     # Cache nucleotide counts in parallel
     if need_nuc:
         print(f"\n{'='*80}")
         print(f"Caching nucleotide counts ({len(need_nuc)} remaining)...")
         print(f"{'='*80}")
         
-        # Prepare arguments (pdb_id, worker_id for each worker)
-        # Each worker gets a unique ID to avoid temp file conflicts
-        args_list = [(pdb_id, i % NUM_WORKERS) for i, pdb_id in enumerate(need_nuc)]
-        
         # Process in parallel
         results = process_batch_parallel(
-            args_list,
-            download_nucleotide_count,
-            num_workers=NUM_WORKERS,
+            need_nuc,
+            partial(download_nucleotide_count, data_loader),
+            client,
             desc="Downloading nucleotide counts"
         )
         
@@ -231,8 +189,8 @@ def main():
         # Process in parallel
         results = process_batch_parallel(
             need_val,
-            download_validation_metrics,
-            num_workers=NUM_WORKERS,
+            partial(download_validation_metrics, data_loader),
+            client,
             desc="Downloading validation metrics"
         )
         
@@ -254,6 +212,8 @@ def main():
     print(f"Cache saved to: {CACHE_FILE}")
     print(f"  Nucleotide counts: {len(cache.get('nucleotide_counts', {}))}")
     print(f"  Validation metrics: {len(cache.get('validation_metrics', {}))}")
+    print(f"\nRequests: {client.stats.report()}")
+    client.close()
     print(f"\nYou can now run batch processing with cached data!")
 
 
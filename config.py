@@ -309,6 +309,11 @@ class Config:
     # ===== DATA DIRECTORIES =====
     BASEPAIR_DIR = './data/basepairs'
     HBOND_DIR = './data/hbonds'
+    TORSION_DIR = './data/torsions'
+    CIF_DIR = './data/cif'  # local mmCIF files ({PDB_ID}.cif or .cif.gz) for offline metadata
+    BINARY_DIR = './data/binary'  # binary columnar copies (convert_inputs_to_binary.py)
+    CORPUS_DIR = None  # packed corpus store (pack_corpus.py build); None reads the files above
+    HBOND_COMPACT = True  # scoring columns only, categorical strings (utils/hbond_table.py)
     
     # ===== OUTPUT CONFIGURATION =====
     MAX_ISSUES_DISPLAYED = 20
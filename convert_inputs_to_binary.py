@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Convert parsed structure inputs (base pair JSON, H-bond CSV, torsion JSON) to
+binary columnar copies under Config.BINARY_DIR.
+
+DataLoader reads a binary copy instead of the text file whenever the copy is
+at least as new as its source, so re-running this after the inputs change
+is enough to keep the copies in use.
+"""
+
+import sys
+import argparse
+from collections import Counter
+from pathlib import Path
+
+from config import Config
+from utils.data_loader import DataLoader
+from utils.instrumentation import SilentSink
+
+
+def find_input_pdb_ids(data_loader):
+    """PDB IDs with a base pair, H-bond or torsion file."""
+    pdb_ids = set()
+    for directory, pattern in ((data_loader.basepair_dir, '*.json'),
+                               (data_loader.hbond_dir, '*.csv'),
+                               (data_loader.torsion_dir, '*.json')):
+        pdb_ids.update(path.stem for path in Path(directory).glob(pattern))
+    return sorted(pdb_ids)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write binary columnar copies of structure inputs")
+    parser.add_argument('--pdb-id', help='Convert a specific PDB ID only')
+    parser.add_argument('--force', action='store_true', help='Rewrite copies that are already current')
+    args = parser.parse_args()
+
+    config = Config()
+    data_loader = DataLoader(config, events=SilentSink())
+    pdb_ids = [args.pdb_id] if args.pdb_id else find_input_pdb_ids(data_loader)
+    print(f"Converting inputs for {len(pdb_ids)} PDB IDs into {data_loader.binary_dir}")
+
+    totals = Counter()
+    failed = []
+    for i, pdb_id in enumerate(pdb_ids, 1):
+        try:
+            status = data_loader.convert_to_binary(pdb_id, force=args.force)
+        except Exception as e:
+            print(f"[{i}/{len(pdb_ids)}] {pdb_id}: ✗ {e}")
+            failed.append(pdb_id)
+            continue
+        totals.update(status.values())
+        if args.pdb_id or 'unsupported' in status.values():
+            print(f"[{i}/{len(pdb_ids)}] {pdb_id}: " +
+                  ", ".join(f"{kind} {state}" for kind, state in status.items()))
+
+    print(f"\n{'='*60}")
+    for state in ('written', 'current', 'unsupported', 'missing'):
+        print(f"{state.capitalize():12s} {totals[state]}")
+    print(f"Failed       {len(failed)}")
+    print(f"{'='*60}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -17,6 +17,11 @@ from collections import defaultdict, Counter
 from typing import List, Dict, Set, Tuple, Optional
 import itertools
 
+from config import Config
+from utils.data_loader import DataLoader
+from utils.instrumentation import SilentSink
+from utils.residue_key import residue_key
+
 
 class GQuadDetector:
     """Detects G-quadruplexes in RNA structures."""
@@ -41,6 +46,11 @@ class GQuadDetector:
     def __init__(self):
         self.basepairs_dir = Path('data/basepairs')
         self.hbonds_dir = Path('data/hbonds')
+        # H-bond CSVs are consulted once per candidate cycle; the loader keeps the
+        # last parsed table, so each structure's file is read only once
+        config = Config()
+        config.HBOND_DIR = str(self.hbonds_dir)
+        self.data_loader = DataLoader(config, events=SilentSink())
     
     def find_gg_pairs(self, basepairs: List[Dict]) -> List[Dict]:
         """Find all G-G base pairs in the structure."""
@@ -208,30 +218,17 @@ class GQuadDetector:
         Validate G-quad specific H-bond patterns.
         Returns: (gquad_hbonds, total_hbonds)
         """
-        hbond_file = self.hbonds_dir / f"{pdb_id}.csv"
-        if not hbond_file.exists():
+        hbonds = self.data_loader.load_all_hbonds(pdb_id, quiet=True)
+        if hbonds is None:
             return 0, 0
         
         cycle_set = set(cycle)
-        gquad_hbonds = 0
-        total_hbonds = 0
-        
-        try:
-            with open(hbond_file, 'r') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    res_1 = row.get('res_1', '')
-                    res_2 = row.get('res_2', '')
-                    atom_1 = row.get('atom_1', '')
-                    atom_2 = row.get('atom_2', '')
-                    
-                    # Check if both residues are in the cycle
-                    if res_1 in cycle_set and res_2 in cycle_set:
-                        total_hbonds += 1
-                        if (atom_1, atom_2) in self.GQUAD_HBOND_PAIRS:
-                            gquad_hbonds += 1
-        except Exception:
-            pass
+        in_cycle = hbonds['res_1'].isin(cycle_set) & hbonds['res_2'].isin(cycle_set)
+        total_hbonds = int(in_cycle.sum())
+        gquad_hbonds = sum(
+            (atom_1, atom_2) in self.GQUAD_HBOND_PAIRS
+            for atom_1, atom_2 in zip(hbonds.loc[in_cycle, 'atom_1'], hbonds.loc[in_cycle, 'atom_2'])
+        )
         
         return gquad_hbonds, total_hbonds
     
@@ -245,12 +242,12 @@ class GQuadDetector:
         
         # Extract residue numbers from each cycle
         def get_residue_numbers(cycle):
-            """Extract residue numbers from cycle (e.g., ['A-G-4-', 'B-G-4-'] -> {'4'} or {'4', '5'} if mixed)"""
+            """Extract residue numbers from cycle (e.g., ['A-G-4-', 'B-G-4-'] -> {4} or {4, 5} if mixed)"""
             res_nums = set()
             for res in cycle:
-                parts = res.split('-')
-                if len(parts) >= 3:
-                    res_nums.add(parts[2])
+                res_key = residue_key(res)
+                if res_key is not None:
+                    res_nums.add(res_key.number)
             return res_nums
         
         # Group cycles by residue numbers
@@ -297,25 +294,14 @@ class GQuadDetector:
     
     def find_g_residues_from_hbonds(self, pdb_id: str) -> Set[str]:
         """Find all G residues from H-bond data."""
-        hbond_file = self.hbonds_dir / f"{pdb_id}.csv"
+        hbonds = self.data_loader.load_all_hbonds(pdb_id, quiet=True)
         g_residues = set()
         
-        if hbond_file.exists():
-            try:
-                with open(hbond_file, 'r') as f:
-                    reader = csv.DictReader(f)
-                    for row in reader:
-                        res_1 = row.get('res_1', '')
-                        res_2 = row.get('res_2', '')
-                        res_type_1 = row.get('res_type_1', '')
-                        res_type_2 = row.get('res_type_2', '')
-                        
-                        if res_type_1 == 'RNA' and 'G-' in res_1:
-                            g_residues.add(res_1)
-                        if res_type_2 == 'RNA' and 'G-' in res_2:
-                            g_residues.add(res_2)
-            except Exception:
-                pass
+        if hbonds is not None:
+            for res_col, type_col in (('res_1', 'res_type_1'), ('res_2', 'res_type_2')):
+                residues = hbonds[res_col]
+                is_g = (hbonds[type_col] == 'RNA') & residues.str.contains('G-', regex=False, na=False)
+                g_residues.update(residues[is_g])
         
         return g_residues
     
@@ -335,18 +321,10 @@ class GQuadDetector:
             g_residues.add(res_2)
             
             # Extract position numbers
-            parts_1 = res_1.split('-')
-            parts_2 = res_2.split('-')
-            if len(parts_1) >= 3:
-                try:
-                    g_positions[res_1] = int(parts_1[2])
-                except:
-                    pass
-            if len(parts_2) >= 3:
-                try:
-                    g_positions[res_2] = int(parts_2[2])
-                except:
-                    pass
+            for res_id in (res_1, res_2):
+                key = residue_key(res_id)
+                if key is not None:
+                    g_positions[res_id] = key.number
         
         if len(g_residues) < 8:  # Need at least 8 G residues for 2 tetrads
             return []
@@ -354,9 +332,9 @@ class GQuadDetector:
         # Group G residues by chain
         chains = defaultdict(list)
         for g in g_residues:
-            parts = g.split('-')
-            if len(parts) >= 3:
-                chain = parts[0]
+            key = residue_key(g)
+            if key is not None:
+                chain = key.chain
                 pos = g_positions.get(g)
                 if pos is not None:
                     chains[chain].append((g, pos))
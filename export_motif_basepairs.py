@@ -17,7 +17,7 @@ import pandas as pd
 from config import Config
 from utils.data_loader import DataLoader
 from scorer2 import Scorer
-from app import filter_motif_data  # reuse existing motif filtering logic
+from app import filter_motifs_data  # reuse existing motif filtering logic
 from analyze_by_edge_type import is_adjacent_pair  # exclude adjacent base pairs (res diff=1)
 
 
@@ -144,6 +144,7 @@ def export_motif_basepairs(
     pdb_filters=None,
 ):
     config = Config()
+    config.HBOND_COMPACT = False  # the export summarizes the H-bond 'quality' column, outside the compact schema
     data_loader = DataLoader(config)
     scorer = Scorer(config)
     pdb_filters = {p.upper() for p in pdb_filters} if pdb_filters else None
@@ -212,183 +213,209 @@ def export_motif_basepairs(
     ]
     total_basepairs_written = 0
 
+    # Parse motifs first and group them by PDB, so each structure is loaded and
+    # scored once and every motif in it aggregates the same per-pair scores
+    motifs_by_pdb = {}
     for idx, motif_path in enumerate(motif_files, 1):
         try:
             motif_name = motif_path.stem
-            motif_type = motif_name.split("-")[0] if "-" in motif_name else motif_name
             pdb_id, chain, motif_residues, start_res, end_res = parse_motif_cif(motif_path)
+        except Exception:
+            continue
 
-            if pdb_filters and pdb_id and pdb_id.upper() not in pdb_filters:
-                continue
+        if pdb_filters and pdb_id and pdb_id.upper() not in pdb_filters:
+            continue
 
-            if not pdb_id or not motif_residues:
-                print(f"[{idx}/{len(motif_files)}] Skipping {motif_name}: could not parse residues/PDB ID")
-                continue
+        if not pdb_id or not motif_residues:
+            print(f"[{idx}/{len(motif_files)}] Skipping {motif_name}: could not parse residues/PDB ID")
+            continue
 
-            # No per-motif print to reduce noise; progress will be per 100 base pairs
+        motifs_by_pdb.setdefault(pdb_id, []).append((motif_path, chain, motif_residues, start_res, end_res))
 
+    for pdb_id, pdb_motifs in motifs_by_pdb.items():
+        try:
             # Load data
             basepairs = data_loader.load_basepairs(pdb_id, quiet=True)
-            hbonds = data_loader.load_hbonds(pdb_id, quiet=True)
-            all_hbonds = data_loader.load_all_hbonds(pdb_id, quiet=True)
+            hbond_table = data_loader.load_hbond_table(pdb_id, quiet=True)
+            hbonds = hbond_table.rna_rna if hbond_table is not None else None
+            # Only H-bonds with a non-RNA partner can indicate protein binding
+            external_hbonds = hbond_table.external if hbond_table is not None else None
             torsion_data = data_loader.load_torsions(pdb_id, quiet=True)
+        except Exception:
+            continue
 
-            if basepairs is None or hbonds is None:
-                print(f"  ✗ Missing data for {pdb_id}, skipping")
-                continue
+        if basepairs is None or hbonds is None:
+            print(f"  ✗ Missing data for {pdb_id}, skipping")
+            continue
 
-            # Filter to motif residues
-            motif_bps, motif_hbonds = filter_motif_data(
+        # Score every base pair of the structure once
+        try:
+            structure_scores = scorer.score_basepairs(basepairs, hbonds, torsion_data=torsion_data)
+        except Exception:
+            structure_scores = None  # fall back to per-pair scoring below
+
+        # Filter all motifs of the structure in one pass over its base pairs and H-bonds
+        try:
+            motif_data = filter_motifs_data(
                 basepairs,
                 hbonds,
-                motif_residues=motif_residues,
-                start_res=start_res,
-                end_res=end_res,
-                chain=chain,
+                {motif_path: motif_residues for motif_path, _, motif_residues, _, _ in pdb_motifs},
+                chains={motif_path: chain for motif_path, chain, _, _, _ in pdb_motifs},
             )
+        except Exception:
+            continue
+
+        pdb_meta = get_pdb_metadata(pdb_id, cache)
+
+        for motif_path, chain, motif_residues, start_res, end_res in pdb_motifs:
+            try:
+                motif_name = motif_path.stem
+                motif_type = motif_name.split("-")[0] if "-" in motif_name else motif_name
 
-            # Exclude adjacent base pairs (same chain, residue numbers differ by 1)
-            motif_bps = [bp for bp in motif_bps if not is_adjacent_pair(bp.get('res_1', ''), bp.get('res_2', ''))]
-
-            pdb_meta = get_pdb_metadata(pdb_id, cache)
-
-            # Load existing rows for this motif (for dedup/overwrite)
-            existing_rows = {}
-            if shard_by_pdb:
-                motif_csv = (shard_dir / pdb_id / f"{motif_name}.csv")
-                if motif_csv.exists():
-                    try:
-                        with open(motif_csv, "r", newline="") as f:
-                            reader = csv.DictReader(f)
-                            for row in reader:
-                                key = (
-                                    row.get("res1", ""),
-                                    row.get("res2", ""),
-                                    row.get("bp_type", ""),
-                                    row.get("lw_notation", ""),
-                                )
-                                existing_rows[key] = row
-                    except Exception:
-                        existing_rows = {}
-
-            for bp in motif_bps:
-                try:
-                    bp_score = scorer._score_base_pair(bp, motif_hbonds, torsion_data)  # reuse scoring logic
-                except Exception:
-                    continue  # skip problematic base pair
-                bp_info = bp_score.get("bp_info", {})
-                res1 = bp_info.get("res_1", "")
-                res2 = bp_info.get("res_2", "")
-                lw = bp_info.get("lw") or bp.get("lw", "")
-                bp_type = bp_info.get("bp_type") or bp.get("bp_type", "")
-
-                # Get H-bonds associated with this base pair
-                hbond_rows = scorer._get_basepair_hbonds(res1, res2, motif_hbonds)
-                hbond_summary = summarize_hbonds(hbond_rows)
-
-                issues = []
-                for issue, present in bp_score.get("geometry_issues", {}).items():
-                    if present:
-                        issues.append(f"geom_{issue}")
-                for issue, present in bp_score.get("hbond_issues", {}).items():
-                    if present:
-                        issues.append(f"hbond_{issue}")
-                # Append backbone suiteness details
-                backbone = bp_score.get("backbone", [])
-                for bd in backbone:
-                    if bd.get('is_outlier', False):
-                        issues.append(f"backbone_outlier({bd.get('residue','?')})")
-                    elif bd.get('suiteness', 1.0) < 0.5:
-                        issues.append(f"low_suiteness({bd.get('residue','?')},s={bd.get('suiteness',0):.2f})")
-
-                has_binding = has_protein_binding(all_hbonds, res1, res2)
-
-                row = {
-                    "pdb_id": pdb_id,
-                    "resolution": pdb_meta["resolution"],
-                    "method": pdb_meta["method"],
-                    "deposition_year": pdb_meta["deposition_year"],
-                    "motif": motif_name,
-                    "motif_type": motif_type,
-                    "motif_chain": chain or "",
-                    "motif_range": f"{start_res}-{end_res}" if start_res and end_res else "",
-                    "res1": res1,
-                    "res2": res2,
-                    "base_pair": f"{res1}-{res2}",
-                    "lw_notation": lw,
-                    "bp_type": bp_type,
-                    "basepair_score": bp_score.get("score", ""),
-                    "isPoor": bp_score.get("score", 100) < config.BASELINE,
-                    "shear": bp.get("shear", ""),
-                    "stretch": bp.get("stretch", ""),
-                    "stagger": bp.get("stagger", ""),
-                    "buckle": bp.get("buckle", ""),
-                    "propeller": bp.get("propeller", ""),
-                    "opening": bp.get("opening", ""),
-                    "dihedral_angle": hbond_summary["dihedral"],
-                    "distance": hbond_summary["distance"],
-                    "angle1": hbond_summary["angle1"],
-                    "angle2": hbond_summary["angle2"],
-                    "hbond_quality": hbond_summary["hbond_quality"],
-                    "hbond_score": bp.get("hbond_score", ""),
-                    "number_of_hbonds": hbond_summary["num_hbonds"],
-                    "HasProtein_binding": has_binding,
-                    "geometry_penalty": bp_score.get("geometry_penalty", ""),
-                    "hbond_penalty": bp_score.get("hbond_penalty", ""),
-                    "avg_suiteness": "",
-                    "res1_conformer": "",
-                    "res1_suiteness": "",
-                    "res2_conformer": "",
-                    "res2_suiteness": "",
-                    "backbone_outlier": False,
-                    "chi_outlier": False,
-                    "res1_chi_conf": "",
-                    "res2_chi_conf": "",
-                    "issues": ",".join(issues) if issues else "",
-                }
-
-                # Populate backbone suiteness columns
-                if backbone:
-                    suiteness_vals = [bd.get('suiteness', 0.0) for bd in backbone]
-                    row["avg_suiteness"] = round(sum(suiteness_vals) / len(suiteness_vals), 3) if suiteness_vals else ""
-                    row["backbone_outlier"] = any(bd.get('is_outlier', False) for bd in backbone)
-                    if len(backbone) >= 1:
-                        row["res1_conformer"] = backbone[0].get('conformer', '')
-                        row["res1_suiteness"] = backbone[0].get('suiteness', '')
-                    if len(backbone) >= 2:
-                        row["res2_conformer"] = backbone[1].get('conformer', '')
-                        row["res2_suiteness"] = backbone[1].get('suiteness', '')
-
-                # Populate chi conformation columns
-                chi_details = bp_score.get('chi_details', {})
-                if chi_details:
-                    row["chi_outlier"] = chi_details.get('chi_outlier', False)
-                    row["res1_chi_conf"] = chi_details.get('res1_chi_conf', '')
-                    row["res2_chi_conf"] = chi_details.get('res2_chi_conf', '')
+                motif_bps, motif_hbonds = motif_data[motif_path]
 
+                # Exclude adjacent base pairs (same chain, residue numbers differ by 1)
+                motif_bps = [bp for bp in motif_bps if not is_adjacent_pair(bp.get('res_1', ''), bp.get('res_2', ''))]
+
+                # Load existing rows for this motif (for dedup/overwrite)
+                existing_rows = {}
                 if shard_by_pdb:
-                    key = (row["res1"], row["res2"], row["bp_type"], row["lw_notation"])
-                    existing_rows[key] = row  # overwrite if already present
-                else:
-                    key = (pdb_id, motif_name, res1, res2)
-                    rows_by_key[key] = row  # overwrite if key already present
-
-                total_basepairs_written += 1
-                if total_basepairs_written % 100 == 0:
-                    print(f"Progress: {total_basepairs_written} base pairs written...")
-
-            if shard_by_pdb:
-                shard_dir.mkdir(parents=True, exist_ok=True)
-                pdb_dir = shard_dir / pdb_id
-                pdb_dir.mkdir(parents=True, exist_ok=True)
-                motif_csv = pdb_dir / f"{motif_name}.csv"
-                with open(motif_csv, "w", newline="") as f:
-                    writer = csv.DictWriter(f, fieldnames=fieldnames)
-                    writer.writeheader()
-                    writer.writerows(existing_rows.values())
-        except Exception:
-            # Skip any motif that raises unexpected errors
-            continue
+                    motif_csv = (shard_dir / pdb_id / f"{motif_name}.csv")
+                    if motif_csv.exists():
+                        try:
+                            with open(motif_csv, "r", newline="") as f:
+                                reader = csv.DictReader(f)
+                                for row in reader:
+                                    key = (
+                                        row.get("res1", ""),
+                                        row.get("res2", ""),
+                                        row.get("bp_type", ""),
+                                        row.get("lw_notation", ""),
+                                    )
+                                    existing_rows[key] = row
+                        except Exception:
+                            existing_rows = {}
+
+                for bp in motif_bps:
+                    bp_score = structure_scores.score_for(bp) if structure_scores is not None else None
+                    if bp_score is None:
+                        try:
+                            bp_score = scorer._score_base_pair(bp, motif_hbonds, torsion_data)  # reuse scoring logic
+                        except Exception:
+                            continue  # skip problematic base pair
+                    bp_info = bp_score.get("bp_info", {})
+                    res1 = bp_info.get("res_1", "")
+                    res2 = bp_info.get("res_2", "")
+                    lw = bp_info.get("lw") or bp.get("lw", "")
+                    bp_type = bp_info.get("bp_type") or bp.get("bp_type", "")
+
+                    # Get H-bonds associated with this base pair
+                    hbond_rows = scorer._get_basepair_hbonds(res1, res2, motif_hbonds)
+                    hbond_summary = summarize_hbonds(hbond_rows)
+
+                    issues = []
+                    for issue, present in bp_score.get("geometry_issues", {}).items():
+                        if present:
+                            issues.append(f"geom_{issue}")
+                    for issue, present in bp_score.get("hbond_issues", {}).items():
+                        if present:
+                            issues.append(f"hbond_{issue}")
+                    # Append backbone suiteness details
+                    backbone = bp_score.get("backbone", [])
+                    for bd in backbone:
+                        if bd.get('is_outlier', False):
+                            issues.append(f"backbone_outlier({bd.get('residue','?')})")
+                        elif bd.get('suiteness', 1.0) < 0.5:
+                            issues.append(f"low_suiteness({bd.get('residue','?')},s={bd.get('suiteness',0):.2f})")
+
+                    has_binding = has_protein_binding(external_hbonds, res1, res2)
+
+                    row = {
+                        "pdb_id": pdb_id,
+                        "resolution": pdb_meta["resolution"],
+                        "method": pdb_meta["method"],
+                        "deposition_year": pdb_meta["deposition_year"],
+                        "motif": motif_name,
+                        "motif_type": motif_type,
+                        "motif_chain": chain or "",
+                        "motif_range": f"{start_res}-{end_res}" if start_res and end_res else "",
+                        "res1": res1,
+                        "res2": res2,
+                        "base_pair": f"{res1}-{res2}",
+                        "lw_notation": lw,
+                        "bp_type": bp_type,
+                        "basepair_score": bp_score.get("score", ""),
+                        "isPoor": bp_score.get("score", 100) < config.BASELINE,
+                        "shear": bp.get("shear", ""),
+                        "stretch": bp.get("stretch", ""),
+                        "stagger": bp.get("stagger", ""),
+                        "buckle": bp.get("buckle", ""),
+                        "propeller": bp.get("propeller", ""),
+                        "opening": bp.get("opening", ""),
+                        "dihedral_angle": hbond_summary["dihedral"],
+                        "distance": hbond_summary["distance"],
+                        "angle1": hbond_summary["angle1"],
+                        "angle2": hbond_summary["angle2"],
+                        "hbond_quality": hbond_summary["hbond_quality"],
+                        "hbond_score": bp.get("hbond_score", ""),
+                        "number_of_hbonds": hbond_summary["num_hbonds"],
+                        "HasProtein_binding": has_binding,
+                        "geometry_penalty": bp_score.get("geometry_penalty", ""),
+                        "hbond_penalty": bp_score.get("hbond_penalty", ""),
+                        "avg_suiteness": "",
+                        "res1_conformer": "",
+                        "res1_suiteness": "",
+                        "res2_conformer": "",
+                        "res2_suiteness": "",
+                        "backbone_outlier": False,
+                        "chi_outlier": False,
+                        "res1_chi_conf": "",
+                        "res2_chi_conf": "",
+                        "issues": ",".join(issues) if issues else "",
+                    }
+
+                    # Populate backbone suiteness columns
+                    if backbone:
+                        suiteness_vals = [bd.get('suiteness', 0.0) for bd in backbone]
+                        row["avg_suiteness"] = round(sum(suiteness_vals) / len(suiteness_vals), 3) if suiteness_vals else ""
+                        row["backbone_outlier"] = any(bd.get('is_outlier', False) for bd in backbone)
+                        if len(backbone) >= 1:
+                            row["res1_conformer"] = backbone[0].get('conformer', '')
+                            row["res1_suiteness"] = backbone[0].get('suiteness', '')
+                        if len(backbone) >= 2:
+                            row["res2_conformer"] = backbone[1].get('conformer', '')
+                            row["res2_suiteness"] = backbone[1].get('suiteness', '')
+
+                    # Populate chi conformation columns
+                    chi_details = bp_score.get('chi_details', {})
+                    if chi_details:
+                        row["chi_outlier"] = chi_details.get('chi_outlier', False)
+                        row["res1_chi_conf"] = chi_details.get('res1_chi_conf', '')
+                        row["res2_chi_conf"] = chi_details.get('res2_chi_conf', '')
+
+                    if shard_by_pdb:
+                        key = (row["res1"], row["res2"], row["bp_type"], row["lw_notation"])
+                        existing_rows[key] = row  # overwrite if already present
+                    else:
+                        key = (pdb_id, motif_name, res1, res2)
+                        rows_by_key[key] = row  # overwrite if key already present
+
+                    total_basepairs_written += 1
+                    if total_basepairs_written % 100 == 0:
+                        print(f"Progress: {total_basepairs_written} base pairs written...")
+
+                if shard_by_pdb:
+                    shard_dir.mkdir(parents=True, exist_ok=True)
+                    pdb_dir = shard_dir / pdb_id
+                    pdb_dir.mkdir(parents=True, exist_ok=True)
+                    motif_csv = pdb_dir / f"{motif_name}.csv"
+                    with open(motif_csv, "w", newline="") as f:
+                        writer = csv.DictWriter(f, fieldnames=fieldnames)
+                        writer.writeheader()
+                        writer.writerows(existing_rows.values())
+            except Exception:
+                # Skip any motif that raises unexpected errors
+                continue
 
     if shard_by_pdb:
         print(f"\nExport complete. Base pairs written: {total_basepairs_written}. Sharded CSVs saved under: {shard_dir}")
@@ -23,6 +23,7 @@ from typing import Dict, List, Optional, Tuple
 from collections import defaultdict
 # scipy.spatial.distance.mahalanobis replaced by vectorized _vectorized_mahalanobis()
 from g_quads import g_quads
+from utils.residue_key import residues_adjacent
 
 # Paths
 DATA_DIR = Path(__file__).resolve().parent / "data"
@@ -102,20 +103,7 @@ def is_adjacent_pair(res_1: str, res_2: str) -> bool:
     Return True if the two residues are adjacent in sequence (same chain,
     residue numbers differ by 1).
     """
-    if not res_1 or not res_2:
-        return False
-    parts1 = res_1.split('-')
-    parts2 = res_2.split('-')
-    if len(parts1) < 3 or len(parts2) < 3:
-        return False
-    try:
-        chain1, num1 = parts1[0], int(parts1[2])
-        chain2, num2 = parts2[0], int(parts2[2])
-    except (ValueError, IndexError):
-        return False
-    if chain1 != chain2:
-        return False
-    return abs(num1 - num2) == 1
+    return residues_adjacent(res_1, res_2)
 
 
 def get_sugar_pucker(delta: float) -> str:
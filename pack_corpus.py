@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Build and verify the packed corpus store.
+
+The store holds every structure's base pairs, H-bonds and torsions as
+columnar blobs in a few large shard files, with an offset index keyed by PDB
+ID. Point Config.CORPUS_DIR (or app.py --corpus) at it and DataLoader reads
+each structure from memory-mapped shards instead of opening three files.
+
+The store is a snapshot: rebuild it after regenerating data/, and use
+`verify` to find entries whose source files have changed since.
+
+Usage:
+    python pack_corpus.py build [--output data/corpus] [--shard-mb 2048]
+    python pack_corpus.py verify [--output data/corpus] [--deep]
+"""
+
+import sys
+import argparse
+from pathlib import Path
+
+import pandas as pd
+
+from config import Config
+from utils import columnar_store
+from utils.corpus_store import CorpusStore, CorpusWriter
+from utils.data_loader import INPUT_KINDS, DataLoader
+from utils.instrumentation import SilentSink
+from utils.result_cache import hash_files
+
+
+def source_loader():
+    """DataLoader that reads the data files, never an existing store."""
+    config = Config()
+    config.CORPUS_DIR = None
+    return DataLoader(config, events=SilentSink())
+
+
+def find_corpus_pdb_ids(data_loader):
+    """
+    PDB IDs with any input file, as spelled by their base pair file when present.
+
+    The store is keyed upper-case, so IDs differing only in case are one structure.
+    """
+    pdb_ids = {}
+    for directory, pattern in ((data_loader.basepair_dir, '*.json'),
+                               (data_loader.hbond_dir, '*.csv'),
+                               (data_loader.torsion_dir, '*.json')):
+        for path in sorted(Path(directory).glob(pattern)):
+            pdb_ids.setdefault(path.stem.upper(), path.stem)
+    return [pdb_ids[key] for key in sorted(pdb_ids)]
+
+
+def source_stats(paths):
+    """[size, mtime_ns] per input kind (None for a missing file)."""
+    stats = {}
+    for kind, path in zip(INPUT_KINDS, paths):
+        try:
+            stat = path.stat()
+            stats[kind] = [stat.st_size, stat.st_mtime_ns]
+        except FileNotFoundError:
+            stats[kind] = None
+    return stats
+
+
+def build(output, shard_mb):
+    data_loader = source_loader()
+    pdb_ids = find_corpus_pdb_ids(data_loader)
+    print(f"Packing inputs for {len(pdb_ids)} PDB IDs into {output}")
+
+    writer = CorpusWriter(output, shard_mb=shard_mb)
+    unsupported = 0
+    for i, pdb_id in enumerate(pdb_ids, 1):
+        paths = data_loader.input_files(pdb_id)
+        sources = source_stats(paths)
+        blobs = {}
+        for kind, path in zip(INPUT_KINDS, paths):
+            if sources[kind] is None:
+                blobs[kind] = None
+                continue
+            blob = data_loader.encode_input(kind, path)
+            if blob is None:
+                # Not representable; left out so DataLoader reads the file
+                print(f"  {pdb_id}: {kind} kept as a file (cannot be packed losslessly)")
+                unsupported += 1
+                continue
+            blobs[kind] = blob
+        writer.add_structure(pdb_id, blobs, input_fingerprint=hash_files(paths), sources=sources)
+        if i % 500 == 0:
+            print(f"  [{i}/{len(pdb_ids)}]")
+
+    index_path = writer.close()
+    total = sum((Path(output) / name).stat().st_size for name in writer.shards)
+    print(f"\n{'='*60}")
+    print(f"Structures:  {len(pdb_ids)}")
+    print(f"Shards:      {len(writer.shards)} ({total / 1e6:.1f} MB)")
+    print(f"Unpacked:    {unsupported} inputs left as files")
+    print(f"Index:       {index_path}")
+    print(f"{'='*60}")
+
+
+def same_data(a, b):
+    if isinstance(a, pd.DataFrame):
+        return isinstance(b, pd.DataFrame) and a.equals(b)
+    return a == b
+
+
+def verify(output, check_sources=True, deep=False):
+    """Check store integrity, then (optionally) that it still matches the data files."""
+    store = CorpusStore.open(output)
+    if store is None:
+        print(f"✗ No corpus store at {output}")
+        return 1
+    print(f"Verifying {len(store)} structures in {output} (build {store.build_id})...")
+    problems = store.verify()
+
+    if check_sources or deep:
+        data_loader = source_loader()
+        for pdb_id in store.pdb_ids():
+            paths = data_loader.input_files(pdb_id)
+            if check_sources:
+                recorded = store.sources(pdb_id)
+                current = source_stats(paths)
+                changed = [kind for kind in INPUT_KINDS if recorded.get(kind) != current[kind]]
+                if changed:
+                    problems.append(f"{pdb_id}: source changed since packing ({', '.join(changed)})")
+            if deep:
+                for kind, path in zip(INPUT_KINDS, paths):
+                    entry = store.lookup(pdb_id, kind)
+                    if entry is None or not path.exists():
+                        continue
+                    blob = data_loader.encode_input(kind, path)
+                    if blob is None or not same_data(store.read(entry), columnar_store.decode(blob)):
+                        problems.append(f"{pdb_id} {kind}: packed data differs from {path}")
+
+    for problem in problems:
+        print(f"  ✗ {problem}")
+    if problems:
+        print(f"\n✗ {len(problems)} problems found; rebuild with `python pack_corpus.py build`")
+        return 1
+    print("✓ Corpus store OK")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or verify the packed corpus store")
+    parser.add_argument('command', choices=['build', 'verify'])
+    parser.add_argument('--output', default=getattr(Config, 'CORPUS_DIR', None) or 'data/corpus',
+                        help='Store directory (default: Config.CORPUS_DIR or data/corpus)')
+    parser.add_argument('--shard-mb', type=float, default=2048, help='Maximum shard size in MB (build)')
+    parser.add_argument('--skip-sources', action='store_true',
+                        help='Verify store integrity only, not that source files are unchanged')
+    parser.add_argument('--deep', action='store_true',
+                        help='Also re-parse every source file and compare it with the packed data')
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        build(args.output, args.shard_mb)
+    else:
+        sys.exit(verify(args.output, check_sources=not args.skip_sources, deep=args.deep))
+
+
+if __name__ == '__main__':
+    main()
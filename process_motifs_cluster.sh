@@ -29,62 +29,21 @@ if [ $TOTAL_MOTIFS -eq 0 ]; then
     exit 1
 fi
 
-# Calculate motifs per task
-MOTIFS_PER_TASK=$(( (TOTAL_MOTIFS + 999) / 1000 ))
-
-# Calculate which motifs this task should process
-START_INDEX=$((SLURM_ARRAY_TASK_ID * MOTIFS_PER_TASK))
-END_INDEX=$((START_INDEX + MOTIFS_PER_TASK - 1))
-
-# Ensure we don't go beyond the last motif
-if [ $END_INDEX -ge $TOTAL_MOTIFS ]; then
-    END_INDEX=$((TOTAL_MOTIFS - 1))
+# One app.py launch per task: motifs are grouped by PDB, each task takes
+# every 1000th PDB group (--shard), and each structure is loaded once for
+# all of its motifs. Motifs already in reports/ and motif_csvs/ are skipped.
+echo "Processing PDB groups $SLURM_ARRAY_TASK_ID, $((SLURM_ARRAY_TASK_ID + 1000)), ..."
+python3 app.py --motif-glob "$MOTIFS_DIR/*.cif" \
+    --shard "$SLURM_ARRAY_TASK_ID" 1000 \
+    --skip-existing \
+    --output-dir reports \
+    --csv-dir motif_csvs \
+    --events silent
+
+exit_code=$?
+if [ $exit_code -eq 0 ]; then
+    echo "Task $SLURM_ARRAY_TASK_ID completed"
+else
+    echo "Task $SLURM_ARRAY_TASK_ID completed with failed motifs (exit code: $exit_code)"
 fi
-
-# Skip if no motifs to process
-if [ $START_INDEX -ge $TOTAL_MOTIFS ]; then
-    echo "No motifs to process for task $SLURM_ARRAY_TASK_ID"
-    exit 0
-fi
-
-SUCCESS=0
-FAILED=0
-
-echo "Processing motifs $START_INDEX to $END_INDEX ($((END_INDEX - START_INDEX + 1)) motifs)"
-
-# Process all motifs assigned to this task
-for ((i=START_INDEX; i<=END_INDEX; i++)); do
-    MOTIF_FILE="${MOTIF_FILES[$i]}"
-    MOTIF_NAME=$(basename "$MOTIF_FILE" .cif)
-    
-    echo "Processing: $MOTIF_NAME (motif $((i + 1))/$TOTAL_MOTIFS)"
-    
-    # Check if already processed
-    REPORT_FILE="reports/${MOTIF_NAME}.json"
-    CSV_FILE="motif_csvs/${MOTIF_NAME}.csv"
-    
-    if [ -f "$REPORT_FILE" ] && [ -f "$CSV_FILE" ]; then
-        echo "  → Already processed, skipping"
-        ((SUCCESS++))
-        continue
-    fi
-    
-    # Process motif (each writes to its own files - no race conditions)
-    python3 app.py --motif-name "$MOTIF_NAME" \
-        --output-dir reports \
-        --csv-dir motif_csvs
-    
-    exit_code=$?
-    if [ $exit_code -eq 0 ]; then
-        echo "  ✓ Successfully processed $MOTIF_NAME"
-        ((SUCCESS++))
-    else
-        echo "  ✗ Failed to process $MOTIF_NAME (exit code: $exit_code)"
-        ((FAILED++))
-    fi
-    echo "----------------------------------------"
-done
-
-echo "Task $SLURM_ARRAY_TASK_ID completed: $SUCCESS success, $FAILED failed"
 exit 0
-
@@ -113,7 +113,7 @@ for ((i=START_INDEX; i<=END_INDEX; i++)); do
     }' | sort -u | tr '\n' ',' | sed 's/,$//')
     
     # Run scoring
-    python app.py --pdb_id "$PDB_ID" --motif "$START_RES" "$END_RES" \
+    python app.py --pdb_id "$PDB_ID" --motif "$START_RES" "$END_RES" --events silent \
         --chain "$CHAIN" --motif-residues "$MOTIF_RESIDUES" 2>&1 | tail -3
     
     EXIT_CODE=$?
@@ -76,7 +76,7 @@ for PDB_ID in $PDB_IDS; do
     echo "=========================================="
     
     # Run scoring
-    if python3 app.py --pdb_id "$PDB_ID" > /dev/null 2>&1; then
+    if python3 app.py --pdb_id "$PDB_ID" --events silent > /dev/null 2>&1; then
         echo -e "${GREEN}✓ Successfully processed $PDB_ID${NC}"
         SUCCESSFUL=$((SUCCESSFUL + 1))
     else
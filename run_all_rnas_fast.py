@@ -23,6 +23,7 @@ sys.path.insert(0, str(Path(__file__).parent))
 from config import Config
 from utils.data_loader import DataLoader
 from scorer2 import Scorer
+from utils.instrumentation import SilentSink
 from utils.report_generator import ReportGenerator
 
 
@@ -88,13 +89,19 @@ def get_nucleotide_count(pdb_id: str, cache: dict, data_loader) -> int:
         return 0
 
 
-def get_validation_metrics(pdb_id: str, cache: dict) -> Optional[dict]:
-    """Get validation metrics from cache, or download if not cached."""
+def get_validation_metrics(pdb_id: str, cache: dict, data_loader) -> Optional[dict]:
+    """Get validation metrics from cache, else from a local mmCIF file, else download them."""
     val_metrics = cache.get('validation_metrics', {})
     if pdb_id in val_metrics and val_metrics[pdb_id] is not None:
         return val_metrics[pdb_id]
     
-    # Not in cache - download it
+    # Not in cache - read the local mmCIF header (no network) when there is one
+    metrics = data_loader.get_local_metadata(pdb_id)
+    if metrics is not None:
+        cache.setdefault('validation_metrics', {})[pdb_id] = metrics
+        return metrics
+    
+    # No local file - download it
     print(f"    (Downloading validation metrics for {pdb_id}...)")
     try:
         metrics = data_loader.get_validation_metrics(pdb_id)
@@ -130,7 +137,7 @@ def process_single_rna_fast(pdb_id: str, config, data_loader, scorer, report_gen
         num_nucleotides = get_nucleotide_count(pdb_id, cache, data_loader)
 
         # Get validation metrics from cache (or download if not cached)
-        validation_metrics = get_validation_metrics(pdb_id, cache)
+        validation_metrics = get_validation_metrics(pdb_id, cache, data_loader)
 
         # Score the structure
         result = scorer.score_structure(basepair_data, hbond_data, torsion_data=torsion_data)
@@ -182,13 +189,22 @@ def main():
     
     # Initialize components
     config = Config()
-    data_loader = DataLoader(config)
-    scorer = Scorer(config)
+    # Per-structure progress lines are printed here; loader/scorer chatter is
+    # dropped, but their stage timings are still collected for the summary
+    events = SilentSink()
+    data_loader = DataLoader(config, events=events)
+    scorer = Scorer(config, events=events)
     report_gen = ReportGenerator(config)
     
-    # Get all PDB IDs
-    print(f"\nScanning {BASEPAIRS_DIR} for RNA structures...")
-    all_pdb_ids = get_all_pdb_ids(BASEPAIRS_DIR)
+    # Get all PDB IDs (from the packed store's index when one is configured,
+    # which avoids listing the data directory)
+    if data_loader.corpus is not None:
+        print(f"\nUsing packed corpus store {data_loader.corpus.root}")
+        all_pdb_ids = [pdb_id for pdb_id in data_loader.corpus.pdb_ids()
+                       if not data_loader.corpus.missing(pdb_id, 'basepairs')]
+    else:
+        print(f"\nScanning {BASEPAIRS_DIR} for RNA structures...")
+        all_pdb_ids = get_all_pdb_ids(BASEPAIRS_DIR)
     
     if not all_pdb_ids:
         print("No PDB IDs found!")
@@ -293,7 +309,11 @@ def main():
         if len(failed_pdb_ids) > 20:
             print(f"  ... and {len(failed_pdb_ids) - 20} more")
 
+    
+    if events.timings:
+        print("\nStage timings:")
+        print(events.timing_summary())
+
 
 if __name__ == '__main__':
     main()
-
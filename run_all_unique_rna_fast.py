@@ -25,6 +25,7 @@ sys.path.insert(0, str(Path(__file__).parent))
 from config import Config
 from utils.data_loader import DataLoader
 from scorer2 import Scorer
+from utils.instrumentation import SilentSink
 from utils.report_generator import ReportGenerator
 
 
@@ -97,12 +98,18 @@ def get_nucleotide_count(pdb_id: str, cache: dict, data_loader) -> int:
 
 
 def get_validation_metrics(pdb_id: str, cache: dict, data_loader) -> Optional[dict]:
-    """Get validation metrics from cache, or download if not cached."""
+    """Get validation metrics from cache, else from a local mmCIF file, else download them."""
     val_metrics = cache.get('validation_metrics', {})
     if pdb_id in val_metrics and val_metrics[pdb_id] is not None:
         return val_metrics[pdb_id]
     
-    # Not in cache - download it
+    # Not in cache - read the local mmCIF header (no network) when there is one
+    metrics = data_loader.get_local_metadata(pdb_id)
+    if metrics is not None:
+        cache.setdefault('validation_metrics', {})[pdb_id] = metrics
+        return metrics
+    
+    # No local file - download it
     print(f"    (Downloading validation metrics for {pdb_id}...)")
     try:
         metrics = data_loader.get_validation_metrics(pdb_id)
@@ -191,8 +198,11 @@ def main():
     
     # Initialize components
     config = Config()
-    data_loader = DataLoader(config)
-    scorer = Scorer(config)
+    # Per-structure progress lines are printed here; loader/scorer chatter is
+    # dropped, but their stage timings are still collected for the summary
+    events = SilentSink()
+    data_loader = DataLoader(config, events=events)
+    scorer = Scorer(config, events=events)
     report_gen = ReportGenerator(config)
     
     # Get unique PDB IDs from uniqueRNAs.csv
@@ -323,7 +333,11 @@ def main():
             print(f"  ... and {len(failed_pdb_ids) - 20} more")
     
     print(f"\nResults saved to: {SCORES_CSV}")
+    
+    if events.timings:
+        print("\nStage timings:")
+        print(events.timing_summary())
 
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
@@ -65,7 +65,7 @@ for ((i=START_INDEX; i<=END_INDEX; i++)); do
     
     echo "Processing: $PDB_ID (file $((i + 1))/$TOTAL_FILES)"
     
-    python app.py --pdb_id "$PDB_ID" --csv "scores_summary.csv"
+    python app.py --pdb_id "$PDB_ID" --csv "scores_summary.csv" --events silent
     
     exit_code=$?
     if [ $exit_code -eq 0 ]; then
@@ -139,7 +139,7 @@ while IFS= read -r line; do
     MOTIF_REPORT="motif_report_${MOTIF_NAME//[^a-zA-Z0-9]/_}.json"
     
     # Run motif scoring with exact residue list from CIF file
-    python app.py --pdb_id "$PDB_ID" --motif "$START_RES" "$END_RES" --chain "$CHAIN" --motif-residues "$MOTIF_RESIDUES" 2>&1 | tail -5
+    python app.py --pdb_id "$PDB_ID" --motif "$START_RES" "$END_RES" --chain "$CHAIN" --motif-residues "$MOTIF_RESIDUES" --events silent 2>&1 | tail -5
     
     exit_code=$?
     
@@ -1,13 +1,52 @@
 """Baseline RNA structure quality scorer - Base pairs only, no hotspots."""
 
+import copy
 import json
 import math
 import pandas as pd
 import numpy as np
 from pathlib import Path
-from typing import Dict, List, Tuple
+from types import SimpleNamespace
+from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 
+from utils.atom_classifier import is_base_atom, base_base_mask
+from utils.residue_index import ResidueIndex
+from utils.residue_key import residues_adjacent
+from utils.instrumentation import ConsoleSink, EventSink
+from utils.result_cache import config_snapshot, scoring_fingerprint
+from utils.threshold_table import GEOMETRY_FIELDS, HBOND_FIELDS, ThresholdTable, compile_thresholds
+
+
+# Columnar engine: range checks, and the order penalties are accumulated in
+# (same order as _score_base_pair)
+_GEOMETRY_RANGE_CHECKS = (
+    ('misaligned', ('shear', 'stretch')),
+    ('non_coplanar', ('buckle', 'stagger')),
+    ('rotational_distortion', ('propeller', 'opening')),
+)
+_GEOMETRY_PENALTIES = (
+    ('misaligned', 'misaligned_pairs'),
+    ('non_coplanar', 'non_coplanar_pairs'),
+    ('rotational_distortion', 'rotational_distortion_pairs'),
+    ('backbone_outlier', 'backbone_suiteness'),
+    ('chi_outlier', 'chi_conformation'),
+    ('zero_hbond', 'zero_hbond_pairs'),
+)
+_HBOND_PENALTIES = (
+    ('poor_hbond_score', 'poor_hbond_score'),
+    ('incorrect_count', 'incorrect_hbond_count'),
+    ('bad_distance', 'bad_hbond_distance'),
+    ('bad_angles', 'bad_hbond_angles'),
+    ('bad_dihedral', 'bad_hbond_dihedrals'),
+)
+
+
+def _outside_range(values: np.ndarray, lo: np.ndarray, hi: np.ndarray) -> np.ndarray:
+    """True where both bounds are defined (not NaN) and the value falls outside them."""
+    defined = ~np.isnan(lo) & ~np.isnan(hi)
+    return defined & ((values < lo) | (values > hi))
+
 
 @dataclass
 class BaselineResult:
@@ -31,6 +70,73 @@ class BaselineResult:
     avg_suiteness: float = None  # Average suiteness across all scored residues
 
 
+class StructureScores:
+    """
+    Per-base-pair scores of one structure, scored once and shared by its motifs.
+
+    Rows are the per-pair dicts from _score_base_pair in scoring order. Motif
+    results are aggregations over a subset of rows (see Scorer.score_motif),
+    so a structure with many motifs is scored only once.
+    """
+
+    def __init__(self, basepair_scores: List[Dict], basepairs: list = None):
+        """
+        Args:
+            basepair_scores: Per-pair score dicts (each with a 'bp_info' entry)
+            basepairs: Optional base pair dicts the rows were scored from (parallel
+                to basepair_scores), so score_for can match the exact input dict
+        """
+        self.basepair_scores = basepair_scores
+        self._rows_by_residue: Dict[str, List[int]] = {}
+        self._rows_by_key: Dict[Tuple, List[int]] = {}
+        self._row_by_id: Dict[int, int] = {}
+        self._basepairs = basepairs  # keeps the dicts alive while their ids are indexed
+        if basepairs is not None:
+            self._row_by_id = {id(bp): row for row, bp in enumerate(basepairs)}
+
+        for row, bp_score in enumerate(basepair_scores):
+            info = bp_score['bp_info']
+            self._rows_by_residue.setdefault(info['res_1'], []).append(row)
+            if info['res_2'] != info['res_1']:
+                self._rows_by_residue.setdefault(info['res_2'], []).append(row)
+            key = (info['res_1'], info['res_2'], info['bp_type'], info['edge_type'])
+            self._rows_by_key.setdefault(key, []).append(row)
+
+    def __len__(self) -> int:
+        return len(self.basepair_scores)
+
+    @staticmethod
+    def _basepair_key(bp: Dict) -> Tuple:
+        """Identify a raw base pair dict by residues, type and edge (as recorded in bp_info)."""
+        return bp.get('res_1', ''), bp.get('res_2', ''), bp.get('bp_type', ''), bp.get('lw', '') or '_OTHER'
+
+    def rows_for_residues(self, residues) -> List[int]:
+        """Rows whose two residues are both in `residues`, in table order."""
+        residues = residues if isinstance(residues, (set, frozenset)) else set(residues)
+        rows = set()
+        for res_id in residues:
+            for row in self._rows_by_residue.get(res_id, ()):
+                info = self.basepair_scores[row]['bp_info']
+                if info['res_1'] in residues and info['res_2'] in residues:
+                    rows.add(row)
+        return sorted(rows)
+
+    def rows_for_basepairs(self, basepairs: list) -> List[int]:
+        """Rows matching the given base pair dicts, in table order (unscored pairs are skipped)."""
+        rows = set()
+        for bp in basepairs:
+            rows.update(self._rows_by_key.get(self._basepair_key(bp), ()))
+        return sorted(rows)
+
+    def score_for(self, bp: Dict) -> Optional[Dict]:
+        """Score dict for a base pair dict, or None if it was not scored (e.g. adjacent pair)."""
+        row = self._row_by_id.get(id(bp))
+        if row is not None:
+            return self.basepair_scores[row]
+        rows = self._rows_by_key.get(self._basepair_key(bp))
+        return self.basepair_scores[rows[0]] if rows else None
+
+
 class Scorer:
     """
     Score RNA structures based on base pair quality only.
@@ -41,17 +147,44 @@ class Scorer:
        - Its hydrogen bonds (distance, angles, quality)
     2. Overall score = average of all base pair scores
     3. No hotspot detection - pure base pair quality assessment
+    
+    The scoring settings (thresholds, penalty weights, baselines) are copied
+    from the config when it is assigned, and the (bp_type, edge) threshold
+    table and the result-cache fingerprint are built from that copy. Changing
+    attributes of the config object afterwards changes neither the scores nor
+    the fingerprint; reassign the config (scorer.config = config) to score
+    with the changed settings.
     """
     
-    def __init__(self, config):
+    def __init__(self, config, columnar: bool = False, events: EventSink = None):
         """
         Args:
             config: Configuration with thresholds and weights
+            columnar: Score all base pairs with the vectorized columnar engine
+                (_score_base_pairs_columnar) instead of one pair at a time
+            events: Sink for progress events and stage timings (default: console output)
         """
-        self.config = config
+        self.columnar = columnar
+        self.events = events if events is not None else ConsoleSink()
         self._load_richardson_suites()
         self._load_chi_expectations()
         self._build_predecessor_map_cache = {}
+        self.config = config
+
+    @property
+    def config(self):
+        """Configuration with thresholds and weights."""
+        return self._config
+
+    @config.setter
+    def config(self, config):
+        self._config = config
+        # Scores, the threshold table and the fingerprint all read this copy,
+        # so in-place edits to config cannot make cached results look current
+        self._settings = SimpleNamespace(**copy.deepcopy(config_snapshot(config)))
+        # Resolve every (bp_type, edge) threshold fallback once for this config
+        self._threshold_table = compile_thresholds(self._settings, self.chi_expectations)
+        self._fingerprint = None
 
     def _load_richardson_suites(self):
         """Load Richardson suite conformer definitions for backbone scoring."""
@@ -63,6 +196,10 @@ class Scorer:
         with open(suite_path, 'r') as f:
             self.richardson_suites = json.load(f)
 
+        self._index_richardson_suites()
+
+    def _index_richardson_suites(self):
+        """Pre-index conformers by bin for per-suite and batched classification."""
         # Pre-index conformers by bin for fast lookup
         self._conformers_by_bin = {}
         for conf in self.richardson_suites['conformers']:
@@ -73,6 +210,12 @@ class Scorer:
 
         self._normal_widths = np.array(self.richardson_suites['widths']['normal'], dtype=float)
 
+        # Stacked (K, 7) conformer centers per bin for _classify_suites
+        self._conformer_matrices = {
+            bin_key: np.array([conf['angles'] for conf in confs], dtype=float)
+            for bin_key, confs in self._conformers_by_bin.items()
+        }
+
     def _load_chi_expectations(self):
         """Load expected chi conformations per (edge_type, bp_type)."""
         chi_file = Path(__file__).parent / 'data' / 'chi_expectations.json'
@@ -82,6 +225,18 @@ class Scorer:
         else:
             self.chi_expectations = {}
 
+    def fingerprint(self) -> str:
+        """
+        Hash of the config thresholds, penalty weights and reference data this
+        scorer uses; scores of identical inputs match whenever it matches.
+        """
+        if self._fingerprint is None:
+            self._fingerprint = scoring_fingerprint(self._settings, {
+                'richardson_suites': self.richardson_suites,
+                'chi_expectations': self.chi_expectations,
+            })
+        return self._fingerprint
+
     @staticmethod
     def _classify_chi(chi: float) -> str:
         """Classify chi glycosidic torsion as anti, syn, or intermediate.
@@ -97,31 +252,36 @@ class Scorer:
 
     def _check_chi_conformation(self, res_1: str, res_2: str,
                                  edge_type: str, bp_type: str,
-                                 torsion_data: dict) -> Tuple[bool, float, dict]:
+                                 torsion_data: dict,
+                                 residue_features: Dict[str, dict] = None) -> Tuple[bool, float, dict]:
         """Check chi glycosidic bond angle for both residues.
 
+        Chi values and classes are read from residue_features when the residue
+        is in the table (see _build_residue_features).
+
         Returns:
             (has_issue: bool, penalty: float, details: dict)
         """
         if torsion_data is None or not self.chi_expectations:
             return False, 0.0, {}
 
-        # Lookup expected conformation with fallback chain
-        expected = (self.chi_expectations.get(edge_type, {}).get(bp_type) or
-                    self.chi_expectations.get(edge_type, {}).get('_OTHER') or
-                    self.chi_expectations.get('_OTHER', {}))
-        expected_conf = expected.get('expected', 'anti') if expected else 'anti'
+        # Expected conformation, fallback chain resolved in the compiled table
+        thresholds = self._get_threshold_table()
+        expected_conf = thresholds.chi_expected[thresholds.code(bp_type, edge_type)]
 
         bad_count = 0
         chi_details = {}
 
         for i, res_id in enumerate([res_1, res_2], 1):
-            torsions = torsion_data.get(res_id, {})
-            chi = torsions.get('chi')
+            if residue_features is not None and res_id in residue_features:
+                chi = residue_features[res_id]['chi']
+                conf = residue_features[res_id]['chi_conf']
+            else:
+                chi = torsion_data.get(res_id, {}).get('chi')
+                conf = self._classify_chi(chi) if chi is not None else None
             if chi is None:
                 continue
 
-            conf = self._classify_chi(chi)
             chi_details[f'res{i}_chi'] = round(chi, 1)
             chi_details[f'res{i}_chi_conf'] = conf
 
@@ -143,7 +303,7 @@ class Scorer:
             return False, 0.0, chi_details
 
         # Half penalty for 1 bad, full penalty for 2 bad
-        weight = self.config.PENALTY_WEIGHTS.get('chi_conformation', 10.0)
+        weight = self._settings.PENALTY_WEIGHTS.get('chi_conformation', 10.0)
         penalty = weight if bad_count >= 2 else weight * 0.5
         chi_details['chi_outlier'] = True
 
@@ -153,46 +313,29 @@ class Scorer:
     def _is_adjacent_pair(res_1: str, res_2: str) -> bool:
         """Return True if two residues are adjacent in sequence (same chain, resnum diff=1).
         These are stacking interactions, not real base pairs."""
-        if not res_1 or not res_2:
-            return False
-        parts1 = res_1.split('-')
-        parts2 = res_2.split('-')
-        if len(parts1) < 3 or len(parts2) < 3:
-            return False
-        try:
-            chain1, num1 = parts1[0], int(parts1[2])
-            chain2, num2 = parts2[0], int(parts2[2])
-        except (ValueError, IndexError):
-            return False
-        if chain1 != chain2:
-            return False
-        return abs(num1 - num2) == 1
-
-    def _find_predecessor(self, res_id: str, torsion_data: dict) -> str:
-        """Find the preceding residue in the chain (same chain, resnum - 1).
+        return residues_adjacent(res_1, res_2)
 
-        Returns the predecessor residue ID or None if not found.
+    def _get_residue_index(self, torsion_data: dict) -> ResidueIndex:
+        """Return the ResidueIndex for torsion_data, building it once per structure.
+
+        Only the most recent structure is kept, so direct _score_base_pair callers
+        reuse the index across pairs without the cache growing across structures.
         """
-        parts = res_id.split('-')
-        if len(parts) < 3:
-            return None
-        try:
-            chain = parts[0]
-            resnum = int(parts[2])
-        except (ValueError, IndexError):
-            return None
+        cached = self._build_predecessor_map_cache
+        if cached.get('torsion_data') is not torsion_data:
+            cached['torsion_data'] = torsion_data
+            cached['index'] = ResidueIndex(torsion_data)
+        return cached['index']
 
-        # Search for chain-X-(resnum-1)- in torsion_data
-        prev_num = resnum - 1
-        for key in torsion_data:
-            kparts = key.split('-')
-            if len(kparts) >= 3 and kparts[0] == chain:
-                try:
-                    if int(kparts[2]) == prev_num:
-                        return key
-                except ValueError:
-                    continue
-        return None
+    def _find_predecessor(self, res_id: str, torsion_data: dict,
+                          residue_index: ResidueIndex = None) -> str:
+        """Find the preceding residue in the chain (see ResidueIndex.predecessor).
+
+        Returns the predecessor residue ID or None if not found.
+        """
+        if residue_index is None:
+            residue_index = self._get_residue_index(torsion_data)
+        return residue_index.predecessor(res_id)
 
     @staticmethod
     def _angle_diff(a: float, b: float) -> float:
@@ -327,12 +470,249 @@ class Scorer:
         result['distance'] = round(d7, 3)
         return result
 
-    def _score_backbone_suiteness(self, res_1: str, res_2: str,
-                                   torsion_data: dict) -> Tuple[dict, float, list]:
+    def _l3_distances(self, suites: np.ndarray, centers: np.ndarray,
+                      indices: range) -> np.ndarray:
+        """Vectorized _l3_distance of every suite against every cluster center.
+
+        Args:
+            suites: (N, 7) suite angles
+            centers: (K, 7) cluster centers
+            indices: range of angle indices to use
+
+        Returns:
+            (N, K) array of L3 distances
+        """
+        total = np.zeros((suites.shape[0], centers.shape[0]))
+        # Accumulate per dimension in the same order as _l3_distance
+        for k in indices:
+            d = np.abs(suites[:, k, None] - centers[None, :, k])
+            d = np.minimum(d, 360.0 - d)
+            total += (d / self._normal_widths[k]) ** 3
+        return total ** (1.0 / 3.0)
+
+    def _classify_suites(self, suites: np.ndarray) -> List[dict]:
+        """Score many suites at once against Richardson conformers.
+
+        Batched equivalent of _score_single_suite: triage, pucker/gamma sieve,
+        4D screening and 7D suiteness run as array operations, one bin at a time
+        against the stacked conformer centers.
+
+        Args:
+            suites: (N, 7) array of [deltaMinus, epsilon, zeta, alpha, beta, gamma, delta]
+                in 0-360 range
+
+        Returns:
+            List of N dicts (same fields as _score_single_suite), or None if
+            Richardson suite definitions are not loaded
+        """
+        if self.richardson_suites is None:
+            return None
+
+        suites = np.asarray(suites, dtype=float).reshape(-1, 7)
+        n = suites.shape[0]
+        results = [{
+            'conformer': '!!', 'suiteness': 0.0, 'bin': None,
+            'is_outlier': True, 'distance': None, 'issue': None
+        } for _ in range(n)]
+        if n == 0:
+            return results
+
+        triage = self.richardson_suites['triage']
+        sieve = self.richardson_suites['sieve']
+        pending = np.ones(n, dtype=bool)
+
+        # Triage checks (first failing angle wins, same order as _score_single_suite)
+        for name, col in (('epsilon', 1), ('alpha', 3), ('beta', 4), ('zeta', 2)):
+            lo, hi = triage[name]
+            values = suites[:, col]
+            failed = pending & ~((lo <= values) & (values <= hi))
+            for i in np.flatnonzero(failed):
+                results[i]['issue'] = f'{name}={values[i]:.1f} outside [{lo}, {hi}]'
+            pending &= ~failed
+
+        # Sieve: classify sugar puckers and gamma
+        def classify_pucker(delta):
+            c3 = sieve['delta']['C3_endo']
+            c2 = sieve['delta']['C2_endo']
+            return np.select([(c3[0] <= delta) & (delta <= c3[1]),
+                              (c2[0] <= delta) & (delta <= c2[1])], [3, 2], 0)
+
+        puckerdm = classify_pucker(suites[:, 0])
+        puckerd = classify_pucker(suites[:, 6])
+        gamma_names = list(sieve['gamma'].keys())
+        gamma_class = np.select(
+            [(rng[0] <= suites[:, 5]) & (suites[:, 5] <= rng[1]) for rng in sieve['gamma'].values()],
+            gamma_names, '')
+
+        failed = pending & ((puckerdm == 0) | (puckerd == 0) | (gamma_class == ''))
+        for i in np.flatnonzero(failed):
+            results[i]['issue'] = (f'sieve fail: puckerdm={puckerdm[i]}, puckerd={puckerd[i]}, '
+                                   f'gamma={gamma_class[i]}')
+        pending &= ~failed
+
+        bin_keys = np.char.add(np.char.add(puckerdm.astype(str), puckerd.astype(str)), gamma_class)
+
+        for bin_key in np.unique(bin_keys[pending]):
+            rows = np.flatnonzero(pending & (bin_keys == bin_key))
+            bin_key = str(bin_key)
+            for i in rows:
+                results[i]['bin'] = bin_key
+
+            centers = self._conformer_matrices.get(bin_key)
+            if centers is None:
+                for i in rows:
+                    results[i]['issue'] = f'no conformers in bin {bin_key}'
+                continue
+
+            # 4D screening (epsilon, zeta, alpha, beta = indices 1-4)
+            d4 = self._l3_distances(suites[rows], centers, range(1, 5))
+            best = np.argmin(d4, axis=1)
+            best_d4 = d4[np.arange(len(rows)), best]
+
+            # 7D distance for suiteness, against the best 4D conformer only
+            d7 = self._l3_distances(suites[rows], centers, range(7))[np.arange(len(rows)), best]
+
+            conformers = self._conformers_by_bin[bin_key]
+            for j, i in enumerate(rows):
+                if best_d4[j] >= 1.0:
+                    # No 4D match — outlier
+                    results[i]['issue'] = f'no 4D match (best={best_d4[j]:.2f})'
+                    continue
+
+                conf = conformers[best[j]]
+                if d7[j] > 1.0:
+                    # 4D matched but 7D didn't — outlier
+                    results[i]['issue'] = f'7D reject {conf["name"]} (d7={d7[j]:.2f})'
+                    continue
+
+                # Suiteness: raised cosine
+                suiteness = (math.cos(math.pi * d7[j]) + 1.0) / 2.0
+                if suiteness < 0.01:
+                    suiteness = 0.01
+
+                results[i]['conformer'] = conf['name']
+                results[i]['suiteness'] = round(suiteness, 3)
+                results[i]['is_outlier'] = False
+                results[i]['distance'] = round(d7[j], 3)
+
+        return results
+
+    def _suite_angles(self, res_id: str, torsion_data: dict,
+                      residue_index: ResidueIndex) -> np.ndarray:
+        """Build the 7-angle suite ending at res_id.
+
+        Returns:
+            [deltaMinus, epsilon, zeta, alpha, beta, gamma, delta] in 0-360 range,
+            or None if the residue, its predecessor or any angle is missing
+        """
+        torsions = torsion_data.get(res_id, {})
+        if not torsions:
+            return None
+
+        # Current residue needs: alpha, beta, gamma, delta
+        alpha = torsions.get('alpha')
+        beta = torsions.get('beta')
+        gamma = torsions.get('gamma')
+        delta = torsions.get('delta')
+
+        if any(v is None for v in [alpha, beta, gamma, delta]):
+            return None
+
+        # Find predecessor to get deltaMinus, epsilon_prev, zeta_prev
+        pred_id = residue_index.predecessor(res_id)
+        if pred_id is None:
+            return None
+
+        pred_torsions = torsion_data.get(pred_id, {})
+        delta_prev = pred_torsions.get('delta')
+        epsilon_prev = pred_torsions.get('epsilon')
+        zeta_prev = pred_torsions.get('zeta')
+
+        if any(v is None for v in [delta_prev, epsilon_prev, zeta_prev]):
+            return None
+
+        # Build 7-angle suite, converting from [-180,180] to [0,360]
+        return np.array([
+            delta_prev % 360,
+            epsilon_prev % 360,
+            zeta_prev % 360,
+            alpha % 360,
+            beta % 360,
+            gamma % 360,
+            delta % 360,
+        ])
+
+    def _build_residue_features(self, basepair_data: list, torsion_data: dict,
+                                residue_index: ResidueIndex = None) -> Dict[str, dict]:
+        """Compute per-residue backbone and chi features once per structure.
+
+        A residue in several base pairs is classified once here instead of once
+        per pair. Suites of all paired residues go through _classify_suites in a
+        single batch.
+
+        Args:
+            basepair_data: List of base pair dictionaries
+            torsion_data: Dict of per-residue torsion angles
+            residue_index: Optional ResidueIndex of torsion_data
+
+        Returns:
+            Dict keyed by residue ID with:
+                - suite_angles: 7-angle suite (or None)
+                - suite: _score_single_suite-style result (or None)
+                - pucker: sugar pucker class of the residue (3, 2, 0 or None)
+                - chi: chi torsion (or None)
+                - chi_conf: 'anti'/'syn' (or None)
+        """
+        features = {}
+        if torsion_data is None:
+            return features
+
+        if residue_index is None:
+            residue_index = self._get_residue_index(torsion_data)
+
+        for bp in basepair_data:
+            for res_id in (bp.get('res_1', ''), bp.get('res_2', '')):
+                if res_id in features:
+                    continue
+                torsions = torsion_data.get(res_id, {})
+                chi = torsions.get('chi')
+                delta = torsions.get('delta')
+                features[res_id] = {
+                    'suite_angles': None,
+                    'suite': None,
+                    'pucker': (self._classify_pucker(delta % 360)
+                               if delta is not None and self.richardson_suites is not None else None),
+                    'chi': chi,
+                    'chi_conf': self._classify_chi(chi) if chi is not None else None,
+                }
+
+        if self.richardson_suites is None:
+            return features
+
+        suite_ids = []
+        suite_rows = []
+        for res_id, feat in features.items():
+            suite_angles = self._suite_angles(res_id, torsion_data, residue_index)
+            if suite_angles is not None:
+                feat['suite_angles'] = suite_angles
+                suite_ids.append(res_id)
+                suite_rows.append(suite_angles)
+
+        if suite_rows:
+            for res_id, suite_result in zip(suite_ids, self._classify_suites(np.vstack(suite_rows))):
+                features[res_id]['suite'] = suite_result
+
+        return features
+
+    def _score_backbone_suiteness(self, res_1: str, res_2: str, torsion_data: dict,
+                                   residue_index: ResidueIndex = None,
+                                   residue_features: Dict[str, dict] = None) -> Tuple[dict, float, list]:
         """Score backbone suiteness for both residues in a base pair.
 
         Uses Richardson suite classification (7 backbone torsion angles spanning
-        two adjacent residues) to assess backbone quality.
+        two adjacent residues) to assess backbone quality. Predecessors come from
+        residue_index (built from torsion_data when not supplied); suites already
+        classified in residue_features are reused.
 
         Returns:
             (geometry_issues dict, total penalty, backbone_details list of dicts)
@@ -344,47 +724,17 @@ class Scorer:
         if torsion_data is None or self.richardson_suites is None:
             return geometry_issues, penalty, backbone_details
 
+        if residue_index is None:
+            residue_index = self._get_residue_index(torsion_data)
+
         suiteness_scores = []
 
         for res_id in [res_1, res_2]:
-            torsions = torsion_data.get(res_id, {})
-            if not torsions:
-                continue
-
-            # Current residue needs: alpha, beta, gamma, delta
-            alpha = torsions.get('alpha')
-            beta = torsions.get('beta')
-            gamma = torsions.get('gamma')
-            delta = torsions.get('delta')
-
-            if any(v is None for v in [alpha, beta, gamma, delta]):
-                continue
-
-            # Find predecessor to get deltaMinus, epsilon_prev, zeta_prev
-            pred_id = self._find_predecessor(res_id, torsion_data)
-            if pred_id is None:
-                continue
-
-            pred_torsions = torsion_data.get(pred_id, {})
-            delta_prev = pred_torsions.get('delta')
-            epsilon_prev = pred_torsions.get('epsilon')
-            zeta_prev = pred_torsions.get('zeta')
-
-            if any(v is None for v in [delta_prev, epsilon_prev, zeta_prev]):
-                continue
-
-            # Build 7-angle suite, converting from [-180,180] to [0,360]
-            suite_angles = np.array([
-                delta_prev % 360,
-                epsilon_prev % 360,
-                zeta_prev % 360,
-                alpha % 360,
-                beta % 360,
-                gamma % 360,
-                delta % 360,
-            ])
-
-            suite_result = self._score_single_suite(suite_angles)
+            if residue_features is not None and res_id in residue_features:
+                suite_result = residue_features[res_id]['suite']
+            else:
+                suite_angles = self._suite_angles(res_id, torsion_data, residue_index)
+                suite_result = self._score_single_suite(suite_angles) if suite_angles is not None else None
             if suite_result is None:
                 continue
 
@@ -406,7 +756,7 @@ class Scorer:
         # Calculate penalty from average suiteness
         if suiteness_scores:
             avg_suiteness = sum(suiteness_scores) / len(suiteness_scores)
-            penalty = (1.0 - avg_suiteness) * self.config.PENALTY_WEIGHTS['backbone_suiteness']
+            penalty = (1.0 - avg_suiteness) * self._settings.PENALTY_WEIGHTS['backbone_suiteness']
 
             # Flag if any residue is an outlier
             if any(d['is_outlier'] for d in backbone_details):
@@ -427,12 +777,45 @@ class Scorer:
         Returns:
             Result with overall quality score and breakdown
         """
-        print("\n" + "="*60)
-        print("RNA STRUCTURE QUALITY ASSESSMENT")
-        print("="*60)
-        
+        with self.events.stage('score_structure', "\n" + "="*60 +
+                               "\nRNA STRUCTURE QUALITY ASSESSMENT\n" + "="*60):
+            structure_scores = self.score_basepairs(basepair_data, hbond_data, torsion_data)
+            if not structure_scores:
+                return self._empty_result()
+
+            self.events.emit('basepairs_scored', f"\nAnalyzing {len(structure_scores)} base pairs...",
+                             count=len(structure_scores))
+
+            with self.events.stage('aggregate', count=len(structure_scores)):
+                result = self.aggregate_scores(structure_scores.basepair_scores)
+
+            self.events.emit('average_score', f"\n{'='*60}\n"
+                             f"Average base pair score: {result.avg_basepair_score:.1f}/100",
+                             score=result.avg_basepair_score)
+
+            self._print_results(result)
+
+        return result
+
+    def score_basepairs(self, basepair_data: list, hbond_data: pd.DataFrame,
+                        torsion_data: dict = None) -> 'StructureScores':
+        """
+        Score every base pair of a structure once, without aggregating.
+
+        Base-pair scores do not depend on which motif a pair is reported in, so
+        the returned table can be aggregated over any number of residue sets
+        with score_motif.
+
+        Args:
+            basepair_data: List of base pair dictionaries
+            hbond_data: DataFrame of hydrogen bonds
+            torsion_data: Optional dict of per-residue torsion angles (keyed by residue ID)
+
+        Returns:
+            StructureScores with one row per non-adjacent base pair, in input order
+        """
         if not basepair_data:
-            return self._empty_result()
+            return StructureScores([])
 
         # Filter out adjacent base pairs (same chain, residue numbers differ by 1)
         # These are stacking interactions, not real base pairs
@@ -440,12 +823,62 @@ class Scorer:
             bp.get('res_1', ''), bp.get('res_2', ''))]
 
         if not basepair_data:
+            return StructureScores([])
+
+        with self.events.stage('residue_features'):
+            # Index residues and their chain predecessors once for backbone scoring
+            residue_index = self._get_residue_index(torsion_data) if torsion_data is not None else None
+            # Suite, pucker and chi per paired residue, computed once rather than once per pair
+            residue_features = self._build_residue_features(basepair_data, torsion_data, residue_index)
+
+        with self.events.stage('score_basepairs', count=len(basepair_data),
+                               engine='columnar' if self.columnar else 'row'):
+            if self.columnar:
+                basepair_scores = self._score_base_pairs_columnar(
+                    basepair_data, hbond_data, torsion_data, residue_index, residue_features)
+            else:
+                # Index base-base H-bonds by residue pair once, so each lookup below is O(1)
+                hbond_index = self._build_hbond_index(hbond_data)
+                basepair_scores = [
+                    self._score_base_pair(bp, hbond_data, torsion_data, hbond_index=hbond_index,
+                                          residue_index=residue_index, residue_features=residue_features)
+                    for bp in basepair_data
+                ]
+
+        return StructureScores(basepair_scores, basepair_data)
+
+    def score_motif(self, structure_scores: 'StructureScores', motif_residues=None,
+                    basepairs: list = None) -> BaselineResult:
+        """
+        Aggregate already-scored base pairs of a structure over one motif.
+
+        Args:
+            structure_scores: Table from score_basepairs for the motif's structure
+            motif_residues: Set of residue IDs; pairs with both residues in it are used
+            basepairs: Alternatively, the motif's base pair dicts (e.g. from filter_motif_data)
+
+        Returns:
+            Same result as score_structure on the motif's base pairs and H-bonds
+        """
+        if basepairs is not None:
+            rows = structure_scores.rows_for_basepairs(basepairs)
+        else:
+            rows = structure_scores.rows_for_residues(motif_residues or ())
+        return self.aggregate_scores([structure_scores.basepair_scores[i] for i in rows])
+
+    def aggregate_scores(self, basepair_scores: List[Dict]) -> BaselineResult:
+        """
+        Build a result (averages, issue counts and fractions, summary) from per-pair scores.
+
+        Args:
+            basepair_scores: Per-pair dicts from _score_base_pair
+
+        Returns:
+            Result with overall quality score and breakdown
+        """
+        if not basepair_scores:
             return self._empty_result()
 
-        print(f"\nAnalyzing {len(basepair_data)} base pairs...")
-        
-        # Score each base pair individually
-        basepair_scores = []
         geometry_stats = {
             'misaligned': 0, 'non_coplanar': 0, 'rotational_distortion': 0,
             'zero_hbond': 0, 'backbone_outlier': 0, 'chi_outlier': 0,
@@ -454,12 +887,9 @@ class Scorer:
             'poor_hbond_score': 0, 'bad_distance': 0, 'bad_angles': 0, 'bad_dihedral': 0,
             'incorrect_count': 0
         }
-        
-        all_suiteness = []
-        for bp in basepair_data:
-            bp_score = self._score_base_pair(bp, hbond_data, torsion_data)
-            basepair_scores.append(bp_score)
 
+        all_suiteness = []
+        for bp_score in basepair_scores:
             # Collect suiteness scores from backbone details
             for bd in bp_score.get('backbone', []):
                 if bd.get('suiteness') is not None:
@@ -473,35 +903,32 @@ class Scorer:
             for issue in hbond_stats:
                 if bp_score['hbond_issues'].get(issue, False):
                     hbond_stats[issue] += 1
-        
+
         # Calculate overall score
         total_pairs = len(basepair_scores)
         avg_score = sum(bp['score'] for bp in basepair_scores) / total_pairs if total_pairs > 0 else 0
-        
-        print(f"\n{'='*60}")
-        print(f"Average base pair score: {avg_score:.1f}/100")
-        
+
         # Calculate fractions
         geometry_fractions = {k: v/total_pairs for k, v in geometry_stats.items()}
         hbond_fractions = {k: v/total_pairs for k, v in hbond_stats.items()}
-        
+
         # Create summary
         summary = self._create_summary(
             avg_score, total_pairs,
             geometry_stats, geometry_fractions,
             hbond_stats, hbond_fractions
         )
-        
+
         # Collect detailed issues (only problematic base pairs)
         # Use BASELINE threshold (75) to match Detailed_Issues column in CSV
         detailed_issues = [
-            bp for bp in basepair_scores 
-            if bp['score'] < self.config.BASELINE
+            bp for bp in basepair_scores
+            if bp['score'] < self._settings.BASELINE
         ]
-        
+
         struct_avg_suiteness = round(sum(all_suiteness) / len(all_suiteness), 3) if all_suiteness else None
 
-        result = BaselineResult(
+        return BaselineResult(
             overall_score=round(avg_score, 1),
             total_base_pairs=total_pairs,
             avg_basepair_score=round(avg_score, 1),
@@ -514,13 +941,11 @@ class Scorer:
             detailed_issues=detailed_issues,
             avg_suiteness=struct_avg_suiteness,
         )
-        
-        self._print_results(result)
-        
-        return result
     
     def _score_base_pair(self, bp: Dict, hbond_data: pd.DataFrame,
-                         torsion_data: dict = None) -> Dict:
+                         torsion_data: dict = None, hbond_index: Dict = None,
+                         residue_index: ResidueIndex = None,
+                         residue_features: Dict[str, dict] = None) -> Dict:
         """
         Score a single base pair based on geometry, H-bonds, and backbone conformation.
         Uses edge-specific thresholds for geometry and H-bonds, global for dihedrals.
@@ -529,6 +954,10 @@ class Scorer:
             bp: Base pair dictionary with geometry info
             hbond_data: DataFrame of all hydrogen bonds
             torsion_data: Optional dict of per-residue torsion angles
+            hbond_index: Optional pair index from _build_hbond_index(hbond_data);
+                when given, H-bonds are looked up instead of filtered from hbond_data
+            residue_index: Optional ResidueIndex of torsion_data for backbone scoring
+            residue_features: Optional table from _build_residue_features
 
         Returns:
             Dictionary with:
@@ -547,21 +976,11 @@ class Scorer:
         edge_type = bp.get('lw', '') or '_OTHER'
         bp_type = bp.get('bp_type', '')
 
-        # Get base-pair + edge thresholds; fallback chain: (bp, edge) -> (bp, _OTHER) -> (_OTHERS, edge) -> (_OTHERS, _OTHER)
-        geo_by_bp = getattr(self.config, 'GEOMETRY_THRESHOLDS_BY_BASE_PAIR_BY_EDGE', {})
-        geo_thresh = (geo_by_bp.get(bp_type, {}).get(edge_type) or
-                      geo_by_bp.get(bp_type, {}).get('_OTHER') or
-                      geo_by_bp.get('_OTHERS', {}).get(edge_type) or
-                      geo_by_bp.get('_OTHERS', {}).get('_OTHER') or {})
-
-        hb_by_bp = getattr(self.config, 'HBOND_THRESHOLDS_BY_BASE_PAIR_BY_EDGE', {})
-        hbond_thresh = (hb_by_bp.get(bp_type, {}).get(edge_type) or
-                        hb_by_bp.get(bp_type, {}).get('_OTHER') or
-                        hb_by_bp.get('_OTHERS', {}).get(edge_type) or
-                        hb_by_bp.get('_OTHERS', {}).get('_OTHER') or {})
+        # Get base-pair + edge thresholds
+        geo_thresh, hbond_thresh = self._resolve_thresholds(bp_type, edge_type)
         
         # Get H-bonds for this base pair
-        bp_hbonds = self._get_basepair_hbonds(nt1_id, nt2_id, hbond_data)
+        bp_hbonds = self._get_basepair_hbonds(nt1_id, nt2_id, hbond_data, hbond_index)
         
         # Analyze geometry using edge-specific thresholds
         geometry_issues = {}
@@ -582,7 +1001,7 @@ class Scorer:
             misaligned = True
         if misaligned:
             geometry_issues['misaligned'] = True
-            geometry_penalty += self.config.PENALTY_WEIGHTS['misaligned_pairs']
+            geometry_penalty += self._settings.PENALTY_WEIGHTS['misaligned_pairs']
 
         # Check coplanarity (buckle and stagger) - use BUCKLE_MIN/MAX, STAGGER_MIN/MAX ranges
         buckle = bp.get('buckle', 0)
@@ -599,7 +1018,7 @@ class Scorer:
             non_coplanar = True
         if non_coplanar:
             geometry_issues['non_coplanar'] = True
-            geometry_penalty += self.config.PENALTY_WEIGHTS['non_coplanar_pairs']
+            geometry_penalty += self._settings.PENALTY_WEIGHTS['non_coplanar_pairs']
 
         # Check rotational distortion (propeller and opening)
         propeller = bp.get('propeller', 0)
@@ -618,18 +1037,18 @@ class Scorer:
             rot_distorted = True
         if rot_distorted:
             geometry_issues['rotational_distortion'] = True
-            geometry_penalty += self.config.PENALTY_WEIGHTS['rotational_distortion_pairs']
+            geometry_penalty += self._settings.PENALTY_WEIGHTS['rotational_distortion_pairs']
 
         # Score backbone suiteness (Richardson suite classification)
         backbone_issues, backbone_penalty, backbone_details = self._score_backbone_suiteness(
-            nt1_id, nt2_id, torsion_data
+            nt1_id, nt2_id, torsion_data, residue_index, residue_features
         )
         geometry_issues.update(backbone_issues)
         geometry_penalty += backbone_penalty
 
         # Check chi glycosidic bond conformation
         chi_issue, chi_penalty, chi_details = self._check_chi_conformation(
-            nt1_id, nt2_id, edge_type, bp_type, torsion_data)
+            nt1_id, nt2_id, edge_type, bp_type, torsion_data, residue_features)
         if chi_issue:
             geometry_issues['chi_outlier'] = True
             geometry_penalty += chi_penalty
@@ -649,7 +1068,7 @@ class Scorer:
 
             if hbond_score_min is not None and dssr_quality < hbond_score_min:
                 hbond_issues['poor_hbond_score'] = True
-                hbond_penalty += self.config.PENALTY_WEIGHTS['poor_hbond_score']
+                hbond_penalty += self._settings.PENALTY_WEIGHTS['poor_hbond_score']
         
         # Reconcile DSSR hbond_score with CSV H-bond data
         # Only flag "zero_hbond" if BOTH sources agree there are no H-bonds
@@ -662,7 +1081,7 @@ class Scorer:
             expects_hbonds = not (geo_hb_min == 0 and geo_hb_max == 0)
             if not has_dssr_hbonds and expects_hbonds:
                 geometry_issues['zero_hbond'] = True
-                geometry_penalty += self.config.PENALTY_WEIGHTS['zero_hbond_pairs']
+                geometry_penalty += self._settings.PENALTY_WEIGHTS['zero_hbond_pairs']
             # If DSSR says H-bonds exist but CSV doesn't, it's a data mismatch
             # Don't penalize - trust DSSR's detection (CSV might be incomplete or filtered)
         else:
@@ -670,9 +1089,9 @@ class Scorer:
             bp_type = bp.get('bp_type', '')
             actual_count = len(bp_hbonds)
             
-            if bp_type in self.config.EXPECTED_HBOND_COUNTS:
+            if bp_type in self._settings.EXPECTED_HBOND_COUNTS:
                 # Interpret as (min, max, ideal) to match analyzers_utils.py
-                min_expected, max_expected, ideal = self.config.EXPECTED_HBOND_COUNTS[bp_type]
+                min_expected, max_expected, ideal = self._settings.EXPECTED_HBOND_COUNTS[bp_type]
                 lw = bp.get('lw', '')
                 
                 # Check if count is outside expected range
@@ -684,7 +1103,7 @@ class Scorer:
                 # Penalize if outside range OR suboptimal cWW
                 if is_outside_range or is_suboptimal_cww:
                     hbond_issues['incorrect_count'] = True
-                    hbond_penalty += self.config.PENALTY_WEIGHTS['incorrect_hbond_count']
+                    hbond_penalty += self._settings.PENALTY_WEIGHTS['incorrect_hbond_count']
             
             # Check each H-bond using edge-specific thresholds
             # Collect flags first
@@ -698,9 +1117,9 @@ class Scorer:
             angle_min = hbond_thresh.get('ANGLE_MIN')
 
             # Dihedral uses config thresholds (structural cis/trans constraint)
-            dihedral_cis_min = self.config.HBOND_DIHEDRAL_CIS_MIN
-            dihedral_cis_max = self.config.HBOND_DIHEDRAL_CIS_MAX
-            dihedral_trans_min = self.config.HBOND_DIHEDRAL_TRANS_MIN
+            dihedral_cis_min = self._settings.HBOND_DIHEDRAL_CIS_MIN
+            dihedral_cis_max = self._settings.HBOND_DIHEDRAL_CIS_MAX
+            dihedral_trans_min = self._settings.HBOND_DIHEDRAL_TRANS_MIN
             
             for _, hb in bp_hbonds.iterrows():
                 # Distance check (only if thresholds from _OTHER are defined)
@@ -726,19 +1145,19 @@ class Scorer:
             # Apply penalties ONCE per issue type
             if has_bad_distance:
                 hbond_issues['bad_distance'] = True
-                hbond_penalty += self.config.PENALTY_WEIGHTS['bad_hbond_distance']
+                hbond_penalty += self._settings.PENALTY_WEIGHTS['bad_hbond_distance']
             
             if has_bad_angles:
                 hbond_issues['bad_angles'] = True
-                hbond_penalty += self.config.PENALTY_WEIGHTS['bad_hbond_angles']
+                hbond_penalty += self._settings.PENALTY_WEIGHTS['bad_hbond_angles']
             
             if has_bad_dihedral:
                 hbond_issues['bad_dihedral'] = True
-                hbond_penalty += self.config.PENALTY_WEIGHTS['bad_hbond_dihedrals']
+                hbond_penalty += self._settings.PENALTY_WEIGHTS['bad_hbond_dihedrals']
         
         # Calculate base pair score
         total_penalty = geometry_penalty + hbond_penalty
-        bp_score = max(0, min(100, self.config.BASE_SCORE - total_penalty))
+        bp_score = max(0, min(100, self._settings.BASE_SCORE - total_penalty))
         
         return {
             'score': bp_score,
@@ -758,8 +1177,263 @@ class Scorer:
             }
         }
     
+    def _score_base_pairs_columnar(self, basepair_data: list, hbond_data: pd.DataFrame,
+                                   torsion_data: dict = None,
+                                   residue_index: ResidueIndex = None,
+                                   residue_features: Dict[str, dict] = None) -> List[Dict]:
+        """
+        Score all base pairs at once with array expressions (columnar engine).
+
+        Same rules and output as calling _score_base_pair for each pair:
+        per-pair threshold vectors are gathered from the compiled threshold
+        table, geometry and H-bond checks run over whole columns,
+        and per-pair H-bond flags come from a groupby over the matched H-bonds.
+        Backbone and chi still come from the per-residue feature table.
+
+        Args:
+            basepair_data: List of base pair dictionaries
+            hbond_data: DataFrame of all hydrogen bonds
+            torsion_data: Optional dict of per-residue torsion angles
+            residue_index: Optional ResidueIndex of torsion_data for backbone scoring
+            residue_features: Optional table from _build_residue_features
+
+        Returns:
+            List of per-pair score dicts, in basepair_data order
+        """
+        n_pairs = len(basepair_data)
+        weights = self._settings.PENALTY_WEIGHTS
+
+        res_1 = [bp.get('res_1', '') for bp in basepair_data]
+        res_2 = [bp.get('res_2', '') for bp in basepair_data]
+        bp_types = [bp.get('bp_type', '') for bp in basepair_data]
+        edge_types = [bp.get('lw', '') or '_OTHER' for bp in basepair_data]
+
+        def column(name, default):
+            return np.array([bp.get(name, default) for bp in basepair_data], dtype=float)
+
+        # Gather one row of the compiled threshold table per pair
+        thresholds = self._get_threshold_table()
+        codes = thresholds.codes_for(bp_types, edge_types)
+        geo = dict(zip(GEOMETRY_FIELDS, thresholds.geometry[codes].T))
+        hb = dict(zip(HBOND_FIELDS, thresholds.hbond[codes].T))
+
+        # Geometry flags
+        geometry_flags = {}
+        for issue, params in _GEOMETRY_RANGE_CHECKS:
+            flag = np.zeros(n_pairs, dtype=bool)
+            for param in params:
+                flag |= _outside_range(column(param, 0), geo[f'{param.upper()}_MIN'],
+                                       geo[f'{param.upper()}_MAX'])
+            geometry_flags[issue] = flag
+
+        # Base-base H-bonds matched to pairs, then reduced per pair
+        hb_count = np.zeros(n_pairs, dtype=int)
+        hbond_flags = {issue: np.zeros(n_pairs, dtype=bool)
+                       for issue in ('bad_distance', 'bad_angles', 'bad_dihedral')}
+        links = self._link_pair_hbonds(res_1, res_2, hbond_data)
+        if links is not None:
+            pair = links['pair'].to_numpy()
+            distance = links['distance'].to_numpy(dtype=float)
+            angle_1 = links['angle_1'].to_numpy(dtype=float)
+            angle_2 = links['angle_2'].to_numpy(dtype=float)
+            dihedral = links['dihedral_angle'].to_numpy(dtype=float)
+
+            angle_min = hb['ANGLE_MIN'][pair]
+            trans_min = self._settings.HBOND_DIHEDRAL_TRANS_MIN
+            is_cis = ((self._settings.HBOND_DIHEDRAL_CIS_MIN <= dihedral) &
+                      (dihedral <= self._settings.HBOND_DIHEDRAL_CIS_MAX))
+            is_trans = (dihedral >= trans_min) | (dihedral <= -trans_min)
+
+            per_hbond = pd.DataFrame({
+                'pair': pair,
+                'bad_distance': _outside_range(distance, hb['DIST_MIN'][pair], hb['DIST_MAX'][pair]),
+                'bad_angles': ~np.isnan(angle_min) & ((angle_1 < angle_min) | (angle_2 < angle_min)),
+                'bad_dihedral': ~(is_cis | is_trans),
+            })
+            per_pair = per_hbond.groupby('pair', sort=False).agg(
+                count=('pair', 'size'),
+                bad_distance=('bad_distance', 'any'),
+                bad_angles=('bad_angles', 'any'),
+                bad_dihedral=('bad_dihedral', 'any'),
+            )
+            rows = per_pair.index.to_numpy()
+            hb_count[rows] = per_pair['count'].to_numpy()
+            for issue in hbond_flags:
+                hbond_flags[issue][rows] = per_pair[issue].to_numpy()
+
+        has_hbonds = hb_count > 0
+        dssr_quality = column('hbond_score', 0.0)
+        has_dssr_hbonds = dssr_quality > 0.0
+
+        hbond_flags['poor_hbond_score'] = (has_dssr_hbonds & ~np.isnan(geo['HBOND_SCORE_MIN']) &
+                                           (dssr_quality < geo['HBOND_SCORE_MIN']))
+
+        expects_hbonds = ~((geo['HBOND_SCORE_MIN'] == 0) & (geo['HBOND_SCORE_MAX'] == 0))
+        geometry_flags['zero_hbond'] = ~has_hbonds & ~has_dssr_hbonds & expects_hbonds
+
+        # Expected H-bond counts as (min, max, ideal) vectors; NaN for unlisted types
+        expected = thresholds.expected_counts[codes]
+        is_cww = np.array([bp.get('lw', '') == 'cWW' for bp in basepair_data], dtype=bool)
+        hbond_flags['incorrect_count'] = has_hbonds & ~np.isnan(expected[:, 0]) & (
+            (hb_count < expected[:, 0]) | (hb_count > expected[:, 1]) |
+            (is_cww & (hb_count != expected[:, 2])))
+
+        # Backbone and chi from the per-residue table; penalties applied in row-engine order
+        backbone = [self._score_backbone_suiteness(r1, r2, torsion_data, residue_index, residue_features)
+                    for r1, r2 in zip(res_1, res_2)]
+        chi = [self._check_chi_conformation(r1, r2, edge, bp_type, torsion_data, residue_features)
+               for r1, r2, edge, bp_type in zip(res_1, res_2, edge_types, bp_types)]
+        geometry_flags['backbone_outlier'] = np.array(
+            [bool(issues.get('backbone_outlier')) for issues, _, _ in backbone], dtype=bool)
+        geometry_flags['chi_outlier'] = np.array([issue for issue, _, _ in chi], dtype=bool)
+
+        geometry_penalty = np.zeros(n_pairs)
+        for issue, weight_key in _GEOMETRY_PENALTIES:
+            if issue == 'backbone_outlier':
+                geometry_penalty += np.array([penalty for _, penalty, _ in backbone], dtype=float)
+            elif issue == 'chi_outlier':
+                geometry_penalty += np.where(geometry_flags[issue],
+                                             np.array([penalty for _, penalty, _ in chi], dtype=float), 0.0)
+            else:
+                geometry_penalty += np.where(geometry_flags[issue], weights[weight_key], 0.0)
+
+        hbond_penalty = np.zeros(n_pairs)
+        for issue, weight_key in _HBOND_PENALTIES:
+            hbond_penalty += np.where(hbond_flags[issue], weights[weight_key], 0.0)
+
+        # Assemble per-pair dicts (flag order matches _score_base_pair)
+        geometry_penalty = geometry_penalty.tolist()
+        hbond_penalty = hbond_penalty.tolist()
+        geometry_rows = {issue: flags.tolist() for issue, flags in geometry_flags.items()}
+        hbond_rows = {issue: flags.tolist() for issue, flags in hbond_flags.items()}
+        hb_count = hb_count.tolist()
+
+        basepair_scores = []
+        for i, bp in enumerate(basepair_data):
+            total_penalty = geometry_penalty[i] + hbond_penalty[i]
+            basepair_scores.append({
+                'score': max(0, min(100, self._settings.BASE_SCORE - total_penalty)),
+                'geometry_penalty': geometry_penalty[i],
+                'hbond_penalty': hbond_penalty[i],
+                'geometry_issues': {issue: True for issue, _ in _GEOMETRY_PENALTIES
+                                    if geometry_rows[issue][i]},
+                'hbond_issues': {issue: True for issue, _ in _HBOND_PENALTIES
+                                 if hbond_rows[issue][i]},
+                'backbone': backbone[i][2],
+                'chi_details': chi[i][2],
+                'bp_info': {
+                    'res_1': res_1[i],
+                    'res_2': res_2[i],
+                    'bp_type': bp_types[i],
+                    'edge_type': edge_types[i],
+                    'num_hbonds': hb_count[i],
+                    'dssr_score': bp.get('hbond_score', 0)
+                }
+            })
+
+        return basepair_scores
+
+    def _link_pair_hbonds(self, res_1: List[str], res_2: List[str],
+                          hbond_data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Match base-base H-bonds to base pairs by unordered residue pair.
+
+        Args:
+            res_1: First residue ID of each pair
+            res_2: Second residue ID of each pair
+            hbond_data: DataFrame of all hydrogen bonds
+
+        Returns:
+            DataFrame with one row per (pair position, H-bond) match and the
+            distance/angle_1/angle_2/dihedral_angle columns, or None if nothing matches
+        """
+        if hbond_data is None or hbond_data.empty:
+            return None
+
+        base_hbonds = hbond_data[base_base_mask(hbond_data)]
+        if base_hbonds.empty:
+            return None
+
+        def ordered(a, b):
+            a = np.asarray(pd.Series(a, dtype=object).astype(str))
+            b = np.asarray(pd.Series(b, dtype=object).astype(str))
+            swap = a > b
+            return np.where(swap, b, a), np.where(swap, a, b)
+
+        hb_lo, hb_hi = ordered(base_hbonds['res_1'], base_hbonds['res_2'])
+        hbond_keys = pd.DataFrame({'key_lo': hb_lo, 'key_hi': hb_hi})
+        for col in ('distance', 'angle_1', 'angle_2', 'dihedral_angle'):
+            hbond_keys[col] = (base_hbonds[col].to_numpy() if col in base_hbonds.columns
+                               else 0)
+
+        pair_lo, pair_hi = ordered(res_1, res_2)
+        pair_keys = pd.DataFrame({'key_lo': pair_lo, 'key_hi': pair_hi,
+                                  'pair': np.arange(len(res_1))})
+
+        links = pair_keys.merge(hbond_keys, on=['key_lo', 'key_hi'], how='inner')
+        return links if not links.empty else None
+
+    def _get_threshold_table(self) -> ThresholdTable:
+        """Compiled threshold table, recompiled only if chi_expectations was replaced."""
+        if self._threshold_table.chi_expectations is not self.chi_expectations:
+            self._threshold_table = compile_thresholds(self._settings, self.chi_expectations)
+        return self._threshold_table
+
+    def _resolve_thresholds(self, bp_type: str, edge_type: str) -> Tuple[dict, dict]:
+        """
+        Resolve geometry and H-bond thresholds for a base-pair type and edge.
+
+        Fallback chain: (bp, edge) -> (bp, _OTHER) -> (_OTHERS, edge) -> (_OTHERS, _OTHER),
+        precomputed in the compiled threshold table.
+
+        Returns:
+            (geometry thresholds dict, H-bond thresholds dict); empty if nothing matches
+        """
+        thresholds = self._get_threshold_table()
+        code = thresholds.code(bp_type, edge_type)
+        return thresholds.geometry_thresholds[code], thresholds.hbond_thresholds[code]
+
+    @staticmethod
+    def _pair_key(nt1_id: str, nt2_id: str) -> Tuple[str, str]:
+        """Order-independent key for a residue pair (same convention as build_base_pair_set)."""
+        return (nt1_id, nt2_id) if nt1_id <= nt2_id else (nt2_id, nt1_id)
+
+    def _build_hbond_index(self, hbond_data: pd.DataFrame) -> Dict[Tuple[str, str], pd.DataFrame]:
+        """
+        Index base-base H-bonds by unordered residue pair.
+
+        Built once per structure so that _get_basepair_hbonds is a dict lookup
+        instead of a boolean mask over the whole H-bond table for every pair.
+
+        Args:
+            hbond_data: DataFrame of all hydrogen bonds
+
+        Returns:
+            Dict mapping (res_a, res_b) with res_a <= res_b to the DataFrame of
+            base-base H-bonds between those residues (either direction)
+        """
+        index = {}
+        if hbond_data is None or hbond_data.empty:
+            return index
+
+        # Filter to only base-base H-bonds (exclude backbone/sugar), once for all pairs
+        base_hbonds = hbond_data[base_base_mask(hbond_data)]
+        if base_hbonds.empty:
+            return index
+
+        res_1 = base_hbonds['res_1'].astype(str).to_numpy()
+        res_2 = base_hbonds['res_2'].astype(str).to_numpy()
+        swap = res_1 > res_2
+        key_lo = np.where(swap, res_2, res_1)
+        key_hi = np.where(swap, res_1, res_2)
+
+        for key, group in base_hbonds.groupby([key_lo, key_hi], sort=False):
+            index[tuple(key)] = group
+        return index
+
     def _get_basepair_hbonds(self, nt1_id: str, nt2_id: str, 
-                            hbond_data: pd.DataFrame) -> pd.DataFrame:
+                            hbond_data: pd.DataFrame,
+                            hbond_index: Dict = None) -> pd.DataFrame:
         """
         Get hydrogen bonds between two nucleotides in a base pair.
         Only includes H-bonds between base atoms (not backbone/sugar).
@@ -768,12 +1442,17 @@ class Scorer:
             nt1_id: First nucleotide identifier (e.g., "Q-C-0-")
             nt2_id: Second nucleotide identifier (e.g., "Q-G-22-")
             hbond_data: DataFrame of all hydrogen bonds
+            hbond_index: Optional pair index from _build_hbond_index(hbond_data)
             
         Returns:
             DataFrame of base-base H-bonds for this base pair
         """
         if hbond_data.empty:
             return pd.DataFrame()
+
+        if hbond_index is not None:
+            bp_hbonds = hbond_index.get(self._pair_key(nt1_id, nt2_id))
+            return bp_hbonds if bp_hbonds is not None else hbond_data.iloc[0:0]
         
         # Find H-bonds where res_1/res_2 match this base pair (bidirectional)
         mask = (
@@ -785,11 +1464,7 @@ class Scorer:
         
         # Filter to only base-base H-bonds (exclude backbone/sugar)
         if not bp_hbonds.empty:
-            base_base_mask = bp_hbonds.apply(
-                lambda row: self._is_base_base_hbond(row['atom_1'], row['atom_2']),
-                axis=1
-            )
-            bp_hbonds = bp_hbonds[base_base_mask]
+            bp_hbonds = bp_hbonds[base_base_mask(bp_hbonds)]
         
         return bp_hbonds
     
@@ -816,39 +1491,7 @@ class Scorer:
         Returns:
             True if base atom, False if backbone/sugar atom
         """
-        # Remove whitespace
-        atom_name = atom_name.strip()
-        
-        # Pattern-based exclusion for robustness
-        # Phosphate patterns
-        if atom_name.startswith('P') and len(atom_name) <= 3:  # P, PA, PB, PG
-            return False
-        if atom_name.startswith('OP'):  # OP1, OP2, OP3
-            return False
-        if 'P' in atom_name and 'O' in atom_name:  # O1P, O2P, O3P
-            return False
-        
-        # Sugar patterns (contains prime ' or asterisk *)
-        if "'" in atom_name or '*' in atom_name:
-            return False
-        
-        # Explicit exclusion list (backup)
-        backbone_sugar_atoms = {
-            # Phosphate
-            'P', 'OP1', 'OP2', 'OP3', 'O1P', 'O2P', 'O3P',
-            'PA', 'PB', 'PG',
-            
-            # Ribose (prime notation)
-            "O5'", "C5'", "C4'", "O4'", "C3'", "O3'", "C2'", "O2'", "C1'",
-            
-            # Ribose (asterisk notation)
-            'O5*', 'C5*', 'C4*', 'O4*', 'C3*', 'O3*', 'C2*', 'O2*', 'C1*',
-            
-            # Hydrogens
-            "HO5'", "HO2'", "HO3'", 'HO5*', 'HO2*', 'HO3*',
-        }
-        
-        return atom_name not in backbone_sugar_atoms
+        return is_base_atom(atom_name)
     
     
     def _create_summary(self, score: float, total_pairs: int,
@@ -885,34 +1528,33 @@ class Scorer:
         return "\n".join(lines)
     
     def _print_results(self, result: BaselineResult):
-        """Print formatted results to console."""
-        print("\n" + "="*60)
-        print("RESULTS")
-        print("="*60)
-        print(f"\nOverall Score: {result.overall_score}/100")
-        print(f"Base Pairs: {result.total_base_pairs}")
+        """Emit the result as a 'structure_result' event (formatted breakdown as its message)."""
+        lines = ["\n" + "="*60, "RESULTS", "="*60]
+        lines.append(f"\nOverall Score: {result.overall_score}/100")
+        lines.append(f"Base Pairs: {result.total_base_pairs}")
         
-        print("\n" + "-"*60)
-        print("GEOMETRY BREAKDOWN")
-        print("-"*60)
+        lines += ["\n" + "-"*60, "GEOMETRY BREAKDOWN", "-"*60]
         for issue, count in result.geometry_issues.items():
             if count > 0:
                 frac = result.geometry_fractions[issue]
-                print(f"{issue:20s}: {count:4d} ({frac*100:5.1f}%)")
+                lines.append(f"{issue:20s}: {count:4d} ({frac*100:5.1f}%)")
         
-        print("\n" + "-"*60)
-        print("H-BOND BREAKDOWN")
-        print("-"*60)
+        lines += ["\n" + "-"*60, "H-BOND BREAKDOWN", "-"*60]
         for issue, count in result.hbond_issues.items():
             if count > 0:
                 frac = result.hbond_fractions[issue]
-                print(f"{issue:20s}: {count:4d} ({frac*100:5.1f}%)")
+                lines.append(f"{issue:20s}: {count:4d} ({frac*100:5.1f}%)")
         
-        print("\n" + "="*60)
-        print("SUMMARY")
-        print("="*60)
-        print(result.summary)
-        print("="*60 + "\n")
+        lines += ["\n" + "="*60, "SUMMARY", "="*60]
+        lines.append(result.summary)
+        lines.append("="*60 + "\n")
+
+        self.events.emit('structure_result', "\n".join(lines),
+                         overall_score=result.overall_score,
+                         total_base_pairs=result.total_base_pairs,
+                         geometry_issues=result.geometry_issues,
+                         hbond_issues=result.hbond_issues,
+                         avg_suiteness=result.avg_suiteness)
     
     def _empty_result(self) -> BaselineResult:
         """Return empty result when no base pairs found."""
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Thin client for the local scoring service (scoring_service.py).
+
+Standard library only, so a request costs interpreter start-up and one
+HTTP round trip. Takes the scoring flags of app.py (app.py --server URL
+forwards through forward()); reports and CSV rows are written by the
+service into the client's working directory, as app.py would write them.
+
+Usage:
+    python scoring_client.py --motif-name HAIRPIN-2-CGAG-7O7Y-1 --output-dir reports --csv-dir motif_csvs
+    python scoring_client.py --pdb_id 1A9N [--residue 52]
+    python scoring_client.py --stats
+"""
+
+import argparse
+import http.client
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Optional, Tuple
+from urllib.parse import urlsplit
+
+DEFAULT_URL = os.environ.get('SCORING_SERVICE_URL', 'http://127.0.0.1:8765')
+
+
+class ScoringError(Exception):
+    """Error response from the service; status is its HTTP status (0: no response)."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class ScoringClient:
+    """Requests to a scoring service over one kept-alive connection."""
+
+    def __init__(self, url: str = DEFAULT_URL, timeout: float = 600):
+        """
+        Args:
+            url: Service base URL (e.g. http://127.0.0.1:8765)
+            timeout: Seconds to wait for a response (scoring a large structure can take minutes)
+        """
+        parts = urlsplit(url)
+        self.host = parts.hostname or '127.0.0.1'
+        self.port = parts.port or 80
+        self.timeout = timeout
+        self._connection = None
+
+    def request(self, method: str, path: str, body: dict = None) -> dict:
+        """
+        JSON response of one request.
+
+        Raises:
+            ScoringError: On an error response, or if the service cannot be reached
+        """
+        data = json.dumps(body).encode() if body is not None else None
+        headers = {'Content-Type': 'application/json'} if data is not None else {}
+        for attempt in (0, 1):
+            reused = self._connection is not None
+            if not reused:
+                self._connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            try:
+                self._connection.request(method, path, body=data, headers=headers)
+                response = self._connection.getresponse()
+                payload = response.read()
+                break
+            except (http.client.HTTPException, OSError) as e:
+                self.close()
+                # A kept-alive connection the service has since closed fails on first use; retry on a new one
+                if attempt or not reused:
+                    raise ScoringError(0, f"Scoring service not reachable at {self.host}:{self.port}: {e}")
+        try:
+            result = json.loads(payload) if payload else {}
+        except ValueError:
+            result = {'error': payload.decode(errors='replace')}
+        if response.status != 200:
+            raise ScoringError(response.status, result.get('error', f"HTTP {response.status}"))
+        return result
+
+    def score_structure(self, pdb_id: str, **options) -> dict:
+        """Full-structure report; see ScoringService.score_structure for options."""
+        return self.request('POST', '/score/structure', dict(options, pdb_id=pdb_id))
+
+    def score_motif(self, **request) -> dict:
+        """Motif report; request holds motif_name or pdb_id with residues or start/end (see ScoringService.score_motif)."""
+        return self.request('POST', '/score/motif', request)
+
+    def score_residue(self, pdb_id: str, residue: int, chain: str = None, **options) -> dict:
+        """Base pair report for one residue."""
+        return self.request('POST', '/score/residue', dict(options, pdb_id=pdb_id, residue=residue, chain=chain))
+
+    def stats(self) -> dict:
+        """Service request counts, latency percentiles and structure cache statistics."""
+        return self.request('GET', '/stats')
+
+    def health(self) -> dict:
+        return self.request('GET', '/health')
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+def request_from_args(args) -> Tuple[str, dict]:
+    """(endpoint, request body) for parsed app.py-style arguments; output files go to the current directory."""
+    body = {'workdir': str(Path.cwd())}
+    if args.motif_name or args.motif or args.motif_residues:
+        body.update(output_dir=args.output_dir, csv_dir=args.csv_dir)
+        if args.motif_name:
+            body.update(motif_name=args.motif_name, motif_dir=args.motif_dir)
+        else:
+            body.update(pdb_id=args.pdb_id, chain=args.chain)
+            if args.motif:
+                body.update(start=args.motif[0], end=args.motif[1])
+            if args.motif_residues:
+                body['residues'] = args.motif_residues.split(',')
+        return '/score/motif', body
+    if args.residue is not None:
+        body.update(pdb_id=args.pdb_id, residue=args.residue, chain=args.chain)
+        return '/score/residue', body
+    body.update(pdb_id=args.pdb_id, csv=args.csv)
+    return '/score/structure', body
+
+
+def forward(args, client: Optional[ScoringClient] = None) -> int:
+    """
+    Score through the service and print a summary.
+
+    Returns:
+        Exit code as app.py uses them: 0 success, 1 nothing to score
+        (no base pairs in the motif or at the residue), 2 error
+    """
+    client = client if client is not None else ScoringClient(args.server)
+    path, body = request_from_args(args)
+    try:
+        result = client.request('POST', path, body)
+    except ScoringError as e:
+        print(f"Error: {e}")
+        return 1 if e.status == 422 else 2
+
+    report = result['report']
+    if path == '/score/motif':
+        print(f"Motif {result['motif_name']}: {report['motif_score']}/100 "
+              f"(full structure {report['full_structure_score']}/100, {report['score_difference']:+.1f} points)")
+    elif path == '/score/residue':
+        scores = [bp['score'] for bp in report['base_pairs']]
+        print(f"Residue {report['query_residue']} ({report['query_chain']}): {len(scores)} base pair(s), "
+              f"average score {sum(scores) / len(scores):.1f}/100")
+    else:
+        print(f"{report['pdb_id']}: {report['overall_score']}/100 over {report['total_base_pairs']} base pairs")
+    for file in result.get('files', []):
+        print(f"  → {file}")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score through a running scoring service (flags as in app.py)")
+    parser.add_argument('--server', default=DEFAULT_URL, help=f'Service URL (default: {DEFAULT_URL})')
+    parser.add_argument('--pdb_id', help='PDB ID of the RNA structure to analyze')
+    parser.add_argument('--motif-name', help='Name of motif (e.g., HAIRPIN-2-CGAG-7O7Y-1)')
+    parser.add_argument('--motif-dir', default='unique_motifs', help='Directory containing motif CIF files')
+    parser.add_argument('--motif', nargs=2, type=int, metavar=('START', 'END'), help='Motif residue range')
+    parser.add_argument('--motif-residues', help='Comma-separated list of motif residue IDs')
+    parser.add_argument('--residue', type=int, metavar='RES_NUM', help='Score base pairs involving one residue')
+    parser.add_argument('--chain', help='Chain ID filter')
+    parser.add_argument('--csv', default='scores_summary.csv', help='CSV file for full-structure summary output')
+    parser.add_argument('--output-dir', help='Directory for individual motif reports')
+    parser.add_argument('--csv-dir', help='Directory for individual motif CSV files')
+    parser.add_argument('--stats', action='store_true', help='Print service statistics and exit')
+    args = parser.parse_args()
+
+    if args.stats:
+        try:
+            print(json.dumps(ScoringClient(args.server).stats(), indent=2))
+        except ScoringError as e:
+            print(f"Error: {e}")
+            sys.exit(2)
+        sys.exit(0)
+    if not args.pdb_id and not args.motif_name:
+        parser.error("Either --pdb_id or --motif-name must be provided")
+    sys.exit(forward(args))
+
+
+if __name__ == '__main__':
+    main()
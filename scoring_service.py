@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+"""
+Long-running local scoring service.
+
+Keeps Config, a pool of warm Scorer instances (reference data loaded once),
+an LRU cache of loaded structures and the full-structure result cache in
+one process, and serves full-structure, motif and single-residue scoring
+over HTTP on localhost. Running `app.py --motif-name ...` once per motif
+pays interpreter start-up, imports, Scorer construction and a re-read of
+the parent structure every time; through the service each request costs
+only its own scoring.
+
+Endpoints (JSON in, JSON out):
+    POST /score/structure  {"pdb_id"}
+    POST /score/motif      {"motif_name"[, "motif_dir"]} or
+                           {"pdb_id", "residues" | "start", "end"[, "chain"]}
+    POST /score/residue    {"pdb_id", "residue"[, "chain"]}
+    GET  /stats            request counts and latency percentiles per endpoint
+    GET  /health
+
+A scoring request that carries "workdir" also writes the files app.py
+writes for that mode, relative to workdir (see scoring_client.py, which
+app.py --server uses).
+
+Usage:
+    python scoring_service.py [--port 8765] [--workers 4] [--cache-mb 2048]
+"""
+
+import argparse
+import json
+import queue
+import sys
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Tuple
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app import (StructureData, _full_structure_scores, _motif_name, load_structure, motif_pdb_id, parse_motif_cif,
+                 save_motif_outputs, score_motif, score_pdb, score_residue)
+from config import Config
+from scorer2 import Scorer, StructureScores
+from utils.data_loader import DataLoader
+from utils.instrumentation import RequestStats, SilentSink
+from utils.report_generator import ReportGenerator
+from utils.result_cache import ResultCache
+from utils.structure_cache import estimate_size
+
+DEFAULT_PORT = 8765
+
+ENDPOINTS = ('/score/structure', '/score/motif', '/score/residue')
+
+
+class ServiceError(Exception):
+    """A request that cannot be served; status is the HTTP status returned."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class ScoringService:
+    """
+    Scores structures, motifs and residues in-process with warm state.
+
+    Requests run concurrently on the HTTP server's threads. Each takes its
+    own Scorer from a pool (Scorer keeps per-structure state while scoring);
+    structure loading goes through the shared DataLoader one request at a
+    time (its caches are not thread-safe); requests for the same structure
+    are serialized, so a structure missing from the result cache is scored
+    once and later requests use the cached result. Input hashes and each
+    structure's per-pair scores are kept in the loader's structure cache, so
+    repeated requests neither rehash the input files nor rescore base pairs.
+    """
+
+    def __init__(self, config=None, workers: int = 4, cache_mb: float = 2048, columnar: bool = False,
+                 cache_dir: str = 'full_structure_cache'):
+        """
+        Args:
+            config: Scoring configuration (default: Config())
+            workers: Scorer instances, i.e. requests scored at the same time
+            cache_mb: Memory budget of the loaded-structure LRU cache in MB
+            columnar: Score base pairs with the vectorized columnar engine
+            cache_dir: Full-structure result cache directory (shared with app.py)
+        """
+        self.config = config if config is not None else Config()
+        events = SilentSink()
+        self.data_loader = DataLoader(self.config, events=events, cache_mb=cache_mb)
+        self.report_gen = ReportGenerator(self.config)
+        self.workers = max(1, workers)
+        self._scorers = queue.Queue()
+        for _ in range(self.workers):
+            self._scorers.put(Scorer(self.config, columnar=columnar, events=events))
+        self.fingerprint = self._scorers.queue[0].fingerprint()
+        self.result_cache = ResultCache(cache_dir, self.fingerprint)
+        self.stats = {endpoint: RequestStats() for endpoint in ENDPOINTS}
+        self.started = time.time()
+        self._load_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._structure_locks = defaultdict(threading.Lock)
+        self._structure_locks_lock = threading.Lock()
+        self._metadata = {}  # pdb_id -> (num_nucleotides, validation_metrics)
+
+    @contextmanager
+    def _scorer(self):
+        scorer = self._scorers.get()
+        try:
+            yield scorer
+        finally:
+            self._scorers.put(scorer)
+
+    def _structure_lock(self, pdb_id: str) -> threading.Lock:
+        with self._structure_locks_lock:
+            return self._structure_locks[pdb_id.upper()]
+
+    def load(self, pdb_id: str, fingerprint: bool = True) -> StructureData:
+        """
+        Loaded inputs of a structure (see app.load_structure).
+
+        Raises:
+            ServiceError: 404 if its base pairs or H-bonds cannot be loaded
+        """
+        with self._load_lock:
+            structure = load_structure(self.data_loader, pdb_id, fingerprint=fingerprint)
+        if structure is None:
+            raise ServiceError(404, f"Could not load data for {pdb_id}")
+        return structure
+
+    def structure_scores(self, structure: StructureData, scorer: Scorer) -> Tuple[StructureScores, float]:
+        """
+        Per-pair scores and full score of a loaded structure (see app._full_structure_scores).
+
+        Kept in the structure cache under the structure's input hash, so each
+        version of a structure's inputs is scored once. Call with the
+        structure's lock held.
+        """
+        cache = self.data_loader.cache
+        if cache is None or structure.input_hash is None:
+            return _full_structure_scores(scorer, self.result_cache, structure)
+        key = ('structure_scores', structure.input_hash)
+        with self._load_lock:
+            scores = cache.get(key)
+        if scores is None:
+            scores = _full_structure_scores(scorer, self.result_cache, structure)
+            with self._load_lock:
+                cache.put(key, scores, size=estimate_size(scores[0].basepair_scores))
+        return scores
+
+    def metadata(self, pdb_id: str) -> tuple:
+        """(num_nucleotides, validation_metrics) of a structure, fetched once per service."""
+        with self._structure_lock(pdb_id):
+            if pdb_id not in self._metadata:
+                self._metadata[pdb_id] = (self.data_loader.get_nucleotide_count(pdb_id),
+                                          self.data_loader.get_validation_metrics(pdb_id))
+            return self._metadata[pdb_id]
+
+    def score_structure(self, request: dict) -> dict:
+        """Full-structure report (app.py --pdb_id)."""
+        pdb_id = _required(request, 'pdb_id')
+        num_nucleotides, validation_metrics = self.metadata(pdb_id)
+        with self._structure_lock(pdb_id):
+            structure = self.load(pdb_id)
+            with self._scorer() as scorer:
+                report = score_pdb(structure, scorer=scorer, result_cache=self.result_cache,
+                                   num_nucleotides=num_nucleotides, validation_metrics=validation_metrics)
+
+        files = []
+        workdir = request.get('workdir')
+        if workdir:
+            output_file = Path(workdir) / "report.json"
+            csv_file = Path(workdir) / request.get('csv', 'scores_summary.csv')
+            with self._write_lock:
+                with open(output_file, 'w') as f:
+                    json.dump(report, f, indent=2)
+                self.report_gen.save_score_summary_csv(report, str(csv_file), hbond_data=structure.hbonds,
+                                                       validation_metrics=validation_metrics)
+            files = [str(output_file), str(csv_file)]
+        return {'report': report, 'files': files}
+
+    def score_motif(self, request: dict) -> dict:
+        """Motif report (app.py --motif-name, or --pdb_id with --motif / --motif-residues)."""
+        workdir = Path(request['workdir']) if request.get('workdir') else None
+        motif_name = request.get('motif_name')
+        chain = request.get('chain')
+        motif_residues = set(request['residues']) if request.get('residues') else None
+        start_res, end_res = request.get('start'), request.get('end')
+
+        if motif_name:
+            motif_dir = Path(request.get('motif_dir', 'unique_motifs'))
+            motif_cif_file = (workdir / motif_dir if workdir else motif_dir) / f"{motif_name}.cif"
+            if not motif_cif_file.exists():
+                raise ServiceError(404, f"Motif CIF file not found: {motif_cif_file}")
+            pdb_id = motif_pdb_id(motif_name)
+            if not pdb_id:
+                raise ServiceError(400, f"Could not extract PDB ID from motif name: {motif_name}")
+            chain, residues = parse_motif_cif(motif_cif_file)
+            if not chain or not residues:
+                raise ServiceError(400, f"Could not parse chain or residues from CIF file: {motif_cif_file}")
+            motif_residues = set(residues)
+            res_nums = sorted(set(int(r.split('-')[2]) for r in residues))
+            start_res, end_res = res_nums[0], res_nums[-1]
+        else:
+            pdb_id = _required(request, 'pdb_id')
+            if motif_residues is None and (start_res is None or end_res is None):
+                raise ServiceError(400, "A motif needs motif_name, residues, or start and end")
+            if motif_residues is not None and (start_res is None or end_res is None):
+                res_nums = sorted(set(int(r.split('-')[2]) for r in motif_residues))
+                start_res, end_res = res_nums[0], res_nums[-1]
+            motif_name = request.get('name') or _motif_name(pdb_id, start_res, end_res, chain)
+
+        with self._structure_lock(pdb_id):
+            structure = self.load(pdb_id)
+            with self._scorer() as scorer:
+                structure_scores, full_score = self.structure_scores(structure, scorer)
+                report = score_motif(structure, motif_residues=motif_residues, start_res=start_res,
+                                     end_res=end_res, chain=chain, scorer=scorer,
+                                     structure_scores=structure_scores, full_score=full_score)
+        if report is None:
+            raise ServiceError(422, "No base pairs found in specified motif range!")
+
+        files = []
+        if workdir:
+            with self._write_lock:
+                output_file = save_motif_outputs(self.report_gen, report, motif_name,
+                                                 output_dir=request.get('output_dir'),
+                                                 csv_dir=request.get('csv_dir'), workdir=workdir)
+            files = [str(output_file)]
+        return {'report': report, 'motif_name': motif_name, 'files': files}
+
+    def score_residue(self, request: dict) -> dict:
+        """Single-residue base pair report (app.py --residue)."""
+        pdb_id = _required(request, 'pdb_id')
+        residue_num = int(_required(request, 'residue'))
+        chain = request.get('chain')
+        structure = self.load(pdb_id, fingerprint=False)
+        with self._scorer() as scorer:
+            report = score_residue(structure, residue_num, chain=chain, scorer=scorer)
+        if report is None:
+            raise ServiceError(422, f"No base pairs found involving residue {residue_num}"
+                                    + (f" (with chain filter: {chain})" if chain else ""))
+
+        files = []
+        if request.get('workdir'):
+            output_file = Path(request['workdir']) / "basepair_report.json"
+            with self._write_lock:
+                with open(output_file, 'w') as f:
+                    json.dump(report, f, indent=2)
+            files = [str(output_file)]
+        return {'report': report, 'files': files}
+
+    def handle(self, path: str, request: dict) -> dict:
+        """Serve one scoring request, recording its latency under the endpoint."""
+        handler = {
+            '/score/structure': self.score_structure,
+            '/score/motif': self.score_motif,
+            '/score/residue': self.score_residue,
+        }.get(path)
+        if handler is None:
+            raise ServiceError(404, f"Unknown endpoint: {path}")
+        start = time.perf_counter()
+        ok = False
+        try:
+            result = handler(request)
+            ok = True
+            return result
+        finally:
+            self.stats[path].record(start, time.perf_counter(), ok)
+
+    def summary(self) -> dict:
+        """Request statistics per endpoint, plus structure cache statistics."""
+        cache = self.data_loader.cache
+        return {
+            'uptime_s': round(time.time() - self.started, 1),
+            'workers': self.workers,
+            'endpoints': {path: stats.summary() for path, stats in self.stats.items()},
+            'structure_cache': cache.stats() if cache is not None else None,
+        }
+
+
+def _required(request: dict, field: str):
+    if request.get(field) in (None, ''):
+        raise ServiceError(400, f"Missing field: {field}")
+    return request[field]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """JSON request handler; server.service is the ScoringService."""
+
+    protocol_version = 'HTTP/1.1'  # keep-alive, so clients can reuse connections
+
+    def _send(self, status: int, body: dict) -> None:
+        data = json.dumps(body, default=str).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        service = self.server.service
+        if self.path == '/health':
+            self._send(200, {'status': 'ok', 'fingerprint': service.fingerprint})
+        elif self.path == '/stats':
+            self._send(200, service.summary())
+        else:
+            self._send(404, {'error': f"Unknown endpoint: {self.path}"})
+
+    def do_POST(self):
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            request = json.loads(self.rfile.read(length) or b'{}')
+            if not isinstance(request, dict):
+                raise ServiceError(400, "Request body must be a JSON object")
+            self._send(200, self.server.service.handle(self.path, request))
+        except ServiceError as e:
+            self._send(e.status, {'error': str(e)})
+        except (ValueError, TypeError) as e:
+            self._send(400, {'error': str(e)})
+        except Exception as e:
+            self._send(500, {'error': f"{type(e).__name__}: {e}"})
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+def make_server(service: ScoringService, host: str = '127.0.0.1', port: int = DEFAULT_PORT,
+                verbose: bool = False) -> ThreadingHTTPServer:
+    """HTTP server for a service (port 0 picks a free port); call serve_forever() to run it."""
+    httpd = ThreadingHTTPServer((host, port), _Handler)
+    httpd.daemon_threads = True
+    httpd.service = service
+    httpd.verbose = verbose
+    return httpd
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local scoring service for app.py --server and scoring_client.py")
+    parser.add_argument('--host', default='127.0.0.1', help='Address to listen on (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f'Port (default: {DEFAULT_PORT})')
+    parser.add_argument('--workers', type=int, default=4, help='Requests scored at the same time (default: 4)')
+    parser.add_argument('--cache-mb', type=float, default=2048,
+                        help='Memory budget for loaded structures in MB (default: 2048)')
+    parser.add_argument('--cache-dir', default='full_structure_cache',
+                        help='Full-structure result cache (default: full_structure_cache)')
+    parser.add_argument('--columnar', action='store_true', help='Use the vectorized columnar scoring engine')
+    parser.add_argument('--corpus', default=None, help='Packed corpus store to read inputs from')
+    parser.add_argument('--full-hbonds', action='store_true',
+                        help='Load every H-bond CSV column with default dtypes instead of the compact scoring schema')
+    parser.add_argument('--verbose', action='store_true', help='Log every request')
+    args = parser.parse_args()
+
+    config = Config()
+    if args.corpus:
+        config.CORPUS_DIR = args.corpus
+    if args.full_hbonds:
+        config.HBOND_COMPACT = False
+    service = ScoringService(config, workers=args.workers, cache_mb=args.cache_mb, columnar=args.columnar,
+                             cache_dir=args.cache_dir)
+    httpd = make_server(service, args.host, args.port, verbose=args.verbose)
+    print(f"Scoring service on http://{args.host}:{httpd.server_address[1]} "
+          f"({args.workers} workers, {args.cache_mb:.0f} MB structure cache)")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        httpd.server_close()
+        for path, stats in service.stats.items():
+            print(f"{path}: {stats.report()}")
+        if service.data_loader.cache is not None:
+            print(service.data_loader.cache.summary())
+
+
+if __name__ == '__main__':
+    main()
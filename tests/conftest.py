@@ -205,3 +205,41 @@ def sample_basepair_list():
 def empty_hbond_data():
     """Empty hydrogen bond DataFrame."""
     return pd.DataFrame()
+
+
+@pytest.fixture
+def richardson_suites():
+    """Small Richardson suite definition set (subset of the real conformer table)."""
+    return {
+        'widths': {'normal': [28.0, 60.0, 55.0, 50.0, 70.0, 35.0, 28.0]},
+        'triage': {
+            'epsilon': [155.0, 310.0],
+            'alpha': [25.0, 335.0],
+            'beta': [60.0, 290.0],
+            'zeta': [25.0, 335.0],
+        },
+        'sieve': {
+            'delta': {'C3_endo': [60.0, 105.0], 'C2_endo': [125.0, 165.0]},
+            'gamma': {'p': [20.0, 95.0], 't': [140.0, 215.0], 'm': [260.0, 335.0]},
+        },
+        'conformers': [
+            {'name': '1a', 'bin': '33p', 'angles': [81.495, 212.250, 288.831, 294.967, 173.990, 53.550, 81.035]},
+            {'name': '1m', 'bin': '33p', 'angles': [83.513, 218.120, 291.593, 292.247, 222.300, 58.067, 86.093]},
+            {'name': '1L', 'bin': '33p', 'angles': [85.664, 245.014, 268.257, 303.879, 138.164, 61.950, 79.457]},
+            {'name': '&a', 'bin': '33p', 'angles': [82.112, 190.682, 264.945, 295.967, 181.839, 51.455, 81.512]},
+            {'name': '1g', 'bin': '33t', 'angles': [83.000, 229.239, 285.978, 313.054, 158.931, 184.000, 83.000]},
+            {'name': '1b', 'bin': '32p', 'angles': [84.215, 215.014, 288.672, 300.420, 177.476, 58.307, 144.841]},
+            {'name': '2a', 'bin': '23p', 'angles': [145.399, 260.339, 288.756, 288.444, 192.733, 53.097, 84.067]},
+        ],
+    }
+
+
+@pytest.fixture
+def suite_scorer(config, richardson_suites):
+    """Scorer with the small Richardson suite definitions installed."""
+    from scorer2 import Scorer
+
+    scorer = Scorer(config)
+    scorer.richardson_suites = richardson_suites
+    scorer._index_richardson_suites()
+    return scorer
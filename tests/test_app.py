@@ -0,0 +1,286 @@
+"""Tests for the app.py scoring functions - score_pdb, score_motif and score_residue."""
+
+import json
+
+import pandas as pd
+import pytest
+
+from app import (StructureData, filter_motif_data, filter_motifs_data, group_motifs_by_pdb, load_structure,
+                 motif_files, motif_residue_index, score_motif, score_motif_batch, score_pdb, score_residue)
+from scorer2 import Scorer
+from utils.data_loader import DataLoader
+from utils.instrumentation import SilentSink
+from utils.report_generator import ReportGenerator
+from utils.result_cache import ResultCache
+
+
+MOTIF_CIF = """data_{name}
+loop_
+_atom_site.group_PDB
+_atom_site.id
+_atom_site.label_atom_id
+_atom_site.label_comp_id
+_atom_site.auth_seq_id
+_atom_site.auth_asym_id
+{atoms}
+#
+"""
+
+
+@pytest.fixture
+def loader(config, tmp_path, sample_basepair_list, sample_hbond_data):
+    """DataLoader reading a three-pair structure 1TST from tmp_path."""
+    (tmp_path / "basepairs").mkdir()
+    (tmp_path / "hbonds").mkdir()
+    (tmp_path / "basepairs" / "1TST.json").write_text(json.dumps(sample_basepair_list))
+    hbonds = sample_hbond_data.copy()
+    hbonds['res_1'], hbonds['res_2'] = 'A-G-1-', 'A-C-24-'
+    protein = hbonds.iloc[[0]].assign(res_2='B-ARG-5-', res_type_2='PROTEIN')
+    pd.concat([hbonds, protein]).to_csv(tmp_path / "hbonds" / "1TST.csv", index=False)
+    config.BASEPAIR_DIR = str(tmp_path / "basepairs")
+    config.HBOND_DIR = str(tmp_path / "hbonds")
+    config.TORSION_DIR = str(tmp_path / "torsions")
+    return DataLoader(config, events=SilentSink())
+
+
+@pytest.fixture
+def scorer(config):
+    return Scorer(config, events=SilentSink())
+
+
+class TestScoringFunctions:
+    """Tests for in-process scoring without files or exits."""
+
+    def test_score_pdb(self, loader, scorer, tmp_path, monkeypatch):
+        """Test a DataLoader and loaded data give the same report, and nothing is written."""
+        monkeypatch.chdir(tmp_path)
+        before = set(tmp_path.iterdir())
+
+        report = score_pdb(loader, '1TST', scorer=scorer, num_nucleotides=6)
+        structure = load_structure(loader, '1TST', quiet=True)
+
+        assert report['pdb_id'] == '1TST'
+        assert report['total_base_pairs'] == 3
+        assert report['num_nucleotides'] == 6
+        assert all('protein_bindings' in bp for bp in report['basepair_scores'])
+        assert score_pdb(structure, scorer=scorer, num_nucleotides=6) == report
+        assert set(tmp_path.iterdir()) == before
+
+    def test_score_pdb_result_cache(self, loader, scorer, tmp_path):
+        """Test the result cache is filled on the first call and read on the next."""
+        result_cache = ResultCache(tmp_path / "cache", scorer.fingerprint())
+        structure = load_structure(loader, '1TST', quiet=True)
+        messages = []
+
+        first = score_pdb(structure, scorer=scorer, result_cache=result_cache, echo=messages.append)
+        assert result_cache.get(structure.input_hash) is not None
+        assert messages == []
+
+        second = score_pdb(structure, scorer=scorer, result_cache=result_cache, echo=messages.append)
+        assert second == first
+        assert messages[0].startswith("Using cached scores")
+
+    def test_score_motif(self, loader, scorer, tmp_path):
+        """Test motif scoring, with the full-structure report handed over only when computed here."""
+        result_cache = ResultCache(tmp_path / "cache", scorer.fingerprint())
+        structure = load_structure(loader, '1TST', quiet=True)
+        full_reports = []
+
+        motif = score_motif(structure, motif_residues={'A-G-1-', 'A-C-24-', 'A-A-2-', 'A-U-23-'},
+                            start_res=1, end_res=24, chain='A', scorer=scorer, result_cache=result_cache,
+                            on_full_report=full_reports.append)
+        again = score_motif(structure, start_res=1, end_res=2, scorer=scorer, result_cache=result_cache,
+                            on_full_report=full_reports.append)
+
+        assert motif['total_base_pairs'] == 2
+        assert motif['motif_chain'] == 'A'
+        assert len(full_reports) == 1 and full_reports[0]['total_base_pairs'] == 3
+        assert motif['full_structure_score'] == full_reports[0]['overall_score']
+        assert again is None  # no pair lies within residues 1-2
+
+    def test_score_motif_compact_hbonds(self, loader, scorer):
+        """Test motif filtering on the categorical residue columns of the compact H-bond schema."""
+        structure = load_structure(loader, '1TST', quiet=True)
+        messages = []
+
+        motif = score_motif(structure, motif_residues={'A-G-1-', 'A-C-24-'}, start_res=1, end_res=24, chain='A',
+                            scorer=scorer, echo=messages.append)
+        by_range = score_motif(structure, start_res=1, end_res=24, chain='A', scorer=scorer)
+
+        assert structure.hbonds['res_1'].dtype == 'category'
+        assert motif['total_base_pairs'] == 1
+        assert "Filtered to 3 H-bonds in motif" in messages
+        assert by_range['total_base_pairs'] == 3
+
+    def test_score_residue(self, loader, scorer):
+        """Test the base pairs of one residue are reported with their H-bonds."""
+        report = score_residue(loader, 1, '1TST', chain='A', scorer=scorer)
+
+        assert report['num_base_pairs'] == 1
+        assert len(report['base_pairs'][0]['hbond_details']) == 3
+        assert score_residue(loader, 1, '1TST', chain='B', scorer=scorer) is None
+
+    def test_errors(self, loader, scorer):
+        """Test a DataLoader needs a PDB ID and a loadable structure."""
+        with pytest.raises(ValueError):
+            score_pdb(loader, scorer=scorer)
+        with pytest.raises(FileNotFoundError):
+            score_motif(loader, '9XYZ', start_res=1, end_res=5, scorer=scorer)
+
+
+def test_structure_data_defaults(sample_basepair_list, sample_hbond_data):
+    """Test loaded data without an input hash bypasses the result cache."""
+    structure = StructureData('1TST', sample_basepair_list, sample_hbond_data)
+    assert structure.input_hash is None
+    assert structure.all_hbonds is None
+
+
+class TestFilterMotifData:
+    """Tests for the vectorized motif filter against per-row filtering."""
+
+    @pytest.fixture
+    def structure(self):
+        """Synthetic structure with malformed and missing residue IDs mixed in."""
+        from benchmarks.synthetic import make_structure
+
+        basepair_data, hbond_data, _ = make_structure(n_pairs=300, n_hbonds=1500, n_chains=2, seed=3)
+        basepair_data.append({'res_1': 'A-G-x-', 'res_2': basepair_data[0]['res_2']})
+        hbond_data.loc[[2, 7], 'res_1'] = ['bad', None]
+        return basepair_data, hbond_data.iloc[::-1]  # index out of order
+
+    @pytest.mark.parametrize('kwargs', [
+        dict(motif_residues='first_pairs'),
+        dict(motif_residues='first_pairs', chain='A'),
+        dict(motif_residues=set()),
+        dict(start_res=1, end_res=200),
+        dict(start_res=1, end_res=200, chain='B'),
+        dict(start_res=50, end_res=49),
+    ])
+    def test_matches_rowwise(self, structure, kwargs):
+        """Test exact-residue and range filtering select the same rows, in order, as per-row filtering."""
+        from benchmarks.bench_motif_filter import filter_motif_data_rowwise
+
+        basepair_data, hbond_data = structure
+        if kwargs.get('motif_residues') == 'first_pairs':
+            kwargs = dict(kwargs, motif_residues={bp[field] for bp in basepair_data[:25] for field in ('res_1', 'res_2')})
+
+        motif_bps, motif_hbonds = filter_motif_data(basepair_data, hbond_data, **kwargs)
+        expected_bps, expected_hbonds = filter_motif_data_rowwise(basepair_data, hbond_data, **kwargs)
+
+        assert motif_bps == expected_bps
+        assert motif_hbonds.equals(expected_hbonds)
+
+    def test_many_motifs_match_single_filtering(self, structure):
+        """Test one pass over overlapping motifs gives each motif its own filter_motif_data result."""
+        basepair_data, hbond_data = structure
+        residues = sorted({bp[field] for bp in basepair_data for field in ('res_1', 'res_2')})
+        motifs = {i: set(residues[i::5]) for i in range(5)}
+        # Every other residue of both chains, so the chain filter of 'alternate_A' drops pairs
+        motifs.update({'alternate': set(residues[::2]), 'alternate_A': set(residues[::2]), 'empty': set(),
+                       'malformed': {'A-G-x-', basepair_data[0]['res_2'], 'bad'}})
+        chains = {'alternate_A': 'A'}
+
+        result = filter_motifs_data(basepair_data, hbond_data, motifs, chains)
+
+        assert list(result) == list(motifs)
+        for motif_id, motif_residues in motifs.items():
+            expected_bps, expected_hbonds = filter_motif_data(basepair_data, hbond_data, motif_residues=motif_residues,
+                                                              chain=chains.get(motif_id))
+            motif_bps, motif_hbonds = result[motif_id]
+            assert motif_bps == expected_bps
+            assert motif_hbonds.equals(expected_hbonds)
+        assert {bp['res_1'][0] for bp in result['alternate'][0]} == {'A', 'B'}
+        assert 0 < len(result['alternate_A'][0]) < len(result['alternate'][0])
+
+    def test_motif_residue_index(self):
+        """Test each residue maps to every motif containing it."""
+        index = motif_residue_index({'m1': ['A-G-1-', 'A-C-2-'], 'm2': {'A-C-2-'}})
+        assert index == {'A-G-1-': {'m1'}, 'A-C-2-': {'m1', 'm2'}}
+
+    def test_no_motif(self, structure):
+        """Test neither residues nor a range selects nothing."""
+        motif_bps, motif_hbonds = filter_motif_data(*structure)
+        assert motif_bps == [] and motif_hbonds.empty
+        assert list(motif_hbonds.columns) == list(structure[1].columns)
+
+
+@pytest.fixture
+def motif_dir(tmp_path):
+    """Motif CIFs of 1TST (one with base pairs, one without) and of the missing structure 9XYZ."""
+    motifs = {
+        'HAIRPIN-1-GAC-1TST-1': "ATOM 1 P G 1 A\nATOM 2 P A 2 A\nATOM 3 P U 23 A\nATOM 4 P C 24 A",
+        'HAIRPIN-2-GA-1TST-1': "ATOM 1 P G 1 A\nATOM 2 P A 2 A",
+        'HAIRPIN-1-GAC-9XYZ-1': "ATOM 1 P G 1 A\nATOM 2 P C 24 A",
+    }
+    directory = tmp_path / "unique_motifs"
+    directory.mkdir()
+    for name, atoms in motifs.items():
+        (directory / f"{name}.cif").write_text(MOTIF_CIF.format(name=name, atoms=atoms))
+    (directory / "notes.cif").write_text("data_notes\n")
+    return directory
+
+
+class TestMotifBatch:
+    """Tests for scoring many motifs with one structure load per PDB."""
+
+    def test_motif_files(self, motif_dir, tmp_path):
+        """Test list entries (names, paths, name|path) and glob matches are merged without duplicates."""
+        list_file = tmp_path / "motifs.txt"
+        list_file.write_text(
+            "# motifs\n\nHAIRPIN-1-GAC-1TST-1\n"
+            f"{motif_dir / 'HAIRPIN-2-GA-1TST-1.cif'}\n"
+            f"HAIRPIN-1-GAC-9XYZ-1|{motif_dir / 'HAIRPIN-1-GAC-9XYZ-1.cif'}\n"
+        )
+
+        files = motif_files(list_file, str(motif_dir / "*-1TST-*.cif"), motif_dir=str(motif_dir))
+
+        assert [path.stem for path in files] == [
+            'HAIRPIN-1-GAC-1TST-1', 'HAIRPIN-2-GA-1TST-1', 'HAIRPIN-1-GAC-9XYZ-1']
+
+    def test_group_motifs_by_pdb(self, motif_dir):
+        files = motif_files(pattern=str(motif_dir / "*.cif"))
+        groups, unmatched = group_motifs_by_pdb(files)
+
+        assert list(groups) == ['1TST', '9XYZ']
+        assert len(groups['1TST']) == 2
+        assert [path.stem for path in unmatched] == ['notes']
+
+    def test_score_motif_batch(self, loader, scorer, motif_dir, tmp_path, monkeypatch):
+        """Test each structure is loaded once, reports are written, and finished motifs are skipped."""
+        monkeypatch.chdir(tmp_path)
+        groups, _ = group_motifs_by_pdb(motif_files(pattern=str(motif_dir / "*.cif")))
+        loads = []
+        load_basepairs = loader.load_basepairs
+        monkeypatch.setattr(loader, 'load_basepairs',
+                            lambda pdb_id, **kwargs: loads.append(pdb_id) or load_basepairs(pdb_id, **kwargs))
+        scored = []
+        score_basepairs = scorer.score_basepairs
+        report_gen = ReportGenerator(loader.config)
+        reports, csvs = tmp_path / "reports", tmp_path / "motif_csvs"
+
+        with monkeypatch.context() as patched:
+            patched.setattr(scorer, 'score_basepairs',
+                            lambda basepairs, *args, **kwargs: scored.append(len(basepairs))
+                            or score_basepairs(basepairs, *args, **kwargs))
+            patched.setattr(scorer, 'score_structure', lambda *args, **kwargs: pytest.fail("rescored structure"))
+            outcomes = score_motif_batch(groups, loader, scorer, report_gen, reports, csvs,
+                                         echo=lambda message: None)
+
+        assert outcomes == {'scored': 1, 'no_base_pairs': 1, 'no_data': 1}
+        assert loads.count('1TST') == 1
+        # The structure's base pairs are scored once, for both of its motifs
+        assert scored == [len(load_structure(loader, '1TST', quiet=True).basepairs)]
+        report = json.loads((reports / "HAIRPIN-1-GAC-1TST-1.json").read_text())
+        assert report['total_base_pairs'] == 2
+        # Same motif scored alone on the compact (categorical) H-bonds DataLoader returns
+        structure = load_structure(loader, '1TST', quiet=True)
+        assert structure.hbonds['res_1'].dtype == 'category'
+        single = score_motif(structure, motif_residues={'A-G-1-', 'A-A-2-', 'A-U-23-', 'A-C-24-'},
+                             start_res=1, end_res=24, chain='A', scorer=scorer)
+        for field in ('motif_score', 'full_structure_score', 'motif_num_nucleotides', 'motif_range'):
+            assert report[field] == single[field]
+        assert (csvs / "HAIRPIN-1-GAC-1TST-1.csv").exists()
+
+        again = score_motif_batch(groups, loader, scorer, report_gen, reports, csvs, skip_existing=True,
+                                  echo=lambda message: None)
+        assert again['skipped'] == 1 and again['scored'] == 0
@@ -0,0 +1,51 @@
+"""Tests for utils/atom_classifier.py - Base/backbone atom classification."""
+
+import pandas as pd
+from utils.atom_classifier import (
+    is_base_atom, base_base_mask, tag_base_base_hbonds, BASE_BASE_COLUMN
+)
+
+
+class TestAtomClassifier:
+    """Tests for the cached atom classifier."""
+
+    def test_is_base_atom(self):
+        """Test base vs backbone/sugar classification."""
+        for atom in ['N1', 'N2', 'N3', 'N4', 'N6', 'N7', 'O2', 'O4', 'O6', ' N1 ']:
+            assert is_base_atom(atom) is True
+        for atom in ['P', 'OP1', 'OP2', 'O1P', 'PA', "C5'", "O2'", 'C1*', 'O4*', "HO2'"]:
+            assert is_base_atom(atom) is False
+
+    def test_is_base_atom_non_string(self):
+        """Test that missing atom names are treated as non-base."""
+        assert is_base_atom(None) is False
+        assert is_base_atom(float('nan')) is False
+
+    def test_base_base_mask_matches_scalar(self):
+        """Test that the vectorized mask agrees with per-row classification."""
+        hbond_df = pd.DataFrame({
+            'atom_1': ['N1', "O2'", 'N6', 'OP1', 'O6'],
+            'atom_2': ['N3', 'N3', "O4'", 'N7', 'N4'],
+        })
+        mask = base_base_mask(hbond_df)
+
+        expected = [is_base_atom(a1) and is_base_atom(a2)
+                    for a1, a2 in zip(hbond_df['atom_1'], hbond_df['atom_2'])]
+        assert mask.tolist() == expected
+
+    def test_tag_base_base_hbonds(self):
+        """Test tagging adds the column once and the mask then reads it."""
+        hbond_df = pd.DataFrame({'atom_1': ['N1', "O2'"], 'atom_2': ['N3', 'N3']})
+        tagged = tag_base_base_hbonds(hbond_df)
+
+        assert tagged is hbond_df
+        assert tagged[BASE_BASE_COLUMN].tolist() == [True, False]
+
+        # Mask should come from the column, not re-derived from atoms
+        tagged.loc[0, BASE_BASE_COLUMN] = False
+        assert base_base_mask(tagged).tolist() == [False, False]
+
+    def test_tag_skips_frames_without_atoms(self):
+        """Test that frames without atom columns are returned untouched."""
+        hbond_df = pd.DataFrame({'res_1': ['A-G-1-'], 'res_2': ['A-C-9-']})
+        assert BASE_BASE_COLUMN not in tag_base_base_hbonds(hbond_df).columns
@@ -0,0 +1,108 @@
+"""Tests for utils/basepair_stream.py - Streaming base pair JSON reader."""
+
+import json
+
+import pytest
+
+from utils.basepair_stream import (BasepairFormatError, BasepairStream, basepair_records, is_stacking,
+                                   iter_basepair_file)
+
+
+BASE_PAIRS = [
+    {'res_1': 'A-G-1-', 'res_2': 'A-C-20-', 'bp_type': 'G-C', 'shear': -0.125, 'stretch': 1e-07},
+    {'res_1': 'A-U-5-', 'res_2': 'A-A-6-', 'bp_type': 'U-A', 'shear': 12345.678, 'note': 'x]},{'},
+    {'res_1': 'A-C-3-', 'res_2': 'B-G-4-', 'bp_type': 'C-G', 'shear': None, 'hbond_score': -2.5E+3},
+    {'res_1': 'bad', 'res_2': 'A-C-2-', 'bp_type': 'G-C', 'flags': [1, 2.5, True, None]},
+]
+
+
+class TestIterBasepairFile:
+    """Tests for incremental parsing of base pair files."""
+
+    @pytest.mark.parametrize('layout', ['list', 'dict'])
+    @pytest.mark.parametrize('chunk_chars', [1, 3, 64, 1 << 16])
+    def test_matches_json_load(self, tmp_path, layout, chunk_chars):
+        """Test every record is read, whichever layout and however the chunks split values."""
+        data = BASE_PAIRS if layout == 'list' else {
+            'meta': {'pdb': '1ABC', 'nested': [{'base_pairs': 'not this one'}]},
+            'base_pairs': BASE_PAIRS,
+            'count': 4,
+        }
+        path = tmp_path / 'TEST.json'
+        path.write_text(json.dumps(data, indent=2))
+
+        assert list(iter_basepair_file(path, chunk_chars)) == BASE_PAIRS
+
+    @pytest.mark.parametrize('text', ['[]', ' [ ] ', '{}', '{"pdb": "1ABC"}'])
+    def test_empty(self, tmp_path, text):
+        """Test files without base pairs give no records."""
+        path = tmp_path / 'TEST.json'
+        path.write_text(text)
+        assert list(iter_basepair_file(path)) == []
+
+    @pytest.mark.parametrize('text, error', [
+        ('"text"', BasepairFormatError),
+        ('42', BasepairFormatError),
+        ('{"base_pairs": null}', BasepairFormatError),
+        ('', json.JSONDecodeError),
+        ('not json', json.JSONDecodeError),
+        ('[{"res_1": "A-G-1-"}', json.JSONDecodeError),
+        ('[{"res_1": "A-G-1-"}] []', json.JSONDecodeError),
+    ])
+    def test_errors(self, tmp_path, text, error):
+        """Test other JSON values are format errors and broken JSON raises JSONDecodeError."""
+        path = tmp_path / 'TEST.json'
+        path.write_text(text)
+        with pytest.raises(error):
+            list(iter_basepair_file(path))
+
+
+class TestBasepairStream:
+    """Tests for filtering base pairs as they are read."""
+
+    def test_stacking_filter(self, tmp_path):
+        """Test stacking pairs are dropped and counted, with keys attached to the rest."""
+        path = tmp_path / 'TEST.json'
+        path.write_text(json.dumps({'base_pairs': BASE_PAIRS}))
+        stream = BasepairStream(path, exclude=is_stacking)
+
+        records = list(stream)
+
+        # A-U-5-/A-A-6- and A-C-3-/B-G-4- are stacking; 'bad' does not parse and is kept
+        assert [bp['res_1'] for bp in records] == ['A-G-1-', 'bad']
+        assert (stream.read, stream.excluded) == (4, 2)
+        assert records[0]['key_1'].number == 1
+        assert records[1]['key_1'] is None
+
+    def test_stacking_with_negative_residue_numbers(self):
+        """Test negative residue numbers parse, so pairs adjacent across 0 or below it are stacking."""
+        data = [{'res_1': 'A-G--1-', 'res_2': 'A-C-0-'},
+                {'res_1': 'A-G--3-', 'res_2': 'A-C--2-'},
+                {'res_1': 'A-G--3-', 'res_2': 'A-C-5-'}]
+        stream = BasepairStream(data, exclude=is_stacking)
+
+        assert [bp['res_2'] for bp in stream] == ['A-C-5-']
+        assert stream.excluded == 2
+
+    def test_parsed_data(self):
+        """Test already parsed lists and dicts are streamed the same way."""
+        for data in (BASE_PAIRS, {'base_pairs': BASE_PAIRS}):
+            data = json.loads(json.dumps(data))
+            assert len(list(BasepairStream(data, exclude=is_stacking))) == 2
+
+    def test_records_read_lazily(self, tmp_path):
+        """Test a record is parsed only when the stream reaches it."""
+        path = tmp_path / 'TEST.json'
+        path.write_text(json.dumps(BASE_PAIRS) + ' trailing garbage')
+        stream = iter(BasepairStream(path))
+
+        assert next(stream)['res_1'] == 'A-G-1-'
+        with pytest.raises(json.JSONDecodeError):
+            list(stream)
+
+    def test_basepair_records_rejects_other_values(self):
+        """Test values that are neither lists nor base pair dicts raise BasepairFormatError."""
+        with pytest.raises(BasepairFormatError):
+            basepair_records('text')
+        with pytest.raises(BasepairFormatError):
+            basepair_records({'base_pairs': None})
@@ -0,0 +1,112 @@
+"""Tests for utils/cif_counter.py - Streaming mmCIF nucleotide counter."""
+
+import gzip
+
+import pytest
+
+from utils.cif_counter import (CifFormatError, count_nucleotides, count_nucleotides_in_bytes,
+                               count_nucleotides_in_file, iter_atom_site, split_fields)
+
+
+HEADER = """data_TEST
+#
+_entry.id TEST
+#
+loop_
+_atom_site.group_PDB
+_atom_site.id
+_atom_site.label_atom_id
+_atom_site.label_comp_id
+_atom_site.label_asym_id
+_atom_site.label_seq_id
+_atom_site.pdbx_PDB_ins_code
+_atom_site.auth_seq_id
+_atom_site.auth_asym_id
+"""
+
+ROWS = """ATOM 1 "O5'" G A 1 ? 10 X
+ATOM 2 P G A 1 ? 10 X
+ATOM 3 P U A 2 ? 11 X
+ATOM 4 P U A 2 A 11 X
+HETATM 5 P PSU B . ? 30 Y
+HETATM 6 P PSU B . ? 31 Y
+ATOM 7 CA ALA C 1 ? 1 Z
+#
+loop_
+_atom_site_anisotrop.id
+1
+"""
+
+CIF = HEADER + ROWS
+
+
+class TestSplitFields:
+    """Tests for tokenizing data rows."""
+
+    def test_plain(self):
+        """Test only the requested leading values are returned."""
+        assert split_fields('ATOM 1 P G A 1', 3) == ['ATOM', '1', 'P']
+        assert split_fields('ATOM 1', 3) == ['ATOM', '1']
+
+    def test_quoted(self):
+        """Test quoted values are unquoted and may contain spaces or the other quote."""
+        assert split_fields("""ATOM "O5'" 'a b' C5'""", 4) == ['ATOM', "O5'", 'a b', "C5'"]
+
+
+class TestCountNucleotides:
+    """Tests for counting RNA residues."""
+
+    def test_counts_distinct_residues(self):
+        """Test residues are keyed by auth chain, number and insertion code; proteins are skipped."""
+        # G10, U11, U11A, PSU30, PSU31 (label_seq_id '.' would merge the PSUs)
+        assert count_nucleotides(CIF.splitlines(True)) == 5
+
+    def test_standard_u_counted(self):
+        """Test standard U residues are RNA (the residue set used to lack a comma after 'U')."""
+        rows = "ATOM 1 P U A 1 ? 1 A\n#\n"
+        assert count_nucleotides((HEADER + rows).splitlines(True)) == 1
+
+    def test_column_order_from_header(self):
+        """Test columns are found by name, whatever their position."""
+        cif = "loop_\n_atom_site.label_comp_id\n_atom_site.auth_seq_id\n_atom_site.auth_asym_id\nG 1 A\nC 2 A\n"
+        assert count_nucleotides(cif.splitlines(True)) == 2
+
+    def test_label_fallback(self):
+        """Test label_* columns are used when a file has no auth_* columns."""
+        cif = "loop_\n_atom_site.label_comp_id\n_atom_site.label_asym_id\n_atom_site.label_seq_id\nG A 1\nG A 2\n"
+        assert count_nucleotides(cif.splitlines(True)) == 2
+
+    def test_no_atom_site(self):
+        """Test files without an _atom_site loop have no nucleotides."""
+        assert count_nucleotides(['data_TEST\n', '#\n']) == 0
+
+    def test_missing_column(self):
+        """Test a loop without a residue number column is a format error."""
+        cif = "loop_\n_atom_site.label_comp_id\n_atom_site.auth_asym_id\nG A\n"
+        with pytest.raises(CifFormatError):
+            count_nucleotides(cif.splitlines(True))
+
+    def test_stops_at_end_of_loop(self):
+        """Test lines after the _atom_site loop are not read."""
+        lines = iter((CIF + 'ATOM 8 P G A 9 ? 99 X\n').splitlines(True))
+        assert len(list(iter_atom_site(lines, [('auth_seq_id',)]))) == 7
+        assert next(lines) == 'loop_\n'
+
+
+class TestSources:
+    """Tests for counting files and in-memory contents."""
+
+    def test_bytes(self):
+        """Test plain and gzip-compressed bytes give the same count."""
+        assert count_nucleotides_in_bytes(CIF.encode()) == 5
+        assert count_nucleotides_in_bytes(gzip.compress(CIF.encode())) == 5
+
+    def test_files(self, tmp_path):
+        """Test plain and gzip-compressed files give the same count."""
+        plain = tmp_path / 'TEST.cif'
+        plain.write_text(CIF)
+        compressed = tmp_path / 'TEST.cif.gz'
+        compressed.write_bytes(gzip.compress(CIF.encode()))
+
+        assert count_nucleotides_in_file(plain) == 5
+        assert count_nucleotides_in_file(compressed) == 5
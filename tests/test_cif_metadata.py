@@ -0,0 +1,148 @@
+"""Tests for utils/cif_metadata.py - Offline metadata from mmCIF headers."""
+
+import gzip
+
+from utils.cif_metadata import extract_directory, metrics_from_categories, read_categories, read_cif_metadata
+
+
+HEADER = """data_1ABC
+#
+_entry.id 1ABC
+#
+_exptl.entry_id 1ABC
+_exptl.method 'X-RAY DIFFRACTION'
+#
+_refine.entry_id  1ABC
+_refine.ls_d_res_high   2.50
+_refine.ls_R_factor_R_free  0.2512
+_refine.ls_R_factor_R_work\t0.2011
+_refine.B_iso_mean ?
+_refine.details
+;Text that looks like
+_a.tag on its own line
+;
+#
+_pdbx_database_status.recvd_initial_deposition_date
+2020-01-15
+#
+loop_
+_software.name
+_software.version
+_software.classification
+PHENIX 1.19 refinement
+'Coot' . 'model building'
+#
+loop_
+_citation.id
+_citation.year
+_citation.title
+primary 2021
+;A title
+on two lines
+;
+#
+loop_
+_pdbx_audit_revision_history.ordinal
+_pdbx_audit_revision_history.major_revision
+_pdbx_audit_revision_history.minor_revision
+_pdbx_audit_revision_history.revision_date
+1 1 0 2021-03-01
+2 1 1 2022-05-04
+#
+"""
+
+COORDINATES = """loop_
+_atom_site.group_PDB
+_atom_site.label_comp_id
+_atom_site.auth_seq_id
+_atom_site.auth_asym_id
+ATOM G 1 A
+ATOM U 2 A
+ATOM ALA 1 B
+#
+"""
+
+CIF = HEADER + COORDINATES
+
+
+class TestReadCategories:
+    """Tests for reading selected categories."""
+
+    def test_layouts(self):
+        """Test key-value pairs, loops, next-line values and text fields."""
+        categories = read_categories(CIF.splitlines(True))
+
+        assert categories['refine'][0]['ls_R_factor_R_work'] == '0.2011'
+        assert categories['refine'][0]['details'].startswith('Text that looks like')
+        assert categories['pdbx_database_status'] == [{'recvd_initial_deposition_date': '2020-01-15'}]
+        assert categories['software'][1] == {'name': 'Coot', 'version': '.', 'classification': 'model building'}
+        assert categories['citation'][0]['title'] == 'A title\non two lines'
+        assert 'entry' not in categories and 'a' not in categories
+
+    def test_stops_at_coordinates(self):
+        """Test the _atom_site loop is not read unless asked for."""
+        assert 'atom_site' not in read_categories(CIF.splitlines(True), {'atom_site'})
+        rows = read_categories(CIF.splitlines(True), {'atom_site'}, stop_prefix=None)['atom_site']
+        assert [row['label_comp_id'] for row in rows] == ['G', 'U', 'ALA']
+
+
+class TestMetrics:
+    """Tests for the get_validation_metrics-shaped result."""
+
+    def test_xray(self, tmp_path):
+        """Test X-ray metadata fields and types."""
+        path = tmp_path / '1ABC.cif'
+        path.write_text(CIF)
+
+        metrics = read_cif_metadata(path)
+
+        assert metrics == {
+            'Structure Determination Method': 'X-RAY DIFFRACTION',
+            'Experimental_method': 'X-ray',
+            'EM Resolution (Å)': None,
+            'EM Diffraction Resolution (Å)': 2.5,
+            'Deposition_Date': '2020-01-15',
+            'R_free': 0.2512,
+            'R_work': 0.2011,
+            'Refinement_resolution': 2.5,
+            'Average_B_factor': None,
+            'Publication_Year': 2021,
+            'Software_used': 'PHENIX 1.19, Coot',
+            'Revision_Date': '2022-05-04',
+            'Major_Revision': 1,
+            'Minor_Revision': 1,
+        }
+
+    def test_em(self):
+        """Test EM structures report the reconstruction resolution."""
+        metrics = metrics_from_categories({
+            'exptl': [{'method': 'ELECTRON MICROSCOPY'}],
+            'em_3d_reconstruction': [{'resolution': '3.1'}],
+        })
+        assert metrics['Experimental_method'] == 'EM'
+        assert metrics['EM Resolution (Å)'] == 3.1
+        assert metrics['EM Diffraction Resolution (Å)'] is None
+        assert 'R_free' not in metrics
+
+    def test_multiple_methods(self):
+        """Test entries with several methods are reported as such."""
+        metrics = metrics_from_categories({'exptl': [{'method': 'X-RAY DIFFRACTION'},
+                                                     {'method': 'NEUTRON DIFFRACTION'}]})
+        assert metrics['Experimental_method'] == 'Multiple methods'
+
+
+def test_extract_directory(tmp_path):
+    """Test the bulk pass reads plain and gzip files, with nucleotide counts."""
+    (tmp_path / '1ABC.cif').write_text(CIF)
+    (tmp_path / '2xyz.cif.gz').write_bytes(gzip.compress(CIF.encode()))
+    (tmp_path / '3BAD.cif').write_bytes(b'\x1f\x8bnot gzip')
+
+    results = extract_directory(tmp_path, workers=2, nucleotides=True)
+
+    assert results['1ABC']['num_nucleotides'] == 2
+    assert results['2XYZ']['metrics']['R_free'] == 0.2512
+    assert results['3BAD'] == {'metrics': None, 'num_nucleotides': None}
+
+    results = extract_directory(tmp_path, ['2XYZ', '9NOP'], workers=1)
+    assert list(results) == ['2XYZ']
+    assert results['2XYZ']['num_nucleotides'] is None
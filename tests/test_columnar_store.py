@@ -0,0 +1,117 @@
+"""Tests for utils/columnar_store.py - Binary columnar copies of structure inputs."""
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils import columnar_store
+from utils.data_loader import DataLoader
+from utils.instrumentation import SilentSink
+
+
+def round_trip(value):
+    blob = columnar_store.encode(value)
+    assert blob is not None
+    return columnar_store.decode(blob)
+
+
+class TestEncoding:
+    """Tests for lossless encode/decode round trips."""
+
+    def test_records_round_trip(self):
+        """Test mixed numbers, nulls, absent keys and nested values survive unchanged."""
+        records = [
+            {'res_1': 'A-G-1-', 'shear': 0, 'flag': True, 'extra': {'a': [1, 2]}},
+            {'res_1': 'A-C-2-', 'shear': 0.5, 'flag': False, 'note': 'x'},
+            {'res_1': None, 'shear': None, 'flag': True, 'extra': None},
+        ]
+        decoded = round_trip(records)
+        assert decoded == records
+        assert [type(r['shear']) for r in decoded] == [int, float, type(None)]
+        assert [list(r) for r in decoded] == [list(r) for r in records]
+
+    def test_records_do_not_share_nested_values(self):
+        """Test equal nested values decode to separate objects."""
+        decoded = round_trip([{'extra': [1]}, {'extra': [1]}])
+        decoded[0]['extra'].append(2)
+        assert decoded[1]['extra'] == [1]
+
+    def test_mapping_round_trip(self):
+        """Test torsion-style dicts keep their keys and key order."""
+        torsions = {'A-G-1-': {'chi': -160.5, 'alpha': None}, 'A-C-2-': {}, 'A-U-3-': {'chi': 60}}
+        decoded = round_trip(torsions)
+        assert decoded == torsions
+        assert list(decoded) == list(torsions)
+
+    def test_frame_round_trip(self):
+        """Test numeric and string columns, including missing strings, keep values and dtypes."""
+        df = pd.DataFrame({
+            'res_1': ['A-G-1-', 'A-C-2-', 'A-G-1-'],
+            'atom_1': ['N1', None, 'O6'],
+            'distance': [2.9, 3.1, np.nan],
+            'count': np.array([1, 2, 3], dtype=np.int64),
+        })
+        decoded = round_trip(df)
+        pd.testing.assert_frame_equal(decoded, df)
+
+    def test_unsupported_values(self):
+        """Test values the format cannot hold losslessly are refused."""
+        assert columnar_store.encode([{'a': 1, 'b': 2}, {'b': 3, 'a': 4}]) is None
+        assert columnar_store.encode(pd.DataFrame({'x': [1]}, index=[5])) is None
+        assert columnar_store.encode('text') is None
+
+    def test_bad_magic(self):
+        """Test decoding something else raises ValueError."""
+        with pytest.raises(ValueError):
+            columnar_store.decode(b'not a blob at all')
+
+
+class TestDataLoaderBinary:
+    """Tests for DataLoader's use of binary copies."""
+
+    def _write_structure(self, tmp_path, config):
+        for name in ('basepairs', 'hbonds', 'torsions'):
+            (tmp_path / name).mkdir()
+        basepairs = [{'res_1': 'A-G-1-', 'res_2': 'A-C-20-', 'bp_type': 'G-C', 'lw': 'cWW', 'shear': 0.1}]
+        (tmp_path / 'basepairs' / '1ABC.json').write_text(json.dumps(basepairs))
+        pd.DataFrame([{'res_1': 'A-G-1-', 'res_2': 'A-C-20-', 'atom_1': 'N1', 'atom_2': 'N3',
+                       'res_type_1': 'RNA', 'res_type_2': 'RNA'}]).to_csv(
+            tmp_path / 'hbonds' / '1ABC.csv', index=False)
+        (tmp_path / 'torsions' / '1ABC.json').write_text(json.dumps({'A-G-1-': {'chi': -160.0}}))
+        config.BASEPAIR_DIR = str(tmp_path / 'basepairs')
+        config.HBOND_DIR = str(tmp_path / 'hbonds')
+        config.TORSION_DIR = str(tmp_path / 'torsions')
+        config.BINARY_DIR = str(tmp_path / 'binary')
+
+    def test_loads_match_text(self, config, tmp_path):
+        """Test loads through binary copies equal loads from the text files."""
+        self._write_structure(tmp_path, config)
+        text = DataLoader(config, events=SilentSink())
+        expected = (text.load_basepairs('1ABC', quiet=True), text.load_all_hbonds('1ABC', quiet=True),
+                    text.load_torsions('1ABC', quiet=True))
+
+        assert set(text.convert_to_binary('1ABC').values()) == {'written'}
+        assert set(text.convert_to_binary('1ABC').values()) == {'current'}
+
+        events = SilentSink()
+        binary = DataLoader(config, events=events)
+        assert binary.load_basepairs('1ABC', quiet=True) == expected[0]
+        pd.testing.assert_frame_equal(binary.load_all_hbonds('1ABC', quiet=True), expected[1])
+        assert binary.load_torsions('1ABC', quiet=True) == expected[2]
+        assert events.calls['read_binary'] == 3
+
+    def test_stale_copy_is_ignored(self, config, tmp_path):
+        """Test a binary copy older than its source is not used."""
+        self._write_structure(tmp_path, config)
+        loader = DataLoader(config, events=SilentSink())
+        loader.convert_to_binary('1ABC')
+
+        torsion_file = tmp_path / 'torsions' / '1ABC.json'
+        torsion_file.write_text(json.dumps({'A-G-1-': {'chi': 60.0}}))
+        stat = loader.binary_path('torsions', torsion_file).stat()
+        os.utime(torsion_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+        assert DataLoader(config, events=SilentSink()).load_torsions('1ABC', quiet=True) == {'A-G-1-': {'chi': 60.0}}
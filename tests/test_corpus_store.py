@@ -0,0 +1,113 @@
+"""Tests for utils/corpus_store.py - Packed single-file corpus store."""
+
+import json
+
+import pandas as pd
+
+from utils.corpus_store import CorpusStore, CorpusWriter
+from utils.data_loader import INPUT_KINDS, DataLoader
+from utils.instrumentation import SilentSink
+from utils.result_cache import hash_files
+
+
+def write_structure(root, pdb_id, n, torsions=True):
+    basepairs = [{'res_1': f'A-G-{i}-', 'res_2': f'A-C-{i + 20}-', 'bp_type': 'G-C', 'lw': 'cWW'}
+                 for i in range(1, n + 1)]
+    (root / 'basepairs' / f'{pdb_id}.json').write_text(json.dumps(basepairs))
+    pd.DataFrame([{'res_1': 'A-G-1-', 'res_2': 'A-C-21-', 'atom_1': 'N1', 'atom_2': 'N3',
+                   'res_type_1': 'RNA', 'res_type_2': 'RNA'},
+                  {'res_1': 'A-G-2-', 'res_2': 'B-LYS-5-', 'atom_1': 'O6', 'atom_2': 'NZ',
+                   'res_type_1': 'RNA', 'res_type_2': 'PROTEIN'}]).to_csv(
+        root / 'hbonds' / f'{pdb_id}.csv', index=False)
+    if torsions:
+        (root / 'torsions' / f'{pdb_id}.json').write_text(json.dumps({'A-G-1-': {'chi': -160.0}}))
+
+
+def pack(loader, root, pdb_ids, shard_mb=64):
+    """Pack structures the way pack_corpus.py does."""
+    writer = CorpusWriter(root / 'corpus', shard_mb=shard_mb)
+    for pdb_id in pdb_ids:
+        paths = loader.input_files(pdb_id)
+        blobs = {kind: loader.encode_input(kind, path) if path.exists() else None
+                 for kind, path in zip(INPUT_KINDS, paths)}
+        writer.add_structure(pdb_id, blobs, input_fingerprint=hash_files(paths))
+    writer.close()
+    return writer
+
+
+class TestCorpusStore:
+    """Tests for building, reading and verifying a packed store."""
+
+    def _setup(self, tmp_path, config):
+        for name in ('basepairs', 'hbonds', 'torsions'):
+            (tmp_path / name).mkdir()
+        write_structure(tmp_path, '1ABC', 3)
+        write_structure(tmp_path, '2XYZ', 5, torsions=False)
+        config.BASEPAIR_DIR = str(tmp_path / 'basepairs')
+        config.HBOND_DIR = str(tmp_path / 'hbonds')
+        config.TORSION_DIR = str(tmp_path / 'torsions')
+        return DataLoader(config, events=SilentSink())
+
+    def test_loader_reads_packed_structures(self, config, tmp_path):
+        """Test loads through the store equal loads from the files, without touching them."""
+        files = self._setup(tmp_path, config)
+        expected = {pdb_id: (files.load_basepairs(pdb_id, quiet=True), files.load_all_hbonds(pdb_id, quiet=True),
+                             files.load_torsions(pdb_id, quiet=True), files.input_fingerprint(pdb_id))
+                    for pdb_id in ('1ABC', '2XYZ')}
+        pack(files, tmp_path, ['1ABC', '2XYZ'])
+
+        for name in ('basepairs', 'hbonds', 'torsions'):
+            for path in (tmp_path / name).iterdir():
+                path.unlink()
+        config.CORPUS_DIR = str(tmp_path / 'corpus')
+        events = SilentSink()
+        loader = DataLoader(config, events=events)
+        assert loader.corpus.pdb_ids() == ['1ABC', '2XYZ']
+
+        for pdb_id, (basepairs, hbonds, torsions, fingerprint) in expected.items():
+            assert loader.load_basepairs(pdb_id.lower(), quiet=True) == basepairs
+            pd.testing.assert_frame_equal(loader.load_all_hbonds(pdb_id, quiet=True), hbonds)
+            assert len(loader.load_hbonds(pdb_id, quiet=True)) == 1
+            assert loader.load_torsions(pdb_id, quiet=True) == torsions
+            assert loader.input_fingerprint(pdb_id) == fingerprint
+        assert expected['2XYZ'][2] is None  # recorded as absent, not looked up on disk
+        assert events.calls['read_corpus'] == 5
+
+    def test_unpacked_structure_falls_back_to_files(self, config, tmp_path):
+        """Test structures the store does not hold are read from the data files."""
+        files = self._setup(tmp_path, config)
+        pack(files, tmp_path, ['1ABC'])
+        config.CORPUS_DIR = str(tmp_path / 'corpus')
+        loader = DataLoader(config, events=SilentSink())
+        assert loader.load_basepairs('2XYZ', quiet=True) == files.load_basepairs('2XYZ', quiet=True)
+
+    def test_shards_and_rebuild(self, config, tmp_path):
+        """Test entries spread over shards and a rebuild removes the old shards."""
+        files = self._setup(tmp_path, config)
+        first = pack(files, tmp_path, ['1ABC', '2XYZ'], shard_mb=1e-6)
+        assert len(first.shards) > 1
+        store = CorpusStore(tmp_path / 'corpus')
+        assert store.verify() == []
+        assert store.read(store.lookup('2XYZ', 'basepairs'))[0]['res_1'] == 'A-G-1-'
+
+        second = pack(files, tmp_path, ['1ABC'])
+        assert sorted(p.name for p in (tmp_path / 'corpus').glob('*.pack')) == second.shards
+        assert CorpusStore(tmp_path / 'corpus').pdb_ids() == ['1ABC']
+
+    def test_verify_detects_corruption(self, config, tmp_path):
+        """Test a modified shard fails its checksum."""
+        files = self._setup(tmp_path, config)
+        writer = pack(files, tmp_path, ['1ABC'])
+        store = CorpusStore(tmp_path / 'corpus')
+        entry = store.lookup('1ABC', 'torsions')
+
+        shard = tmp_path / 'corpus' / writer.shards[entry.shard]
+        data = bytearray(shard.read_bytes())
+        data[entry.offset + entry.length - 1] ^= 0xFF
+        shard.write_bytes(bytes(data))
+        assert CorpusStore(tmp_path / 'corpus').verify() == ['1ABC torsions: checksum mismatch']
+
+    def test_open_without_store(self, tmp_path):
+        """Test an unset or empty store location opens nothing."""
+        assert CorpusStore.open(None) is None
+        assert CorpusStore.open(tmp_path) is None
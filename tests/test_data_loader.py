@@ -2,10 +2,35 @@
 
 import pytest
 import json
+import numpy as np
 import pandas as pd
 from pathlib import Path
 from unittest.mock import Mock, patch, MagicMock
 from utils.data_loader import DataLoader
+from utils.hbond_table import HBOND_SCHEMA, read_hbond_csv
+
+# Columns DataLoader adds to the parsed H-bond CSV
+DERIVED_COLUMNS = ['is_base_base']
+
+# Minimal mmCIF: two atoms of G1, U2, a protein residue and U2 again in model 2
+ATOM_SITE_CIF = """data_TEST
+#
+loop_
+_atom_site.group_PDB
+_atom_site.id
+_atom_site.label_atom_id
+_atom_site.label_comp_id
+_atom_site.auth_seq_id
+_atom_site.auth_asym_id
+_atom_site.pdbx_PDB_model_num
+ATOM 1 "O5'" G 1 A 1
+ATOM 2 P G 1 A 1
+ATOM 3 P U 2 A 1
+HETATM 4 P PSU 3 A 1
+ATOM 5 CA ALA 1 B 1
+ATOM 6 P U 2 A 2
+#
+"""
 
 
 class TestDataLoader:
@@ -191,6 +216,8 @@ class TestDataLoader:
         assert len(result) == 1
         assert result.iloc[0]['res_type_1'] == 'RNA'
         assert result.iloc[0]['res_type_2'] == 'RNA'
+        # Base-base classification is attached at load time
+        assert bool(result.iloc[0]['is_base_base']) is True
 
     def test_load_all_hbonds(self, config, tmp_path):
         """Test loading all H-bonds including RNA-protein."""
@@ -238,26 +265,28 @@ class TestDataLoader:
         # DataLoader doesn't have an is_base_atom method
         pass
 
-    @patch('utils.data_loader.requests.get')
-    def test_download_cif_success(self, mock_get, config):
+    @patch('utils.rcsb_client.requests.Session.get')
+    def test_download_cif_success(self, mock_get, config, tmp_path):
         """Test successful CIF file download."""
         # Mock successful response
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.text = "# CIF file content"
+        mock_response.content = b"# CIF file content"
         mock_get.return_value = mock_response
 
         loader = DataLoader(config)
-        result = loader.download_cif("TEST", "test_output.cif")
+        output = tmp_path / "test_output.cif"
+        result = loader.download_cif("TEST", str(output))
 
         assert result is True
+        assert output.read_bytes() == b"# CIF file content"
         mock_get.assert_called_once_with(
             "https://files.rcsb.org/download/TEST.cif",
             timeout=30
         )
 
-    @patch('utils.data_loader.requests.get')
-    def test_download_cif_failure(self, mock_get, config):
+    @patch('utils.rcsb_client.requests.Session.get')
+    def test_download_cif_failure(self, mock_get, config, tmp_path):
         """Test failed CIF file download."""
         # Mock failed response
         mock_response = Mock()
@@ -265,38 +294,63 @@ class TestDataLoader:
         mock_get.return_value = mock_response
 
         loader = DataLoader(config)
-        result = loader.download_cif("NONEXISTENT", "test_output.cif")
+        result = loader.download_cif("NONEXISTENT", str(tmp_path / "test_output.cif"))
 
         assert result is False
 
-    # Note: count_nucleotides_from_cif test removed - requires complex CIF format with 20+ columns
-    # The function is tested indirectly through integration tests with real CIF files
-
-    @patch.object(DataLoader, 'download_cif')
-    @patch.object(DataLoader, 'count_nucleotides_from_cif')
-    def test_get_nucleotide_count(self, mock_count, mock_download, config):
-        """Test getting nucleotide count (download + count)."""
-        mock_download.return_value = True
-        mock_count.return_value = 75
+    @patch('utils.rcsb_client.requests.Session.get')
+    def test_get_nucleotide_count(self, mock_get, config, tmp_path):
+        """Test the downloaded CIF is counted in memory, without a file on disk."""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.content = ATOM_SITE_CIF.encode()
+        mock_get.return_value = mock_response
 
         loader = DataLoader(config)
         count = loader.get_nucleotide_count("TEST")
 
-        assert count == 75
-        mock_download.assert_called_once()
-        mock_count.assert_called_once()
+        assert count == 3
+        assert not Path("temp_structure.cif").exists()
 
-    @patch.object(DataLoader, 'download_cif')
-    def test_get_nucleotide_count_download_fails(self, mock_download, config):
+    @patch.object(DataLoader, 'fetch_cif')
+    def test_get_nucleotide_count_download_fails(self, mock_fetch, config):
         """Test nucleotide count when download fails."""
-        mock_download.return_value = False
+        mock_fetch.return_value = None
 
         loader = DataLoader(config)
         count = loader.get_nucleotide_count("NONEXISTENT")
 
         assert count == 0
 
-    @patch('utils.data_loader.requests.get')
+    def test_count_nucleotides_from_cif_file(self, config, tmp_path):
+        """Test local plain and gzip-compressed CIF files give the same count."""
+        import gzip
+        plain = tmp_path / "TEST.cif"
+        plain.write_text(ATOM_SITE_CIF)
+        compressed = tmp_path / "TEST.cif.gz"
+        compressed.write_bytes(gzip.compress(ATOM_SITE_CIF.encode()))
+
+        loader = DataLoader(config)
+        assert loader.count_nucleotides_from_cif(plain) == 3
+        assert loader.count_nucleotides_from_cif(str(compressed)) == 3
+        assert loader.count_nucleotides_from_cif(tmp_path / "missing.cif") == 0
+
+    def test_get_local_metadata(self, config, tmp_path):
+        """Test metadata is read from a local mmCIF header when the file exists."""
+        config.CIF_DIR = str(tmp_path)
+        (tmp_path / "1ABC.cif").write_text(
+            "data_1ABC\n_exptl.method 'SOLUTION NMR'\n"
+            "_pdbx_database_status.recvd_initial_deposition_date 2019-05-01\n#\n"
+        )
+
+        loader = DataLoader(config)
+        metrics = loader.get_local_metadata("1abc")
+
+        assert metrics['Experimental_method'] == 'NMR'
+        assert metrics['Deposition_Date'] == '2019-05-01'
+        assert loader.get_local_metadata("9XYZ") is None
+
+    @patch('utils.rcsb_client.requests.Session.get')
     def test_get_validation_metrics_success(self, mock_get, config):
         """Test fetching validation metrics from RCSB API."""
         # Mock API response
@@ -327,7 +381,7 @@ class TestDataLoader:
         assert metrics['EM Diffraction Resolution (Å)'] == 2.5
         assert metrics['Deposition_Date'] == '2020-01-15'
 
-    @patch('utils.data_loader.requests.get')
+    @patch('utils.rcsb_client.requests.Session.get')
     def test_get_validation_metrics_failure(self, mock_get, config):
         """Test fetching validation metrics when API fails."""
         mock_response = Mock()
@@ -379,3 +433,86 @@ class TestDataLoader:
         assert result is not None
         assert len(result) == 1
         assert result[0]['bp_type'] == 'G-C'
+
+
+class TestHBondTable:
+    """Tests for single-parse H-bond loading."""
+
+    @pytest.fixture
+    def hbond_file(self, tmp_path):
+        hbond_dir = tmp_path / "hbonds"
+        hbond_dir.mkdir()
+        rows = [
+            ('A-G-1-', 'B-ARG-5-', 'RNA', 'PROTEIN', 3.1),
+            ('A-G-1-', 'A-C-20-', 'RNA', 'RNA', 2.9),
+            ('C-MG-1-', 'A-U-4-', 'LIGAND', 'RNA', 2.5),
+            ('A-U-2-', 'A-A-19-', 'RNA', 'RNA', 3.0),
+        ]
+        test_data = pd.DataFrame(rows, columns=['res_1', 'res_2', 'res_type_1', 'res_type_2', 'distance'])
+        test_data['atom_1'] = 'N1'
+        test_data['atom_2'] = 'N3'
+        test_data.to_csv(hbond_dir / "TEST.csv", index=False)
+        return hbond_dir / "TEST.csv"
+
+    def test_views_match_filtered_frames(self, config, hbond_file):
+        """Test the views equal boolean filtering of the CSV, in file order."""
+        config.HBOND_DIR = str(hbond_file.parent)
+        table = DataLoader(config).load_hbond_table("TEST", quiet=True)
+        raw = read_hbond_csv(hbond_file)
+        rna_rna = (raw['res_type_1'] == 'RNA') & (raw['res_type_2'] == 'RNA')
+
+        assert len(table) == 4
+        pd.testing.assert_frame_equal(table.rna_rna.drop(columns=DERIVED_COLUMNS), raw[rna_rna])
+        pd.testing.assert_frame_equal(table.external.drop(columns=DERIVED_COLUMNS), raw[~rna_rna])
+        assert list(table.all.index) == list(table.rna_rna.index) + list(table.external.index)
+
+    def test_views_share_memory(self, config, hbond_file):
+        """Test the RNA-RNA and external views are slices of the full table, not copies."""
+        config.HBOND_DIR = str(hbond_file.parent)
+        table = DataLoader(config).load_hbond_table("TEST", quiet=True)
+
+        full = table.all['distance'].to_numpy()
+        assert np.shares_memory(table.rna_rna['distance'].to_numpy(), full)
+        assert np.shares_memory(table.external['distance'].to_numpy(), full)
+
+    def test_csv_parsed_once(self, config, hbond_file):
+        """Test load_hbonds followed by load_all_hbonds reads the CSV once, and again after a change."""
+        config.HBOND_DIR = str(hbond_file.parent)
+        loader = DataLoader(config)
+
+        with patch('utils.data_loader.pd.read_csv', wraps=pd.read_csv) as read_csv:
+            rna_rna = loader.load_hbonds("TEST", quiet=True)
+            all_hbonds = loader.load_all_hbonds("TEST", quiet=True)
+            assert read_csv.call_count == 1
+
+            hbond_file.write_text(hbond_file.read_text() + "A-C-3-,A-G-18-,RNA,RNA,2.8,N1,N3\n")
+            assert len(loader.load_hbonds("TEST", quiet=True)) == 3
+            assert read_csv.call_count == 2
+
+        assert len(rna_rna) == 2
+        assert len(all_hbonds) == 4
+
+    def test_compact_schema(self, config, hbond_file):
+        """Test the default load keeps only schema columns, with categorical strings and float64 geometry."""
+        hbond_file.write_text(hbond_file.read_text().replace('atom_2\n', 'atom_2,notes\n', 1)
+                              .replace('N3\n', 'N3,x\n'))
+        config.HBOND_DIR = str(hbond_file.parent)
+        hbonds = DataLoader(config).load_all_hbonds("TEST", quiet=True)
+
+        assert 'notes' not in hbonds.columns
+        assert isinstance(hbonds['res_1'].dtype, pd.CategoricalDtype)
+        assert hbonds['distance'].dtype == np.float64
+        assert {c for c in hbonds.columns if c not in DERIVED_COLUMNS} <= set(HBOND_SCHEMA)
+        assert hbonds['is_base_base'].all()  # N1-N3 is base-base
+
+    def test_full_load(self, config, hbond_file):
+        """Test HBOND_COMPACT = False reads every column with default dtypes."""
+        hbond_file.write_text(hbond_file.read_text().replace('atom_2\n', 'atom_2,notes\n', 1)
+                              .replace('N3\n', 'N3,x\n'))
+        config.HBOND_DIR = str(hbond_file.parent)
+        config.HBOND_COMPACT = False
+        hbonds = DataLoader(config).load_all_hbonds("TEST", quiet=True)
+
+        assert list(hbonds['notes']) == ['x'] * 4
+        assert hbonds['distance'].dtype == np.float64
+        assert not isinstance(hbonds['res_1'].dtype, pd.CategoricalDtype)
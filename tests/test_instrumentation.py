@@ -0,0 +1,109 @@
+"""Tests for utils/instrumentation.py - Event sinks and stage timings."""
+
+import io
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from scorer2 import Scorer
+from utils.instrumentation import ConsoleSink, EventSink, JsonLinesSink, SilentSink, make_sink
+
+
+class TestEventSinks:
+    """Tests for the silent, console and ndjson sinks."""
+
+    def test_console_prints_messages_only(self):
+        """Test console sink prints messages and skips message-less events."""
+        stream = io.StringIO()
+        sink = ConsoleSink(stream)
+        sink.emit('hbonds_loaded', "Loaded 5 H-bonds", count=5)
+        sink.emit('stage_end', stage='load', duration=0.1)
+
+        assert stream.getvalue() == "Loaded 5 H-bonds\n"
+
+    def test_ndjson_writes_one_record_per_event(self):
+        """Test ndjson sink writes parseable records with structured fields."""
+        stream = io.StringIO()
+        sink = JsonLinesSink(stream)
+        with sink.stage('load', "Loading...", pdb_id='1ABC'):
+            sink.emit('hbonds_loaded', count=5)
+
+        records = [json.loads(line) for line in stream.getvalue().splitlines()]
+        assert [r['event'] for r in records] == ['stage_start', 'hbonds_loaded', 'stage_end']
+        assert records[0]['message'] == "Loading..."
+        assert records[0]['pdb_id'] == '1ABC'
+        assert records[1]['count'] == 5
+        assert 'message' not in records[1]
+        assert records[2]['stage'] == 'load'
+        assert records[2]['duration'] >= 0
+
+    def test_silent_still_collects_timings(self, capsys):
+        """Test silent sink writes nothing but accumulates per-stage timings."""
+        sink = SilentSink()
+        for _ in range(3):
+            with sink.stage('score', "Scoring..."):
+                pass
+        with pytest.raises(KeyError):
+            with sink.stage('load'):
+                raise KeyError('missing')
+
+        assert capsys.readouterr().out == ''
+        assert sink.calls == {'score': 3, 'load': 1}
+        assert set(sink.timings) == {'score', 'load'}
+        assert 'score' in sink.timing_summary()
+
+    def test_shared_sink_counts_every_thread(self):
+        """Test stages timed on many threads at once are all counted."""
+        sink = SilentSink()
+
+        def work(_):
+            for _ in range(200):
+                with sink.stage('score'):
+                    pass
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(work, range(8)))
+
+        assert sink.calls == {'score': 1600}
+
+    def test_base_sink_drops_events(self, capsys):
+        """Test the base sink writes nothing but still times stages."""
+        sink = EventSink()
+        with sink.stage('load', "Loading..."):
+            sink.emit('hbonds_loaded', "Loaded 5 H-bonds", count=5)
+
+        assert capsys.readouterr().out == ''
+        assert sink.calls == {'load': 1}
+
+    def test_make_sink(self):
+        """Test sinks are created by name and unknown names are rejected."""
+        assert isinstance(make_sink('console'), ConsoleSink)
+        assert isinstance(make_sink('silent'), SilentSink)
+        assert isinstance(make_sink('ndjson'), JsonLinesSink)
+        with pytest.raises(ValueError):
+            make_sink('xml')
+
+
+class TestScorerEvents:
+    """Tests for events emitted by the scorer."""
+
+    def test_silent_scorer_prints_nothing(self, config, sample_basepair_list, sample_hbond_data, capsys):
+        """Test scoring with a silent sink produces no output and records stage timings."""
+        events = SilentSink()
+        scorer = Scorer(config, events=events)
+        result = scorer.score_structure(sample_basepair_list, sample_hbond_data)
+
+        assert capsys.readouterr().out == ''
+        assert result.total_base_pairs == len(sample_basepair_list)
+        assert {'score_structure', 'score_basepairs', 'aggregate'} <= set(events.timings)
+
+    def test_console_scorer_output(self, config, sample_basepair_list, sample_hbond_data):
+        """Test the default console sink still prints the structure summary."""
+        stream = io.StringIO()
+        scorer = Scorer(config, events=ConsoleSink(stream))
+        scorer.score_structure(sample_basepair_list, sample_hbond_data)
+
+        output = stream.getvalue()
+        assert f"Analyzing {len(sample_basepair_list)} base pairs..." in output
+        assert "Average base pair score:" in output
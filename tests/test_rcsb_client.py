@@ -0,0 +1,169 @@
+"""Tests for utils/rcsb_client.py - Pooled RCSB metadata client, against a local stand-in server."""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+import requests
+
+from utils.rcsb_client import RateLimiter, RcsbClient, extract_validation_metrics
+
+
+ENTRY = {
+    'pdbx_vrpt_summary_geometry': [{'clashscore': 5.2}],
+    'rcsb_entry_info': {'experimental_method': 'EM', 'resolution_combined': [3.1]},
+    'rcsb_accession_info': {'deposit_date': '2020-01-15T00:00:00Z'},
+}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Serves entries from server.entries; server.failures[path] error responses come first."""
+
+    protocol_version = 'HTTP/1.1'  # keep-alive
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests.append(self.path)
+            server.connections.add(self.client_address)
+            pending = server.failures.get(self.path, [])
+            status = pending.pop(0) if pending else None
+        if status is None:
+            pdb_id = self.path.rsplit('/', 1)[-1]
+            body = json.dumps(server.entries[pdb_id]).encode() if pdb_id in server.entries else b'{}'
+            status = 200 if pdb_id in server.entries else 404
+        else:
+            body = b'{}'
+        self.send_response(status)
+        if status == 429:
+            self.send_header('Retry-After', '0')
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    """Local HTTP server standing in for data.rcsb.org."""
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    httpd.entries = {f'E{i:03d}': dict(ENTRY, id=i) for i in range(40)}
+    httpd.failures = {}
+    httpd.requests = []
+    httpd.connections = set()
+    httpd.lock = threading.Lock()
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    httpd.url = f'http://127.0.0.1:{httpd.server_address[1]}'
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def make_client(server, **kwargs):
+    kwargs.setdefault('rate', None)
+    kwargs.setdefault('backoff', 0.01)
+    return RcsbClient(data_url=server.url, files_url=server.url, **kwargs)
+
+
+class TestRcsbClient:
+    """Tests for requests made through the client."""
+
+    def test_concurrent_entries_reuse_connections(self, server):
+        """Test map() fetches every entry, in order, over a pool of kept-alive connections."""
+        client = make_client(server, max_workers=4)
+        pdb_ids = sorted(server.entries)
+
+        results = list(client.map(lambda pdb_id: client.get(client.entry_url(pdb_id)).json()['id'], pdb_ids))
+
+        assert results == list(range(40))
+        assert len(server.connections) <= 4
+        summary = client.stats.summary()
+        assert (summary['requests'], summary['failures'], summary['retries']) == (40, 0, 0)
+        assert summary['p99_ms'] >= summary['p50_ms'] > 0
+        assert 'p95' in client.stats.report()
+
+    def test_retries_transient_failures(self, server):
+        """Test 5xx and 429 responses are retried, and a 404 is returned without retrying."""
+        client = make_client(server, retries=3)
+        server.failures['/rest/v1/core/entry/E001'] = [503, 429]
+
+        assert client.get(client.entry_url('e001')).status_code == 200
+        assert client.get(client.entry_url('MISSING')).status_code == 404
+        assert server.requests.count('/rest/v1/core/entry/E001') == 3
+        assert client.stats.retries == 2
+        assert client.stats.failures == 1
+
+    def test_retried_responses_closed(self, server):
+        """Test each error response that is retried is closed, and the returned one is left open."""
+        client = make_client(server, retries=3)
+        server.failures['/rest/v1/core/entry/E003'] = [503, 429]
+        closed = []
+
+        with patch.object(requests.Response, 'close', autospec=True, side_effect=closed.append):
+            response = client.get(client.entry_url('E003'))
+
+        assert [r.status_code for r in closed] == [503, 429]
+        assert response not in closed
+
+    def test_gives_up_after_retries(self, server):
+        """Test the last error response is returned once retries run out."""
+        client = make_client(server, retries=1)
+        server.failures['/rest/v1/core/entry/E002'] = [500, 500, 500]
+
+        assert client.get(client.entry_url('E002')).status_code == 500
+        assert server.requests.count('/rest/v1/core/entry/E002') == 2
+
+    def test_connection_error_raised(self):
+        """Test a host that refuses connections raises after the retries."""
+        client = RcsbClient(data_url='http://127.0.0.1:9', retries=1, backoff=0.01, rate=None, timeout=2)
+        with pytest.raises(Exception):
+            client.get(client.entry_url('E000'))
+        assert client.stats.failures == 1
+
+    def test_data_loader_metrics(self, server, config):
+        """Test DataLoader.get_validation_metrics through a client pointed at the stand-in server."""
+        from utils.data_loader import DataLoader
+        from utils.instrumentation import SilentSink
+
+        loader = DataLoader(config, events=SilentSink(), rcsb=make_client(server))
+
+        metrics = loader.get_validation_metrics('E005')
+        assert metrics['clashscore'] == 5.2
+        assert metrics['EM Resolution (Å)'] == 3.1
+        assert loader.get_validation_metrics('MISSING') is None
+
+
+def test_rate_limiter_spaces_requests():
+    """Test calls across threads are at least 1 / rate apart."""
+    limiter = RateLimiter(50)
+    times = []
+    lock = threading.Lock()
+
+    def call():
+        limiter.wait()
+        with lock:
+            times.append(time.monotonic())
+
+    threads = [threading.Thread(target=call) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    times.sort()
+    assert times[-1] - times[0] >= 5 * 0.02 * 0.9
+
+
+def test_extract_validation_metrics():
+    """Test entry fields are mapped to the cached metric names."""
+    metrics = extract_validation_metrics(ENTRY)
+    assert metrics['Experimental_method'] == 'EM'
+    assert metrics['EM Diffraction Resolution (Å)'] is None
+    assert metrics['Deposition_Date'] == '2020-01-15'
@@ -0,0 +1,48 @@
+"""Tests for utils/residue_index.py - Residue lookup and chain predecessors."""
+
+from utils.residue_index import ResidueIndex, parse_residue_position
+
+
+def _torsions(*res_ids):
+    return {res_id: {'delta': 80.0} for res_id in res_ids}
+
+
+class TestResidueIndex:
+    """Tests for the per-structure residue index."""
+
+    def test_parse_residue_position(self):
+        """Test parsing chain, number and insertion code."""
+        assert parse_residue_position('A-G-52-') == ('A', 52, '')
+        assert parse_residue_position('AN1-C-2104-B') == ('AN1', 2104, 'B')
+        assert parse_residue_position('A-G-X-') is None
+        assert parse_residue_position('bad') is None
+
+    def test_consecutive_predecessor(self):
+        """Test that resnum - 1 on the same chain is the predecessor."""
+        index = ResidueIndex(_torsions('A-G-1-', 'A-C-2-', 'B-U-1-', 'B-A-2-'))
+
+        assert index.predecessor('A-C-2-') == 'A-G-1-'
+        assert index.predecessor('B-A-2-') == 'B-U-1-'
+        assert index.predecessor('A-G-1-') is None
+        assert index.get('B', 2) == 'B-A-2-'
+
+    def test_gap_has_no_predecessor(self):
+        """Test that a numbering gap breaks the chain."""
+        index = ResidueIndex(_torsions('A-G-10-', 'A-C-13-'))
+        assert index.predecessor('A-C-13-') is None
+
+    def test_insertion_codes(self):
+        """Test that insertion-coded residues chain in order."""
+        index = ResidueIndex(_torsions('A-C-53-', 'A-G-52-A', 'A-U-52-', 'A-A-51-'))
+
+        assert index.predecessor('A-U-52-') == 'A-A-51-'
+        assert index.predecessor('A-G-52-A') == 'A-U-52-'
+        assert index.predecessor('A-C-53-') == 'A-G-52-A'
+
+    def test_malformed_ids_are_skipped(self):
+        """Test that malformed IDs do not break the index."""
+        index = ResidueIndex(_torsions('A-G-1-', 'junk', 'A-C-x-', 'A-U-2-'))
+
+        assert len(index) == 2
+        assert index.predecessor('A-U-2-') == 'A-G-1-'
+        assert index.predecessor('junk') is None
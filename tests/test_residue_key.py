@@ -0,0 +1,88 @@
+"""Tests for utils/residue_key.py - Residue identifier parsing."""
+
+import pandas as pd
+import pytest
+
+from utils.residue_index import parse_residue_position
+from utils.residue_key import (ResidueKey, attach_basepair_keys, parse_residue_id, require_residue_key,
+                               residue_columns, residue_key, residue_mask, residues_adjacent)
+
+
+class TestParse:
+    """Tests for parsing residue IDs."""
+
+    @pytest.mark.parametrize('res_id, expected', [
+        ('A-G-52-', ResidueKey('A', 'G', 52, '')),
+        ('A-G-52-A', ResidueKey('A', 'G', 52, 'A')),
+        ('B-U--3-', ResidueKey('B', 'U', -3, '')),
+        ('B-U--3-B', ResidueKey('B', 'U', -3, 'B')),
+        ('Q-ARG-101', ResidueKey('Q', 'ARG', 101, '')),
+        ('AA-2MG-7-', ResidueKey('AA', '2MG', 7, '')),
+    ])
+    def test_well_formed(self, res_id, expected):
+        """Test chain, name, number and insertion code are extracted."""
+        assert parse_residue_id(res_id) == expected
+        assert parse_residue_position(res_id) == expected.position
+
+    @pytest.mark.parametrize('res_id', ['', 'A-G', 'A-G--', 'A-G-x-', 'A-G- 5-', 'A-G-+5-', None, 52])
+    def test_malformed(self, res_id):
+        """Test IDs without an integer residue number are rejected."""
+        assert parse_residue_id(res_id) is None
+        assert residue_key(res_id) is None
+        with pytest.raises(ValueError):
+            require_residue_key(res_id)
+
+    def test_interned(self):
+        """Test equal IDs give the same key object and shared strings."""
+        res_id = ''.join(['A-', 'G-', '60-'])
+        key = residue_key(res_id)
+        assert residue_key('A-G-60-') is key
+        assert parse_residue_id('A-C-61-').chain is key.chain
+
+    def test_adjacency(self):
+        """Test adjacency needs the same chain and numbers one apart."""
+        assert residues_adjacent('A-G-10-', 'A-C-11-')
+        assert residues_adjacent('A-G-0-', 'A-C--1-')
+        assert not residues_adjacent('A-G-10-', 'B-C-11-')
+        assert not residues_adjacent('A-G-10-', 'A-C-12-')
+        assert not residues_adjacent('A-G-10-', 'bad')
+
+
+class TestAttach:
+    """Tests for attaching keys to loaded data."""
+
+    def test_basepair_keys(self):
+        """Test base pairs gain key_1/key_2 fields."""
+        basepairs = attach_basepair_keys([{'res_1': 'A-G-1-', 'res_2': 'A-C-20-'}, {'res_1': 'bad', 'res_2': 'A-C-2-'}])
+        assert basepairs[0]['key_1'] == ResidueKey('A', 'G', 1)
+        assert basepairs[0]['key_2'].number == 20
+        assert basepairs[1]['key_1'] is None
+
+    def test_residue_columns(self):
+        """Test ID columns become aligned valid/chain/number arrays, malformed and missing IDs invalid."""
+        (valid_1, chain_1, num_1), (valid_2, chain_2, num_2) = residue_columns(
+            ['A-G-1-', 'bad', 'B-U--3-'], pd.Series(['A-C-20-', None, 'A-G-1-'], index=[9, 8, 7]))
+        assert valid_1.tolist() == [True, False, True]
+        assert chain_1.tolist() == ['A', '', 'B']
+        assert num_1.tolist() == [1, 0, -3]
+        assert valid_2.tolist() == [True, False, True]
+        assert num_2.tolist() == [20, 0, 1]
+        assert residue_columns([], [])[0][0].shape == (0,)
+
+    def test_residue_mask_on_categorical_columns(self):
+        """Test masks of categorical ID columns combine with & and |, one predicate call per distinct ID."""
+        df = pd.DataFrame({'res_1': ['A-G-1-', 'A-G-2-', 'A-G-1-', None],
+                           'res_2': ['A-C-20-', 'B-C-3-', 'A-C-21-', 'A-C-20-']}).astype('category')
+        calls = []
+
+        def on_chain_a(res_id):
+            calls.append(res_id)
+            return residue_key(res_id).chain == 'A'
+
+        both = residue_mask(df['res_1'], on_chain_a) & residue_mask(df['res_2'], on_chain_a)
+        either = residue_mask(df['res_1'], on_chain_a) | residue_mask(df['res_2'], on_chain_a)
+        assert both.tolist() == [True, False, True, False]
+        assert either.tolist() == [True, True, True, True]
+        assert len(df[both]) == 2
+        assert calls.count('A-G-1-') == 2  # once per mask, not per row
+        assert None not in calls
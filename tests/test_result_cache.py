@@ -0,0 +1,161 @@
+"""Tests for utils/result_cache.py - Content-addressed full-structure result cache."""
+
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from config import Config
+from scorer2 import Scorer
+from utils import data_loader
+from utils.data_loader import DataLoader
+from utils.instrumentation import SilentSink
+from utils.result_cache import ResultCache, hash_files, hash_value, scoring_fingerprint
+
+
+class TestFingerprints:
+    """Tests for input and scoring fingerprints."""
+
+    def test_hash_files_tracks_content(self, tmp_path):
+        """Test file hashes depend on content and order, not on location."""
+        a = tmp_path / 'a.json'
+        b = tmp_path / 'b.csv'
+        a.write_text('[1, 2]')
+        b.write_text('x,y\n')
+        digest = hash_files([a, b])
+
+        copy_dir = tmp_path / 'copy'
+        copy_dir.mkdir()
+        (copy_dir / 'a.json').write_text('[1, 2]')
+        (copy_dir / 'b.csv').write_text('x,y\n')
+        assert hash_files([copy_dir / 'a.json', copy_dir / 'b.csv']) == digest
+
+        assert hash_files([b, a]) != digest
+        assert hash_files([a, tmp_path / 'missing.json']) != hash_files([a, b])
+        b.write_text('x,z\n')
+        assert hash_files([a, b]) != digest
+
+    def test_hash_value_ignores_dict_order(self):
+        """Test canonical hashing is independent of dict insertion order."""
+        assert hash_value({'a': 1, 'b': (2, 3)}) == hash_value({'b': [2, 3], 'a': 1})
+        assert hash_value({'a': 1}) != hash_value({'a': 2})
+
+    def test_scoring_fingerprint_tracks_config_and_reference(self, config):
+        """Test threshold, weight and reference changes change the fingerprint; directories do not."""
+        base = scoring_fingerprint(config, {'chi_expectations': {}})
+
+        moved = Config()
+        moved.BASEPAIR_DIR = '/elsewhere/basepairs'
+        assert scoring_fingerprint(moved, {'chi_expectations': {}}) == base
+
+        stricter = Config()
+        stricter.BASELINE = config.BASELINE + 5
+        assert scoring_fingerprint(stricter, {'chi_expectations': {}}) != base
+
+        reweighted = Config()
+        reweighted.PENALTY_WEIGHTS = {**config.PENALTY_WEIGHTS, 'misaligned': -1}
+        assert scoring_fingerprint(reweighted, {'chi_expectations': {}}) != base
+
+        chi = {'cWW': {'_OTHER': {'expected': 'anti'}}}
+        assert scoring_fingerprint(config, {'chi_expectations': chi}) != base
+
+    def test_scorer_fingerprint(self, config):
+        """Test scorers with equal settings share a fingerprint."""
+        events = SilentSink()
+        assert Scorer(config, events=events).fingerprint() == Scorer(Config(), events=events).fingerprint()
+
+    def test_data_loader_input_fingerprint(self, config, tmp_path):
+        """Test the loader hashes the base pair and H-bond files it reads."""
+        config.BASEPAIR_DIR = str(tmp_path / 'basepairs')
+        config.HBOND_DIR = str(tmp_path / 'hbonds')
+        (tmp_path / 'basepairs').mkdir()
+        (tmp_path / 'hbonds').mkdir()
+        bp_file = tmp_path / 'basepairs' / '1ABC.json'
+        bp_file.write_text('[]')
+        (tmp_path / 'hbonds' / '1ABC.csv').write_text('res_1,res_2\n')
+
+        loader = DataLoader(config, events=SilentSink())
+        before = loader.input_fingerprint('1ABC')
+        assert loader.input_fingerprint('1ABC') == before
+
+        bp_file.write_text('[{"res_1": "A-G-1-"}]')
+        assert loader.input_fingerprint('1ABC') != before
+
+    def test_data_loader_keeps_input_fingerprint(self, config, tmp_path, monkeypatch):
+        """Test a loader with a structure cache rehashes only files whose size or mtime changed."""
+        config.BASEPAIR_DIR = str(tmp_path / 'basepairs')
+        config.HBOND_DIR = str(tmp_path / 'hbonds')
+        (tmp_path / 'basepairs').mkdir()
+        (tmp_path / 'hbonds').mkdir()
+        bp_file = tmp_path / 'basepairs' / '1ABC.json'
+        bp_file.write_text('[]')
+        hashed = []
+        monkeypatch.setattr(data_loader, 'hash_files', lambda files: hashed.append(1) or hash_files(files))
+
+        loader = DataLoader(config, events=SilentSink(), cache_mb=1)
+        before = loader.input_fingerprint('1ABC')
+        assert loader.input_fingerprint('1ABC') == before
+        assert len(hashed) == 1
+
+        (tmp_path / 'hbonds' / '1ABC.csv').write_text('res_1,res_2\n')
+        assert loader.input_fingerprint('1ABC') != before
+        assert len(hashed) == 2
+
+
+class TestResultCache:
+    """Tests for cache lookups and eviction."""
+
+    def test_put_and_get(self, tmp_path):
+        """Test a stored result is returned for the same inputs and fingerprint only."""
+        cache = ResultCache(tmp_path, 'fp1')
+        result = {'overall_score': 87.5, 'basepair_scores': [{'score': 90}]}
+        path = cache.put('1ABC', 'inputs', result)
+
+        assert path.exists()
+        assert cache.get('inputs') == result
+        assert cache.get('other-inputs') is None
+        assert ResultCache(tmp_path, 'fp2').get('inputs') is None
+        assert not list(tmp_path.rglob('*.tmp'))
+
+    def test_concurrent_puts_of_one_key(self, tmp_path):
+        """Test threads storing the same key each write their own temp file and leave one whole entry."""
+        cache = ResultCache(tmp_path, 'fp1')
+        results = [{'overall_score': float(i), 'basepair_scores': [{'score': i}] * 2000} for i in range(8)]
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lambda result: cache.put('1ABC', 'inputs', result), results * 4))
+
+        assert cache.get('inputs') in results
+        assert not list(tmp_path.rglob('*.tmp'))
+
+    def test_corrupt_entry_is_a_miss(self, tmp_path):
+        """Test unreadable entries are treated as misses."""
+        cache = ResultCache(tmp_path, 'fp1')
+        path = cache.put('1ABC', 'inputs', {'overall_score': 50.0})
+        path.write_text('{"key": ')
+        assert cache.get('inputs') is None
+
+    def test_evict_keeps_current_fingerprint(self, tmp_path):
+        """Test eviction removes old-fingerprint, legacy and stale temporary files only."""
+        old = ResultCache(tmp_path, 'old')
+        current = ResultCache(tmp_path, 'new')
+        old_path = old.put('1ABC', 'inputs', {'overall_score': 50.0})
+        kept_path = current.put('1ABC', 'inputs', {'overall_score': 60.0})
+        legacy = tmp_path / '1ABC.json'
+        legacy.write_text(json.dumps({'pdb_id': '1ABC', 'full_structure_score': 50.0}))
+        stale_tmp = kept_path.with_name('.abc.1.tmp')
+        stale_tmp.write_text('{}')
+        hour_ago = time.time() - 7200
+        os.utime(stale_tmp, (hour_ago, hour_ago))
+        fresh_tmp = kept_path.with_name('.abc.2.tmp')
+        fresh_tmp.write_text('{}')
+
+        assert set(current.evict(dry_run=True)) == {old_path, legacy, stale_tmp}
+        assert old_path.exists()
+
+        current.evict()
+        assert not old_path.exists()
+        assert not legacy.exists()
+        assert not stale_tmp.exists()
+        assert fresh_tmp.exists()
+        assert current.get('inputs') == {'overall_score': 60.0}
@@ -1,6 +1,7 @@
 """Tests for scorer2.py - RNA structure quality scoring."""
 
 import pytest
+import numpy as np
 import pandas as pd
 from scorer2 import Scorer, BaselineResult
 
@@ -260,3 +261,202 @@ class TestScorer:
         bp_score = scorer._score_base_pair(terrible_bp, pd.DataFrame())
 
         assert bp_score['score'] >= 0
+
+    def test_hbond_index_matches_mask_lookup(self, config):
+        """Test that the pair index returns the same H-bonds as the per-pair mask."""
+        scorer = Scorer(config)
+
+        hbond_data = pd.DataFrame([
+            {'res_1': 'A-G-10-', 'res_2': 'A-C-20-', 'atom_1': 'N1', 'atom_2': 'N3',
+             'distance': 2.9, 'angle_1': 150.0, 'angle_2': 145.0, 'dihedral_angle': 10.0, 'score': 0.85},
+            {'res_1': 'A-C-20-', 'res_2': 'A-G-10-', 'atom_1': 'N4', 'atom_2': 'O6',
+             'distance': 2.85, 'angle_1': 160.0, 'angle_2': 155.0, 'dihedral_angle': 5.0, 'score': 0.92},
+            {'res_1': 'A-G-10-', 'res_2': 'A-C-20-', 'atom_1': "O2'", 'atom_2': 'O2',
+             'distance': 2.7, 'angle_1': 140.0, 'angle_2': 130.0, 'dihedral_angle': 0.0, 'score': 0.80},
+            {'res_1': 'A-A-11-', 'res_2': 'A-U-19-', 'atom_1': 'N6', 'atom_2': 'O4',
+             'distance': 3.0, 'angle_1': 150.0, 'angle_2': 150.0, 'dihedral_angle': 0.0, 'score': 0.90},
+        ])
+        hbond_index = scorer._build_hbond_index(hbond_data)
+
+        for nt1, nt2 in [('A-G-10-', 'A-C-20-'), ('A-C-20-', 'A-G-10-'),
+                         ('A-U-19-', 'A-A-11-'), ('A-G-10-', 'A-U-19-')]:
+            expected = scorer._get_basepair_hbonds(nt1, nt2, hbond_data)
+            indexed = scorer._get_basepair_hbonds(nt1, nt2, hbond_data, hbond_index)
+            assert sorted(indexed.index) == sorted(expected.index)
+
+        # Backbone H-bond (O2') is excluded from the index
+        assert len(hbond_index[('A-C-20-', 'A-G-10-')]) == 2
+
+    def test_score_base_pair_with_hbond_index_is_identical(self, config, sample_basepair_list,
+                                                          sample_hbond_data):
+        """Test that scoring through the pair index gives the same per-pair result."""
+        scorer = Scorer(config)
+        hbond_index = scorer._build_hbond_index(sample_hbond_data)
+
+        for bp in sample_basepair_list:
+            assert (scorer._score_base_pair(bp, sample_hbond_data, hbond_index=hbond_index) ==
+                    scorer._score_base_pair(bp, sample_hbond_data))
+
+    def test_find_predecessor_uses_residue_index(self, config):
+        """Test predecessor lookup is built once and reused for the same torsion data."""
+        scorer = Scorer(config)
+        torsion_data = {'A-G-1-': {}, 'A-C-2-': {}, 'A-U-4-': {}}
+
+        assert scorer._find_predecessor('A-C-2-', torsion_data) == 'A-G-1-'
+        assert scorer._find_predecessor('A-U-4-', torsion_data) is None
+
+        index = scorer._get_residue_index(torsion_data)
+        assert scorer._get_residue_index(torsion_data) is index
+
+    def test_classify_suites_matches_single_suite(self, suite_scorer, richardson_suites):
+        """Test that batched suite classification matches the per-suite path."""
+        rng = np.random.default_rng(7)
+        centers = np.array([c['angles'] for c in richardson_suites['conformers']])
+
+        # Mix of near-conformer suites (matches, 7D rejects) and random angles (triage/sieve fails)
+        near = centers[rng.integers(len(centers), size=300)] + rng.normal(0, 15, size=(300, 7))
+        uniform = rng.uniform(0, 360, size=(300, 7))
+        suites = np.vstack([near, uniform]) % 360
+
+        batch = suite_scorer._classify_suites(suites)
+        single = [suite_scorer._score_single_suite(s) for s in suites]
+
+        assert batch == single
+        assert any(not r['is_outlier'] for r in batch)
+        assert {r['issue'].split()[0] for r in batch if r['issue']} >= {'no', 'sieve'}
+
+    def test_classify_suites_empty_and_unloaded(self, config, suite_scorer):
+        """Test batch classifier edge cases."""
+        assert suite_scorer._classify_suites(np.empty((0, 7))) == []
+
+        scorer = Scorer(config)
+        scorer.richardson_suites = None
+        assert scorer._classify_suites(np.zeros((1, 7))) is None
+
+    def test_residue_features_keep_per_pair_output(self, suite_scorer):
+        """Test that scoring from the residue feature table matches per-pair recomputation."""
+        from benchmarks.synthetic import make_structure
+
+        basepair_data, hbond_data, torsion_data = make_structure(n_pairs=150, n_hbonds=600, seed=3)
+        suite_scorer.chi_expectations = {'cWW': {'_OTHER': {'expected': 'anti'}},
+                                         '_OTHER': {'expected': 'both'}}
+        basepair_data = [bp for bp in basepair_data
+                         if not suite_scorer._is_adjacent_pair(bp['res_1'], bp['res_2'])]
+
+        result = suite_scorer.score_structure(basepair_data, hbond_data, torsion_data=torsion_data)
+        expected = [suite_scorer._score_base_pair(bp, hbond_data, torsion_data) for bp in basepair_data]
+
+        assert result.basepair_scores == expected
+        assert any(bp['backbone'] for bp in expected)
+        assert any(bp['chi_details'] for bp in expected)
+
+    def test_build_residue_features_once_per_residue(self, suite_scorer):
+        """Test the feature table has one entry per paired residue."""
+        torsion = {'alpha': -68.0, 'beta': 178.0, 'gamma': 54.0, 'delta': 82.0,
+                   'epsilon': -150.0, 'zeta': -71.0, 'chi': -160.0}
+        torsion_data = {f'A-G-{i}-': dict(torsion) for i in range(1, 6)}
+        basepair_data = [
+            {'res_1': 'A-G-2-', 'res_2': 'A-G-5-'},
+            {'res_1': 'A-G-2-', 'res_2': 'A-G-4-'},
+        ]
+
+        features = suite_scorer._build_residue_features(basepair_data, torsion_data)
+
+        assert set(features) == {'A-G-2-', 'A-G-4-', 'A-G-5-'}
+        assert features['A-G-2-']['chi_conf'] == 'anti'
+        assert features['A-G-2-']['pucker'] == 3
+        assert features['A-G-2-']['suite']['bin'] == '33p'
+
+    def test_columnar_engine_matches_row_engine(self, config, suite_scorer, sample_basepair_list,
+                                                sample_hbond_data, empty_hbond_data):
+        """Test the columnar engine gives the same BaselineResult as per-pair scoring."""
+        from benchmarks.synthetic import make_structure
+
+        chi_expectations = {'cWW': {'_OTHER': {'expected': 'anti'}}, '_OTHER': {'expected': 'both'}}
+        columnar = Scorer(config, columnar=True)
+        columnar.richardson_suites = suite_scorer.richardson_suites
+        columnar._index_richardson_suites()
+        suite_scorer.chi_expectations = columnar.chi_expectations = chi_expectations
+
+        structures = [
+            (sample_basepair_list, sample_hbond_data, None),
+            (sample_basepair_list, empty_hbond_data, None),
+        ]
+        # Sparse H-bonds leave pairs with no H-bonds (zero_hbond / DSSR reconciliation)
+        for seed, n_hbonds in [(0, 600), (1, 40), (2, 0)]:
+            basepair_data, hbond_data, torsion_data = make_structure(
+                n_pairs=150, n_hbonds=n_hbonds, seed=seed)
+            basepair_data = [dict(bp, hbond_score=0.0) if i % 3 == 0 else bp
+                             for i, bp in enumerate(basepair_data)]
+            structures.append((basepair_data, hbond_data, torsion_data))
+
+        zero_hbond = 0
+        for basepair_data, hbond_data, torsion_data in structures:
+            expected = suite_scorer.score_structure(basepair_data, hbond_data, torsion_data)
+            result = columnar.score_structure(basepair_data, hbond_data, torsion_data)
+            assert result == expected
+            zero_hbond += expected.geometry_issues['zero_hbond']
+
+        assert zero_hbond > 0
+
+    def test_compact_hbonds_score_like_full(self, config, sample_base_pair, sample_hbond_data):
+        """Test compact H-bonds keep full geometry precision, at and just past a threshold."""
+        from utils.hbond_table import compact_hbonds
+
+        base_pair = dict(sample_base_pair, bp_type='A-U')
+        _, thresholds = Scorer(config)._resolve_thresholds('A-U', 'cWW')
+        hbond_data = sample_hbond_data.copy()
+        hbond_data.loc[0, 'distance'] = thresholds['DIST_MIN']
+        hbond_data.loc[1, 'distance'] = thresholds['DIST_MAX'] + 1e-7
+        hbond_data.loc[0, 'angle_1'] = thresholds['ANGLE_MIN']
+        compact = compact_hbonds(hbond_data)
+
+        for columnar in (False, True):
+            scorer = Scorer(config, columnar=columnar)
+            expected = scorer.score_structure([base_pair], hbond_data)
+            assert expected.hbond_issues['bad_distance'] == 1
+            assert scorer.score_structure([base_pair], compact) == expected
+
+    def test_score_motif_matches_rescoring_subset(self, suite_scorer):
+        """Test aggregating one scored table equals re-scoring each motif's filtered data."""
+        from app import filter_motif_data
+        from benchmarks.synthetic import make_structure
+
+        basepair_data, hbond_data, torsion_data = make_structure(n_pairs=200, n_hbonds=800, seed=5)
+        structure_scores = suite_scorer.score_basepairs(basepair_data, hbond_data, torsion_data)
+
+        residues = sorted({bp['res_1'] for bp in basepair_data} | {bp['res_2'] for bp in basepair_data})
+        motifs = [set(residues[i::7]) for i in range(7)] + [set(residues[:60]), set()]
+
+        for motif_residues in motifs:
+            motif_bps, motif_hbonds = filter_motif_data(basepair_data, hbond_data,
+                                                        motif_residues=motif_residues)
+            expected = suite_scorer.score_structure(motif_bps, motif_hbonds, torsion_data)
+
+            assert suite_scorer.score_motif(structure_scores, motif_residues) == expected
+            assert suite_scorer.score_motif(structure_scores, basepairs=motif_bps) == expected
+
+    def test_score_motif_by_range(self, config, sample_basepair_list, sample_hbond_data):
+        """Test range-filtered motifs aggregate the same as re-scoring."""
+        from app import filter_motif_data
+
+        scorer = Scorer(config)
+        structure_scores = scorer.score_basepairs(sample_basepair_list, sample_hbond_data)
+        motif_bps, motif_hbonds = filter_motif_data(sample_basepair_list, sample_hbond_data,
+                                                    start_res=2, end_res=30, chain='A')
+
+        expected = scorer.score_structure(motif_bps, motif_hbonds)
+        assert expected.total_base_pairs == 2
+        assert scorer.score_motif(structure_scores, basepairs=motif_bps) == expected
+        assert scorer.score_structure(sample_basepair_list, sample_hbond_data).basepair_scores == \
+            structure_scores.basepair_scores
+
+    def test_structure_scores_score_for(self, config, sample_basepair_list, sample_hbond_data):
+        """Test per-pair lookup by base pair dict."""
+        scorer = Scorer(config)
+        structure_scores = scorer.score_basepairs(sample_basepair_list, sample_hbond_data)
+        bp = sample_basepair_list[0]
+
+        assert structure_scores.score_for(bp)['bp_info']['res_1'] == bp['res_1']
+        assert structure_scores.score_for(dict(bp)) == structure_scores.score_for(bp)
+        assert structure_scores.score_for({'res_1': 'Z-A-1-', 'res_2': 'Z-U-9-'}) is None
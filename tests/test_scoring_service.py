@@ -0,0 +1,207 @@
+"""Tests for scoring_service.py and scoring_client.py - Local scoring service."""
+
+import argparse
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+import utils.data_loader as data_loader_module
+from scorer2 import Scorer
+from scoring_client import ScoringClient, ScoringError, forward, request_from_args
+from scoring_service import ScoringService, make_server
+
+
+MOTIF_CIF = """data_HAIRPIN-1-GAC-1TST-1
+loop_
+_atom_site.group_PDB
+_atom_site.id
+_atom_site.label_atom_id
+_atom_site.label_comp_id
+_atom_site.auth_seq_id
+_atom_site.auth_asym_id
+ATOM 1 P G 1 A
+ATOM 2 P A 2 A
+ATOM 3 P U 23 A
+ATOM 4 P C 24 A
+#
+"""
+
+
+@pytest.fixture
+def data_dirs(config, tmp_path, sample_basepair_list, sample_hbond_data):
+    """Config reading a three-pair structure 1TST from tmp_path, and a motif CIF directory."""
+    (tmp_path / "basepairs").mkdir()
+    (tmp_path / "hbonds").mkdir()
+    (tmp_path / "basepairs" / "1TST.json").write_text(json.dumps(sample_basepair_list))
+    hbonds = sample_hbond_data.copy()
+    hbonds['res_1'], hbonds['res_2'] = 'A-G-1-', 'A-C-24-'
+    protein = hbonds.iloc[[0]].assign(res_2='B-ARG-5-', res_type_2='PROTEIN')
+    pd.concat([hbonds, protein]).to_csv(tmp_path / "hbonds" / "1TST.csv", index=False)
+    (tmp_path / "unique_motifs").mkdir()
+    (tmp_path / "unique_motifs" / "HAIRPIN-1-GAC-1TST-1.cif").write_text(MOTIF_CIF)
+
+    config.BASEPAIR_DIR = str(tmp_path / "basepairs")
+    config.HBOND_DIR = str(tmp_path / "hbonds")
+    config.TORSION_DIR = str(tmp_path / "torsions")
+    return config
+
+
+@pytest.fixture
+def service(data_dirs, tmp_path):
+    service = ScoringService(data_dirs, workers=2, cache_mb=64, cache_dir=str(tmp_path / "cache"))
+    service._metadata['1TST'] = (6, None)  # no RCSB lookups
+    return service
+
+
+@pytest.fixture
+def client(service):
+    """Client of the service running on a free local port."""
+    httpd = make_server(service, port=0)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    client = ScoringClient(f"http://127.0.0.1:{httpd.server_address[1]}")
+    yield client
+    client.close()
+    httpd.shutdown()
+    httpd.server_close()
+
+
+class TestScoringService:
+    """Tests for requests served over HTTP."""
+
+    def test_structure(self, client, tmp_path):
+        """Test full-structure scoring writes report.json and the summary CSV into workdir."""
+        result = client.score_structure('1TST', workdir=str(tmp_path), csv='summary.csv')
+
+        report = result['report']
+        assert report['pdb_id'] == '1TST'
+        assert report['total_base_pairs'] == 3
+        assert report['num_nucleotides'] == 6
+        assert json.loads((tmp_path / "report.json").read_text())['overall_score'] == report['overall_score']
+        assert (tmp_path / "summary.csv").exists()
+
+    def test_motif_by_name(self, client, tmp_path):
+        """Test a motif named like its CIF file is parsed, scored and written as app.py writes it."""
+        result = client.score_motif(motif_name='HAIRPIN-1-GAC-1TST-1', workdir=str(tmp_path),
+                                    output_dir='reports', csv_dir='motif_csvs')
+
+        report = result['report']
+        assert report['pdb_id'] == '1TST'
+        assert report['motif_chain'] == 'A'
+        assert report['motif_range'] == '1-24'
+        assert report['total_base_pairs'] == 2  # the pair of C-3 and G-22 is outside the motif
+        assert (tmp_path / "reports" / "HAIRPIN-1-GAC-1TST-1.json").exists()
+        assert (tmp_path / "motif_csvs" / "HAIRPIN-1-GAC-1TST-1.csv").exists()
+
+    def test_motif_matches_full_structure(self, client):
+        """Test a motif covering every pair scores as the full structure, cached or not."""
+        first = client.score_motif(pdb_id='1TST', start=1, end=24, chain='A')['report']
+        second = client.score_motif(pdb_id='1TST', start=1, end=24)['report']
+
+        assert first['motif_score'] == first['full_structure_score']
+        assert second == dict(first, motif_chain='all')
+
+    def test_residue(self, client):
+        """Test single-residue scoring, and 422 when no pair involves the residue."""
+        report = client.score_residue('1TST', 2, chain='A')['report']
+        assert report['num_base_pairs'] == 1
+        assert report['base_pairs'][0]['bp_info']['res_2'] == 'A-U-23-'
+
+        with pytest.raises(ScoringError) as error:
+            client.score_residue('1TST', 99)
+        assert error.value.status == 422
+
+    def test_errors(self, client):
+        """Test missing structures, missing fields and unknown paths."""
+        for request, status in [
+            (lambda: client.score_structure('9XYZ'), 404),
+            (lambda: client.score_motif(pdb_id='1TST'), 400),
+            (lambda: client.request('POST', '/score/nothing', {}), 404),
+        ]:
+            with pytest.raises(ScoringError) as error:
+                request()
+            assert error.value.status == status
+        assert client.health()['status'] == 'ok'
+
+    def test_concurrent_requests_and_stats(self, client, service):
+        """Test concurrent motif requests agree and are counted with latency percentiles."""
+        def score(_):
+            own_client = ScoringClient(f"http://127.0.0.1:{client.port}")
+            try:
+                return own_client.score_motif(pdb_id='1TST', start=1, end=24, chain='A')['report']['motif_score']
+            finally:
+                own_client.close()
+
+        with ThreadPoolExecutor(max_workers=6) as executor:
+            scores = list(executor.map(score, range(12)))
+
+        assert len(set(scores)) == 1
+        stats = client.stats()
+        motif = stats['endpoints']['/score/motif']
+        assert (motif['requests'], motif['failures']) == (12, 0)
+        assert motif['p99_ms'] >= motif['p50_ms'] > 0
+        assert stats['structure_cache']['hits'] > 0
+
+    def test_repeated_motifs_reuse_hash_and_scores(self, service, data_dirs, monkeypatch):
+        """Test repeated motif requests hash the inputs and score the base pairs once, until a file changes."""
+        hashed, scored = [], []
+        hash_files = data_loader_module.hash_files
+        monkeypatch.setattr(data_loader_module, 'hash_files', lambda files: hashed.append(1) or hash_files(files))
+        score_basepairs = Scorer.score_basepairs
+        monkeypatch.setattr(Scorer, 'score_basepairs',
+                            lambda self, *args, **kwargs: scored.append(1) or score_basepairs(self, *args, **kwargs))
+
+        reports = [service.score_motif({'pdb_id': '1TST', 'start': 1, 'end': 24, 'chain': 'A'})['report']
+                   for _ in range(3)]
+        assert reports[1] == reports[2] == reports[0]
+        assert (len(hashed), len(scored)) == (1, 1)
+
+        basepair_file = Path(data_dirs.BASEPAIR_DIR) / "1TST.json"
+        basepair_file.write_text(basepair_file.read_text() + "\n")
+        service.score_motif({'pdb_id': '1TST', 'start': 1, 'end': 24, 'chain': 'A'})
+        assert (len(hashed), len(scored)) == (2, 2)
+
+    def test_metadata_fetched_once(self, service, monkeypatch):
+        """Test concurrent first requests for a structure's metadata fetch it once."""
+        fetched = []
+
+        def count(pdb_id):
+            fetched.append(pdb_id)
+            time.sleep(0.05)
+            return 6
+
+        monkeypatch.setattr(service.data_loader, 'get_nucleotide_count', count)
+        monkeypatch.setattr(service.data_loader, 'get_validation_metrics', lambda pdb_id: None)
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(service.metadata, ['2TST'] * 8))
+
+        assert results == [(6, None)] * 8
+        assert fetched == ['2TST']
+
+
+def test_forward_exit_codes(client, tmp_path, monkeypatch):
+    """Test app.py-style arguments map to requests and app.py exit codes."""
+    monkeypatch.chdir(tmp_path)
+    args = argparse.Namespace(
+        pdb_id='1TST', motif_name=None, motif=None, motif_residues=None, residue=2, chain=None,
+        csv='scores_summary.csv', output_dir=None, csv_dir=None, motif_dir='unique_motifs', server=None,
+    )
+    assert request_from_args(args)[0] == '/score/residue'
+    assert forward(args, client) == 0
+    assert (tmp_path / "basepair_report.json").exists()
+
+    args.residue = 99
+    assert forward(args, client) == 1
+    args.pdb_id = '9XYZ'
+    assert forward(args, client) == 2
+
+    args.motif_name = 'HAIRPIN-1-GAC-1TST-1'
+    path, body = request_from_args(args)
+    assert path == '/score/motif'
+    assert body['workdir'] == str(tmp_path)
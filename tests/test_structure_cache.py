@@ -0,0 +1,121 @@
+"""Tests for utils/structure_cache.py - Memory-bounded LRU structure cache."""
+
+import json
+
+import pandas as pd
+
+from utils.data_loader import DataLoader
+from utils.hbond_table import HBondTable
+from utils.instrumentation import SilentSink
+from utils.structure_cache import StructureCache, estimate_size
+
+MB = 1024 * 1024
+
+
+class TestStructureCache:
+    """Tests for LRU bookkeeping."""
+
+    def test_evicts_least_recently_used(self):
+        """Test entries are evicted in LRU order once the budget is exceeded."""
+        cache = StructureCache(budget_mb=3)
+        cache.put('a', 'A', size=MB)
+        cache.put('b', 'B', size=MB)
+        cache.put('c', 'C', size=MB)
+        assert cache.get('a') == 'A'  # 'b' is now least recently used
+
+        cache.put('d', 'D', size=MB)
+        assert 'b' not in cache
+        assert {'a', 'c', 'd'} == {key for key in ('a', 'b', 'c', 'd') if key in cache}
+        assert cache.evictions == 1
+        assert cache.bytes == 3 * MB
+
+    def test_oversized_entry_not_cached(self):
+        """Test an entry larger than the whole budget is skipped without evicting others."""
+        cache = StructureCache(budget_mb=1)
+        cache.put('small', 1, size=100)
+        assert not cache.put('huge', 2, size=2 * MB)
+        assert 'small' in cache
+        assert 'huge' not in cache
+        assert cache.evictions == 0
+
+    def test_replacing_key_updates_size(self):
+        """Test re-putting a key replaces its size instead of double counting."""
+        cache = StructureCache(budget_mb=1)
+        cache.put('a', 1, size=100)
+        cache.put('a', 2, size=300)
+        assert len(cache) == 1
+        assert cache.bytes == 300
+        assert cache.get('a') == 2
+
+    def test_stats(self):
+        """Test hit/miss counters and summary."""
+        cache = StructureCache(budget_mb=1)
+        cache.put('a', 1, size=10)
+        cache.get('a')
+        cache.get('a')
+        cache.get('missing')
+
+        stats = cache.stats()
+        assert (stats['hits'], stats['misses'], stats['entries']) == (2, 1, 1)
+        assert abs(stats['hit_rate'] - 2 / 3) < 1e-9
+        assert '2 hits, 1 misses' in cache.summary()
+
+    def test_estimate_size(self):
+        """Test sizes grow with content and H-bond tables count their full table once."""
+        small = [{'res_1': 'A-G-1-', 'shear': 0.1}]
+        large = small * 100
+        assert estimate_size(large) > estimate_size(small) > 0
+
+        df = pd.DataFrame({'res_1': ['A-G-1-'] * 10, 'res_2': ['A-C-2-'] * 10,
+                           'res_type_1': ['RNA'] * 10, 'res_type_2': ['RNA'] * 5 + ['PROTEIN'] * 5})
+        table = HBondTable(df)
+        assert estimate_size(table) == estimate_size(table.all)
+
+
+class TestDataLoaderCache:
+    """Tests for the DataLoader's opt-in structure cache."""
+
+    def _write_structure(self, tmp_path, config):
+        (tmp_path / 'basepairs').mkdir()
+        (tmp_path / 'hbonds').mkdir()
+        (tmp_path / 'torsions').mkdir()
+        basepairs = [{'res_1': 'A-G-1-', 'res_2': 'A-C-20-', 'bp_type': 'G-C', 'lw': 'cWW'}]
+        (tmp_path / 'basepairs' / '1ABC.json').write_text(json.dumps(basepairs))
+        pd.DataFrame([{'res_1': 'A-G-1-', 'res_2': 'A-C-20-', 'atom_1': 'N1', 'atom_2': 'N3',
+                       'res_type_1': 'RNA', 'res_type_2': 'RNA'}]).to_csv(
+            tmp_path / 'hbonds' / '1ABC.csv', index=False)
+        (tmp_path / 'torsions' / '1ABC.json').write_text(json.dumps({'A-G-1-': {'chi': -160.0}}))
+        config.BASEPAIR_DIR = str(tmp_path / 'basepairs')
+        config.HBOND_DIR = str(tmp_path / 'hbonds')
+        config.TORSION_DIR = str(tmp_path / 'torsions')
+
+    def test_disabled_by_default(self, config):
+        """Test the cache is opt-in."""
+        assert DataLoader(config).cache is None
+
+    def test_repeated_loads_hit(self, config, tmp_path):
+        """Test repeated loads return the cached objects and count hits."""
+        self._write_structure(tmp_path, config)
+        loader = DataLoader(config, events=SilentSink(), cache_mb=16)
+
+        for _ in range(2):
+            basepairs = loader.load_basepairs('1ABC', quiet=True)
+            torsions = loader.load_torsions('1ABC', quiet=True)
+        assert loader.load_basepairs('1ABC', quiet=True) is basepairs
+        assert loader.load_torsions('1ABC', quiet=True) is torsions
+        assert len(loader.load_hbonds('1ABC', quiet=True)) == 1
+
+        stats = loader.cache.stats()
+        assert stats['misses'] == 3  # basepairs, torsions, hbonds
+        assert stats['hits'] == 4
+        assert stats['entries'] == 3
+
+    def test_changed_file_is_reloaded(self, config, tmp_path):
+        """Test a modified input file misses the cache."""
+        self._write_structure(tmp_path, config)
+        loader = DataLoader(config, events=SilentSink(), cache_mb=16)
+        assert loader.load_torsions('1ABC', quiet=True) == {'A-G-1-': {'chi': -160.0}}
+
+        (tmp_path / 'torsions' / '1ABC.json').write_text(json.dumps({'A-G-1-': {'chi': 60.0}, 'A-C-2-': {}}))
+        assert loader.load_torsions('1ABC', quiet=True) == {'A-G-1-': {'chi': 60.0}, 'A-C-2-': {}}
+        assert loader.cache.misses == 2
@@ -0,0 +1,132 @@
+"""Tests for utils/threshold_table.py - Compiled (bp_type, edge) thresholds."""
+
+import numpy as np
+
+import config_bc
+import config_bc_thresholds
+from config import Config
+from scorer2 import Scorer
+from utils.threshold_table import (
+    GEOMETRY_FIELDS, ThresholdTable, compile_thresholds, resolve_chi_expected, resolve_thresholds
+)
+
+
+CHI_EXPECTATIONS = {
+    'cWW': {'G-C': {'expected': 'anti'}, '_OTHER': {'expected': 'both'}},
+    'tSH': {'A-G': {'expected': 'syn'}},
+    '_OTHER': {'expected': 'both'},
+}
+
+
+def _combinations(config):
+    by_bp = config.GEOMETRY_THRESHOLDS_BY_BASE_PAIR_BY_EDGE
+    bp_types = list(by_bp) + ['X-Y', '']
+    edge_types = sorted({edge for by_edge in by_bp.values() for edge in by_edge}) + ['cXX', '_OTHER']
+    return [(bp, edge) for bp in bp_types for edge in edge_types]
+
+
+class TestThresholdTable:
+    """Tests for threshold compilation."""
+
+    def test_matches_fallback_chain(self):
+        """Test every lookup equals walking the config fallback chain, unknown values included."""
+        for config in (Config(), config_bc.Config()):
+            table = compile_thresholds(config)
+            geo_by_bp = config.GEOMETRY_THRESHOLDS_BY_BASE_PAIR_BY_EDGE
+            hb_by_bp = config.HBOND_THRESHOLDS_BY_BASE_PAIR_BY_EDGE
+
+            for bp_type, edge_type in _combinations(config):
+                code = table.code(bp_type, edge_type)
+                assert table.geometry_thresholds[code] == resolve_thresholds(geo_by_bp, bp_type, edge_type)
+                assert table.hbond_thresholds[code] == resolve_thresholds(hb_by_bp, bp_type, edge_type)
+
+    def test_dense_rows(self):
+        """Test dense arrays hold the resolved values, NaN for undefined fields."""
+        config = Config()
+        table = compile_thresholds(config)
+        code = table.code('A-U', 'cWW')
+        resolved = table.geometry_thresholds[code]
+
+        for col, field in enumerate(GEOMETRY_FIELDS):
+            if resolved.get(field) is None:
+                assert np.isnan(table.geometry[code, col])
+            else:
+                assert table.geometry[code, col] == resolved[field]
+
+        min_count, max_count, ideal = config.EXPECTED_HBOND_COUNTS['A-U']
+        assert table.expected_counts[code].tolist() == [min_count, max_count, ideal]
+        assert np.isnan(table.expected_counts[table.code('X-Y', 'cWW')]).all()
+
+    def test_codes_for(self):
+        """Test vector lookup matches scalar lookup."""
+        table = compile_thresholds(Config())
+        bp_types = ['A-U', 'X-Y', 'G-C']
+        edge_types = ['cWW', 'tHS', 'cXX']
+
+        assert table.codes_for(bp_types, edge_types).tolist() == [
+            table.code(bp, edge) for bp, edge in zip(bp_types, edge_types)]
+
+    def test_chi_expectations(self):
+        """Test compiled chi expectations follow the (edge, bp) -> (edge, _OTHER) -> _OTHER chain."""
+        table = ThresholdTable(Config(), CHI_EXPECTATIONS)
+
+        for bp_type, edge_type in [('G-C', 'cWW'), ('A-U', 'cWW'), ('A-G', 'tSH'),
+                                   ('A-U', 'tSH'), ('X-Y', 'cXX')]:
+            assert (table.chi_expected[table.code(bp_type, edge_type)] ==
+                    resolve_chi_expected(CHI_EXPECTATIONS, bp_type, edge_type))
+        assert table.chi_expected[table.code('A-G', 'tSH')] == 'syn'
+
+    def test_edge_only_config(self):
+        """Test edge-keyed configs compile as base-pair-agnostic thresholds."""
+        config = config_bc_thresholds.Config()
+        table = compile_thresholds(config)
+        edge_type = next(iter(config.GEOMETRY_THRESHOLDS_BY_EDGE))
+
+        code = table.code('A-U', edge_type)
+        assert table.geometry_thresholds[code] == config.GEOMETRY_THRESHOLDS_BY_EDGE[edge_type]
+
+    def test_scorer_recompiles_replaced_chi_expectations(self, config):
+        """Test the scorer picks up chi expectations assigned after construction."""
+        scorer = Scorer(config)
+        scorer.chi_expectations = CHI_EXPECTATIONS
+
+        torsion_data = {'A-A-1-': {'chi': -160.0}, 'A-G-9-': {'chi': -160.0}}
+        has_issue, _, details = scorer._check_chi_conformation(
+            'A-A-1-', 'A-G-9-', 'tSH', 'A-G', torsion_data)
+
+        assert has_issue
+        assert details['chi_outlier']
+
+    def test_scorer_recompiles_reassigned_config(self, config):
+        """Test assigning a config recompiles the threshold table and resets the result-cache fingerprint."""
+        scorer = Scorer(config)
+        table, fingerprint = scorer._get_threshold_table(), scorer.fingerprint()
+        edge_only = config_bc_thresholds.Config()
+
+        scorer.config = edge_only
+
+        assert scorer._get_threshold_table() is not table
+        edge_type = next(iter(edge_only.GEOMETRY_THRESHOLDS_BY_EDGE))
+        code = scorer._get_threshold_table().code('A-U', edge_type)
+        assert scorer._get_threshold_table().geometry_thresholds[code] == \
+            edge_only.GEOMETRY_THRESHOLDS_BY_EDGE[edge_type]
+        assert scorer.fingerprint() != fingerprint
+        assert scorer.config is edge_only
+
+    def test_scorer_snapshots_config_settings(self, config, sample_basepair_list, sample_hbond_data):
+        """Test in-place weight edits change neither scores nor fingerprint until the config is reassigned."""
+        scorer = Scorer(config)
+
+        def scores():
+            result = scorer.score_basepairs(sample_basepair_list, sample_hbond_data)
+            return [row['score'] for row in result.basepair_scores]
+
+        before, fingerprint = scores(), scorer.fingerprint()
+
+        config.PENALTY_WEIGHTS = {name: weight * 3 for name, weight in config.PENALTY_WEIGHTS.items()}
+        assert scores() == before
+        assert scorer.fingerprint() == fingerprint
+
+        scorer.config = config
+        assert scores() != before
+        assert scorer.fingerprint() != fingerprint
@@ -25,6 +25,8 @@ import numpy as np
 from pathlib import Path
 
 from config import Config
+from utils.data_loader import DataLoader
+from utils.instrumentation import SilentSink
 from g_quads import g_quads
 
 # Torsion angles to extract
@@ -109,7 +111,7 @@ def get_chi_conformation(chi: float) -> str:
 
 
 def analyze_basepairs(input_csv: str, n_em: int, n_xray: int,
-                      torsion_dir: str, output_csv: str):
+                      torsion_dir: str, output_csv: str, cache_mb: float = 512):
     """
     Main analysis function.
 
@@ -119,6 +121,7 @@ def analyze_basepairs(input_csv: str, n_em: int, n_xray: int,
         n_xray: Number of X-ray base-pairs to sample
         torsion_dir: Directory containing torsion JSON files
         output_csv: Output CSV file path
+        cache_mb: Memory budget in MB for cached torsion data
     """
     print(f"Loading base-pair data from {input_csv}...")
     df = pd.read_csv(input_csv, low_memory=False)
@@ -162,8 +165,10 @@ def analyze_basepairs(input_csv: str, n_em: int, n_xray: int,
     sampled = pd.concat([em_sample, xray_sample], ignore_index=True)
     print(f"Total sampled: {len(sampled):,}")
 
-    # Cache for torsion data
-    torsion_cache = {}
+    # Torsion data, cached within a memory budget (samples revisit structures)
+    config = Config()
+    config.TORSION_DIR = torsion_dir
+    data_loader = DataLoader(config, events=SilentSink(), cache_mb=cache_mb)
 
     # Build output records
     records = []
@@ -173,9 +178,7 @@ def analyze_basepairs(input_csv: str, n_em: int, n_xray: int,
         pdb_id = row['pdb_id']
 
         # Load torsions (with caching)
-        if pdb_id not in torsion_cache:
-            torsion_cache[pdb_id] = load_torsions(pdb_id, torsion_dir)
-        torsions = torsion_cache[pdb_id]
+        torsions = data_loader.load_torsions(pdb_id, quiet=True) or {}
 
         # Get residue identifiers
         res1 = row['res1']  # e.g., "Y-G-2-"
@@ -297,6 +300,8 @@ def analyze_basepairs(input_csv: str, n_em: int, n_xray: int,
 
     print(f"\nRecords with torsion data: {len(records):,}")
     print(f"Missing torsion data: {missing_torsions:,}")
+    if data_loader.cache is not None:
+        print(data_loader.cache.summary())
 
     # Create output DataFrame
     output_df = pd.DataFrame(records)
@@ -389,6 +394,12 @@ def main():
         default='torsion_scores.csv',
         help='Output CSV file (default: torsion_scores.csv)'
     )
+    parser.add_argument(
+        '--cache-mb',
+        type=float,
+        default=512,
+        help='Memory budget in MB for cached torsion data (default: 512)'
+    )
     parser.add_argument(
         '--all',
         action='store_true',
@@ -406,7 +417,8 @@ def main():
         n_em=args.em,
         n_xray=args.xray,
         torsion_dir=args.torsion_dir,
-        output_csv=args.output
+        output_csv=args.output,
+        cache_mb=args.cache_mb
     )
 
 
@@ -0,0 +1,113 @@
+"""Base vs. backbone/sugar atom classification shared by the scorer and analyzers."""
+
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+
+
+# Explicit exclusion list (backup to the pattern rules in is_base_atom)
+BACKBONE_SUGAR_ATOMS = frozenset({
+    # Phosphate
+    'P', 'OP1', 'OP2', 'OP3', 'O1P', 'O2P', 'O3P',
+    'PA', 'PB', 'PG',
+
+    # Ribose (prime notation)
+    "O5'", "C5'", "C4'", "O4'", "C3'", "O3'", "C2'", "O2'", "C1'",
+
+    # Ribose (asterisk notation)
+    'O5*', 'C5*', 'C4*', 'O4*', 'C3*', 'O3*', 'C2*', 'O2*', 'C1*',
+
+    # Hydrogens
+    "HO5'", "HO2'", "HO3'", 'HO5*', 'HO2*', 'HO3*',
+})
+
+# Column added to H-bond DataFrames by tag_base_base_hbonds
+BASE_BASE_COLUMN = 'is_base_base'
+
+
+@lru_cache(maxsize=None)
+def is_base_atom(atom_name: str) -> bool:
+    """
+    Check if an atom is part of the base (not backbone/sugar).
+
+    Results are cached per atom name, so each distinct name is classified once
+    per process no matter how many H-bond rows carry it.
+
+    Args:
+        atom_name: Atom name (e.g., 'N1', 'O2', 'C5')
+
+    Returns:
+        True if base atom, False if backbone/sugar atom
+    """
+    if not isinstance(atom_name, str):
+        return False
+
+    # Remove whitespace
+    atom_name = atom_name.strip()
+
+    # Pattern-based exclusion for robustness
+    # Phosphate patterns
+    if atom_name.startswith('P') and len(atom_name) <= 3:  # P, PA, PB, PG
+        return False
+    if atom_name.startswith('OP'):  # OP1, OP2, OP3
+        return False
+    if 'P' in atom_name and 'O' in atom_name:  # O1P, O2P, O3P
+        return False
+
+    # Sugar patterns (contains prime ' or asterisk *)
+    if "'" in atom_name or '*' in atom_name:
+        return False
+
+    return atom_name not in BACKBONE_SUGAR_ATOMS
+
+
+def base_base_mask(hbond_df: pd.DataFrame) -> pd.Series:
+    """
+    Boolean mask of H-bonds whose two atoms are both base atoms.
+
+    Reads the precomputed `is_base_base` column when the loader already tagged
+    the frame; otherwise classifies the distinct atom names once and maps them.
+
+    Args:
+        hbond_df: H-bond DataFrame with atom_1/atom_2 columns
+
+    Returns:
+        Boolean Series aligned with hbond_df.index
+    """
+    if BASE_BASE_COLUMN in hbond_df.columns:
+        return hbond_df[BASE_BASE_COLUMN].astype(bool)
+
+    if hbond_df.empty:
+        return pd.Series(False, index=hbond_df.index, dtype=bool)
+
+    return pd.Series(_base_flags(hbond_df['atom_1']) & _base_flags(hbond_df['atom_2']),
+                     index=hbond_df.index)
+
+
+def _base_flags(atoms: pd.Series) -> np.ndarray:
+    """is_base_atom for each value, classifying each distinct atom name once."""
+    if isinstance(atoms.dtype, pd.CategoricalDtype):
+        # Classify the categories; code -1 (missing) picks the trailing False
+        flags = np.array([is_base_atom(name) for name in atoms.cat.categories] + [False], dtype=bool)
+        return flags[atoms.cat.codes.to_numpy()]
+    lookup = {name: is_base_atom(name) for name in pd.unique(atoms)}
+    return atoms.map(lookup).fillna(False).astype(bool).to_numpy()
+
+
+def tag_base_base_hbonds(hbond_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Add the boolean `is_base_base` column to an H-bond DataFrame in place.
+
+    Args:
+        hbond_df: H-bond DataFrame with atom_1/atom_2 columns
+
+    Returns:
+        The same DataFrame, for chaining
+    """
+    if hbond_df is None or BASE_BASE_COLUMN in hbond_df.columns:
+        return hbond_df
+    if 'atom_1' not in hbond_df.columns or 'atom_2' not in hbond_df.columns:
+        return hbond_df
+
+    hbond_df[BASE_BASE_COLUMN] = base_base_mask(hbond_df)
+    return hbond_df
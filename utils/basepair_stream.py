@@ -0,0 +1,195 @@
+"""Streaming base pair JSON reader: records are parsed and filtered one at a time."""
+
+import json
+import re
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+from .residue_key import KEY_FIELDS, residue_key
+
+
+_CHUNK_CHARS = 1 << 16
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_NUMBER_TAIL = re.compile(r'[0-9.eE+-]*')
+
+
+class BasepairFormatError(ValueError):
+    """Base pair data that is neither a list nor a dict with a 'base_pairs' list."""
+
+
+class _JsonScanner:
+    """
+    Incremental JSON tokenizer over a text file.
+
+    Holds one chunk plus the value being decoded, so a file of many small
+    records is read in memory proportional to its largest record.
+    """
+
+    def __init__(self, f, chunk_chars: int):
+        self.f = f
+        self.chunk_chars = chunk_chars
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self) -> bool:
+        """Append the next chunk (dropping consumed text); False at end of file."""
+        chunk = self.f.read(self.chunk_chars)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace character ('' at end of file), without consuming it."""
+        while True:
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf) or not self._fill():
+                return self.buf[self.pos:self.pos + 1]
+
+    def expect(self, allowed: str) -> str:
+        """Consume one of the allowed structural characters."""
+        char = self.peek()
+        if not char or char not in allowed:
+            raise json.JSONDecodeError(f"Expecting one of {allowed!r}", self.buf, self.pos)
+        self.pos += 1
+        return char
+
+    def value(self):
+        """Decode the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # A number cut off by the end of the buffer ('12.' of '12.5') may continue in the next chunk
+            if not self.eof and _NUMBER_TAIL.fullmatch(self.buf, end) and self._fill():
+                continue
+            self.pos = end
+            return value
+
+    def array_items(self) -> Iterator:
+        """Values of an array whose '[' has been consumed, through its ']'."""
+        if self.peek() == ']':
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            if self.expect(',]') == ']':
+                return
+
+
+def iter_basepair_file(path: Path, chunk_chars: int = _CHUNK_CHARS) -> Iterator[dict]:
+    """
+    Yield the records of a base pair JSON file one at a time.
+
+    Handles both layouts: a top-level list of base pairs, or a dict whose
+    'base_pairs' key holds the list (other keys are skipped). A syntax error
+    is raised when reached, after the records before it have been yielded.
+
+    Raises:
+        BasepairFormatError: If the file holds some other JSON value
+        json.JSONDecodeError: If the file is not valid JSON
+    """
+    with open(path, 'r') as f:
+        scanner = _JsonScanner(f, chunk_chars)
+        start = scanner.peek()
+        if start == '[':
+            scanner.pos += 1
+            yield from scanner.array_items()
+        elif start == '{':
+            scanner.pos += 1
+            if scanner.peek() == '}':
+                scanner.pos += 1
+            else:
+                while True:
+                    key = scanner.value()
+                    scanner.expect(':')
+                    if key == 'base_pairs' and scanner.peek() == '[':
+                        scanner.pos += 1
+                        yield from scanner.array_items()
+                    elif key == 'base_pairs':
+                        raise BasepairFormatError(f"'base_pairs' in {path} is not a list")
+                    else:
+                        scanner.value()
+                    if scanner.expect(',}') == '}':
+                        break
+        else:
+            scanner.value()  # raises if the file is not JSON at all
+            raise BasepairFormatError(f"Unexpected data format in {path}")
+        if scanner.peek():
+            raise json.JSONDecodeError("Extra data", scanner.buf, scanner.pos)
+
+
+def basepair_records(data) -> Iterable[dict]:
+    """
+    Base pair records of already parsed data (list, {'base_pairs': [...]} or an iterator of records).
+
+    Raises:
+        BasepairFormatError: For any other value
+    """
+    if isinstance(data, dict):
+        data = data.get('base_pairs', [])
+    if isinstance(data, (list, Iterator)):
+        return data
+    raise BasepairFormatError(f"Unexpected base pair data of type {type(data).__name__}")
+
+
+def is_stacking(bp: dict) -> bool:
+    """
+    DataLoader's stacking filter: both residue numbers parse and differ by at
+    most 1 (on any chain). Needs the key_1/key_2 fields BasepairStream attaches.
+
+    Negative residue numbers parse (see residue_key), so pairs such as
+    A-G--1-/A-C-0- are stacking and dropped. The string-splitting filter
+    before residue keys could not parse them and kept these pairs.
+    """
+    key_1, key_2 = bp['key_1'], bp['key_2']
+    return key_1 is not None and key_2 is not None and abs(key_1.number - key_2.number) <= 1
+
+
+class BasepairStream:
+    """
+    Base pair records read one at a time, with key_1/key_2 (interned
+    ResidueKey of res_1/res_2, see utils/residue_key.py) attached and
+    excluded records dropped as they are read.
+
+    Iterating a file source parses it incrementally, so only the records the
+    caller keeps stay in memory.
+
+    Attributes:
+        read: Records read so far
+        excluded: Records dropped by the exclude predicate so far
+    """
+
+    def __init__(self, source, exclude: Optional[Callable[[dict], bool]] = None):
+        """
+        Args:
+            source: Base pair JSON file path, or parsed data (see basepair_records)
+            exclude: Predicate for records to drop, e.g. is_stacking
+        """
+        self.source = source
+        self.exclude = exclude
+        self.read = 0
+        self.excluded = 0
+
+    def __iter__(self) -> Iterator[dict]:
+        if isinstance(self.source, (str, Path)):
+            records = iter_basepair_file(self.source)
+        else:
+            records = basepair_records(self.source)
+        for bp in records:
+            self.read += 1
+            for field, key_field in KEY_FIELDS.items():
+                bp[key_field] = residue_key(bp.get(field))
+            if self.exclude is not None and self.exclude(bp):
+                self.excluded += 1
+                continue
+            yield bp
@@ -0,0 +1,138 @@
+"""Streaming mmCIF reader: counts RNA nucleotides from the _atom_site loop without temp files."""
+
+import gzip
+import io
+import itertools
+import re
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Sequence, Tuple, Union
+
+
+# Residue names counted as RNA nucleotides: standard bases and common modifications
+RNA_RESIDUES = frozenset({
+    # Standard RNA
+    'A', 'C', 'G', 'U',
+    # Common modified
+    'PSU', 'H2U', '5MU', '4SU', '1MA', 'M2G', 'OMC', 'OMG',
+})
+
+# Columns identifying a residue: (chain, name, number, insertion code). Each
+# entry lists the _atom_site column names to use, in order of preference;
+# a trailing None marks the column as optional.
+RESIDUE_COLUMNS = (
+    ('auth_asym_id', 'label_asym_id'),
+    ('label_comp_id', 'auth_comp_id'),
+    ('auth_seq_id', 'label_seq_id'),
+    ('pdbx_PDB_ins_code', None),
+)
+
+_GZIP_MAGIC = b'\x1f\x8b'
+_PREFIX = '_atom_site.'
+# A quoted value ends at a matching quote followed by whitespace (so "O5'" is one value)
+_TOKEN = re.compile(r"""'(.*?)'(?=\s|$)|"(.*?)"(?=\s|$)|(\S+)""")
+# mmCIF placeholders for inapplicable (.) and unknown (?) values
+NULL_VALUES = ('.', '?')
+
+
+class CifFormatError(ValueError):
+    """mmCIF _atom_site loop without a column the reader needs."""
+
+
+def split_fields(line: str, count: int = None) -> list:
+    """
+    First count values of an mmCIF data row (fewer if the row is shorter; all if count is None).
+
+    Quoted values are unquoted; the rest of the line is not tokenized.
+    """
+    if "'" not in line and '"' not in line:
+        return line.split() if count is None else line.split(None, count)[:count]
+    values = []
+    for match in _TOKEN.finditer(line):
+        values.append(match.group(match.lastindex))
+        if len(values) == count:
+            break
+    return values
+
+
+def iter_atom_site(lines: Iterable[str], columns: Sequence[Tuple[Optional[str], ...]]) -> Iterator[tuple]:
+    """
+    Values of the requested columns for each _atom_site row.
+
+    Column positions come from the loop's _atom_site.* header, so the
+    reader does not depend on the column order of a particular file. Only
+    the fields up to the last requested column are tokenized, and reading
+    stops at the end of the loop.
+
+    Args:
+        lines: Text lines of an mmCIF file
+        columns: For each value to yield, the column names to try in order;
+            a trailing None makes the column optional (yielded as None)
+
+    Raises:
+        CifFormatError: If a required column is missing from the header
+    """
+    header = []
+    lines = iter(lines)
+    for line in lines:
+        if line.startswith(_PREFIX):
+            header.append(line[len(_PREFIX):].split(None, 1)[0])
+        elif header:
+            first_row = line
+            break
+    else:
+        return  # no _atom_site loop (or a header without rows)
+
+    positions = {name: i for i, name in enumerate(header)}
+    indices = []
+    for names in columns:
+        index = next((positions[name] for name in names if name in positions), None)
+        if index is None and names[-1] is not None:
+            raise CifFormatError(f"_atom_site loop has none of the columns {', '.join(names)}")
+        indices.append(index)
+    needed = max(i for i in indices if i is not None) + 1
+
+    for line in itertools.chain([first_row], lines):
+        if line.startswith(('#', '_', 'loop_', 'data_')):
+            return
+        fields = split_fields(line, needed)
+        if len(fields) < needed:
+            continue
+        yield tuple(None if i is None else fields[i] for i in indices)
+
+
+def count_nucleotides(lines: Iterable[str], residues: frozenset = RNA_RESIDUES) -> int:
+    """
+    Number of distinct residues with a name in residues among the _atom_site rows.
+
+    A residue is identified by chain, name, number and insertion code, so
+    atoms of the same residue in alternate locations or later models are
+    counted once.
+    """
+    nucleotides = set()
+    for chain, name, number, icode in iter_atom_site(lines, RESIDUE_COLUMNS):
+        if name in residues:
+            nucleotides.add((chain, name, number, '' if icode in NULL_VALUES else icode))
+    return len(nucleotides)
+
+
+def open_cif(path: Union[str, Path]):
+    """Open a local mmCIF file for reading text, decompressing gzip (.gz) files."""
+    with open(path, 'rb') as f:
+        compressed = f.read(2) == _GZIP_MAGIC
+    if compressed:
+        return gzip.open(path, 'rt', encoding='utf-8', errors='replace')
+    return open(path, 'r', encoding='utf-8', errors='replace')
+
+
+def count_nucleotides_in_file(path: Union[str, Path], residues: frozenset = RNA_RESIDUES) -> int:
+    """count_nucleotides for a local mmCIF file, plain or gzip-compressed."""
+    with open_cif(path) as f:
+        return count_nucleotides(f, residues)
+
+
+def count_nucleotides_in_bytes(data: bytes, residues: frozenset = RNA_RESIDUES) -> int:
+    """count_nucleotides for mmCIF contents held in memory (e.g. a download), plain or gzip-compressed."""
+    if data[:2] == _GZIP_MAGIC:
+        data = gzip.decompress(data)
+    with io.TextIOWrapper(io.BytesIO(data), encoding='utf-8', errors='replace') as f:
+        return count_nucleotides(f, residues)
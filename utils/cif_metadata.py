@@ -0,0 +1,278 @@
+"""Offline structure metadata from local mmCIF headers, in the shape of DataLoader.get_validation_metrics."""
+
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+
+from .cif_counter import NULL_VALUES, count_nucleotides, open_cif, split_fields
+
+
+# Header categories the metadata is read from
+METADATA_CATEGORIES = frozenset({
+    'exptl', 'refine', 'reflns', 'em_3d_reconstruction', 'pdbx_database_status',
+    'software', 'citation', 'pdbx_audit_revision_history',
+})
+
+# Reading stops at the coordinates, which follow the header categories in PDB mmCIF files
+STOP_PREFIX = '_atom_site.'
+
+# exptl.method -> rcsb_entry_info.experimental_method as reported by the RCSB API
+EXPERIMENTAL_METHODS = {
+    'X-RAY DIFFRACTION': 'X-ray',
+    'ELECTRON MICROSCOPY': 'EM',
+    'ELECTRON CRYSTALLOGRAPHY': 'EM',
+    'SOLUTION NMR': 'NMR',
+    'SOLID-STATE NMR': 'NMR',
+    'NEUTRON DIFFRACTION': 'Neutron',
+}
+
+# File names tried for a PDB ID in a CIF directory, in order
+CIF_NAMES = ('{id}.cif', '{id}.cif.gz', '{lower}.cif', '{lower}.cif.gz')
+
+
+def read_categories(lines: Iterable[str], categories: Iterable[str] = METADATA_CATEGORIES,
+                    stop_prefix: Optional[str] = STOP_PREFIX) -> Dict[str, List[Dict[str, str]]]:
+    """
+    Rows of selected mmCIF categories, read in one pass.
+
+    Both layouts are handled: loops (one row per record) and key-value pairs
+    (a single row), including values on the following line and ';' text
+    fields. Rows of other categories are skipped without being tokenized.
+
+    Args:
+        lines: Text lines of an mmCIF file
+        categories: Category names without the leading '_' (e.g. 'refine')
+        stop_prefix: Stop reading at the first line with this prefix (None reads to the end)
+
+    Returns:
+        Category -> list of rows (item name -> raw value); absent categories are missing
+    """
+    wanted = set(categories)
+    result: Dict[str, List[Dict[str, str]]] = {}
+    loop_category = None  # category of the current loop
+    loop_items: List[str] = []
+    in_header = False  # reading the _category.item lines after loop_
+    values: List[str] = []  # values of the current loop row
+    pending = None  # (category, item) of a key-value pair whose value is on a later line
+    text = None  # lines of the ';' text field being read
+
+    def add_value(value: str) -> None:
+        nonlocal pending
+        if pending is not None:
+            category, item = pending
+            result.setdefault(category, [{}])[0][item] = value
+            pending = None
+        elif loop_category in wanted:
+            values.append(value)
+            if len(values) == len(loop_items):
+                result.setdefault(loop_category, []).append(dict(zip(loop_items, values)))
+                values.clear()
+
+    for line in lines:
+        if text is not None:
+            if line.startswith(';'):
+                add_value('\n'.join(text).strip())
+                text = None
+            else:
+                text.append(line.rstrip('\n'))
+            continue
+        if line.startswith(';'):
+            text = [line[1:].rstrip('\n')]
+            in_header = False
+            continue
+        if line.startswith('#'):
+            continue
+        if stop_prefix is not None and line.startswith(stop_prefix):
+            break
+        if line.startswith('loop_'):
+            loop_category, loop_items, in_header = None, [], True
+            values.clear()
+            continue
+        if line.startswith('_'):
+            tag, *rest = line.split(None, 1)
+            rest = rest[0] if rest else ''
+            category, _, item = tag[1:].partition('.')
+            if in_header:
+                loop_category = category
+                loop_items.append(item)
+                continue
+            loop_category = None
+            if category in wanted:
+                fields = split_fields(rest, 1)
+                if fields:
+                    result.setdefault(category, [{}])[0][item] = fields[0]
+                else:
+                    pending = (category, item)
+            continue
+        if line.startswith('data_'):
+            continue
+
+        in_header = False
+        if pending is None and loop_category not in wanted:
+            continue
+        for value in split_fields(line):
+            add_value(value)
+
+    return result
+
+
+def _value(row: Optional[dict], item: str) -> Optional[str]:
+    """Raw value of an item, None when missing or a '.'/'?' placeholder."""
+    if row is None:
+        return None
+    value = row.get(item)
+    return None if value is None or value in NULL_VALUES else value
+
+
+def _number(row: Optional[dict], item: str, kind=float):
+    value = _value(row, item)
+    try:
+        return kind(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def metrics_from_categories(categories: Dict[str, List[Dict[str, str]]]) -> dict:
+    """
+    Metrics dict of DataLoader.get_validation_metrics from mmCIF header categories.
+
+    Validation report values (clashscore, RMSZ, outliers, suiteness) and
+    RNA structural features are not in the mmCIF file and are left out, as
+    the API result leaves out fields for missing categories.
+    """
+    metrics = {}
+    first = {name: rows[0] for name, rows in categories.items() if rows}
+
+    # Experimental method and resolution
+    methods = [_value(row, 'method') for row in categories.get('exptl', [])]
+    methods = [method for method in methods if method]
+    if methods:
+        metrics['Structure Determination Method'] = methods[0]
+        if len(methods) > 1:
+            metrics['Experimental_method'] = 'Multiple methods'
+        else:
+            metrics['Experimental_method'] = EXPERIMENTAL_METHODS.get(methods[0].upper(), 'Other')
+
+        if metrics['Experimental_method'] == 'EM':
+            resolution = _number(first.get('em_3d_reconstruction'), 'resolution')
+            metrics['EM Resolution (Å)'] = resolution
+            metrics['EM Diffraction Resolution (Å)'] = None
+        else:
+            resolution = _number(first.get('refine'), 'ls_d_res_high')
+            if resolution is None:
+                resolution = _number(first.get('reflns'), 'd_resolution_high')
+            metrics['EM Resolution (Å)'] = None
+            metrics['EM Diffraction Resolution (Å)'] = resolution
+
+    # Deposition date
+    if 'pdbx_database_status' in first:
+        metrics['Deposition_Date'] = _value(first['pdbx_database_status'], 'recvd_initial_deposition_date')
+
+    # Refinement statistics from the first refinement
+    if 'refine' in first:
+        refine = first['refine']
+        metrics.update({
+            'R_free': _number(refine, 'ls_R_factor_R_free'),
+            'R_work': _number(refine, 'ls_R_factor_R_work'),
+            'Refinement_resolution': _number(refine, 'ls_d_res_high'),
+            'Average_B_factor': _number(refine, 'B_iso_mean'),
+        })
+
+    # Publication year of the primary citation
+    for citation in categories.get('citation', []):
+        if _value(citation, 'id') == 'primary':
+            metrics['Publication_Year'] = _number(citation, 'year', int)
+            break
+
+    # Software used
+    if 'software' in categories:
+        software_list = []
+        for sw in categories['software']:
+            name = _value(sw, 'name') or ''
+            version = _value(sw, 'version')
+            software_list.append(f"{name} {version}" if version else name)
+        metrics['Software_used'] = ', '.join(software_list) if software_list else None
+
+    # Latest revision
+    revisions = categories.get('pdbx_audit_revision_history', [])
+    if revisions:
+        latest = max(revisions, key=lambda row: _number(row, 'ordinal', int) or 0)
+        metrics.update({
+            'Revision_Date': _value(latest, 'revision_date'),
+            'Major_Revision': _number(latest, 'major_revision', int),
+            'Minor_Revision': _number(latest, 'minor_revision', int),
+        })
+
+    return metrics
+
+
+def read_cif_metadata(path: Union[str, Path]) -> dict:
+    """Metrics dict for a local mmCIF file (plain or gzip-compressed), reading only its header."""
+    with open_cif(path) as f:
+        return metrics_from_categories(read_categories(f))
+
+
+def find_cif(cif_dir: Union[str, Path], pdb_id: str) -> Optional[Path]:
+    """Local mmCIF file of a PDB ID in cif_dir (see CIF_NAMES), or None."""
+    cif_dir = Path(cif_dir)
+    for name in CIF_NAMES:
+        path = cif_dir / name.format(id=pdb_id.upper(), lower=pdb_id.lower())
+        if path.is_file():
+            return path
+    return None
+
+
+def _split_header(lines: Iterable[str]) -> tuple:
+    """(lines before the coordinates, iterator over the coordinates and the rest of the file)."""
+    lines = iter(lines)
+    header = []
+    for line in lines:
+        if line.startswith(STOP_PREFIX):
+            return header, itertools.chain([line], lines)
+        header.append(line)
+    return header, iter(())
+
+
+def _extract_file(task) -> tuple:
+    """Worker: (pdb_id, metrics or None, nucleotide count or None) for one file, read in one pass."""
+    pdb_id, path, nucleotides = task
+    try:
+        with open_cif(path) as f:
+            header, rest = _split_header(f)
+            metrics = metrics_from_categories(read_categories(header))
+            count = count_nucleotides(rest) if nucleotides else None
+        return pdb_id, metrics, count
+    except Exception:
+        return pdb_id, None, None
+
+
+def extract_directory(cif_dir: Union[str, Path], pdb_ids: Sequence[str] = None, workers: int = None,
+                      nucleotides: bool = False) -> Dict[str, dict]:
+    """
+    Metadata for every mmCIF file in a directory, parsed on a process pool.
+
+    Args:
+        cif_dir: Directory of {PDB_ID}.cif / .cif.gz files
+        pdb_ids: PDB IDs to extract (default: every *.cif / *.cif.gz file)
+        workers: Worker processes (default: CPU count)
+        nucleotides: Also count RNA nucleotides from the coordinates
+
+    Returns:
+        PDB ID (upper case) -> {'metrics': dict or None, 'num_nucleotides': int or None};
+        IDs without a local file are missing
+    """
+    cif_dir = Path(cif_dir)
+    if pdb_ids is None:
+        paths = sorted(cif_dir.glob('*.cif')) + sorted(cif_dir.glob('*.cif.gz'))
+        found = {path.name.split('.')[0].upper(): path for path in paths}
+    else:
+        found = {pdb_id.upper(): find_cif(cif_dir, pdb_id) for pdb_id in pdb_ids}
+    tasks = [(pdb_id, path, nucleotides) for pdb_id, path in found.items() if path is not None]
+
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        for pdb_id, metrics, count in executor.map(_extract_file, tasks, chunksize=16):
+            results[pdb_id] = {'metrics': metrics, 'num_nucleotides': count}
+    return results
@@ -0,0 +1,310 @@
+"""Compact binary columnar encoding of parsed structure inputs, readable through mmap."""
+
+import json
+import mmap
+import os
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+# Blob layout: MAGIC | header length (uint64, little-endian) | header JSON |
+# padding | arrays, each starting on an _ALIGN boundary. Array offsets in the
+# header are relative to the start of the array section.
+MAGIC = b'RNACOL01'
+_ALIGN = 64
+_PREFIX = len(MAGIC) + 8
+
+# Per-value states of a records column (stored only when not all present)
+_VALUE, _NULL, _ABSENT_STATE = 0, 1, 2
+_ABSENT = object()  # placeholder for a key missing from a record
+
+# Largest integer magnitude a float64 holds exactly
+_MAX_EXACT_INT = 2 ** 53
+
+
+def _align(n: int) -> int:
+    return (n + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+class _ArrayWriter:
+    """Collects arrays for the array section and hands out their locations."""
+
+    def __init__(self):
+        self.chunks: List[bytes] = []
+        self.size = 0
+
+    def add(self, array: np.ndarray) -> list:
+        array = np.ascontiguousarray(array)
+        location = [self.size, array.dtype.str, int(array.size)]
+        data = array.tobytes()
+        padded = _align(len(data))
+        self.chunks.append(data + b'\0' * (padded - len(data)))
+        self.size += padded
+        return location
+
+
+def _pack(header: dict, arrays: _ArrayWriter) -> bytes:
+    header_bytes = json.dumps(header, separators=(',', ':')).encode()
+    data_start = _align(_PREFIX + len(header_bytes))
+    prefix = MAGIC + len(header_bytes).to_bytes(8, 'little') + header_bytes
+    return b''.join([prefix, b'\0' * (data_start - len(prefix))] + arrays.chunks)
+
+
+def _encode_values(name: str, values: list, arrays: _ArrayWriter) -> Optional[dict]:
+    """
+    Encode one column of JSON values (None allowed, _ABSENT for missing keys).
+
+    Returns:
+        Column spec, or None if the values cannot be encoded losslessly
+    """
+    n = len(values)
+    state = np.zeros(n, dtype=np.uint8)
+    present = []
+    for i, value in enumerate(values):
+        if value is _ABSENT:
+            state[i] = _ABSENT_STATE
+        elif value is None:
+            state[i] = _NULL
+        else:
+            present.append(i)
+    types = {type(values[i]) for i in present}
+    spec = {'name': name}
+    if state.any():
+        spec['state'] = arrays.add(state)
+
+    def filled(dtype, fill):
+        out = np.full(n, fill, dtype=dtype)
+        if present:
+            out[present] = [values[i] for i in present]
+        return out
+
+    if types <= {bool}:
+        spec['kind'] = 'bool'
+        spec['data'] = arrays.add(filled(np.uint8, 0))
+    elif types <= {int} and all(-2 ** 63 <= values[i] < 2 ** 63 for i in present):
+        spec['kind'] = 'int'
+        spec['data'] = arrays.add(filled(np.int64, 0))
+    elif types <= {float}:
+        spec['kind'] = 'float'
+        spec['data'] = arrays.add(filled(np.float64, np.nan))
+    elif types <= {int, float} and all(isinstance(values[i], float) or abs(values[i]) <= _MAX_EXACT_INT
+                                       for i in present):
+        spec['kind'] = 'number'  # JSON mixes 0 and 0.0; keep each value's type
+        spec['data'] = arrays.add(filled(np.float64, np.nan))
+        spec['ints'] = arrays.add(np.array([type(v) is int for v in values], dtype=np.uint8))
+    else:
+        if types <= {str}:
+            spec['kind'] = 'str'
+            strings = [None if v is _ABSENT else v for v in values]
+        else:
+            spec['kind'] = 'json'
+            strings = [None] * n
+            for i in present:
+                strings[i] = json.dumps(values[i])
+        codes, vocab = pd.factorize(np.array(strings, dtype=object))
+        spec['vocab'] = [str(v) for v in vocab]
+        spec['data'] = arrays.add(codes.astype(np.int32))
+    return spec
+
+
+def _array(buffer, data_start: int, location: list) -> np.ndarray:
+    offset, dtype, count = location
+    return np.frombuffer(buffer, dtype=np.dtype(dtype), count=count, offset=data_start + offset)
+
+
+def _decode_values(spec: dict, buffer, data_start: int) -> list:
+    """Decode a records column back to Python values (_ABSENT for missing keys)."""
+    data = _array(buffer, data_start, spec['data'])
+    kind = spec['kind']
+    if kind == 'bool':
+        values = data.astype(bool).tolist()
+    elif kind in ('int', 'float'):
+        values = data.tolist()
+    elif kind == 'number':
+        values = data.tolist()
+        for i in np.flatnonzero(_array(buffer, data_start, spec['ints'])).tolist():
+            values[i] = int(values[i])
+    elif kind == 'str':
+        vocab = np.array(spec['vocab'] + [None], dtype=object)  # code -1 -> None
+        values = vocab[data].tolist()
+    else:  # json: decode per row, so rows never share mutable values
+        vocab = spec['vocab']
+        values = [json.loads(vocab[code]) if code >= 0 else None for code in data.tolist()]
+
+    if 'state' in spec:
+        state = _array(buffer, data_start, spec['state'])
+        for i in np.flatnonzero(state == _NULL).tolist():
+            values[i] = None
+        for i in np.flatnonzero(state == _ABSENT_STATE).tolist():
+            values[i] = _ABSENT
+    return values
+
+
+def _record_columns(records: list) -> Optional[List[str]]:
+    """Keys in first-seen order, or None if some record orders its keys differently."""
+    order = {}
+    for record in records:
+        if not isinstance(record, dict):
+            return None
+        last = -1
+        for key in record:
+            if not isinstance(key, str):
+                return None
+            position = order.setdefault(key, len(order))
+            if position < last:
+                return None
+            last = position
+    return list(order)
+
+
+def _encode_record_columns(records: list, arrays: _ArrayWriter) -> Optional[list]:
+    names = _record_columns(records)
+    if names is None:
+        return None
+    columns = []
+    for name in names:
+        spec = _encode_values(name, [record.get(name, _ABSENT) for record in records], arrays)
+        if spec is None:
+            return None
+        columns.append(spec)
+    return columns
+
+
+def _decode_records(columns: list, rows: int, buffer, data_start: int) -> list:
+    names = [spec['name'] for spec in columns]
+    values = [_decode_values(spec, buffer, data_start) for spec in columns]
+    if not names:
+        return [{} for _ in range(rows)]
+    if not any('state' in spec and _ABSENT_STATE in _array(buffer, data_start, spec['state'])
+               for spec in columns):
+        return [dict(zip(names, row)) for row in zip(*values)]
+    return [{name: value for name, value in zip(names, row) if value is not _ABSENT}
+            for row in zip(*values)]
+
+
+def _encode_frame(df: pd.DataFrame, arrays: _ArrayWriter) -> Optional[list]:
+    if not isinstance(df.index, pd.RangeIndex) or df.index.start != 0 or df.index.step != 1:
+        return None
+    if not df.columns.is_unique or not all(isinstance(c, str) for c in df.columns):
+        return None
+    columns = []
+    for name in df.columns:
+        series = df[name]
+        dtype = series.dtype
+        spec = {'name': name, 'dtype': str(dtype)}
+        if isinstance(dtype, np.dtype) and dtype.kind in 'biuf':
+            spec['kind'] = 'array'
+            spec['data'] = arrays.add(series.to_numpy())
+        elif pd.api.types.is_string_dtype(dtype) or dtype == object:
+            codes, vocab = pd.factorize(series)
+            if not all(isinstance(v, str) for v in vocab):
+                return None
+            spec['kind'] = 'str'
+            spec['vocab'] = list(vocab)
+            spec['data'] = arrays.add(codes.astype(np.int32))
+        else:
+            return None
+        columns.append(spec)
+    return columns
+
+
+def _decode_frame(columns: list, rows: int, buffer, data_start: int) -> pd.DataFrame:
+    data = {}
+    for spec in columns:
+        values = _array(buffer, data_start, spec['data'])
+        if spec['kind'] == 'array':
+            data[spec['name']] = pd.Series(values, dtype=spec['dtype'], copy=True)
+        else:
+            vocab = np.array(spec['vocab'] + [np.nan], dtype=object)  # code -1 -> NaN
+            dtype = object if spec['dtype'] == 'object' else spec['dtype']
+            data[spec['name']] = pd.Series(vocab[values], dtype=dtype)
+    return pd.DataFrame(data, index=pd.RangeIndex(rows))
+
+
+def encode(value) -> Optional[bytes]:
+    """
+    Encode parsed input data as a binary columnar blob.
+
+    Supported values:
+        list of dicts (base pairs) -> 'records'
+        dict of dicts keyed by residue ID (torsions) -> 'mapping'
+        DataFrame with numeric and string columns (H-bonds) -> 'frame'
+
+    Returns:
+        Blob bytes, or None if the value cannot be encoded losslessly
+    """
+    arrays = _ArrayWriter()
+    if isinstance(value, pd.DataFrame):
+        kind, rows = 'frame', len(value)
+        columns = _encode_frame(value, arrays)
+        extra = {}
+    elif isinstance(value, list):
+        kind, rows = 'records', len(value)
+        columns = _encode_record_columns(value, arrays)
+        extra = {}
+    elif isinstance(value, dict):
+        kind, rows = 'mapping', len(value)
+        keys = list(value)
+        if not all(isinstance(k, str) for k in keys):
+            return None
+        columns = _encode_record_columns(list(value.values()), arrays)
+        extra = {'keys': _encode_values('keys', keys, arrays)}
+    else:
+        return None
+    if columns is None:
+        return None
+    return _pack({'kind': kind, 'rows': rows, 'columns': columns, **extra}, arrays)
+
+
+def decode(buffer, offset: int = 0):
+    """
+    Decode a blob written by encode().
+
+    Args:
+        buffer: bytes, memoryview or mmap holding the blob
+        offset: Position of the blob in the buffer
+
+    Returns:
+        The list, dict or DataFrame that was encoded
+
+    Raises:
+        ValueError: If the buffer does not hold a blob at offset
+    """
+    if bytes(buffer[offset:offset + len(MAGIC)]) != MAGIC:
+        raise ValueError("Not a columnar structure blob")
+    header_len = int.from_bytes(buffer[offset + len(MAGIC):offset + _PREFIX], 'little')
+    header = json.loads(bytes(buffer[offset + _PREFIX:offset + _PREFIX + header_len]))
+    data_start = offset + _align(_PREFIX + header_len)
+
+    kind, rows, columns = header['kind'], header['rows'], header['columns']
+    if kind == 'frame':
+        return _decode_frame(columns, rows, buffer, data_start)
+    records = _decode_records(columns, rows, buffer, data_start)
+    if kind == 'mapping':
+        return dict(zip(_decode_values(header['keys'], buffer, data_start), records))
+    return records
+
+
+def write_file(path: Path, blob: bytes) -> None:
+    """Write a blob atomically (temporary file + rename)."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(blob)
+    os.replace(tmp_path, path)
+
+
+def read_file(path: Path):
+    """
+    Memory-map a blob file and decode it.
+
+    Decoded values never reference the mapping, which is released once the
+    temporary arrays viewing it are gone.
+    """
+    with open(path, 'rb') as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return decode(mapped)
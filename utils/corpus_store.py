@@ -0,0 +1,233 @@
+"""Packed corpus store: every structure's inputs in a few large shard files with an offset index."""
+
+import hashlib
+import json
+import mmap
+import os
+import uuid
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional
+
+from . import columnar_store
+
+
+# Bump when the index or shard layout changes
+FORMAT_VERSION = 1
+
+INDEX_NAME = 'index.json'
+_SHARD_SUFFIX = '.pack'
+_ALIGN = 64
+
+
+class CorpusEntry(NamedTuple):
+    """Location of one packed input (a columnar_store blob) inside a shard."""
+
+    pdb_id: str
+    kind: str
+    shard: int
+    offset: int
+    length: int
+
+    @property
+    def name(self) -> str:
+        return f"{self.pdb_id} {self.kind} (packed corpus)"
+
+
+class CorpusWriter:
+    """
+    Builds a packed store by appending blobs to size-capped shard files.
+
+    Shard file names carry a per-build ID, so rebuilding never overwrites a
+    shard another process may have memory-mapped; the index is written last
+    (atomically), and shards of earlier builds are removed on close.
+    """
+
+    def __init__(self, root: Path, shard_mb: float = 2048):
+        """
+        Args:
+            root: Store directory (created if needed)
+            shard_mb: Start a new shard once the current one reaches this size
+        """
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.shard_bytes = int(shard_mb * 1024 * 1024)
+        self.build_id = uuid.uuid4().hex[:12]
+        self.shards: List[str] = []
+        self.entries: Dict[str, dict] = {}
+        self._file = None
+        self._size = 0
+
+    def _open_shard(self) -> None:
+        if self._file is not None:
+            self._file.close()
+        name = f"{self.build_id}-{len(self.shards):03d}{_SHARD_SUFFIX}"
+        self.shards.append(name)
+        self._file = open(self.root / name, 'wb')
+        self._size = 0
+
+    def add_structure(self, pdb_id: str, blobs: Dict[str, Optional[bytes]],
+                      input_fingerprint: str = None, sources: Dict[str, list] = None) -> None:
+        """
+        Pack one structure's inputs.
+
+        Args:
+            pdb_id: PDB ID (stored upper-case)
+            blobs: Input kind -> columnar_store blob, or None for an input the
+                structure does not have. Kinds left out are not held by the
+                store and are read from the data files instead.
+            input_fingerprint: DataLoader.input_fingerprint of the source files
+            sources: Input kind -> [size, mtime_ns] of the source file, for the verifier
+        """
+        record = {'kinds': {}, 'fingerprint': input_fingerprint, 'sources': sources or {}}
+        for kind, blob in blobs.items():
+            if blob is None:
+                record['kinds'][kind] = None
+                continue
+            if self._file is None or (self._size and self._size + len(blob) > self.shard_bytes):
+                self._open_shard()
+            offset = self._size
+            self._file.write(blob)
+            padded = (len(blob) + _ALIGN - 1) // _ALIGN * _ALIGN
+            self._file.write(b'\0' * (padded - len(blob)))
+            self._size += padded
+            record['kinds'][kind] = [len(self.shards) - 1, offset, len(blob),
+                                     hashlib.sha256(blob).hexdigest()]
+        self.entries[pdb_id.upper()] = record
+
+    def close(self) -> Path:
+        """Finish the last shard, write the index and drop shards of earlier builds."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        index = {'version': FORMAT_VERSION, 'build_id': self.build_id,
+                 'shards': self.shards, 'entries': self.entries}
+        index_path = self.root / INDEX_NAME
+        tmp_path = index_path.with_name(f".{INDEX_NAME}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(index, f, separators=(',', ':'))
+        os.replace(tmp_path, index_path)
+
+        current = set(self.shards)
+        for path in self.root.glob(f"*{_SHARD_SUFFIX}"):
+            if path.name not in current:
+                path.unlink()
+        return index_path
+
+
+class CorpusStore:
+    """
+    Read access to a packed store.
+
+    Opening the store reads only its index; each shard is memory-mapped the
+    first time one of its entries is read, so loading a structure is an
+    index lookup plus a decode at a known offset, with no per-file opens.
+
+    Attributes:
+        root: Store directory
+        build_id: ID of the build that wrote the store
+    """
+
+    def __init__(self, root: Path):
+        """
+        Raises:
+            OSError: If the index cannot be read
+            ValueError: If the index has an unknown format version
+        """
+        self.root = Path(root)
+        with open(self.root / INDEX_NAME, 'r') as f:
+            index = json.load(f)
+        if index.get('version') != FORMAT_VERSION:
+            raise ValueError(f"Unsupported corpus store version {index.get('version')} in {self.root}")
+        self.build_id = index['build_id']
+        self.shards: List[str] = index['shards']
+        self._entries: Dict[str, dict] = index['entries']
+        self._maps: Dict[int, mmap.mmap] = {}
+
+    @classmethod
+    def open(cls, root) -> Optional['CorpusStore']:
+        """Open the store at root, or return None if root is unset or holds no index."""
+        if not root or not (Path(root) / INDEX_NAME).is_file():
+            return None
+        return cls(root)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, pdb_id: str) -> bool:
+        return pdb_id.upper() in self._entries
+
+    def pdb_ids(self) -> List[str]:
+        """Packed PDB IDs, sorted."""
+        return sorted(self._entries)
+
+    def lookup(self, pdb_id: str, kind: str) -> Optional[CorpusEntry]:
+        """Location of a packed input, or None if the store does not hold it."""
+        record = self._entries.get(pdb_id.upper())
+        location = record['kinds'].get(kind) if record else None
+        if location is None:
+            return None
+        return CorpusEntry(pdb_id.upper(), kind, *location[:3])
+
+    def missing(self, pdb_id: str, kind: str) -> bool:
+        """True if the structure was packed without this input (its file did not exist)."""
+        record = self._entries.get(pdb_id.upper())
+        return record is not None and kind in record['kinds'] and record['kinds'][kind] is None
+
+    def input_fingerprint(self, pdb_id: str) -> Optional[str]:
+        """Input fingerprint recorded when the structure was packed."""
+        record = self._entries.get(pdb_id.upper())
+        return record.get('fingerprint') if record else None
+
+    def sources(self, pdb_id: str) -> Dict[str, list]:
+        """Input kind -> [size, mtime_ns] of the source files when packed."""
+        record = self._entries.get(pdb_id.upper())
+        return record.get('sources', {}) if record else {}
+
+    def _map(self, shard: int) -> mmap.mmap:
+        mapped = self._maps.get(shard)
+        if mapped is None:
+            with open(self.root / self.shards[shard], 'rb') as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._maps[shard] = mapped
+        return mapped
+
+    def read(self, entry: CorpusEntry):
+        """Decode a packed input (a fresh object on every call)."""
+        return columnar_store.decode(self._map(entry.shard), entry.offset)
+
+    def verify(self) -> List[str]:
+        """
+        Check the store's integrity: shards present, entries in bounds, blob
+        checksums matching and every blob decodable.
+
+        Returns:
+            Problem descriptions (empty if the store is sound)
+        """
+        problems = []
+        sizes = {}
+        for i, name in enumerate(self.shards):
+            path = self.root / name
+            if path.is_file():
+                sizes[i] = path.stat().st_size
+            else:
+                problems.append(f"shard {name} is missing")
+
+        for pdb_id, record in self._entries.items():
+            for kind, location in record['kinds'].items():
+                if location is None:
+                    continue
+                shard, offset, length, checksum = location
+                if shard not in sizes:
+                    continue
+                if offset + length > sizes[shard]:
+                    problems.append(f"{pdb_id} {kind}: entry runs past the end of {self.shards[shard]}")
+                    continue
+                blob = self._map(shard)[offset:offset + length]
+                if hashlib.sha256(blob).hexdigest() != checksum:
+                    problems.append(f"{pdb_id} {kind}: checksum mismatch")
+                    continue
+                try:
+                    columnar_store.decode(blob)
+                except (ValueError, KeyError) as e:
+                    problems.append(f"{pdb_id} {kind}: cannot decode ({e})")
+        return problems
@@ -4,16 +4,107 @@ import json
 import pandas as pd
 from pathlib import Path
 from typing import Optional
-import requests
+
+from . import columnar_store
+from .atom_classifier import tag_base_base_hbonds
+from .basepair_stream import BasepairFormatError, BasepairStream, is_stacking, iter_basepair_file
+from .cif_counter import count_nucleotides_in_bytes, count_nucleotides_in_file
+from .cif_metadata import find_cif, read_cif_metadata
+from .corpus_store import CorpusEntry, CorpusStore
+from .hbond_table import HBondTable, compact_hbonds, read_hbond_csv
+from .rcsb_client import RcsbClient, extract_validation_metrics
+from .instrumentation import ConsoleSink, EventSink
+from .result_cache import hash_files
+from .structure_cache import StructureCache
+
+
+# Input kinds, in DataLoader.input_files order
+INPUT_KINDS = ('basepairs', 'hbonds', 'torsions')
 
 
 class DataLoader:
     """Loads precomputed RNA structural data."""
     
-    def __init__(self, config):
+    def __init__(self, config, events: EventSink = None, cache_mb: float = None,
+                 rcsb: RcsbClient = None):
+        """
+        Args:
+            config: Configuration with data directories
+            events: Sink for load messages and stage timings (default: console output)
+            cache_mb: Memory budget in MB for an LRU cache of parsed base pairs,
+                H-bond tables and torsions (default: no cache). Cached values are
+                shared between callers and must not be modified.
+            rcsb: Client for RCSB downloads and metadata (default: a new client
+                for rcsb.org). Share one client between loaders to pool connections.
+        
+        If config.CORPUS_DIR names a packed corpus store (see pack_corpus.py),
+        inputs it holds are read from the store instead of the data files.
+        
+        H-bonds are loaded with the compact schema (utils/hbond_table.py:
+        scoring columns only, categorical strings) unless config.HBOND_COMPACT
+        is False.
+        """
         self.config = config
         self.basepair_dir = Path(config.BASEPAIR_DIR)
         self.hbond_dir = Path(config.HBOND_DIR)
+        self.torsion_dir = Path(getattr(config, 'TORSION_DIR', 'data/torsions'))
+        self.binary_dir = Path(getattr(config, 'BINARY_DIR', 'data/binary'))
+        self.cif_dir = Path(getattr(config, 'CIF_DIR', 'data/cif'))
+        self.corpus = CorpusStore.open(getattr(config, 'CORPUS_DIR', None))
+        self.compact_hbonds = getattr(config, 'HBOND_COMPACT', True)
+        self.events = events if events is not None else ConsoleSink()
+        self.cache = StructureCache(cache_mb) if cache_mb else None
+        self.rcsb = rcsb if rcsb is not None else RcsbClient()
+        self._hbond_table = None  # (file signature, HBondTable) of the last parsed H-bond CSV
+    
+    @staticmethod
+    def _file_signature(file_path: Path) -> tuple:
+        """Identify a file's current contents by path, size and modification time."""
+        stat = file_path.stat()
+        return (str(file_path), stat.st_size, stat.st_mtime_ns)
+    
+    @classmethod
+    def _input_signature(cls, file_path: Path) -> tuple:
+        """_file_signature of an input file, or (path, None, None) while it is absent."""
+        try:
+            return cls._file_signature(file_path)
+        except FileNotFoundError:
+            return (str(file_path), None, None)
+    
+    def _signature(self, source) -> tuple:
+        """Identify the current contents of a data file or packed corpus entry."""
+        if isinstance(source, CorpusEntry):
+            return (self.corpus.build_id,) + tuple(source)
+        return self._file_signature(source)
+    
+    def _locate(self, kind: str, pdb_id: str, file_path: Path):
+        """
+        Where to read an input from.
+        
+        Returns:
+            CorpusEntry if the packed store holds it, else file_path if the
+            file exists, else None. Inputs the store recorded as absent are
+            not looked up on disk.
+        """
+        if self.corpus is not None:
+            entry = self.corpus.lookup(pdb_id, kind)
+            if entry is not None:
+                return entry
+            if self.corpus.missing(pdb_id, kind):
+                return None
+        return file_path if file_path.exists() else None
+    
+    def _cached(self, kind: str, source, load):
+        """Return load() for a data file or corpus entry, through the structure cache when enabled."""
+        if self.cache is None:
+            return load()
+        key = (kind,) + self._signature(source)
+        value = self.cache.get(key)
+        if value is None:
+            value = load()
+            if value is not None:
+                self.cache.put(key, value)
+        return value
     
     # def load_basepairs(self, pdb_id: str) -> Optional[list]:
     #     """Load base pair data from JSON file."""
@@ -33,113 +124,246 @@ class DataLoader:
     #         return None
     
     
+    def input_files(self, pdb_id: str) -> list:
+        """Paths of the base pair, H-bond and torsion files read for a structure."""
+        return [
+            self.basepair_dir / f"{pdb_id}.json",
+            self.hbond_dir / f"{pdb_id.upper()}.csv",
+            self.torsion_dir / f"{pdb_id.upper()}.json",
+        ]
+    
+    def input_fingerprint(self, pdb_id: str) -> str:
+        """
+        Hash of a structure's input file contents (see utils/result_cache.py).
+        
+        Identical files give identical fingerprints on any machine; a missing
+        file hashes as absent, so adding torsions later changes the fingerprint.
+        With a structure cache the hash is kept there, keyed on the files'
+        sizes and modification times, and recomputed only when they change.
+        """
+        if self.corpus is not None:
+            fingerprint = self.corpus.input_fingerprint(pdb_id)
+            if fingerprint is not None:
+                return fingerprint  # recorded from the same files when the store was built
+        files = self.input_files(pdb_id)
+        if self.cache is None:
+            with self.events.stage('input_fingerprint', pdb_id=pdb_id):
+                return hash_files(files)
+        # Rehash only when a file's size or modification time changed
+        key = ('input_fingerprint',) + tuple(self._input_signature(path) for path in files)
+        fingerprint = self.cache.get(key)
+        if fingerprint is None:
+            with self.events.stage('input_fingerprint', pdb_id=pdb_id):
+                fingerprint = hash_files(files)
+            self.cache.put(key, fingerprint)
+        return fingerprint
+    
+    def binary_path(self, kind: str, source: Path) -> Path:
+        """Location of the binary columnar copy of an input file."""
+        return self.binary_dir / kind / f"{source.name}.col"
+    
+    def _read_binary(self, kind: str, source: Path):
+        """Decoded binary copy of an input file, or None if missing, older than the source or unreadable."""
+        path = self.binary_path(kind, source)
+        try:
+            if path.stat().st_mtime_ns < source.stat().st_mtime_ns:
+                return None
+            with self.events.stage('read_binary', kind=kind):
+                return columnar_store.read_file(path)
+        except (OSError, ValueError, KeyError):
+            return None
+    
+    def _read_source(self, kind: str, source):
+        """
+        Parsed contents of an input, from the corpus store, a current binary copy or the file.
+        
+        Base pair files are not parsed up front: the result is an iterator
+        over their records (see utils/basepair_stream.py).
+        """
+        if isinstance(source, CorpusEntry):
+            with self.events.stage('read_corpus', kind=kind):
+                data = self.corpus.read(source)
+        else:
+            data = self._read_binary(kind, source)
+        if data is not None:
+            if kind == 'hbonds' and self.compact_hbonds:
+                return compact_hbonds(data)
+            return data
+        if kind == 'hbonds':
+            return read_hbond_csv(source, full=not self.compact_hbonds)
+        if kind == 'basepairs':
+            return iter_basepair_file(source)
+        with open(source, 'r') as f:
+            return json.load(f)
+    
+    @staticmethod
+    def encode_input(kind: str, source: Path) -> Optional[bytes]:
+        """
+        Parse an input file and encode it as a columnar_store blob.
+        
+        Base pair files in the {'base_pairs': [...]} format are stored as the list.
+        
+        Returns:
+            Blob bytes, or None if the data cannot be encoded losslessly
+        """
+        if kind == 'hbonds':
+            data = pd.read_csv(source)
+        else:
+            with open(source, 'r') as f:
+                data = json.load(f)
+            if kind == 'basepairs' and isinstance(data, dict):
+                data = data.get('base_pairs', [])
+        return columnar_store.encode(data)
+    
+    def convert_to_binary(self, pdb_id: str, force: bool = False) -> dict:
+        """
+        Write binary columnar copies of a structure's input files.
+        
+        Loaders use a copy instead of parsing the JSON/CSV text as long as it
+        is at least as new as its source.
+        
+        Args:
+            pdb_id: PDB ID
+            force: Rewrite copies that are already current
+        
+        Returns:
+            Dict of input kind -> 'written', 'current', 'missing' or 'unsupported'
+            (data the columnar format cannot hold losslessly; left as text)
+        """
+        status = {}
+        for kind, source in zip(INPUT_KINDS, self.input_files(pdb_id)):
+            if not source.exists():
+                status[kind] = 'missing'
+                continue
+            dest = self.binary_path(kind, source)
+            if not force and dest.exists() and dest.stat().st_mtime_ns >= source.stat().st_mtime_ns:
+                status[kind] = 'current'
+                continue
+            
+            blob = self.encode_input(kind, source)
+            if blob is None:
+                status[kind] = 'unsupported'
+                continue
+            columnar_store.write_file(dest, blob)
+            status[kind] = 'written'
+        return status
+    
     def load_basepairs(self, pdb_id: str, quiet: bool = False) -> list:
         """
         Load base pair data from JSON file.
         Filters out stacking interactions (adjacent residues).
+        
+        Each base pair gets key_1/key_2 fields holding the interned ResidueKey
+        of res_1/res_2 (None if malformed); see utils/residue_key.py.
         """
         bp_file = self.basepair_dir / f"{pdb_id}.json"
+        source = self._locate('basepairs', pdb_id, bp_file)
         
-        if not bp_file.exists():
+        if source is None:
             if not quiet:
-                print(f"Error: Base pair file not found: {bp_file}")
+                self.events.emit('file_missing', f"Error: Base pair file not found: {bp_file}",
+                                 pdb_id=pdb_id, kind='basepairs', path=str(bp_file))
             return None
         
+        return self._cached('basepairs', source, lambda: self._timed_read_basepairs(source, pdb_id, quiet))
+    
+    def _timed_read_basepairs(self, bp_file, pdb_id: str, quiet: bool) -> list:
+        with self.events.stage('load_basepairs', pdb_id=pdb_id):
+            return self._read_basepairs(bp_file, pdb_id, quiet)
+
+    def _read_basepairs(self, bp_file, pdb_id: str, quiet: bool) -> list:
+        """Read base pairs (JSON file or corpus entry), dropping stacking (adjacent-residue) entries as they are read."""
         try:
-            with open(bp_file, 'r') as f:
-                data = json.load(f)
-            
-            # data is already a list, not a dict
             # Handle both formats: list or dict with 'base_pairs' key
-            if isinstance(data, list):
-                base_pairs = data
-            elif isinstance(data, dict):
-                base_pairs = data.get('base_pairs', [])
-            else:
-                if not quiet:
-                    print(f"Error: Unexpected data format in {bp_file}")
-                return None
+            stream = BasepairStream(self._read_source('basepairs', bp_file), exclude=is_stacking)
+            filtered_bps = list(stream)
             
-            # Filter out stacking interactions (adjacent residues)
-            filtered_bps = []
-            stacking_count = 0
-            
-            for bp in base_pairs:
-                res1_parts = bp['res_1'].split('-')
-                res2_parts = bp['res_2'].split('-')
-                
-                try:
-                    res1_num = int(res1_parts[2])
-                    res2_num = int(res2_parts[2])
-                    
-                    # Skip if residues are adjacent (stacking)
-                    if abs(res1_num - res2_num) <= 1:
-                        stacking_count += 1
-                        continue
-                    
-                    filtered_bps.append(bp)
-                    
-                except (IndexError, ValueError):
-                    # If parsing fails, keep the base pair
-                    filtered_bps.append(bp)
-            
-            if stacking_count > 0 and not quiet:
-                print(f"  Filtered out {stacking_count} stacking interactions")
+            if stream.excluded > 0 and not quiet:
+                self.events.emit('stacking_filtered', f"  Filtered out {stream.excluded} stacking interactions",
+                                 pdb_id=pdb_id, count=stream.excluded)
             
             return filtered_bps
             
+        except BasepairFormatError:
+            if not quiet:
+                self.events.emit('load_error', f"Error: Unexpected data format in {bp_file}",
+                                 pdb_id=pdb_id, kind='basepairs')
+            return None
         except Exception as e:
             if not quiet:
-                print(f"Error loading base pairs: {e}")
+                self.events.emit('load_error', f"Error loading base pairs: {e}",
+                                 pdb_id=pdb_id, kind='basepairs', error=str(e))
             import traceback
             traceback.print_exc()
             return None
     
-    def load_hbonds(self, pdb_id: str, quiet: bool = False) -> Optional[pd.DataFrame]:
-        """Load H-bond data from CSV file (RNA-RNA only)."""
+    def load_hbond_table(self, pdb_id: str, quiet: bool = False) -> Optional[HBondTable]:
+        """
+        Load a structure's H-bond CSV once, with RNA-RNA and external views.
+        
+        The most recently parsed table is kept, so calling load_hbonds and
+        load_all_hbonds for the same structure parses its CSV only once (the
+        file is re-read if it changed on disk).
+        
+        Returns:
+            HBondTable, or None if the file is missing or unreadable
+        """
         file_path = self.hbond_dir / f"{pdb_id.upper()}.csv"
-        # json_files = list(self.hbond_dir.glob("*.csv"))
-        # print(f"@@@@@@@@@@@@@@@@@@@@@@@@@Found {len(json_files)} CSV files in {self.hbond_dir}")
+        source = self._locate('hbonds', pdb_id, file_path)
         
-        if not file_path.exists():
+        if source is None:
             if not quiet:
-                print(f"Warning: H-bond file not found: {file_path}")
+                self.events.emit('file_missing', f"Warning: H-bond file not found: {file_path}",
+                                 pdb_id=pdb_id, kind='hbonds', path=str(file_path))
             return None
         
+        signature = self._signature(source)
+        if self._hbond_table is not None and self._hbond_table[0] == signature:
+            return self._hbond_table[1]
+        
+        table = self._cached('hbonds', source, lambda: self._parse_hbonds(source, pdb_id, quiet))
+        if table is not None:
+            self._hbond_table = (signature, table)
+        return table
+    
+    def _parse_hbonds(self, source, pdb_id: str, quiet: bool) -> Optional[HBondTable]:
         try:
-            df = pd.read_csv(file_path)
-            
-            # Filter to only RNA-RNA interactions
-            rna_rna = df[(df['res_type_1'] == 'RNA') & (df['res_type_2'] == 'RNA')]
-            
-            if not quiet:
-                print(f"✓ Loaded {len(rna_rna)} RNA-RNA H-bonds from {file_path.name}")
-                print(f"  (Filtered out {len(df) - len(rna_rna)} RNA-protein interactions)")
-            
-            return rna_rna
+            with self.events.stage('parse_hbonds', pdb_id=pdb_id):
+                hbond_df = tag_base_base_hbonds(self._read_source('hbonds', source))
+                return HBondTable(hbond_df)
         except Exception as e:
             if not quiet:
-                print(f"Error loading H-bonds from {file_path}: {e}")
+                self.events.emit('load_error', f"Error loading H-bonds from {source}: {e}",
+                                 pdb_id=pdb_id, kind='hbonds', error=str(e))
+            return None
+    
+    def load_hbonds(self, pdb_id: str, quiet: bool = False) -> Optional[pd.DataFrame]:
+        """Load H-bond data from CSV file (RNA-RNA only)."""
+        table = self.load_hbond_table(pdb_id, quiet=quiet)
+        if table is None:
             return None
+        
+        if not quiet:
+            self.events.emit('hbonds_loaded',
+                             f"✓ Loaded {len(table.rna_rna)} RNA-RNA H-bonds from {pdb_id.upper()}.csv\n"
+                             f"  (Filtered out {len(table.external)} RNA-protein interactions)",
+                             pdb_id=pdb_id, count=len(table.rna_rna), filtered=len(table.external))
+        return table.rna_rna
     
     def load_all_hbonds(self, pdb_id: str, quiet: bool = False) -> Optional[pd.DataFrame]:
-        """Load all H-bond data from CSV file (including RNA-PROTEIN and RNA-LIGAND)."""
-        file_path = self.hbond_dir / f"{pdb_id.upper()}.csv"
+        """
+        Load all H-bond data from CSV file (including RNA-PROTEIN and RNA-LIGAND).
         
-        if not file_path.exists():
-            if not quiet:
-                print(f"Warning: H-bond file not found: {file_path}")
+        RNA-RNA rows come first; see HBondTable.
+        """
+        table = self.load_hbond_table(pdb_id, quiet=quiet)
+        if table is None:
             return None
         
-        try:
-            df = pd.read_csv(file_path)
-            if not quiet:
-                print(f"✓ Loaded {len(df)} total H-bonds from {file_path.name}")
-            return df
-        except Exception as e:
-            if not quiet:
-                print(f"Error loading H-bonds: {e}")
-            return None
+        if not quiet:
+            self.events.emit('all_hbonds_loaded', f"✓ Loaded {len(table.all)} total H-bonds from {pdb_id.upper()}.csv",
+                             pdb_id=pdb_id, count=len(table.all))
+        return table.all
         
     def load_torsions(self, pdb_id: str, quiet: bool = False) -> dict:
         """Load per-residue torsion angles from JSON file.
@@ -148,22 +372,30 @@ class DataLoader:
             Dict keyed by residue ID (e.g. 'A-C-1-') with torsion angle values,
             or None if file not found.
         """
-        file_path = Path('data/torsions') / f"{pdb_id.upper()}.json"
+        file_path = self.torsion_dir / f"{pdb_id.upper()}.json"
+        source = self._locate('torsions', pdb_id, file_path)
 
-        if not file_path.exists():
+        if source is None:
             if not quiet:
-                print(f"Warning: Torsion file not found: {file_path}")
+                self.events.emit('file_missing', f"Warning: Torsion file not found: {file_path}",
+                                 pdb_id=pdb_id, kind='torsions', path=str(file_path))
             return None
 
+        return self._cached('torsions', source, lambda: self._read_torsions(source, pdb_id, quiet))
+
+    def _read_torsions(self, source, pdb_id: str, quiet: bool) -> Optional[dict]:
         try:
-            with open(file_path, 'r') as f:
-                data = json.load(f)
+            with self.events.stage('load_torsions', pdb_id=pdb_id):
+                data = self._read_source('torsions', source)
             if not quiet:
-                print(f"✓ Loaded torsion data for {len(data)} residues from {file_path.name}")
+                self.events.emit('torsions_loaded',
+                                 f"✓ Loaded torsion data for {len(data)} residues from {source.name}",
+                                 pdb_id=pdb_id, count=len(data))
             return data
         except Exception as e:
             if not quiet:
-                print(f"Error loading torsion data: {e}")
+                self.events.emit('load_error', f"Error loading torsion data: {e}",
+                                 pdb_id=pdb_id, kind='torsions', error=str(e))
             return None
 
     def download_cif(self, pdb_id: str, output_path: str = "temp_structure.cif") -> bool:
@@ -177,121 +409,70 @@ class DataLoader:
         Returns:
             True if successful, False otherwise
         """
+        data = self.fetch_cif(pdb_id)
+        if data is None:
+            return False
+        with open(output_path, 'wb') as f:
+            f.write(data)
+        return True
+    
+    def fetch_cif(self, pdb_id: str) -> Optional[bytes]:
+        """
+        Download a CIF file from RCSB PDB into memory.
+        
+        Args:
+            pdb_id: PDB ID (e.g., '3QG9')
+            
+        Returns:
+            File contents, or None if the download failed
+        """
         pdb_id = pdb_id.upper().strip()
-        url = f"https://files.rcsb.org/download/{pdb_id}.cif"
         
         try:
-            response = requests.get(url, timeout=30)
+            response = self.rcsb.get(self.rcsb.cif_url(pdb_id))
             
             if response.status_code == 200:
-                with open(output_path, 'w') as f:
-                    f.write(response.text)
-                return True
-            else:
-                print(f"Warning: Could not download {pdb_id}.cif (HTTP {response.status_code})")
-                return False
+                return response.content
+            self.events.emit('download_failed', f"Warning: Could not download {pdb_id}.cif (HTTP {response.status_code})",
+                             pdb_id=pdb_id, status=response.status_code)
+            return None
                 
         except Exception as e:
-            print(f"Warning: Error downloading {pdb_id}.cif: {e}")
-            return False
+            self.events.emit('download_failed', f"Warning: Error downloading {pdb_id}.cif: {e}",
+                             pdb_id=pdb_id, error=str(e))
+            return None
     
-    """
-CORRECTED CIF PARSER for utils/data_loader.py
-
-Replace the count_nucleotides_from_cif method with this one.
-"""
-
-    def count_nucleotides_from_cif(self, cif_file: str) -> int:
+    def count_nucleotides_from_cif(self, cif_file) -> int:
         """
-        Count unique RNA nucleotides from CIF file.
+        Count unique RNA nucleotides from a CIF file.
         
-        CIF format uses columnar data after headers like:
-        _atom_site.group_PDB
-        _atom_site.label_comp_id (residue name)
-        _atom_site.auth_asym_id (chain)
-        _atom_site.auth_seq_id (residue number)
+        Columns are located through the _atom_site.* header (see
+        utils/cif_counter.py), so files with any column order or count work.
         
         Args:
-            cif_file: Path to CIF file
+            cif_file: Path to a local CIF file (plain or gzip-compressed),
+                or the file contents as bytes
             
         Returns:
-            Number of unique nucleotides
+            Number of unique nucleotides (0 if the file cannot be read)
         """
-        rna_residues = {
-            # Standard RNA
-            'A', 'C', 'G', 'U'
-            # Common modified
-            'PSU', 'H2U', '5MU', '4SU', '1MA', 'M2G', 'OMC', 'OMG',
-        }
-        
-        nucleotides = set()
-        in_atom_site = False
-        
         try:
-            with open(cif_file, 'r') as f:
-                for line in f:
-                    # Check if we're in the atom_site loop
-                    if line.startswith('_atom_site.'):
-                        in_atom_site = True
-                        continue
-                    
-                    # End of atom_site loop
-                    if in_atom_site and (line.startswith('#') or line.startswith('loop_') or 
-                                        (line.startswith('_') and not line.startswith('_atom_site.'))):
-                        in_atom_site = False
-                        continue
-                    
-                    # Parse atom lines in the atom_site loop
-                    if in_atom_site and line.startswith(('ATOM', 'HETATM')):
-                        parts = line.split()
-                        
-                        # CIF format (columns may vary, but typically):
-                        # 0: ATOM/HETATM
-                        # 1: atom_id
-                        # 2: type_symbol
-                        # 3: label_atom_id
-                        # 4: alt_id (. or A/B/C)
-                        # 5: label_comp_id (residue name) ← WE NEED THIS
-                        # 6: label_asym_id
-                        # 7: label_entity_id
-                        # 8: label_seq_id
-                        # ... (more fields)
-                        # Near end: auth_seq_id, auth_comp_id, auth_asym_id
-                        
-                        if len(parts) >= 20:  # CIF has many columns
-                            try:
-                                # Get residue name (label_comp_id - column 5)
-                                res_name = parts[5]
-                                
-                                # Get chain (auth_asym_id - usually near end)
-                                # In the sample: position varies, but auth_asym_id is typically ~column 18-19
-                                # Let's use label_asym_id (column 6) as it's more reliable
-                                chain = parts[6]
-                                
-                                # Get residue number (auth_seq_id - near end)
-                                # Let's use label_seq_id (column 8) 
-                                res_num = parts[8]
-                                
-                                # Check if it's RNA/DNA
-                                if res_name in rna_residues:
-                                    nt_id = f"{chain}-{res_name}-{res_num}-"
-                                    nucleotides.add(nt_id)
-                                    
-                            except (IndexError, ValueError):
-                                continue
-            
-            return len(nucleotides)
+            if isinstance(cif_file, bytes):
+                return count_nucleotides_in_bytes(cif_file)
+            return count_nucleotides_in_file(cif_file)
             
         except Exception as e:
-            print(f"Warning: Error reading CIF file: {e}")
+            path = '<bytes>' if isinstance(cif_file, bytes) else str(cif_file)
+            self.events.emit('cif_error', f"Warning: Error reading CIF file: {e}",
+                             path=path, error=str(e))
             return 0
     
-    
     def get_nucleotide_count(self, pdb_id: str) -> int:
         """
         Get nucleotide count by downloading CIF from RCSB PDB.
         
-        Downloads CIF, counts nucleotides, deletes CIF.
+        The CIF is counted in memory, so concurrent callers never share a
+        file on disk.
         
         Args:
             pdb_id: PDB ID
@@ -299,23 +480,10 @@ Replace the count_nucleotides_from_cif method with this one.
         Returns:
             Number of unique RNA nucleotides (0 if download fails)
         """
-        temp_cif = "temp_structure.cif"
-        
-        # Download CIF
-        if not self.download_cif(pdb_id, temp_cif):
+        data = self.fetch_cif(pdb_id)
+        if data is None:
             return 0
-        
-        # Count nucleotides
-        count = self.count_nucleotides_from_cif(temp_cif)
-        
-        # Clean up temp file
-        try:
-            Path(temp_cif).unlink()
-        except:
-            pass
-        
-        return count
-    
+        return self.count_nucleotides_from_cif(data)
     
     def get_validation_metrics(self, pdb_id: str) -> Optional[dict]:
         """
@@ -327,125 +495,46 @@ Replace the count_nucleotides_from_cif method with this one.
         Returns:
             Dictionary containing validation metrics and metadata, or None if failed
         """
-        url = f"https://data.rcsb.org/rest/v1/core/entry/{pdb_id.upper()}"
-        
         try:
-            response = requests.get(url, timeout=30)
+            response = self.rcsb.get(self.rcsb.entry_url(pdb_id))
             
             if response.status_code != 200:
-                print(f"Warning: Could not fetch data for {pdb_id} (HTTP {response.status_code})")
+                self.events.emit('metadata_failed', f"Warning: Could not fetch data for {pdb_id} (HTTP {response.status_code})",
+                                 pdb_id=pdb_id, status=response.status_code)
                 return None
             
-            data = response.json()
-            metrics = {}
-            
-            # Primary validation metrics from pdbx_vrpt_summary_geometry
-            if 'pdbx_vrpt_summary_geometry' in data and len(data['pdbx_vrpt_summary_geometry']) > 0:
-                geom_data = data['pdbx_vrpt_summary_geometry'][0]
-                metrics.update({
-                    'clashscore': geom_data.get('clashscore'),
-                    'angles_rmsz': geom_data.get('angles_rmsz'),
-                    'bonds_rmsz': geom_data.get('bonds_rmsz'),
-                    'percent_ramachandran_outliers': geom_data.get('percent_ramachandran_outliers'),
-                    'percent_rotamer_outliers': geom_data.get('percent_rotamer_outliers')
-                })
-                
-            # RNA backbone quality from pdbx_vrpt_summary
-            if 'pdbx_vrpt_summary' in data:
-                vrpt_summary = data['pdbx_vrpt_summary']
-                metrics['rnasuiteness'] = vrpt_summary.get('rnasuiteness', None)
-            
-            # Experimental method and resolution from rcsb_entry_info
-            if 'rcsb_entry_info' in data:
-                entry_info = data['rcsb_entry_info']
-                metrics['Experimental_method'] = entry_info.get('experimental_method', None)
-                
-                # Resolution - try multiple sources
-                resolution = None
-                if 'resolution_combined' in entry_info and entry_info['resolution_combined']:
-                    resolution = entry_info['resolution_combined'][0]  # Get first/best resolution
-                elif 'diffrn_resolution_high' in entry_info and entry_info['diffrn_resolution_high']:
-                    resolution = entry_info['diffrn_resolution_high'].get('value', None)
-                
-                # Set resolution based on experimental method
-                if metrics.get('Experimental_method') == 'EM':
-                    metrics['EM Resolution (Å)'] = resolution
-                    metrics['EM Diffraction Resolution (Å)'] = None
-                else:
-                    metrics['EM Resolution (Å)'] = None
-                    metrics['EM Diffraction Resolution (Å)'] = resolution
-            
-            # Deposition date from rcsb_accession_info
-            if 'rcsb_accession_info' in data:
-                accession_info = data['rcsb_accession_info']
-                deposit_date = accession_info.get('deposit_date', None)
-                if deposit_date:
-                    # Extract just the date part (YYYY-MM-DD) from ISO format
-                    metrics['Deposition_Date'] = deposit_date.split('T')[0] if 'T' in deposit_date else deposit_date
-                else:
-                    metrics['Deposition_Date'] = None
+            metrics = extract_validation_metrics(response.json())
             
-            # Refinement statistics from refine[0]
-            if 'refine' in data and len(data['refine']) > 0:
-                refine_data = data['refine'][0]
-                metrics.update({
-                    'R_free': refine_data.get('ls_rfactor_rfree', None),
-                    'R_work': refine_data.get('ls_rfactor_rwork', None),
-                    'Refinement_resolution': refine_data.get('ls_dres_high', None),
-                    'Average_B_factor': refine_data.get('biso_mean', None)
-                })
-            
-            # Structure determination method from exptl[0]
-            if 'exptl' in data and len(data['exptl']) > 0:
-                exptl_data = data['exptl'][0]
-                metrics['Structure Determination Method'] = exptl_data.get('method', None)
-            
-            # Data collection quality from pdbx_vrpt_summary_diffraction[0]
-            if 'pdbx_vrpt_summary_diffraction' in data and len(data['pdbx_vrpt_summary_diffraction']) > 0:
-                diff_data = data['pdbx_vrpt_summary_diffraction'][0]
-                metrics.update({
-                    'data_completeness': diff_data.get('data_completeness', None),
-                    'iover_sigma': diff_data.get('iover_sigma', None),
-                    'data_anisotropy': diff_data.get('data_anisotropy', None),
-                    'fo_fc_correlation': diff_data.get('fo_fc_correlation', None)
-                })
-            
-            # RNA structural features from rcsb_entry_info
-            if 'rcsb_entry_info' in data:
-                entry_info = data['rcsb_entry_info']
-                if 'ndb_struct_conf_na_feature_combined' in entry_info:
-                    features = entry_info['ndb_struct_conf_na_feature_combined']
-                    metrics['RNA_structural_features'] = ', '.join(features) if features else None
-            
-            # Publication year from rcsb_primary_citation
-            if 'rcsb_primary_citation' in data:
-                citation = data['rcsb_primary_citation']
-                metrics['Publication_Year'] = citation.get('year', None)
-            
-            # Software used
-            if 'software' in data:
-                software_list = []
-                for sw in data['software']:
-                    name = sw.get('name', '')
-                    version = sw.get('version', '')
-                    if version:
-                        software_list.append(f"{name} {version}")
-                    else:
-                        software_list.append(name)
-                metrics['Software_used'] = ', '.join(software_list) if software_list else None
-            
-            # Revision information from rcsb_accession_info
-            if 'rcsb_accession_info' in data:
-                accession_info = data['rcsb_accession_info']
-                metrics.update({
-                    'Revision_Date': accession_info.get('revision_date', '').split('T')[0] if accession_info.get('revision_date') else None,
-                    'Major_Revision': accession_info.get('major_revision', None),
-                    'Minor_Revision': accession_info.get('minor_revision', None)
-                })
-            
-            print(f"✓ Extracted {len(metrics)} validation metrics and metadata for {pdb_id}")
+            self.events.emit('metadata_loaded', f"✓ Extracted {len(metrics)} validation metrics and metadata for {pdb_id}",
+                             pdb_id=pdb_id, count=len(metrics))
             return metrics
         
         except Exception as e:
-            print(f"Error fetching validation metrics: {e}")
+            self.events.emit('metadata_failed', f"Error fetching validation metrics: {e}",
+                             pdb_id=pdb_id, error=str(e))
+            return None
+    
+    def get_local_metadata(self, pdb_id: str) -> Optional[dict]:
+        """
+        Metadata for a PDB ID from its local mmCIF file in config.CIF_DIR, without network access.
+        
+        Fills the keys of get_validation_metrics that the mmCIF header holds
+        (method, resolution, dates, refinement statistics, software,
+        revisions); validation report values are left out (see
+        utils/cif_metadata.py).
+        
+        Returns:
+            Dictionary of metadata, or None if there is no readable local file
+        """
+        cif_file = find_cif(self.cif_dir, pdb_id)
+        if cif_file is None:
+            return None
+        try:
+            metrics = read_cif_metadata(cif_file)
+        except Exception as e:
+            self.events.emit('cif_error', f"Warning: Error reading CIF file: {e}",
+                             path=str(cif_file), error=str(e))
             return None
+        self.events.emit('metadata_loaded', f"✓ Extracted {len(metrics)} metadata fields for {pdb_id} from {cif_file.name}",
+                         pdb_id=pdb_id, count=len(metrics), source='mmcif')
+        return metrics
@@ -0,0 +1,85 @@
+"""One structure's H-bond table, parsed once and partitioned into RNA-RNA and external rows."""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+# Compact H-bond schema: only the columns scoring and the analyzers read, with
+# categorical strings (residue IDs, atom names and residue types repeat
+# heavily within a structure). Geometry stays float64 so threshold checks see
+# exactly the values a full load does.
+HBOND_SCHEMA = {
+    'res_1': 'category',
+    'res_2': 'category',
+    'atom_1': 'category',
+    'atom_2': 'category',
+    'res_type_1': 'category',
+    'res_type_2': 'category',
+    'distance': 'float64',
+    'angle_1': 'float64',
+    'angle_2': 'float64',
+    'dihedral_angle': 'float64',
+    'score': 'float64',
+}
+
+
+def read_hbond_csv(path: Path, full: bool = False) -> pd.DataFrame:
+    """
+    Read an H-bond CSV.
+
+    Args:
+        path: CSV file
+        full: Read every column with pandas' default dtypes instead of the
+            compact schema (for reports that need columns scoring ignores)
+
+    Returns:
+        H-bond DataFrame
+    """
+    if full:
+        return pd.read_csv(path)
+    return pd.read_csv(path, usecols=lambda column: column in HBOND_SCHEMA, dtype=HBOND_SCHEMA)
+
+
+def compact_hbonds(hbond_df: pd.DataFrame) -> pd.DataFrame:
+    """Apply HBOND_SCHEMA to an already parsed H-bond DataFrame (drops other columns)."""
+    columns = [column for column in hbond_df.columns if column in HBOND_SCHEMA]
+    return hbond_df[columns].astype({column: HBOND_SCHEMA[column] for column in columns})
+
+
+class HBondTable:
+    """
+    All H-bonds of a structure with RNA-RNA and RNA-protein/ligand views.
+
+    Rows are stably partitioned once at load time: RNA-RNA H-bonds first, then
+    every H-bond with a non-RNA partner. Both views are contiguous row slices
+    of the full table, so they share its memory instead of copying. Within a
+    view rows keep their file order and index labels, so `rna_rna` equals the
+    boolean-filtered frame DataLoader.load_hbonds used to return.
+
+    Attributes:
+        all: Every H-bond (RNA-RNA rows first)
+        rna_rna: H-bonds between two RNA residues (used for scoring)
+        external: H-bonds with a protein, ligand or other non-RNA partner
+    """
+
+    def __init__(self, hbond_df: pd.DataFrame):
+        """
+        Args:
+            hbond_df: Parsed H-bond CSV with res_type_1/res_type_2 columns
+        """
+        rna_rna = ((hbond_df['res_type_1'] == 'RNA') & (hbond_df['res_type_2'] == 'RNA')).to_numpy()
+        num_rna_rna = int(rna_rna.sum())
+
+        # Reorder only when some external row precedes an RNA-RNA row
+        if not rna_rna[:num_rna_rna].all():
+            order = np.argsort(~rna_rna, kind='stable')
+            hbond_df = hbond_df.take(order)
+
+        self.all = hbond_df
+        self.rna_rna = hbond_df.iloc[:num_rna_rna]
+        self.external = hbond_df.iloc[num_rna_rna:]
+
+    def __len__(self) -> int:
+        return len(self.all)
@@ -0,0 +1,189 @@
+"""Pluggable event sinks for progress messages, counts and per-stage timings."""
+
+import json
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, TextIO
+
+
+class EventSink:
+    """
+    Receives structured events from the scorer, data loader and hotspot analyzer.
+
+    Events have a name, an optional human-readable message and keyword fields
+    (counts, IDs, durations). stage() brackets a step with stage_start /
+    stage_end events and accumulates its duration in `timings`, whatever the
+    sink does with the events themselves. Timings are accumulated under a
+    lock, so one sink can be shared by threads.
+    """
+
+    def __init__(self):
+        self.timings: Dict[str, float] = {}  # stage -> total seconds
+        self.calls: Dict[str, int] = {}  # stage -> times entered
+        self._lock = threading.Lock()
+
+    def emit(self, event: str, message: Optional[str] = None, **fields) -> None:
+        """
+        Record one event.
+
+        Args:
+            event: Event name (e.g. 'hbonds_loaded', 'stage_end')
+            message: Human-readable text, shown by the console sink
+            **fields: Structured values (JSON-serializable where possible)
+        """
+        self._write(event, message, fields)
+
+    @contextmanager
+    def stage(self, name: str, message: Optional[str] = None, **fields):
+        """
+        Time a block as a named stage.
+
+        Args:
+            name: Stage name (e.g. 'score_basepairs')
+            message: Optional human-readable text for the start of the stage
+            **fields: Structured values attached to both stage events
+        """
+        self.emit('stage_start', message, stage=name, **fields)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            with self._lock:
+                self.timings[name] = self.timings.get(name, 0.0) + duration
+                self.calls[name] = self.calls.get(name, 0) + 1
+            self.emit('stage_end', stage=name, duration=round(duration, 6), **fields)
+
+    def timing_summary(self) -> str:
+        """Per-stage totals, one line per stage, slowest first."""
+        lines = []
+        for name, total in sorted(self.timings.items(), key=lambda item: -item[1]):
+            calls = self.calls.get(name, 0)
+            lines.append(f"{name:24s} {total:10.3f} s  {calls:7d} calls  "
+                         f"{1000 * total / max(calls, 1):9.2f} ms/call")
+        return "\n".join(lines)
+
+    def _write(self, event: str, message: Optional[str], fields: dict) -> None:
+        """Output one event; subclasses override this, the base sink drops it."""
+
+
+class SilentSink(EventSink):
+    """Drops every event; stage timings are still collected."""
+
+    def emit(self, event: str, message: Optional[str] = None, **fields) -> None:
+        pass
+
+
+class ConsoleSink(EventSink):
+    """Prints event messages as plain text (the scripts' traditional output)."""
+
+    def __init__(self, stream: TextIO = None):
+        """
+        Args:
+            stream: Output stream (default: sys.stdout at write time)
+        """
+        super().__init__()
+        self.stream = stream
+
+    def _write(self, event: str, message: Optional[str], fields: dict) -> None:
+        if message is not None:
+            print(message, file=self.stream or sys.stdout)
+
+
+class JsonLinesSink(EventSink):
+    """Writes one JSON object per event (newline-delimited JSON)."""
+
+    def __init__(self, stream: TextIO = None):
+        """
+        Args:
+            stream: Output stream (default: sys.stdout at write time)
+        """
+        super().__init__()
+        self.stream = stream
+
+    def _write(self, event: str, message: Optional[str], fields: dict) -> None:
+        record = {'event': event, 'time': round(time.time(), 6)}
+        if message is not None:
+            record['message'] = message
+        record.update(fields)
+        stream = self.stream or sys.stdout
+        stream.write(json.dumps(record, default=str) + '\n')
+
+
+class RequestStats:
+    """Latency and outcome of requests, for throughput and tail latency reports (thread-safe)."""
+
+    def __init__(self):
+        self.latencies: List[float] = []  # seconds per request, retries included
+        self.failures = 0  # requests without a 200 response
+        self.retries = 0  # extra attempts (clients that retry)
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def record(self, start: float, end: float, ok: bool = True, retries: int = 0) -> None:
+        """Record one request from its perf_counter start and end times."""
+        with self._lock:
+            self.latencies.append(end - start)
+            self.failures += not ok
+            self.retries += retries
+            self.started = start if self.started is None else min(self.started, start)
+            self.finished = end if self.finished is None else max(self.finished, end)
+
+    def summary(self) -> Dict[str, float]:
+        """Request count, failures, retries, throughput (requests/s) and latency percentiles (ms)."""
+        with self._lock:
+            latencies = sorted(self.latencies)
+            elapsed = (self.finished - self.started) if latencies else 0.0
+            failures, retries = self.failures, self.retries
+
+        def percentile(q: float) -> float:
+            if not latencies:
+                return 0.0
+            return 1000 * latencies[min(len(latencies) - 1, int(q * len(latencies)))]
+
+        return {
+            'requests': len(latencies),
+            'failures': failures,
+            'retries': retries,
+            'elapsed_s': elapsed,
+            'throughput': len(latencies) / elapsed if elapsed > 0 else 0.0,
+            'p50_ms': percentile(0.50),
+            'p95_ms': percentile(0.95),
+            'p99_ms': percentile(0.99),
+            'max_ms': 1000 * latencies[-1] if latencies else 0.0,
+        }
+
+    def report(self) -> str:
+        """One-line throughput and tail latency summary."""
+        s = self.summary()
+        return (f"{s['requests']} requests in {s['elapsed_s']:.1f} s ({s['throughput']:.1f}/s), "
+                f"{s['failures']} failed, {s['retries']} retries | latency p50 {s['p50_ms']:.0f} ms, "
+                f"p95 {s['p95_ms']:.0f} ms, p99 {s['p99_ms']:.0f} ms, max {s['max_ms']:.0f} ms")
+
+
+SINKS = {
+    'console': ConsoleSink,
+    'silent': SilentSink,
+    'ndjson': JsonLinesSink,
+}
+
+
+def make_sink(name: str = 'console', stream: TextIO = None) -> EventSink:
+    """
+    Create an event sink by name.
+
+    Args:
+        name: 'console' (human-readable), 'silent' or 'ndjson'
+        stream: Output stream for console/ndjson sinks (default: stdout)
+
+    Returns:
+        EventSink instance
+    """
+    if name not in SINKS:
+        raise ValueError(f"Unknown event sink '{name}' (choose from {', '.join(SINKS)})")
+    if name == 'silent':
+        return SilentSink()
+    return SINKS[name](stream)
@@ -0,0 +1,270 @@
+"""Pooled HTTP client for RCSB entry metadata and CIF downloads, with retries and rate limiting."""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .instrumentation import RequestStats
+
+
+DATA_URL = 'https://data.rcsb.org'
+FILES_URL = 'https://files.rcsb.org'
+
+# Responses worth another attempt: rate limited or a transient server error
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class RateLimiter:
+    """Spaces requests to one host at least 1 / rate seconds apart, across threads."""
+
+    def __init__(self, rate: float):
+        """
+        Args:
+            rate: Requests per second (None or <= 0: unlimited)
+        """
+        self.interval = 1.0 / rate if rate and rate > 0 else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        """Block until this caller's slot comes up."""
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class RcsbClient:
+    """
+    RCSB REST and file downloads over one keep-alive session.
+
+    Connections are pooled per host and shared by the worker threads of
+    map(), each host is rate limited, and transient failures (connection
+    errors, timeouts, 429 and 5xx responses) are retried with exponential
+    backoff, honouring Retry-After. Base URLs are configurable, so a local
+    server can stand in for RCSB.
+    """
+
+    def __init__(self, data_url: str = DATA_URL, files_url: str = FILES_URL, max_workers: int = 16,
+                 rate: float = 20.0, retries: int = 3, backoff: float = 0.5, timeout: float = 30):
+        """
+        Args:
+            data_url: Base URL of the data API (entry metadata)
+            files_url: Base URL of the file server (CIF downloads)
+            max_workers: Threads used by map(), and pooled connections per host
+            rate: Requests per second per host (None or <= 0: unlimited)
+            retries: Extra attempts after a transient failure
+            backoff: Delay before the first retry in seconds, doubled for each further retry
+            timeout: Per-attempt timeout in seconds
+        """
+        self.data_url = data_url.rstrip('/')
+        self.files_url = files_url.rstrip('/')
+        self.max_workers = max_workers
+        self.rate = rate
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.stats = RequestStats()
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max_workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self._limiters: Dict[str, RateLimiter] = {}
+        self._limiters_lock = threading.Lock()
+
+    def entry_url(self, pdb_id: str) -> str:
+        return f"{self.data_url}/rest/v1/core/entry/{pdb_id.upper().strip()}"
+
+    def cif_url(self, pdb_id: str) -> str:
+        return f"{self.files_url}/download/{pdb_id.upper().strip()}.cif"
+
+    def _limiter(self, url: str) -> RateLimiter:
+        host = urlsplit(url).netloc
+        with self._limiters_lock:
+            if host not in self._limiters:
+                self._limiters[host] = RateLimiter(self.rate)
+            return self._limiters[host]
+
+    def _delay(self, attempt: int, response: Optional[requests.Response]) -> float:
+        """Seconds to wait before retry number attempt + 1."""
+        retry_after = response.headers.get('Retry-After') if response is not None else None
+        try:
+            return max(0.0, float(retry_after))
+        except (TypeError, ValueError):
+            return self.backoff * (2 ** attempt)
+
+    def get(self, url: str) -> requests.Response:
+        """
+        GET a URL, retrying transient failures.
+
+        Returns:
+            The final response (which may still be an error status)
+
+        Raises:
+            requests.RequestException: If the last attempt failed without a response
+        """
+        limiter = self._limiter(url)
+        start = time.perf_counter()
+        attempt = 0
+        response = None
+        try:
+            while True:
+                limiter.wait()
+                try:
+                    response = self.session.get(url, timeout=self.timeout)
+                except (requests.ConnectionError, requests.Timeout):
+                    response = None
+                    if attempt >= self.retries:
+                        raise
+                else:
+                    if response.status_code not in RETRY_STATUSES or attempt >= self.retries:
+                        return response
+                delay = self._delay(attempt, response)
+                if response is not None:
+                    response.close()  # hand its connection back to the pool before waiting
+                time.sleep(delay)
+                attempt += 1
+        finally:
+            ok = response is not None and response.status_code == 200
+            self.stats.record(start, time.perf_counter(), ok, attempt)
+
+    def map(self, func: Callable, items: Iterable) -> Iterator:
+        """
+        func(item) for every item on max_workers threads, results in item order.
+
+        func typically calls get() (directly or through DataLoader), so the
+        threads share this client's connection pool and rate limits.
+        """
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            yield from executor.map(func, items)
+
+    def close(self) -> None:
+        self.session.close()
+
+
+def extract_validation_metrics(data: dict) -> dict:
+    """
+    Validation metrics and structure metadata from an RCSB core entry record.
+
+    Args:
+        data: Parsed JSON of /rest/v1/core/entry/{pdb_id}
+
+    Returns:
+        Dictionary of metrics (keys as cached in metadata_cache.json)
+    """
+    metrics = {}
+
+    # Primary validation metrics from pdbx_vrpt_summary_geometry
+    if 'pdbx_vrpt_summary_geometry' in data and len(data['pdbx_vrpt_summary_geometry']) > 0:
+        geom_data = data['pdbx_vrpt_summary_geometry'][0]
+        metrics.update({
+            'clashscore': geom_data.get('clashscore'),
+            'angles_rmsz': geom_data.get('angles_rmsz'),
+            'bonds_rmsz': geom_data.get('bonds_rmsz'),
+            'percent_ramachandran_outliers': geom_data.get('percent_ramachandran_outliers'),
+            'percent_rotamer_outliers': geom_data.get('percent_rotamer_outliers')
+        })
+
+    # RNA backbone quality from pdbx_vrpt_summary
+    if 'pdbx_vrpt_summary' in data:
+        vrpt_summary = data['pdbx_vrpt_summary']
+        metrics['rnasuiteness'] = vrpt_summary.get('rnasuiteness', None)
+
+    # Experimental method and resolution from rcsb_entry_info
+    if 'rcsb_entry_info' in data:
+        entry_info = data['rcsb_entry_info']
+        metrics['Experimental_method'] = entry_info.get('experimental_method', None)
+
+        # Resolution - try multiple sources
+        resolution = None
+        if 'resolution_combined' in entry_info and entry_info['resolution_combined']:
+            resolution = entry_info['resolution_combined'][0]  # Get first/best resolution
+        elif 'diffrn_resolution_high' in entry_info and entry_info['diffrn_resolution_high']:
+            resolution = entry_info['diffrn_resolution_high'].get('value', None)
+
+        # Set resolution based on experimental method
+        if metrics.get('Experimental_method') == 'EM':
+            metrics['EM Resolution (Å)'] = resolution
+            metrics['EM Diffraction Resolution (Å)'] = None
+        else:
+            metrics['EM Resolution (Å)'] = None
+            metrics['EM Diffraction Resolution (Å)'] = resolution
+
+    # Deposition date from rcsb_accession_info
+    if 'rcsb_accession_info' in data:
+        accession_info = data['rcsb_accession_info']
+        deposit_date = accession_info.get('deposit_date', None)
+        if deposit_date:
+            # Extract just the date part (YYYY-MM-DD) from ISO format
+            metrics['Deposition_Date'] = deposit_date.split('T')[0] if 'T' in deposit_date else deposit_date
+        else:
+            metrics['Deposition_Date'] = None
+
+    # Refinement statistics from refine[0]
+    if 'refine' in data and len(data['refine']) > 0:
+        refine_data = data['refine'][0]
+        metrics.update({
+            'R_free': refine_data.get('ls_rfactor_rfree', None),
+            'R_work': refine_data.get('ls_rfactor_rwork', None),
+            'Refinement_resolution': refine_data.get('ls_dres_high', None),
+            'Average_B_factor': refine_data.get('biso_mean', None)
+        })
+
+    # Structure determination method from exptl[0]
+    if 'exptl' in data and len(data['exptl']) > 0:
+        exptl_data = data['exptl'][0]
+        metrics['Structure Determination Method'] = exptl_data.get('method', None)
+
+    # Data collection quality from pdbx_vrpt_summary_diffraction[0]
+    if 'pdbx_vrpt_summary_diffraction' in data and len(data['pdbx_vrpt_summary_diffraction']) > 0:
+        diff_data = data['pdbx_vrpt_summary_diffraction'][0]
+        metrics.update({
+            'data_completeness': diff_data.get('data_completeness', None),
+            'iover_sigma': diff_data.get('iover_sigma', None),
+            'data_anisotropy': diff_data.get('data_anisotropy', None),
+            'fo_fc_correlation': diff_data.get('fo_fc_correlation', None)
+        })
+
+    # RNA structural features from rcsb_entry_info
+    if 'rcsb_entry_info' in data:
+        entry_info = data['rcsb_entry_info']
+        if 'ndb_struct_conf_na_feature_combined' in entry_info:
+            features = entry_info['ndb_struct_conf_na_feature_combined']
+            metrics['RNA_structural_features'] = ', '.join(features) if features else None
+
+    # Publication year from rcsb_primary_citation
+    if 'rcsb_primary_citation' in data:
+        citation = data['rcsb_primary_citation']
+        metrics['Publication_Year'] = citation.get('year', None)
+
+    # Software used
+    if 'software' in data:
+        software_list = []
+        for sw in data['software']:
+            name = sw.get('name', '')
+            version = sw.get('version', '')
+            if version:
+                software_list.append(f"{name} {version}")
+            else:
+                software_list.append(name)
+        metrics['Software_used'] = ', '.join(software_list) if software_list else None
+
+    # Revision information from rcsb_accession_info
+    if 'rcsb_accession_info' in data:
+        accession_info = data['rcsb_accession_info']
+        metrics.update({
+            'Revision_Date': accession_info.get('revision_date', '').split('T')[0] if accession_info.get('revision_date') else None,
+            'Major_Revision': accession_info.get('major_revision', None),
+            'Minor_Revision': accession_info.get('minor_revision', None)
+        })
+
+    return metrics
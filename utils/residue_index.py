@@ -0,0 +1,92 @@
+"""Per-structure residue index with chain-order predecessors for backbone scoring."""
+
+from typing import Dict, Optional, Tuple
+
+from .residue_key import residue_key
+
+
+def parse_residue_position(res_id: str) -> Optional[Tuple[str, int, str]]:
+    """
+    Parse a residue ID into (chain, residue number, insertion code).
+
+    Format: CHAIN-NAME-NUMBER-INSCODE, e.g. 'A-G-52-' or 'A-G-52-A' (see utils/residue_key.py).
+
+    Returns:
+        (chain, resnum, icode) or None if the ID is malformed
+    """
+    key = residue_key(res_id)
+    return key.position if key is not None else None
+
+
+class ResidueIndex:
+    """
+    Residue lookup built once from a structure's torsion data.
+
+    Maps (chain, resnum, insertion code) to the residue ID and records each
+    residue's chain predecessor, so backbone code never scans the torsion dict.
+
+    Residues of a chain are ordered by (resnum, insertion code). The previous
+    residue in that order is the predecessor only if it is sequence-contiguous:
+    same number (insertion code step, e.g. 52 -> 52A) or number - 1. Across a
+    numbering gap there is no predecessor, since no suite spans a chain break.
+    """
+
+    def __init__(self, torsion_data: dict):
+        """
+        Args:
+            torsion_data: Dict keyed by residue ID (e.g. 'A-C-1-')
+        """
+        self._by_position: Dict[Tuple[str, int, str], str] = {}
+        self._position: Dict[str, Tuple[str, int, str]] = {}
+        self._predecessor: Dict[str, str] = {}
+
+        if not torsion_data:
+            return
+
+        by_chain: Dict[str, list] = {}
+        for res_id in torsion_data:
+            position = parse_residue_position(res_id)
+            if position is None:
+                continue
+            # Keep the first residue seen at a position (alternate names at the same position)
+            if position in self._by_position:
+                continue
+            self._by_position[position] = res_id
+            self._position[res_id] = position
+            by_chain.setdefault(position[0], []).append(position)
+
+        for positions in by_chain.values():
+            positions.sort(key=lambda p: (p[1], p[2]))
+            for prev, cur in zip(positions, positions[1:]):
+                if cur[1] - prev[1] in (0, 1):
+                    self._predecessor[self._by_position[cur]] = self._by_position[prev]
+
+    def __len__(self) -> int:
+        return len(self._position)
+
+    def __contains__(self, res_id: str) -> bool:
+        return res_id in self._position
+
+    def get(self, chain: str, resnum: int, icode: str = '') -> Optional[str]:
+        """Return the residue ID at (chain, resnum, icode), or None."""
+        return self._by_position.get((chain, resnum, icode))
+
+    def position(self, res_id: str) -> Optional[Tuple[str, int, str]]:
+        """Return (chain, resnum, icode) for an indexed residue ID, or None."""
+        return self._position.get(res_id)
+
+    def predecessor(self, res_id: str) -> Optional[str]:
+        """
+        Return the preceding residue in the chain, or None.
+
+        Residues missing from the torsion data fall back to the (chain, resnum - 1)
+        position lookup, which is all their ID can tell us.
+        """
+        if res_id in self._position:
+            return self._predecessor.get(res_id)
+
+        position = parse_residue_position(res_id)
+        if position is None:
+            return None
+        chain, resnum, _ = position
+        return self._by_position.get((chain, resnum - 1, ''))
@@ -0,0 +1,159 @@
+"""Residue identifier parsing: interned, structured keys for IDs like 'A-G-52-'."""
+
+import sys
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+# Columns/fields holding residue IDs, and the key fields loaders attach for them
+KEY_FIELDS = {'res_1': 'key_1', 'res_2': 'key_2'}
+
+# Interned keys are dropped wholesale beyond this many distinct IDs, so a long
+# batch over many structures cannot grow the table without bound
+_MAX_INTERNED = 1_000_000
+
+
+class ResidueKey(NamedTuple):
+    """
+    Parsed residue ID.
+
+    Format: CHAIN-NAME-NUMBER-INSCODE, e.g. 'A-G-52-', 'A-G-52-A' (insertion
+    code A) or 'B-U--3-' (residue number -3). Chain and name strings are
+    interned, so equal keys share their strings.
+    """
+
+    chain: str
+    name: str
+    number: int
+    icode: str = ''
+
+    @property
+    def position(self) -> Tuple[str, int, str]:
+        """(chain, number, insertion code): the residue's place in its chain."""
+        return self.chain, self.number, self.icode
+
+    def is_adjacent(self, other: 'ResidueKey') -> bool:
+        """True if both residues are on the same chain with residue numbers differing by 1."""
+        return self.chain == other.chain and abs(self.number - other.number) == 1
+
+
+def parse_residue_id(res_id: str) -> Optional[ResidueKey]:
+    """
+    Parse a residue ID without the intern table (see residue_key).
+
+    Returns:
+        ResidueKey, or None if the ID is not a string or has no integer residue number
+    """
+    if not isinstance(res_id, str):
+        return None
+    chain, _, rest = res_id.partition('-')
+    name, sep, rest = rest.partition('-')
+    if not sep:
+        return None
+    negative = rest.startswith('-')
+    number, _, icode = (rest[1:] if negative else rest).partition('-')
+    if not (number.isascii() and number.isdigit()):
+        return None
+    icode = icode.partition('-')[0]
+    return ResidueKey(sys.intern(chain), sys.intern(name),
+                      -int(number) if negative else int(number), sys.intern(icode))
+
+
+_interned: Dict[str, Optional[ResidueKey]] = {}
+
+
+def residue_key(res_id: str) -> Optional[ResidueKey]:
+    """
+    Interned ResidueKey for a residue ID (None if malformed).
+
+    Each distinct ID is parsed once per process; later calls are a dict
+    lookup returning the same key object.
+    """
+    try:
+        return _interned[res_id]
+    except KeyError:
+        pass
+    except TypeError:  # unhashable
+        return None
+    key = parse_residue_id(res_id)
+    if len(_interned) >= _MAX_INTERNED:
+        _interned.clear()
+    _interned[res_id] = key
+    return key
+
+
+def require_residue_key(res_id: str) -> ResidueKey:
+    """
+    ResidueKey for a residue ID that must be well formed.
+
+    Raises:
+        ValueError: If the ID cannot be parsed
+    """
+    key = residue_key(res_id)
+    if key is None:
+        raise ValueError(f"Malformed residue ID: {res_id!r}")
+    return key
+
+
+def residues_adjacent(res_1: str, res_2: str) -> bool:
+    """True if two residue IDs are on the same chain with numbers differing by 1 (False if malformed)."""
+    key_1 = residue_key(res_1)
+    key_2 = residue_key(res_2)
+    return key_1 is not None and key_2 is not None and key_1.is_adjacent(key_2)
+
+
+def attach_basepair_keys(basepairs: list) -> list:
+    """Add key_1/key_2 (ResidueKey or None) to each base pair dict, in place."""
+    for bp in basepairs:
+        for field, key_field in KEY_FIELDS.items():
+            bp[key_field] = residue_key(bp.get(field))
+    return basepairs
+
+
+def residue_columns(*columns) -> List[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    Parsed residue ID columns as arrays, for vectorized chain and number filters.
+
+    Each distinct ID across the columns is parsed once (see residue_key);
+    the per-row arrays are then gathered from the distinct IDs by their codes.
+
+    Args:
+        columns: Sequences of residue IDs (lists, Series or arrays)
+
+    Returns:
+        Per column, a tuple of (valid bool array, chain object array,
+        number int64 array); rows with a malformed or missing ID have
+        valid False, chain '' and number 0
+    """
+    arrays = [np.asarray(column, dtype=object) for column in columns]
+    codes, uniques = pd.factorize(np.concatenate(arrays) if arrays else np.empty(0, dtype=object))
+    keys = [residue_key(res_id) for res_id in uniques]
+    # One trailing sentinel entry, so the code -1 of missing IDs gathers an invalid residue
+    valid = np.array([key is not None for key in keys] + [False], dtype=bool)
+    chains = np.array([key.chain if key is not None else '' for key in keys] + [''], dtype=object)
+    numbers = np.array([key.number if key is not None else 0 for key in keys] + [0], dtype=np.int64)
+
+    parsed = []
+    offset = 0
+    for array in arrays:
+        column_codes = codes[offset:offset + len(array)]
+        offset += len(array)
+        parsed.append((valid[column_codes], chains[column_codes], numbers[column_codes]))
+    return parsed
+
+
+def residue_mask(column, predicate: Callable[[str], bool]) -> np.ndarray:
+    """
+    Boolean row mask of predicate(residue ID) over an ID column.
+
+    The predicate runs once per distinct ID rather than once per row, and
+    the column may be categorical (compact H-bond schema), where
+    Series.apply would return a Categorical that cannot be combined with &
+    or |. Missing IDs give False without calling the predicate.
+    """
+    codes, uniques = pd.factorize(np.asarray(column, dtype=object))
+    # Trailing False for the code -1 of missing IDs
+    selected = np.array([bool(predicate(res_id)) for res_id in uniques] + [False], dtype=bool)
+    return selected[codes]
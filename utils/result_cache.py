@@ -0,0 +1,232 @@
+"""Content-addressed cache of full-structure scoring results."""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+
+# Bump when the layout of cache entries or of the cached result changes
+CACHE_VERSION = 1
+
+# Config attributes that locate inputs rather than affect scores
+_LOCATION_SUFFIX = '_DIR'
+
+# Temporary files older than this (seconds) are from interrupted writes
+_TMP_MAX_AGE = 3600
+
+
+def _canonical(value):
+    """Convert a value to a JSON-serializable form with a stable ordering."""
+    if isinstance(value, dict):
+        items = [(_canonical(k), _canonical(v)) for k, v in value.items()]
+        return [list(item) for item in sorted(items, key=lambda item: json.dumps(item[0]))]
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    if isinstance(value, (set, frozenset)):
+        return sorted((_canonical(v) for v in value), key=json.dumps)
+    if hasattr(value, 'tolist'):  # numpy arrays and scalars
+        return _canonical(value.tolist())
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return repr(value)
+
+
+def hash_value(value) -> str:
+    """SHA-256 hex digest of a value's canonical JSON form."""
+    encoded = json.dumps(_canonical(value), separators=(',', ':')).encode()
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def hash_files(paths: Sequence[Path]) -> str:
+    """
+    SHA-256 hex digest over the contents of several files.
+
+    Each file contributes its position and length, so moving bytes between
+    files changes the digest; a missing file contributes a marker.
+
+    Args:
+        paths: Files in a fixed order
+
+    Returns:
+        Hex digest
+    """
+    digest = hashlib.sha256()
+    for i, path in enumerate(paths):
+        path = Path(path)
+        if not path.is_file():
+            digest.update(f"{i}:missing\n".encode())
+            continue
+        digest.update(f"{i}:{path.stat().st_size}\n".encode())
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+def config_snapshot(config) -> dict:
+    """Scoring-relevant config values: every upper-case attribute except input directories."""
+    return {
+        name: getattr(config, name)
+        for name in dir(config)
+        if name.isupper() and not name.endswith(_LOCATION_SUFFIX)
+        and not callable(getattr(config, name))
+    }
+
+
+def scoring_fingerprint(config, reference_data: dict = None) -> str:
+    """
+    Fingerprint of everything besides the inputs that determines a score.
+
+    Args:
+        config: Configuration with thresholds and penalty weights
+        reference_data: Reference tables used by the scorer, by name
+            (e.g. {'richardson_suites': ..., 'chi_expectations': ...})
+
+    Returns:
+        Hex digest
+    """
+    return hash_value({
+        'version': CACHE_VERSION,
+        'config': config_snapshot(config),
+        'reference': reference_data or {},
+    })
+
+
+class ResultCache:
+    """
+    Full-structure results keyed by input content and scoring fingerprint.
+
+    An entry's key hashes the structure's input files together with the
+    scoring fingerprint (config thresholds, penalty weights, reference data),
+    so a hit is valid wherever the same inputs are scored with the same
+    settings, across runs and nodes. Entries are written atomically
+    (temporary file + rename), so concurrent writers on a shared filesystem
+    never expose a partial entry.
+
+    Layout: {cache_dir}/{key[:2]}/{key}.json, each holding the key's parts
+    (pdb_id, input_hash, fingerprint) next to the cached result.
+    """
+
+    def __init__(self, cache_dir, fingerprint: str):
+        """
+        Args:
+            cache_dir: Cache directory (created on first write)
+            fingerprint: Current scoring fingerprint (see scoring_fingerprint)
+        """
+        self.cache_dir = Path(cache_dir)
+        self.fingerprint = fingerprint
+
+    def key(self, input_hash: str) -> str:
+        """Cache key for one structure's input hash under the current fingerprint."""
+        return hashlib.sha256(f"{input_hash}:{self.fingerprint}".encode()).hexdigest()
+
+    def path(self, key: str) -> Path:
+        """Entry file for a key."""
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, input_hash: str) -> Optional[dict]:
+        """
+        Look up a cached result.
+
+        Args:
+            input_hash: Hash of the structure's input files
+
+        Returns:
+            Cached result dict, or None on a miss or an unreadable entry
+        """
+        key = self.key(input_hash)
+        try:
+            with open(self.path(key), 'r') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get('key') != key or entry.get('fingerprint') != self.fingerprint:
+            return None
+        return entry.get('result')
+
+    def put(self, pdb_id: str, input_hash: str, result: dict) -> Path:
+        """
+        Store a result.
+
+        Args:
+            pdb_id: PDB ID (informational; not part of the key)
+            input_hash: Hash of the structure's input files
+            result: JSON-serializable result
+
+        Returns:
+            Path of the written entry
+        """
+        key = self.key(input_hash)
+        path = self.path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        entry = {
+            'version': CACHE_VERSION,
+            'key': key,
+            'pdb_id': pdb_id,
+            'input_hash': input_hash,
+            'fingerprint': self.fingerprint,
+            'created': round(time.time(), 3),
+            'result': result,
+        }
+        # A temp file of its own per writer, so threads and processes storing
+        # the same key never write into or rename each other's partial file
+        fd, tmp_path = tempfile.mkstemp(prefix=f".{key}.", suffix='.tmp', dir=path.parent)
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+        return path
+
+    def entries(self) -> Iterator[Tuple[Path, Optional[dict]]]:
+        """Yield (path, header) for every JSON file in the cache; header is None if unreadable."""
+        if not self.cache_dir.is_dir():
+            return
+        for path in sorted(self.cache_dir.rglob('*.json')):
+            try:
+                with open(path, 'r') as f:
+                    entry = json.load(f)
+            except (OSError, ValueError):
+                yield path, None
+                continue
+            if not isinstance(entry, dict):
+                yield path, None
+                continue
+            entry.pop('result', None)
+            yield path, entry
+
+    def evict(self, dry_run: bool = False) -> List[Path]:
+        """
+        Remove entries that cannot be hits under the current fingerprint.
+
+        That is entries written with another fingerprint, legacy per-PDB files
+        ({PDB}.json, keyed by PDB ID only), unreadable files and temporary
+        files left by interrupted writes (older than an hour, so writes in
+        progress elsewhere are not disturbed).
+
+        Args:
+            dry_run: Only report what would be removed
+
+        Returns:
+            Removed (or removable) paths
+        """
+        stale = [path for path, header in self.entries()
+                 if header is None or header.get('fingerprint') != self.fingerprint
+                 or header.get('key') != path.stem]
+        if self.cache_dir.is_dir():
+            cutoff = time.time() - _TMP_MAX_AGE
+            stale.extend(path for path in sorted(self.cache_dir.rglob('.*.tmp'))
+                         if path.stat().st_mtime < cutoff)
+        if not dry_run:
+            for path in stale:
+                path.unlink(missing_ok=True)
+        return stale
@@ -0,0 +1,136 @@
+"""Memory-bounded LRU cache of parsed structure data (base pairs, H-bonds, torsions)."""
+
+import sys
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional
+
+import pandas as pd
+
+from .hbond_table import HBondTable
+
+
+def estimate_size(value, _depth: int = 0) -> int:
+    """
+    Estimate the memory footprint of parsed structure data in bytes.
+
+    DataFrames report their own (deep) memory usage. Lists and dicts are
+    walked a few levels deep, counting containers and their values; dict keys
+    are skipped, since parsed JSON shares them across records.
+
+    Args:
+        value: DataFrame, HBondTable, or list/dict of JSON-like values
+
+    Returns:
+        Estimated size in bytes
+    """
+    if isinstance(value, HBondTable):
+        return estimate_size(value.all)  # the views share the full table's memory
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    size = sys.getsizeof(value)
+    if _depth >= 3:
+        return size
+    if isinstance(value, dict):
+        return size + sum(estimate_size(v, _depth + 1) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return size + sum(estimate_size(v, _depth + 1) for v in value)
+    return size
+
+
+class StructureCache:
+    """
+    Least-recently-used cache with a memory budget.
+
+    Entries carry an estimated size (see estimate_size); adding an entry
+    evicts the least recently used ones until the total fits the budget.
+    An entry larger than the whole budget is not cached.
+
+    Attributes:
+        budget_bytes: Maximum total estimated size
+        hits / misses / evictions: Lookup and eviction counters
+        bytes: Current total estimated size
+    """
+
+    def __init__(self, budget_mb: float):
+        """
+        Args:
+            budget_mb: Memory budget in megabytes
+        """
+        self.budget_bytes = int(budget_mb * 1024 * 1024)
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()  # key -> (value, size)
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def get(self, key: Hashable):
+        """Return the cached value for key (marking it most recently used), or None."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key: Hashable, value, size: Optional[int] = None) -> bool:
+        """
+        Cache a value.
+
+        Args:
+            key: Cache key
+            value: Value to cache (returned as-is by get; callers must not mutate it)
+            size: Estimated size in bytes (default: estimate_size(value))
+
+        Returns:
+            True if the value was cached, False if it exceeds the budget
+        """
+        if size is None:
+            size = estimate_size(value)
+        self.discard(key)
+        if size > self.budget_bytes:
+            return False
+        while self._entries and self.bytes + size > self.budget_bytes:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self.bytes -= evicted_size
+            self.evictions += 1
+        self._entries[key] = (value, size)
+        self.bytes += size
+        return True
+
+    def discard(self, key: Hashable) -> None:
+        """Drop an entry if present (not counted as an eviction)."""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.bytes -= entry[1]
+
+    def clear(self) -> None:
+        """Drop all entries; counters are kept."""
+        self._entries.clear()
+        self.bytes = 0
+
+    def stats(self) -> Dict[str, float]:
+        """Counters and current usage."""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'entries': len(self._entries),
+            'mb': self.bytes / (1024 * 1024),
+            'budget_mb': self.budget_bytes / (1024 * 1024),
+        }
+
+    def summary(self) -> str:
+        """One-line human-readable statistics."""
+        s = self.stats()
+        return (f"Structure cache: {s['hits']} hits, {s['misses']} misses "
+                f"({100 * s['hit_rate']:.1f}% hit rate), {s['evictions']} evictions, "
+                f"{s['entries']} entries using {s['mb']:.1f}/{s['budget_mb']:.0f} MB")
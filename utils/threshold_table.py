@@ -0,0 +1,162 @@
+"""Compiled (bp_type, edge) threshold table resolved once from a Config."""
+
+from typing import Dict, List, Sequence, Tuple
+import numpy as np
+
+
+# Dense column order of ThresholdTable.geometry / ThresholdTable.hbond
+GEOMETRY_FIELDS = (
+    'SHEAR_MIN', 'SHEAR_MAX', 'STRETCH_MIN', 'STRETCH_MAX',
+    'BUCKLE_MIN', 'BUCKLE_MAX', 'STAGGER_MIN', 'STAGGER_MAX',
+    'PROPELLER_MIN', 'PROPELLER_MAX', 'OPENING_MIN', 'OPENING_MAX',
+    'HBOND_SCORE_MIN', 'HBOND_SCORE_MAX',
+)
+HBOND_FIELDS = ('DIST_MIN', 'DIST_MAX', 'ANGLE_MIN')
+
+# Stand-in for any bp_type / edge the config never mentions; all such values
+# resolve identically, so they share one row per known partner
+UNKNOWN = '\0unknown'
+
+
+def resolve_thresholds(by_bp: dict, bp_type: str, edge_type: str) -> dict:
+    """
+    Walk the config fallback chain for one (bp_type, edge).
+
+    Fallback chain: (bp, edge) -> (bp, _OTHER) -> (_OTHERS, edge) -> (_OTHERS, _OTHER)
+
+    Args:
+        by_bp: Dict keyed by base-pair type, then edge (e.g. GEOMETRY_THRESHOLDS_BY_BASE_PAIR_BY_EDGE)
+        bp_type: Base-pair type (e.g. 'A-U')
+        edge_type: Leontis-Westhof edge (e.g. 'cWW')
+
+    Returns:
+        Threshold dict, empty if nothing matches
+    """
+    return (by_bp.get(bp_type, {}).get(edge_type) or
+            by_bp.get(bp_type, {}).get('_OTHER') or
+            by_bp.get('_OTHERS', {}).get(edge_type) or
+            by_bp.get('_OTHERS', {}).get('_OTHER') or {})
+
+
+def resolve_chi_expected(chi_expectations: dict, bp_type: str, edge_type: str) -> str:
+    """
+    Expected chi conformation for one (bp_type, edge).
+
+    Fallback chain: (edge, bp) -> (edge, _OTHER) -> _OTHER; 'anti' if nothing matches.
+    """
+    expected = (chi_expectations.get(edge_type, {}).get(bp_type) or
+                chi_expectations.get(edge_type, {}).get('_OTHER') or
+                chi_expectations.get('_OTHER', {}))
+    return expected.get('expected', 'anti') if expected else 'anti'
+
+
+def _by_base_pair(config, name: str) -> dict:
+    """
+    Thresholds keyed by base-pair type, then edge.
+
+    Edge-only configs (config_bc_thresholds: *_THRESHOLDS_BY_EDGE) are read as
+    the base-pair-agnostic '_OTHERS' entry.
+    """
+    by_bp = getattr(config, f'{name}_THRESHOLDS_BY_BASE_PAIR_BY_EDGE', None)
+    if by_bp is not None:
+        return by_bp
+    by_edge = getattr(config, f'{name}_THRESHOLDS_BY_EDGE', None)
+    return {'_OTHERS': by_edge} if by_edge else {}
+
+
+def _dense_row(thresholds: dict, fields: Sequence[str]) -> List[float]:
+    """Thresholds in field order, NaN where a field is not defined."""
+    return [np.nan if thresholds.get(f) is None else thresholds[f] for f in fields]
+
+
+class ThresholdTable:
+    """
+    Scoring thresholds resolved for every (bp_type, edge) combination in a config.
+
+    Compiled once per Scorer, so scoring a pair is one code lookup instead of
+    walking the fallback chains for geometry, H-bond and chi thresholds.
+    Each combination gets an integer code (see code()); row `code` of the dense
+    arrays holds its thresholds, NaN where the config defines none.
+
+    Attributes:
+        codes: (bp_type, edge) -> row code
+        geometry: (n_codes, len(GEOMETRY_FIELDS)) float array
+        hbond: (n_codes, len(HBOND_FIELDS)) float array
+        expected_counts: (n_codes, 3) float array of (min, max, ideal) H-bond counts
+        geometry_thresholds / hbond_thresholds: resolved dicts per code
+        chi_expected: expected chi conformation per code
+    """
+
+    def __init__(self, config, chi_expectations: dict = None):
+        """
+        Args:
+            config: Configuration with thresholds (Config, config_bc or config_bc_thresholds)
+            chi_expectations: Expected chi conformations keyed by edge, then bp_type
+        """
+        self.chi_expectations = chi_expectations if chi_expectations is not None else {}
+        geo_by_bp = _by_base_pair(config, 'GEOMETRY')
+        hb_by_bp = _by_base_pair(config, 'HBOND')
+        expected_counts = getattr(config, 'EXPECTED_HBOND_COUNTS', {})
+
+        bp_types = set(geo_by_bp) | set(hb_by_bp) | set(expected_counts)
+        edge_types = {'_OTHER'}
+        for by_bp in (geo_by_bp, hb_by_bp):
+            for by_edge in by_bp.values():
+                edge_types.update(by_edge)
+        for edge_type, by_bp in self.chi_expectations.items():
+            edge_types.add(edge_type)
+            if isinstance(by_bp, dict):
+                bp_types.update(bp for bp, value in by_bp.items() if isinstance(value, dict))
+
+        self._bp_types = frozenset(bp_types)
+        self._edge_types = frozenset(edge_types)
+
+        self.codes: Dict[Tuple[str, str], int] = {}
+        self.geometry_thresholds: List[dict] = []
+        self.hbond_thresholds: List[dict] = []
+        self.chi_expected: List[str] = []
+        counts = []
+
+        for bp_type in sorted(bp_types) + [UNKNOWN]:
+            for edge_type in sorted(edge_types) + [UNKNOWN]:
+                self.codes[(bp_type, edge_type)] = len(self.codes)
+                self.geometry_thresholds.append(resolve_thresholds(geo_by_bp, bp_type, edge_type))
+                self.hbond_thresholds.append(resolve_thresholds(hb_by_bp, bp_type, edge_type))
+                self.chi_expected.append(resolve_chi_expected(self.chi_expectations, bp_type, edge_type))
+                counts.append(expected_counts.get(bp_type, (np.nan,) * 3))
+
+        self.geometry = np.array([_dense_row(t, GEOMETRY_FIELDS) for t in self.geometry_thresholds],
+                                 dtype=float)
+        self.hbond = np.array([_dense_row(t, HBOND_FIELDS) for t in self.hbond_thresholds],
+                              dtype=float)
+        self.expected_counts = np.array(counts, dtype=float)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def code(self, bp_type: str, edge_type: str) -> int:
+        """Row code for a (bp_type, edge); values the config never mentions share the UNKNOWN rows."""
+        code = self.codes.get((bp_type, edge_type))
+        if code is None:
+            code = self.codes[(bp_type if bp_type in self._bp_types else UNKNOWN,
+                               edge_type if edge_type in self._edge_types else UNKNOWN)]
+        return code
+
+    def codes_for(self, bp_types: Sequence[str], edge_types: Sequence[str]) -> np.ndarray:
+        """Row codes for parallel sequences of bp_types and edges."""
+        return np.fromiter((self.code(bp, edge) for bp, edge in zip(bp_types, edge_types)),
+                           dtype=np.intp, count=len(bp_types))
+
+
+def compile_thresholds(config, chi_expectations: dict = None) -> ThresholdTable:
+    """
+    Compile a config's threshold dictionaries into a ThresholdTable.
+
+    Args:
+        config: Configuration with thresholds
+        chi_expectations: Optional expected chi conformations (data/chi_expectations.json)
+
+    Returns:
+        ThresholdTable covering every (bp_type, edge) the config and chi data mention
+    """
+    return ThresholdTable(config, chi_expectations)